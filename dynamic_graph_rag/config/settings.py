@@ -49,7 +49,10 @@ GRAPH_DB_CONFIG = {
     "uri": os.getenv("NEO4J_URI", "bolt://localhost:7688"),
     "user": os.getenv("NEO4J_USER", "neo4j"),
     "password": os.getenv("NEO4J_PASSWORD", "graphrag_password"),
-    "database": os.getenv("NEO4J_DATABASE", "neo4j")
+    "database": os.getenv("NEO4J_DATABASE", "neo4j"),
+    "max_pool_size": int(os.getenv("NEO4J_MAX_POOL_SIZE", "50")),                      # 每个驱动的最大连接数
+    "acquisition_timeout": float(os.getenv("NEO4J_ACQUISITION_TIMEOUT", "60")),        # 等待空闲连接的超时（秒）
+    "max_connection_lifetime": float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))  # 连接最长存活时间（秒）
 }
 
 # InfluxDB时序数据库配置
@@ -58,7 +61,41 @@ INFLUXDB_CONFIG = {
     "token": os.getenv("INFLUXDB_TOKEN", "graphrag_token"),
     "org": os.getenv("INFLUXDB_ORG", "graphrag_org"),
     "bucket": os.getenv("INFLUXDB_BUCKET", "metrics"),
-    "timeout": int(os.getenv("INFLUXDB_TIMEOUT", "30000"))
+    "timeout": int(os.getenv("INFLUXDB_TIMEOUT", "30000")),
+    "bulk_chunk_size": int(os.getenv("INFLUXDB_BULK_CHUNK_SIZE", "500"))  # 批量查询每次包含的最大节点数
+}
+
+# 拓扑快照缓存配置（GraphData快照模式）
+TOPOLOGY_CACHE_CONFIG = {
+    "enabled": os.getenv("TOPOLOGY_SNAPSHOT_ENABLED", "false").lower() == "true",
+    "ttl": float(os.getenv("TOPOLOGY_SNAPSHOT_TTL", "300")),  # 快照有效期（秒）
+    "max_renewals": int(os.getenv("TOPOLOGY_SNAPSHOT_MAX_RENEWALS", "3"))  # 版本未变化时最多续期次数
+}
+
+# 节点类型健康状态配置（DynamicGraph.get_health_status）
+FLEET_HEALTH_CONFIG = {
+    "window": os.getenv("FLEET_HEALTH_WINDOW", "1h"),                   # 统计窗口
+    "threshold": float(os.getenv("FLEET_HEALTH_THRESHOLD", "3.5"))      # 稳健Z分数阈值
+}
+
+# 指标趋势与预测配置（DynamicGraph.get_metric_trend / predict_node_metrics）
+METRIC_ANALYTICS_CONFIG = {
+    "interval": os.getenv("METRIC_ANALYTICS_INTERVAL", "1h"),    # 序列对齐的时间步长，同时用于选择汇总层级
+    "season": os.getenv("METRIC_ANALYTICS_SEASON", "1d"),        # 季节周期
+    "alpha": float(os.getenv("METRIC_ANALYTICS_ALPHA", "0.3")),  # Holt-Winters水平平滑系数
+    "beta": float(os.getenv("METRIC_ANALYTICS_BETA", "0.05")),   # Holt-Winters趋势平滑系数
+    "gamma": float(os.getenv("METRIC_ANALYTICS_GAMMA", "0.2")),  # Holt-Winters季节平滑系数
+    "stable_change": float(os.getenv("METRIC_ANALYTICS_STABLE_CHANGE", "0.05"))  # 相对变化低于该值视为平稳
+}
+
+# 图数据导入配置
+GRAPH_IMPORT_CONFIG = {
+    "workers": int(os.getenv("GRAPH_IMPORT_WORKERS", "4")),                    # 并发导入的会话数
+    "batch_size": int(os.getenv("GRAPH_IMPORT_BATCH_SIZE", "500")),            # 初始批大小
+    "min_batch_size": int(os.getenv("GRAPH_IMPORT_MIN_BATCH_SIZE", "50")),
+    "max_batch_size": int(os.getenv("GRAPH_IMPORT_MAX_BATCH_SIZE", "20000")),
+    "target_batch_seconds": float(os.getenv("GRAPH_IMPORT_TARGET_BATCH_SECONDS", "1.0")),  # 每批目标耗时
+    "max_retries": int(os.getenv("GRAPH_IMPORT_MAX_RETRIES", "3"))             # 单批失败后的最大重试次数
 }
 
 # 节点类型配置
@@ -122,6 +159,22 @@ RETENTION_POLICIES = {
     "daily_rollups": 365    # 每日汇总数据保留365天
 }
 
+# 汇总层级配置（InfluxDBManager查询规划器），按分辨率从细到粗排列
+# 汇总桶中每个窗口保存mean/min/max/count四个字段，由InfluxDB任务按every周期写入
+ROLLUP_CONFIG = {
+    "enabled": os.getenv("ROLLUP_ENABLED", "false").lower() == "true",
+    "min_points": int(os.getenv("ROLLUP_MIN_POINTS", "24")),   # 自动选择层级时每条序列至少保留的点数
+    "task_offset": os.getenv("ROLLUP_TASK_OFFSET", "5m"),       # 汇总任务在窗口结束后的延迟，等待迟到数据
+    "tiers": [
+        {"name": "raw", "bucket": INFLUXDB_CONFIG["bucket"], "resolution": "15m",
+         "retention_days": RETENTION_POLICIES["raw_metrics"]},
+        {"name": "hourly", "bucket": os.getenv("INFLUXDB_HOURLY_BUCKET", "metrics_hourly"), "resolution": "1h",
+         "retention_days": RETENTION_POLICIES["hourly_rollups"]},
+        {"name": "daily", "bucket": os.getenv("INFLUXDB_DAILY_BUCKET", "metrics_daily"), "resolution": "1d",
+         "retention_days": RETENTION_POLICIES["daily_rollups"]}
+    ]
+}
+
 # 日志配置
 LOG_DIR = BASE_DIR / 'logs'
 LOG_DIR.mkdir(exist_ok=True)
@@ -7,20 +7,46 @@
 """
 
 import logging
+from collections import deque
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
-import random
-from influxdb_client import Point
+from typing import Dict, List, Optional
+
+from dynamic_graph_rag.db.line_protocol import encode_line_protocol
 
 logger = logging.getLogger('log_generator')
 
+# 阈值状态编码
+STATE_NORMAL, STATE_WARNING, STATE_ERROR, STATE_RECOVERY = 0, 1, 2, 3
+STATE_NAMES = {STATE_NORMAL: 'normal', STATE_WARNING: 'warning', STATE_ERROR: 'error', STATE_RECOVERY: 'recovery'}
+STATE_LEVELS = {'error': 'ERROR', 'warning': 'WARNING', 'recovery': 'INFO', 'normal': 'INFO'}
+
+# 异常日志与同一指标此前日志的最小间隔（秒）
+ANOMALY_DEDUP_SECONDS = 300
+
+# 没有特定模板时使用的通用异常模板
+DEFAULT_ANOMALY_TEMPLATES = {
+    'spike': "{node_type} {node_id} {metric} 出现突发峰值，当前值{value}，明显偏离平均水平{mean}",
+    'drop': "{node_type} {node_id} {metric} 出现异常下降，当前值{value}，明显偏离平均水平{mean}"
+}
+
+# 日志级别为WARNING的系统事件类型
+EVENT_WARNING_TYPES = ('stop', 'maintenance', 'restart', 'migrate')
+
+# 日志写入InfluxDB时的度量名称和标签
+LOGS_MEASUREMENT = 'node_logs'
+LOG_TAG_COLUMNS = ['node_id', 'node_type', 'level', 'source', 'metric']
+
 class LogGenerator:
     """根据性能指标生成对应日志状态的生成器"""
     
-    def __init__(self):
-        """初始化日志生成器"""
+    def __init__(self, seed=None):
+        """初始化日志生成器
+        
+        Args:
+            seed: 可选的随机种子（整数或numpy.random.SeedSequence），用于日志时间抖动和随机事件的可复现性
+        """
+        self.rng = np.random.default_rng(seed)
         self._init_log_config()
     
     def _init_log_config(self):
@@ -227,10 +253,195 @@ class LogGenerator:
             }
         }
     
+    @staticmethod
+    def threshold_states(values: np.ndarray, threshold_config: Dict) -> np.ndarray:
+        """
+        计算每个采样点的阈值状态，与逐点状态机的结果一致
+        
+        超过错误/警告阈值时进入error/warning；低于恢复阈值时，若此前出现过warning或error则进入recovery；
+        其余采样点保持前一个状态。因此状态等于最近一个"越界"采样点所在的区间，
+        恢复区间的状态取决于此前是否出现过warning或error。
+        
+        Args:
+            values: 指标值数组
+            threshold_config: 阈值配置，包含warning、error、recovery和可选的inverse
+            
+        Returns:
+            状态编码数组，见STATE_NAMES
+        """
+        if threshold_config.get('inverse', False):
+            values = -np.asarray(values, dtype=float)
+            warning, error, recovery = (-threshold_config['warning'], -threshold_config['error'],
+                                        -threshold_config['recovery'])
+        else:
+            values = np.asarray(values, dtype=float)
+            warning, error, recovery = threshold_config['warning'], threshold_config['error'], threshold_config['recovery']
+        
+        # 每个采样点所在的区间：2为错误，1为警告，-1为恢复，0为保持前一个状态
+        band = np.where(values >= error, 2, np.where(values >= warning, 1, np.where(values <= recovery, -1, 0)))
+        
+        # 最近一个非0区间（前向填充）
+        positions = np.where(band != 0, np.arange(len(band)), -1)
+        np.maximum.accumulate(positions, out=positions)
+        last_band = np.where(positions >= 0, band[np.maximum(positions, 0)], 0)
+        
+        # 最近一个区间为恢复时，此前出现过警告或错误则为recovery，否则保持normal
+        seen_alert = np.maximum.accumulate(band > 0)
+        return np.where(last_band > 0, last_band, np.where((last_band < 0) & seen_alert, STATE_RECOVERY, STATE_NORMAL))
+    
+    def _jitter(self, max_minutes: float, size: int) -> pd.TimedeltaIndex:
+        """生成 [-max_minutes, max_minutes) 分钟内的随机时间偏移，精度为微秒（与timedelta一致）"""
+        microseconds = np.round(self.rng.uniform(-max_minutes, max_minutes, size) * 60 * 10 ** 6)
+        return pd.to_timedelta(microseconds.astype(np.int64), unit='us')
+    
+    def _threshold_logs(self, node_id: str, node_type: str, metric_name: str, times: pd.DatetimeIndex,
+                        values: np.ndarray) -> Dict[str, list]:
+        """生成状态变化日志，返回按列组织的日志"""
+        threshold_config = self.thresholds[node_type][metric_name]
+        template_config = self.log_templates.get(node_type, {}).get(metric_name, {})
+        
+        states = self.threshold_states(values, threshold_config)
+        previous = np.concatenate(([STATE_NORMAL], states[:-1]))
+        changed = np.flatnonzero(states != previous)
+        changed = changed[[STATE_NAMES[state] in template_config for state in states[changed]]]
+        
+        # 在采样点前后5分钟内随机生成日志时间，使其不完全等于性能数据采样点
+        jitter = self._jitter(5, len(changed))
+        messages = []
+        levels = []
+        for position in changed:
+            state = STATE_NAMES[states[position]]
+            value = round(float(values[position]), 2)
+            messages.append(template_config[state].format(
+                node_id=node_id,
+                value=value,
+                threshold=threshold_config.get(state, value)
+            ))
+            levels.append(STATE_LEVELS[state])
+        
+        return {
+            'positions': changed,
+            'timestamp': times[changed] + jitter,
+            'level': levels,
+            'message': messages,
+            'source': 'threshold',
+            'metric_value': values[changed]
+        }
+    
+    def _anomaly_logs(self, node_id: str, node_type: str, metric_name: str, times: pd.DatetimeIndex,
+                      values: np.ndarray, threshold_logs: Dict[str, list]) -> Dict[str, list]:
+        """
+        生成偏离均值超过2.5个标准差的异常日志，返回按列组织的日志
+        
+        与同一指标此前（包括同一采样点）的阈值日志或已生成的异常日志相隔不足300秒时不再生成。
+        """
+        mean_value = float(np.mean(values)) if len(values) else np.nan
+        std_value = float(np.std(values, ddof=1)) if len(values) > 1 else np.nan
+        if not std_value > 0:
+            candidates = np.array([], dtype=int)
+        else:
+            candidates = np.flatnonzero(np.abs(values - mean_value) > 2.5 * std_value)
+        
+        # 与阈值日志的时间窗口连接：按阈值日志时间排序后，用二分查找找出候选点前后300秒内的日志，
+        # 只有由不晚于候选点的采样点产生的阈值日志才算作"此前"的日志（候选点通常很少）
+        window = ANOMALY_DEDUP_SECONDS * 10 ** 9
+        candidate_ns = times.asi8[candidates]
+        if len(threshold_logs['positions']) and len(candidates):
+            order = np.argsort(threshold_logs['timestamp'].asi8, kind='stable')
+            log_ns = threshold_logs['timestamp'].asi8[order]
+            log_positions = threshold_logs['positions'][order]
+            lower = np.searchsorted(log_ns, candidate_ns - window, side='right')
+            upper = np.searchsorted(log_ns, candidate_ns + window, side='left')
+            duplicated = np.array([
+                start < end and log_positions[start:end].min() <= position
+                for start, end, position in zip(lower, upper, candidates)
+            ], dtype=bool)
+            candidates = candidates[~duplicated]
+            candidate_ns = candidate_ns[~duplicated]
+        
+        jitter_ns = self._jitter(2, len(candidates)).asi8
+        
+        # 异常日志之间的去重：只有相邻候选点的采样时间相差不足 300秒+最大抖动 时才可能互相影响，
+        # 此时按时间顺序逐个判断，其余候选点直接保留
+        reach = window + 2 * 60 * 10 ** 9
+        keep = np.ones(len(candidates), dtype=bool)
+        if len(candidates) > 1 and (np.diff(candidate_ns) < reach).any():
+            accepted = deque()
+            for index, sample_ns in enumerate(candidate_ns):
+                while accepted and accepted[0][0] < sample_ns - reach:
+                    accepted.popleft()
+                if any(abs(log_ns - sample_ns) < window for _, log_ns in accepted):
+                    keep[index] = False
+                else:
+                    accepted.append((sample_ns, sample_ns + jitter_ns[index]))
+        candidates = candidates[keep]
+        jitter_ns = jitter_ns[keep]
+        
+        inverse = self.thresholds[node_type][metric_name].get('inverse', False)
+        templates = self.anomaly_templates.get(node_type, {}).get(metric_name, {})
+        messages = []
+        for position in candidates:
+            value = float(values[position])
+            # 对于反向指标，低值是危险的
+            anomaly_type = 'spike' if (value > mean_value) != inverse else 'drop'
+            template = templates.get(anomaly_type) or DEFAULT_ANOMALY_TEMPLATES[anomaly_type]
+            messages.append(template.format(
+                node_id=node_id,
+                node_type=node_type,
+                metric=metric_name,
+                value=round(value, 2),
+                mean=round(mean_value, 2)
+            ))
+        
+        return {
+            'positions': candidates,
+            'timestamp': times[candidates] + pd.to_timedelta(jitter_ns, unit='ns'),
+            'level': 'WARNING',
+            'message': messages,
+            'source': 'anomaly',
+            'metric_value': values[candidates]
+        }
+    
+    def _info_logs(self, node_id: str, node_type: str, timepoints: pd.DatetimeIndex,
+                   info_log_frequency: int) -> Dict[str, list]:
+        """每隔info_log_frequency个采样点生成一条INFO日志，返回按列组织的日志"""
+        templates = self.info_log_templates[node_type]
+        selected = timepoints[::info_log_frequency]
+        choices = self.rng.integers(0, len(templates), len(selected))
+        jitter = self._jitter(10, len(selected))
+        return {
+            'timestamp': selected + jitter,
+            'level': 'INFO',
+            'message': [templates[choice].format(node_id=node_id) for choice in choices],
+            'source': 'info',
+            'metric': 'system',
+            'metric_value': 0.0
+        }
+    
+    def _event_logs(self, node_id: str, node_type: str, timepoints: pd.DatetimeIndex) -> Optional[Dict[str, list]]:
+        """以30%的概率为节点在随机采样点生成1-2条系统事件日志，返回按列组织的日志"""
+        if self.rng.random() >= 0.3:
+            return None
+        event_types = list(self.event_templates[node_type].keys())
+        event_count = int(self.rng.integers(1, 3))
+        selected = self.rng.integers(0, len(timepoints), event_count)
+        chosen_types = [event_types[choice] for choice in self.rng.integers(0, len(event_types), event_count)]
+        return {
+            'timestamp': timepoints[selected],
+            'level': ['WARNING' if event_type in EVENT_WARNING_TYPES else 'INFO' for event_type in chosen_types],
+            'message': [self.event_templates[node_type][event_type].format(node_id=node_id)
+                        for event_type in chosen_types],
+            'source': 'event',
+            'metric': 'system',
+            'metric_value': 0.0
+        }
+    
     def generate_logs_for_metrics(self, metrics_data: Dict, nodes_info: List[Dict], 
                                  random_events: bool = True, info_log_frequency: int = 20) -> Dict:
         """根据性能指标数据生成对应的日志状态数据
         
+        每个指标的状态变化、异常点和去重都按数组整体计算，不逐行遍历DataFrame。
+        
         Args:
             metrics_data: 生成的性能指标数据，格式为 {node_id: {metric_name: DataFrame}}
             nodes_info: 节点信息列表
@@ -241,282 +452,90 @@ class LogGenerator:
             日志数据，格式为 {node_id: DataFrame}
         """
         all_logs = {}
+        node_types = {node_info['id']: node_info['type'] for node_info in nodes_info}
         
         # 为每个节点生成日志
         for node_id, metrics in metrics_data.items():
-            # 获取节点信息
-            node_info = next((n for n in nodes_info if n['id'] == node_id), None)
-            if not node_info:
-                continue
-                
-            node_type = node_info['type']
+            node_type = node_types.get(node_id)
             
             # 跳过不需要生成日志的节点类型
-            if node_type not in self.thresholds:
+            if node_type is None or node_type not in self.thresholds:
                 continue
-                
-            # 初始化日志列表
-            logs = []
-            
-            # 记录该节点的样本时间点，用于生成随机INFO日志
-            timepoints = []
             
-            # 处理每个指标
+            parts = []
+            metric_times = []
             for metric_name, df in metrics.items():
                 # 检查是否有此指标的阈值配置
-                if metric_name not in self.thresholds.get(node_type, {}):
+                if metric_name not in self.thresholds[node_type] or df.empty:
                     continue
-                    
-                threshold_config = self.thresholds[node_type][metric_name]
-                template_config = self.log_templates.get(node_type, {}).get(metric_name, {})
                 
-                # 跟踪指标状态
-                current_state = 'normal'  # 初始状态
+                times = pd.DatetimeIndex(df['timestamp'])
+                values = df['value'].to_numpy(dtype=float)
+                metric_times.append(times)
                 
-                # 收集所有时间点
-                for ts in df['timestamp']:
-                    if ts not in timepoints:
-                        timepoints.append(ts)
-                
-                # 计算统计特性，用于异常检测
-                mean_value = df['value'].mean()
-                std_value = df['value'].std()
-                
-                # 遍历时间序列数据
-                for idx, row in df.iterrows():
-                    value = row['value']
-                    timestamp = row['timestamp']
-                    
-                    # 确定当前状态
-                    new_state = current_state
-                    
-                    # 正向指标（越高越危险）
-                    if not threshold_config.get('inverse', False):
-                        # 检查错误阈值
-                        if value >= threshold_config['error']:
-                            new_state = 'error'
-                        # 检查警告阈值
-                        elif value >= threshold_config['warning']:
-                            new_state = 'warning'
-                        # 检查恢复阈值
-                        elif value <= threshold_config['recovery'] and (current_state == 'warning' or current_state == 'error'):
-                            new_state = 'recovery'
-                    # 反向指标（越低越危险，如成功率）
-                    else:
-                        # 检查错误阈值
-                        if value <= threshold_config['error']:
-                            new_state = 'error'
-                        # 检查警告阈值
-                        elif value <= threshold_config['warning']:
-                            new_state = 'warning'
-                        # 检查恢复阈值
-                        elif value >= threshold_config['recovery'] and (current_state == 'warning' or current_state == 'error'):
-                            new_state = 'recovery'
-                    
-                    # 状态变化时生成日志
-                    if new_state != current_state and new_state in template_config:
-                        log_message = template_config[new_state].format(
-                            node_id=node_id,
-                            value=round(value, 2),
-                            threshold=threshold_config.get(new_state, round(value, 2))
-                        )
-                        
-                        # 确定日志级别
-                        level = {
-                            'error': 'ERROR',
-                            'warning': 'WARNING',
-                            'recovery': 'INFO',
-                            'normal': 'INFO'
-                        }.get(new_state, 'INFO')
-                        
-                        # 添加随机波动，使日志时间不完全等于性能数据采样点
-                        # 在采样点前后5分钟内随机生成
-                        jitter = timedelta(minutes=random.uniform(-5, 5))
-                        log_timestamp = timestamp + jitter
-                        
-                        # 创建日志条目
-                        log_entry = {
-                            'timestamp': log_timestamp,
-                            'node_id': node_id,
-                            'node_type': node_type,
-                            'level': level,
-                            'message': log_message,
-                            'source': 'threshold',
-                            'metric': metric_name,
-                            'metric_value': value
-                        }
-                        logs.append(log_entry)
-                        
-                    # 更新状态
-                    current_state = new_state
-                    
-                    # 检测异常值 (超过2.5个标准差)
-                    if abs(value - mean_value) > 2.5 * std_value and std_value > 0:
-                        # 避免与阈值日志重复
-                        if any(abs((l['timestamp'] - timestamp).total_seconds()) < 300 and 
-                               l['metric'] == metric_name for l in logs):
-                            continue
-                            
-                        # 判断是高异常还是低异常
-                        if value > mean_value and not threshold_config.get('inverse', False):
-                            anomaly_type = 'spike'
-                            level = "WARNING"
-                        elif value < mean_value and not threshold_config.get('inverse', False):
-                            anomaly_type = 'drop'
-                            level = "WARNING"
-                        elif value < mean_value and threshold_config.get('inverse', False):
-                            anomaly_type = 'spike'  # 对于反向指标，低值是危险的
-                            level = "WARNING"
-                        elif value > mean_value and threshold_config.get('inverse', False):
-                            anomaly_type = 'drop'  # 对于反向指标，高值是安全的
-                            level = "WARNING"
-                        
-                        # 查找对应的异常模板
-                        anomaly_template = self.anomaly_templates.get(node_type, {}).get(metric_name, {}).get(anomaly_type)
-                        
-                        # 如果没有特定模板，使用通用模板
-                        if not anomaly_template:
-                            if anomaly_type == 'spike':
-                                anomaly_template = "{node_type} {node_id} {metric} 出现突发峰值，当前值{value}，明显偏离平均水平{mean}"
-                            else:
-                                anomaly_template = "{node_type} {node_id} {metric} 出现异常下降，当前值{value}，明显偏离平均水平{mean}"
-                        
-                        log_message = anomaly_template.format(
-                            node_id=node_id,
-                            node_type=node_type,
-                            metric=metric_name,
-                            value=round(value, 2),
-                            mean=round(mean_value, 2)
-                        )
-                        
-                        # 添加随机波动
-                        jitter = timedelta(minutes=random.uniform(-2, 2))
-                        log_timestamp = timestamp + jitter
-                        
-                        # 创建日志条目
-                        log_entry = {
-                            'timestamp': log_timestamp,
-                            'node_id': node_id,
-                            'node_type': node_type,
-                            'level': level,
-                            'message': log_message,
-                            'source': 'anomaly',
-                            'metric': metric_name,
-                            'metric_value': value
-                        }
-                        logs.append(log_entry)
+                threshold_logs = self._threshold_logs(node_id, node_type, metric_name, times, values)
+                anomaly_logs = self._anomaly_logs(node_id, node_type, metric_name, times, values, threshold_logs)
+                for part in (threshold_logs, anomaly_logs):
+                    part.pop('positions')
+                    part['metric'] = metric_name
+                    parts.append(part)
+            
+            # 该节点所有指标的采样时间点（去重并排序）
+            timepoints = metric_times[0].append(metric_times[1:]).unique().sort_values() if metric_times else None
             
             # 添加定期信息日志
-            if timepoints and node_type in self.info_log_templates:
-                sorted_timepoints = sorted(timepoints)
-                
-                # 每隔一定样本点生成一条INFO日志
-                for i in range(0, len(sorted_timepoints), info_log_frequency):
-                    timestamp = sorted_timepoints[i]
-                    
-                    # 随机选择一个INFO日志模板
-                    info_template = random.choice(self.info_log_templates[node_type])
-                    
-                    # 生成日志消息
-                    log_message = info_template.format(node_id=node_id)
-                    
-                    # 添加随机波动
-                    jitter = timedelta(minutes=random.uniform(-10, 10))
-                    log_timestamp = timestamp + jitter
-                    
-                    # 创建日志条目
-                    log_entry = {
-                        'timestamp': log_timestamp,
-                        'node_id': node_id,
-                        'node_type': node_type,
-                        'level': 'INFO',
-                        'message': log_message,
-                        'source': 'info',
-                        'metric': 'system',
-                        'metric_value': 0.0
-                    }
-                    logs.append(log_entry)
+            if timepoints is not None and len(timepoints) and node_type in self.info_log_templates:
+                parts.append(self._info_logs(node_id, node_type, timepoints, info_log_frequency))
             
             # 添加随机系统事件日志
-            if random_events and timepoints and node_type in self.event_templates:
-                sorted_timepoints = sorted(timepoints)
-                
-                # 决定是否为此节点生成事件
-                if random.random() < 0.3:  # 30%的节点会有事件
-                    # 随机选择1-2个时间点生成事件
-                    event_count = random.randint(1, 2)
-                    for _ in range(event_count):
-                        # 随机选择一个时间点
-                        timestamp_idx = random.randint(0, len(sorted_timepoints) - 1)
-                        timestamp = sorted_timepoints[timestamp_idx]
-                        
-                        # 随机选择一个事件类型
-                        event_type = random.choice(list(self.event_templates[node_type].keys()))
-                        
-                        # 生成日志消息
-                        log_message = self.event_templates[node_type][event_type].format(node_id=node_id)
-                        
-                        # 确定日志级别
-                        if event_type in ['stop', 'maintenance']:
-                            level = 'WARNING'
-                        elif event_type in ['restart', 'migrate']:
-                            level = 'WARNING'
-                        else:
-                            level = 'INFO'
-                        
-                        # 创建日志条目
-                        log_entry = {
-                            'timestamp': timestamp,
-                            'node_id': node_id,
-                            'node_type': node_type,
-                            'level': level,
-                            'message': log_message,
-                            'source': 'event',
-                            'metric': 'system',
-                            'metric_value': 0.0
-                        }
-                        logs.append(log_entry)
+            if random_events and timepoints is not None and len(timepoints) and node_type in self.event_templates:
+                event_logs = self._event_logs(node_id, node_type, timepoints)
+                if event_logs:
+                    parts.append(event_logs)
+            
+            frames = [self._logs_frame(node_id, node_type, part) for part in parts if len(part['timestamp'])]
             
-            # 如果有日志，转换为DataFrame并排序
-            if logs:
-                logs_df = pd.DataFrame(logs)
-                logs_df = logs_df.sort_values('timestamp')
-                all_logs[node_id] = logs_df
+            # 如果有日志，合并为DataFrame并排序
+            if frames:
+                logs_df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+                all_logs[node_id] = logs_df.sort_values('timestamp', kind='stable')
         
         return all_logs
     
-    def prepare_logs_for_influxdb(self, logs_data: Dict) -> List[Point]:
-        """将日志数据转换为适合InfluxDB的Point对象
+    @staticmethod
+    def _logs_frame(node_id: str, node_type: str, part: Dict[str, list]) -> pd.DataFrame:
+        """将按列组织的日志转换为DataFrame，列顺序与日志条目一致"""
+        return pd.DataFrame({
+            'timestamp': part['timestamp'],
+            'node_id': node_id,
+            'node_type': node_type,
+            'level': part['level'],
+            'message': part['message'],
+            'source': part['source'],
+            'metric': part['metric'],
+            'metric_value': part['metric_value']
+        })
+    
+    def prepare_logs_for_influxdb(self, logs_data: Dict) -> List[str]:
+        """将日志数据按列编码为InfluxDB行协议
+        
+        度量名称为node_logs，node_id、node_type、level、source和metric为标签，message和value为字段，
+        与逐行构建Point的结果一致。
         
         Args:
             logs_data: 日志数据，格式为 {node_id: DataFrame}
             
         Returns:
-            InfluxDB Point对象列表
+            行协议字符串列表
         """
-        points = []
-        
-        for node_id, logs_df in logs_data.items():
-            for _, row in logs_df.iterrows():
-                # 创建日志数据点
-                point = Point("node_logs")
-                
-                # 添加标签
-                point = point.tag("node_id", row['node_id'])
-                point = point.tag("node_type", row['node_type'])
-                point = point.tag("level", row['level'])
-                point = point.tag("source", row['source'])
-                
-                # 添加字段
-                point = point.field("message", row['message'])
-                if 'metric' in row:
-                    point = point.tag("metric", row['metric'])
-                if 'metric_value' in row:
-                    point = point.field("value", float(row['metric_value']))
-                
-                # 设置时间戳
-                point = point.time(row['timestamp'])
-                
-                points.append(point)
-        
-        return points
+        frames = [df for df in logs_data.values() if not df.empty]
+        if not frames:
+            return []
+        logs_df = pd.concat(frames, ignore_index=True)
+        return encode_line_protocol(
+            logs_df.rename(columns={'metric_value': 'value'}),
+            measurement=LOGS_MEASUREMENT,
+            tag_columns=[column for column in LOG_TAG_COLUMNS if column in logs_df.columns],
+            field_columns=['message', 'value'] if 'metric_value' in logs_df.columns else ['message'],
+            time_column='timestamp'
+        )
@@ -14,12 +14,12 @@ from pathlib import Path
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-from influxdb_client import Point
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 import time
 import threading
-from queue import Queue, Empty
-import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from queue import Queue
 
 # 添加项目根目录到路径
 sys.path.append(str(Path(__file__).resolve().parent.parent.parent.parent))
@@ -27,22 +27,59 @@ sys.path.append(str(Path(__file__).resolve().parent.parent.parent.parent))
 from dynamic_graph_rag.config.settings import NODE_TYPES, INFLUXDB_CONFIG, GRAPH_DB_CONFIG
 from dynamic_graph_rag.db.neo4j_connector import Neo4jConnector
 from dynamic_graph_rag.db.influxdb_client import InfluxDBManager
+from dynamic_graph_rag.db.line_protocol import DEFAULT_CHUNK_SIZE, iter_line_protocol_batches
 from .log_generator import LogGenerator
 
 
 logger = logging.getLogger('time_series_generator')
 
+# 波动性对应的标准差系数（相对基础值）
+VOLATILITY_FACTORS = {
+    'low': 0.05,
+    'medium': 0.15,
+    'high': 0.3
+}
+
+# 异常严重程度对应的放大/缩小倍数
+SEVERITY_FACTORS = {
+    'low': 1.5,
+    'medium': 2.5,
+    'high': 4.0
+}
+
+# 批量生成时每个张量包含的最大节点数，限制单个张量的内存占用
+DEFAULT_NODE_CHUNK_SIZE = 5000
+
+# 并行生成时每个分片包含的最大节点数
+DEFAULT_SHARD_SIZE = 1000
+
+# 指标数据的行协议编码参数：度量名称由节点类型决定，见InfluxDBManager.get_measurement
+METRICS_LINE_PROTOCOL = {
+    'measurement_column': 'measurement',
+    'tag_columns': ['node_id', 'node_type', 'metric'],
+    'field_columns': ['value', 'unit'],
+    'time_column': 'timestamp'
+}
+
+# 分片工作进程中使用的生成器，由_init_shard_worker创建
+_shard_generator = None
+
 class TimeSeriesGenerator:
     """时序数据生成器，用于生成模拟的时序数据"""
     
-    def __init__(self, nodes_info: Optional[List[Dict]] = None):
+    def __init__(self, nodes_info: Optional[List[Dict]] = None, seed: Optional[int] = None,
+                 connect_databases: bool = True):
         """
         初始化时序数据生成器
         
         Args:
             nodes_info: 可选的节点信息列表，包含节点ID和类型
+            seed: 可选的随机种子，用于批量生成和并行分片生成的可复现性
+            connect_databases: 是否创建InfluxDB和Neo4j客户端，并行生成的工作进程中为False
         """
         self.nodes_info = nodes_info or []
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
         
         # 配置节点类型的指标定义
         self._init_metrics_config()
@@ -59,6 +96,11 @@ class TimeSeriesGenerator:
         # 尝试连接到InfluxDB和Neo4j（可能会失败，但不影响其他功能）
         self.influxdb_client = None
         self.neo4j_connector = None
+        self.influxdb_available = False
+        self.neo4j_available = False
+        if not connect_databases:
+            return
+        
         try:
             self.influxdb_client = InfluxDBManager(
                 url=INFLUXDB_CONFIG["url"],
@@ -79,7 +121,8 @@ class TimeSeriesGenerator:
                 user=GRAPH_DB_CONFIG["user"],
                 password=GRAPH_DB_CONFIG["password"]
             )
-            self.neo4j_available = True
+            # 连接器创建时不连接数据库，这里主动检测连接是否可用
+            self.neo4j_available = self.neo4j_connector.verify_connectivity()
         except Exception as e:
             logger.warning(f"无法初始化Neo4j连接器: {str(e)}")
             self.neo4j_available = False
@@ -155,25 +198,14 @@ class TimeSeriesGenerator:
             # 对每个节点类型执行查询
             for node_type in node_types:
                 try:
-                    # 查询Neo4j获取指定类型的节点
-                    with self.neo4j_connector.driver.session() as session:
-                        result = session.run(f"""
-                            MATCH (n:{node_type})
-                            RETURN n.id as id, '{node_type}' as type, 
-                                   COALESCE(n.name, n.id) as name
-                        """)
-                        
-                        count = 0
-                        for record in result:
-                            node_info = {
-                                'id': record['id'],
-                                'type': record['type'],
-                                'name': record['name']
-                            }
-                            loaded_nodes.append(node_info)
-                            count += 1
-                        
-                        logger.info(f"已加载 {count} 个 {node_type} 类型的节点")
+                    # 查询Neo4j获取指定类型的节点（使用共享驱动的连接池）
+                    records = self.neo4j_connector.execute_query(f"""
+                        MATCH (n:{node_type})
+                        RETURN n.id as id, '{node_type}' as type, 
+                               COALESCE(n.name, n.id) as name
+                    """)
+                    loaded_nodes.extend(records)
+                    logger.info(f"已加载 {len(records)} 个 {node_type} 类型的节点")
                     
                 except Exception as e:
                     logger.error(f"加载 {node_type} 类型节点失败: {str(e)}")
@@ -216,37 +248,48 @@ class TimeSeriesGenerator:
             包含周期性模式的数值数组
         """
         # 根据波动性设置标准差
-        volatility_factors = {
-            'low': 0.05,
-            'medium': 0.15,
-            'high': 0.3
-        }
-        std_dev = base_value * volatility_factors.get(volatility, 0.1)
+        std_dev = base_value * VOLATILITY_FACTORS.get(volatility, 0.1)
         
-        # 创建基础随机数据
+        # 创建基础随机数据，叠加周期性模式
         values = np.random.normal(base_value, std_dev, len(time_range))
-        
-        # 添加日变化模式
-        if daily_pattern:
-            # 创建基于一天24小时的周期性变化
-            hours = np.array([t.hour for t in time_range])
-            # 工作时间（8-18点）负载较高
-            daily_pattern = np.sin(hours * (2 * np.pi / 24) - np.pi/2) * 0.2 + 0.1
-            values += base_value * daily_pattern
-            
-        # 添加周变化模式
-        if weekly_pattern:
-            # 创建基于一周7天的周期性变化
-            days = np.array([t.dayofweek for t in time_range])
-            # 工作日（0-4）负载较高，周末（5-6）负载较低
-            weekly_factor = np.where(days < 5, 0.1, -0.1)
-            values += base_value * weekly_factor
+        values += base_value * self.seasonal_profile(time_range, daily_pattern, weekly_pattern)
             
         # 确保值不为负
         values = np.maximum(values, 0)
         
         return values
     
+    @staticmethod
+    def seasonal_profile(time_range: pd.DatetimeIndex,
+                         daily_pattern: bool = True,
+                         weekly_pattern: bool = False) -> np.ndarray:
+        """
+        计算时间范围内每个时间点的周期性因子（相对基础值）
+        
+        同一时间范围内所有节点和指标共用，只需计算一次。
+        
+        Args:
+            time_range: 时间范围
+            daily_pattern: 是否包含日变化模式
+            weekly_pattern: 是否包含周变化模式
+            
+        Returns:
+            长度与time_range相同的因子数组
+        """
+        profile = np.zeros(len(time_range))
+        
+        # 日变化模式：工作时间（8-18点）负载较高
+        if daily_pattern:
+            hours = time_range.hour.to_numpy()
+            profile += np.sin(hours * (2 * np.pi / 24) - np.pi/2) * 0.2 + 0.1
+        
+        # 周变化模式：工作日（0-4）负载较高，周末（5-6）负载较低
+        if weekly_pattern:
+            days = time_range.dayofweek.to_numpy()
+            profile += np.where(days < 5, 0.1, -0.1)
+        
+        return profile
+    
     def add_anomalies(self, 
                      values: np.ndarray, 
                      anomaly_probability: float = 0.05,
@@ -268,12 +311,7 @@ class TimeSeriesGenerator:
         result = values.copy()
         
         # 设置异常严重程度
-        severity_factors = {
-            'low': 1.5,
-            'medium': 2.5,
-            'high': 4.0
-        }
-        factor = severity_factors.get(anomaly_severity, 2.0)
+        factor = SEVERITY_FACTORS.get(anomaly_severity, 2.0)
         
         # 随机选择异常发生的起始位置
         if len(values) <= anomaly_duration:
@@ -294,6 +332,238 @@ class TimeSeriesGenerator:
                 
         return result
     
+    def build_time_range(self, node_type: str, start_time: datetime, end_time: datetime) -> pd.DatetimeIndex:
+        """按节点类型的采样间隔创建时间点列表"""
+        interval_minutes = self.sample_intervals.get(node_type, 1)
+        return pd.date_range(start=start_time, end=end_time, freq=f'{interval_minutes}min')
+    
+    def apply_anomalies_batch(self,
+                              values: np.ndarray,
+                              anomaly_probability: float = 0.05,
+                              anomaly_severity: str = 'medium',
+                              anomaly_duration: int = 5,
+                              rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        使用向量化掩码在张量的最后一维（时间）上注入异常，原地修改并返回
+        
+        与add_anomalies语义一致：每个起点以给定概率触发，持续anomaly_duration个点，
+        一半为突增一半为突降，重叠的异常效果相乘。通过净触发次数的滑动窗口和一次幂运算实现，
+        不需要逐个起点循环。
+        
+        Args:
+            values: 形状为 (..., 时间点数) 的数值张量
+            anomaly_probability: 异常发生的概率
+            anomaly_severity: 异常严重程度 ('low', 'medium', 'high')
+            anomaly_duration: 异常持续的数据点数量
+            rng: 随机数生成器，默认使用生成器自身的rng
+            
+        Returns:
+            添加异常后的数值张量
+        """
+        rng = rng or self.rng
+        timesteps = values.shape[-1]
+        if timesteps <= anomaly_duration:
+            return values
+        factor = SEVERITY_FACTORS.get(anomaly_severity, 2.0)
+        
+        # 每个候选起点：+1突增，-1突降，0无异常。同一个随机数决定是否触发及方向（各占一半）
+        candidates = values.shape[:-1] + (timesteps - anomaly_duration,)
+        draws = rng.random(candidates, dtype=np.float32)
+        signed = (draws < anomaly_probability / 2).astype(np.int8)
+        signed -= (draws >= anomaly_probability / 2) & (draws < anomaly_probability)
+        del draws
+        # cumulative[k] 为起点 < k 的净触发次数
+        last = candidates[-1]
+        cumulative = np.zeros(values.shape[:-1] + (timesteps + 1,), dtype=np.int32)
+        cumulative[..., 1:last + 1] = np.cumsum(signed, axis=-1, dtype=np.int32)
+        cumulative[..., last + 1:] = cumulative[..., last:last + 1]
+        
+        # 时间点t受起点落在 [t-duration+1, t] 内的异常影响
+        window = cumulative[..., 1:].copy()
+        window[..., anomaly_duration - 1:] -= cumulative[..., :timesteps - anomaly_duration + 1]
+        
+        # 净触发次数在 [-duration, duration] 内，查表得到乘数
+        multipliers = np.power(factor, np.arange(-anomaly_duration, anomaly_duration + 1)).astype(values.dtype)
+        window += anomaly_duration
+        values *= multipliers[window]
+        return values
+    
+    def generate_metrics_tensor(self,
+                                node_type: str,
+                                node_count: int,
+                                time_range: pd.DatetimeIndex,
+                                include_anomalies: bool = True,
+                                rng: Optional[np.random.Generator] = None) -> Tuple[List[str], np.ndarray]:
+        """
+        为同一类型的一批节点一次性生成所有指标数据
+        
+        Args:
+            node_type: 节点类型
+            node_count: 节点数量
+            time_range: 时间范围
+            include_anomalies: 是否包含异常值
+            rng: 随机数生成器，默认使用生成器自身的rng
+            
+        Returns:
+            (指标名称列表, 形状为 (节点数, 指标数, 时间点数) 的float32张量)
+        """
+        rng = rng or self.rng
+        metrics = self.metrics_config.get(node_type) or {}
+        metric_names = list(metrics)
+        
+        base = np.array([(config['min'] + config['max']) / 2 for config in metrics.values()], dtype=np.float32)
+        std = base * np.array([VOLATILITY_FACTORS.get(config.get('volatility', 'medium'), 0.1)
+                               for config in metrics.values()], dtype=np.float32)
+        lower = np.array([config['min'] for config in metrics.values()], dtype=np.float32)
+        upper = np.array([config['max'] for config in metrics.values()], dtype=np.float32)
+        
+        # 周期性模式对每个时间范围只计算一次，按指标的基础值缩放
+        profile = self.seasonal_profile(time_range, daily_pattern=True, weekly_pattern=True).astype(np.float32)
+        mean = base[:, None] * (1 + profile[None, :])
+        
+        values = rng.standard_normal((node_count, len(metric_names), len(time_range)), dtype=np.float32)
+        values *= std[None, :, None]
+        values += mean[None, :, :]
+        np.maximum(values, 0, out=values)
+        
+        if include_anomalies:
+            self.apply_anomalies_batch(values, anomaly_probability=0.05, rng=rng)
+        
+        np.clip(values, lower[None, :, None], upper[None, :, None], out=values)
+        return metric_names, values
+    
+    def tensor_to_frame(self,
+                        node_type: str,
+                        node_ids: List[str],
+                        metric_names: List[str],
+                        time_range: pd.DatetimeIndex,
+                        values: np.ndarray) -> pd.DataFrame:
+        """
+        将 (节点数, 指标数, 时间点数) 张量展开为长格式列式DataFrame
+        
+        node_id、node_type、metric和unit列使用Categorical存储，不为每行复制字符串。
+        
+        Returns:
+            包含timestamp、node_id、node_type、metric、value、unit列的DataFrame
+        """
+        node_count, metric_count, timesteps = values.shape
+        metrics = self.metrics_config.get(node_type) or {}
+        units = [metrics[name]['unit'] for name in metric_names]
+        unit_categories = list(dict.fromkeys(units))
+        unit_codes = np.array([unit_categories.index(unit) for unit in units])
+        
+        metric_codes = np.tile(np.repeat(np.arange(metric_count), timesteps), node_count)
+        return pd.DataFrame({
+            'timestamp': np.tile(time_range.values, node_count * metric_count),
+            'node_id': pd.Categorical.from_codes(np.repeat(np.arange(node_count), metric_count * timesteps),
+                                                 categories=node_ids),
+            'node_type': pd.Categorical.from_codes(np.zeros(values.size, dtype=np.int8), categories=[node_type]),
+            'metric': pd.Categorical.from_codes(metric_codes, categories=metric_names),
+            'value': values.reshape(-1),
+            'unit': pd.Categorical.from_codes(unit_codes[metric_codes], categories=unit_categories)
+        })
+    
+    def _group_nodes_by_type(self, nodes_info: List[Dict]) -> Dict[str, List[str]]:
+        """按类型分组有指标定义的节点ID（去重并保持顺序）"""
+        nodes_by_type = {}
+        for node_info in nodes_info:
+            node_type = node_info['type']
+            if node_type in ['DC', 'TENANT']:
+                continue
+            if node_type not in self.metrics_config:
+                logger.warning(f"未找到节点类型 {node_type} 的指标定义")
+                continue
+            nodes_by_type.setdefault(node_type, {})[node_info['id']] = None
+        return {node_type: list(node_ids) for node_type, node_ids in nodes_by_type.items()}
+    
+    def iter_metrics_tensors(self,
+                             start_time: datetime,
+                             end_time: datetime,
+                             include_anomalies: bool = True,
+                             nodes_info: Optional[List[Dict]] = None,
+                             node_chunk_size: int = DEFAULT_NODE_CHUNK_SIZE
+                             ) -> Iterator[Tuple[str, List[str], List[str], pd.DatetimeIndex, np.ndarray]]:
+        """
+        按节点类型批量生成指标张量，每种类型按node_chunk_size分块以限制内存
+        
+        Yields:
+            (节点类型, 节点ID列表, 指标名称列表, 时间范围, 张量)
+        """
+        for node_type, node_ids in self._group_nodes_by_type(nodes_info or self.nodes_info).items():
+            time_range = self.build_time_range(node_type, start_time, end_time)
+            for offset in range(0, len(node_ids), node_chunk_size):
+                chunk_ids = node_ids[offset:offset + node_chunk_size]
+                metric_names, values = self.generate_metrics_tensor(
+                    node_type, len(chunk_ids), time_range, include_anomalies=include_anomalies
+                )
+                yield node_type, chunk_ids, metric_names, time_range, values
+    
+    def iter_metrics_frames(self,
+                            start_time: datetime,
+                            end_time: datetime,
+                            include_anomalies: bool = True,
+                            nodes_info: Optional[List[Dict]] = None,
+                            node_chunk_size: int = DEFAULT_NODE_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        按节点类型和节点分块依次产出长格式指标数据，适合大规模数据的流式处理
+        
+        Yields:
+            长格式DataFrame，见tensor_to_frame
+        """
+        for node_type, node_ids, metric_names, time_range, values in self.iter_metrics_tensors(
+                start_time, end_time, include_anomalies, nodes_info, node_chunk_size):
+            yield self.tensor_to_frame(node_type, node_ids, metric_names, time_range, values)
+    
+    def generate_metrics_frame(self,
+                               start_time: Optional[datetime] = None,
+                               end_time: Optional[datetime] = None,
+                               include_anomalies: bool = True,
+                               node_chunk_size: int = DEFAULT_NODE_CHUNK_SIZE) -> pd.DataFrame:
+        """
+        为所有加载的节点生成单个长格式指标DataFrame
+        
+        Args:
+            start_time: 开始时间，默认为当前时间前30天
+            end_time: 结束时间，默认为当前时间
+            include_anomalies: 是否包含异常数据
+            node_chunk_size: 每个张量包含的最大节点数
+            
+        Returns:
+            包含timestamp、node_id、node_type、metric、value、unit列的DataFrame
+        """
+        if end_time is None:
+            end_time = datetime.now()
+        if start_time is None:
+            start_time = end_time - timedelta(days=30)
+        
+        frames = list(self.iter_metrics_frames(start_time, end_time, include_anomalies,
+                                               node_chunk_size=node_chunk_size))
+        if not frames:
+            return pd.DataFrame(columns=['timestamp', 'node_id', 'node_type', 'metric', 'value', 'unit'])
+        return pd.concat(frames, ignore_index=True)
+    
+    def _tensor_to_metrics_dict(self,
+                                node_type: str,
+                                node_ids: List[str],
+                                metric_names: List[str],
+                                time_range: pd.DatetimeIndex,
+                                values: np.ndarray) -> Dict[str, Dict[str, pd.DataFrame]]:
+        """将张量拆分为 {node_id: {metric_name: DataFrame}} 格式"""
+        metrics = self.metrics_config[node_type]
+        return {
+            node_id: {
+                metric_name: pd.DataFrame({
+                    'timestamp': time_range,
+                    'value': values[node_index, metric_index].astype(np.float64),
+                    'node_id': node_id,
+                    'node_type': node_type,
+                    'unit': metrics[metric_name]['unit']
+                })
+                for metric_index, metric_name in enumerate(metric_names)
+            }
+            for node_index, node_id in enumerate(node_ids)
+        }
+    
     def generate_metrics_for_node(self, 
                                  node_info: Dict, 
                                  start_time: datetime,
@@ -311,64 +581,13 @@ class TimeSeriesGenerator:
         Returns:
             包含各指标时序数据的字典，格式为 {metric_name: DataFrame}
         """
-        node_id = node_info['id']
         node_type = node_info['type']
-        
-        # DC和TENANT类型节点不需要生成指标
-        if node_type in ['DC', 'TENANT']:
-            return {}
-        
-        # 获取该节点类型的指标定义
-        metrics = self.metrics_config.get(node_type)
-        if not metrics:
-            logger.warning(f"未找到节点类型 {node_type} 的指标定义")
+        if not self._group_nodes_by_type([node_info]):
             return {}
         
-        # 获取采样间隔
-        interval_minutes = self.sample_intervals.get(node_type, 1)
-        
-        # 创建时间点列表
-        time_range = pd.date_range(
-            start=start_time, 
-            end=end_time, 
-            freq=f'{interval_minutes}min'
-        )
-        
-        # 为每个指标生成数据
-        results = {}
-        for metric_name, metric_config in metrics.items():
-            # 设置基础值和波动性
-            base_value = (metric_config['min'] + metric_config['max']) / 2
-            volatility = metric_config.get('volatility', 'medium')
-            
-            # 生成基本的时序模式
-            values = self.generate_periodic_pattern(
-                base_value=base_value,
-                volatility=volatility,
-                time_range=time_range,
-                daily_pattern=True,
-                weekly_pattern=True
-            )
-            
-            # 添加异常值
-            if include_anomalies:
-                values = self.add_anomalies(values, anomaly_probability=0.05)
-            
-            # 确保值在有效范围内
-            values = np.clip(values, metric_config['min'], metric_config['max'])
-            
-            # 创建DataFrame
-            df = pd.DataFrame({
-                'timestamp': time_range,
-                'value': values,
-                'node_id': node_id,
-                'node_type': node_type,
-                'unit': metric_config['unit']
-            })
-            
-            results[metric_name] = df
-        
-        return results
+        time_range = self.build_time_range(node_type, start_time, end_time)
+        metric_names, values = self.generate_metrics_tensor(node_type, 1, time_range, include_anomalies)
+        return self._tensor_to_metrics_dict(node_type, [node_info['id']], metric_names, time_range, values)[node_info['id']]
     
     def generate_metrics_data(self, 
                             start_time: Optional[datetime] = None,
@@ -377,6 +596,9 @@ class TimeSeriesGenerator:
         """
         为所有加载的节点生成时序数据
         
+        按节点类型批量生成后拆分为每个节点、每个指标一个DataFrame的格式；
+        大规模数据请使用generate_metrics_frame或iter_metrics_frames。
+        
         Args:
             start_time: 开始时间，默认为当前时间前30天
             end_time: 结束时间，默认为当前时间
@@ -397,17 +619,11 @@ class TimeSeriesGenerator:
             
         logger.info(f"生成时序数据，时间范围: {start_time} 到 {end_time}")
         
-        # 为每个节点生成指标数据
-        all_metrics = {}
-        for node_info in self.nodes_info:
-            node_id = node_info['id']
-            node_metrics = self.generate_metrics_for_node(
-                node_info=node_info,
-                start_time=start_time,
-                end_time=end_time,
-                include_anomalies=include_anomalies
-            )
-            all_metrics[node_id] = node_metrics
+        # 没有指标的节点保留空字典，与逐节点生成的结果一致
+        all_metrics = {node_info['id']: {} for node_info in self.nodes_info}
+        for node_type, node_ids, metric_names, time_range, values in self.iter_metrics_tensors(
+                start_time, end_time, include_anomalies):
+            all_metrics.update(self._tensor_to_metrics_dict(node_type, node_ids, metric_names, time_range, values))
             
         return all_metrics
     
@@ -444,368 +660,193 @@ class TimeSeriesGenerator:
                 
         return generated_files
     
-    def import_to_influxdb(self, metrics_data: Dict) -> int:
-        """将生成的指标数据导入到InfluxDB
+    def export_logs_to_csv(self, logs_data: Dict, output_dir: str) -> List[str]:
+        """
+        将生成的日志数据按节点导出为CSV文件
         
         Args:
-            metrics_data: 生成的指标数据，格式为 {node_id: {metric_name: DataFrame}}
+            logs_data: 日志数据，格式为 {node_id: DataFrame}
+            output_dir: 输出目录
             
         Returns:
-            成功导入的数据点数量
+            生成的CSV文件路径列表
         """
-        if not metrics_data:
-            logger.warning("没有数据可导入InfluxDB")
-            return 0
-        
-        # 检查InfluxDB是否可用
-        if not self.influxdb_available or self.influxdb_client is None:
-            logger.warning("InfluxDB不可用，跳过导入")
-            return 0
-        
-        # 连接到InfluxDB
-        # 不提前关闭连接，这可能导致之后的所有操作失败
-        if not self.influxdb_client.connect():
-            logger.error("无法连接到InfluxDB，跳过导入")
-            return 0
-        
-        # 获取配置的超时值，用于日志显示
-        config = INFLUXDB_CONFIG
-        timeout_ms = config.get("timeout", 60000)
-        logger.info(f"开始导入数据到InfluxDB - 连接成功 - 地址: {config['url']}, 桶: {config['bucket']}, 超时: {timeout_ms}ms")
-        
-        # 计算总数据点
-        total_points = sum(sum(len(df) for df in node_metrics.values()) for node_metrics in metrics_data.values())
-        logger.info(f"总计准备导入 {total_points} 个数据点，共 {len(metrics_data)} 个节点")
+        os.makedirs(output_dir, exist_ok=True)
         
-        # 准备存储所有数据点的列表
-        all_points = []
+        generated_files = []
+        for node_id, logs_df in logs_data.items():
+            file_path = os.path.join(output_dir, f"{node_id}_logs.csv")
+            logs_df.to_csv(file_path, index=False)
+            generated_files.append(file_path)
+            logger.info(f"已导出日志到 {file_path}")
+            
+        return generated_files
+    
+    def _iter_import_frames(self, metrics_data: Union[Dict, pd.DataFrame, Iterable[pd.DataFrame]],
+                            chunk_rows: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        将指标数据整理为可直接编码的长格式DataFrame块
         
-        # 1. 准备数据点
-        logger.info("正在准备数据点...")
+        支持 {node_id: {metric_name: DataFrame}} 嵌套字典、长格式DataFrame或其迭代器
+        （如iter_metrics_frames的输出）。嵌套字典中的小DataFrame按chunk_rows合并后产出。
+        """
+        if isinstance(metrics_data, pd.DataFrame):
+            frames = [metrics_data]
+        elif isinstance(metrics_data, dict):
+            frames = self._merge_nested_metrics(metrics_data, chunk_rows)
+        else:
+            frames = metrics_data
+        
+        for frame in frames:
+            if frame.empty:
+                continue
+            node_types = frame['node_type'].astype('category')
+            frame = frame.assign(measurement=node_types.map(InfluxDBManager.get_measurement))
+            if 'unit' not in frame.columns:
+                frame['unit'] = None
+            yield frame
+    
+    @staticmethod
+    def _merge_nested_metrics(metrics_data: Dict, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        """将嵌套字典中每个 (节点, 指标) 的DataFrame补充node_id和metric列后按块合并"""
+        pending, pending_rows = [], 0
         for node_id, metrics in metrics_data.items():
             for metric_name, df in metrics.items():
                 if df.empty or not all(col in df.columns for col in ['timestamp', 'value', 'node_type']):
                     continue
-                    
-                # 将数据转换为适合导入的格式
-                ts_df = df.copy()
-                ts_df['node_id'] = node_id
-                ts_df['metric'] = metric_name
-                
-                # 生成Point对象
-                for _, row in ts_df.iterrows():
-                    measurement = f"{row['node_type'].lower()}_metrics"
-                    
-                    # 创建Point对象
-                    point = Point(measurement)
-                    point = point.tag("node_id", row['node_id'])
-                    point = point.tag("node_type", row['node_type'])
-                    point = point.tag("metric", row['metric'])
-                    point = point.field("value", float(row['value']))
-                    if 'unit' in row:
-                        point = point.field("unit", row['unit'])
-                    point = point.time(row['timestamp'])
-                    
-                    all_points.append(point)
-                    
-                # 每100万点进度报告
-                if len(all_points) % 1000000 == 0:
-                    logger.info(f"已准备 {len(all_points):,}/{total_points:,} 个数据点 ({len(all_points)/total_points*100:.1f}%)")
-        
-        logger.info(f"数据点准备完成，共 {len(all_points):,} 个点")
-        
-        # 2. 使用优化的批处理模式导入数据
-        
-        # 导入配置 - 优化批次大小
-        batch_size = 5000  # 增加到5000个点每批次
-        max_workers = min(8, os.cpu_count())  # 适当减少线程数，降低资源竞争
-        max_retries = 3  # 每个批次最大重试次数
-        retry_delay = 5  # 重试延迟（秒）
-        
-        # 任务队列和结果
-        task_queue = Queue(maxsize=max_workers * 2)  # 降低队列最大长度，减少内存占用
-        result_lock = threading.Lock()  # 保护共享变量的锁
-        success_count = 0  # 成功导入的数据点
-        failed_count = 0  # 失败的数据点
-        in_progress = 0  # 正在处理的任务数
-        
-        # 分割数据点为批次
-        batches = []
-        for i in range(0, len(all_points), batch_size):
-            batches.append(all_points[i:i+batch_size])
-        
-        total_batches = len(batches)
-        logger.info(f"将 {len(all_points):,} 个数据点分成 {total_batches} 个批次进行导入")
-        
-        # 创建InfluxDB客户端连接池
-        # 预先创建连接，避免每个任务创建连接的开销
-        client_pool = []
-        for _ in range(max_workers):
-            try:
-                client = InfluxDBManager(
-                    url=config["url"],
-                    token=config["token"],
-                    org=config["org"],
-                    bucket=config["bucket"]
-                )
-                if client.connect():
-                    client_pool.append(client)
-                else:
-                    logger.warning("无法创建InfluxDB连接")
-            except Exception as e:
-                logger.error(f"创建InfluxDB连接时出错: {str(e)}")
-        
-        if not client_pool:
-            logger.error("无法创建任何InfluxDB连接，放弃导入")
-            return 0
+                pending.append(df.assign(node_id=node_id, metric=metric_name))
+                pending_rows += len(df)
+                if pending_rows >= chunk_rows:
+                    yield pd.concat(pending, ignore_index=True)
+                    pending, pending_rows = [], 0
+        if pending:
+            yield pd.concat(pending, ignore_index=True)
+    
+    def write_line_batches(self, batches: Iterable[List[str]], max_workers: int = 4) -> Tuple[int, int]:
+        """
+        使用有界队列和多个写线程发送行协议批次
+        
+        Args:
+            batches: 行协议批次迭代器
+            max_workers: 写线程数量
+            
+        Returns:
+            (成功写入的点数量, 写入失败的点数量)
+        """
+        counts = self.write_keyed_line_batches((('points', lines) for lines in batches), max_workers)
+        return counts.get('points', (0, 0))
+    
+    def write_keyed_line_batches(self, items: Iterable[Tuple[str, List[str]]],
+                                 max_workers: int = 4) -> Dict[str, Tuple[int, int]]:
+        """
+        使用有界队列和多个写线程发送行协议批次，按批次的类别分别统计
         
-        logger.info(f"创建了 {len(client_pool)} 个InfluxDB连接")
+        生产端边生成边放入队列，队列满时阻塞，因此任意时刻内存中最多只有 2 * max_workers 个批次。
+        每个写线程使用独立的InfluxDB连接，写入失败由write_line_protocol重试。
         
-        # 任务完成事件，用于同步完成状态
-        all_tasks_submitted = threading.Event()
-        all_tasks_completed = threading.Event()
+        Args:
+            items: (类别, 行协议批次) 迭代器，类别如 'metrics'、'logs'
+            max_workers: 写线程数量
+            
+        Returns:
+            {类别: (成功写入的点数量, 写入失败的点数量)}
+        """
+        config = INFLUXDB_CONFIG
+        task_queue = Queue(maxsize=max_workers * 2)
+        result_lock = threading.Lock()
+        counts = {}
         
-        # 设置进度跟踪
-        start_time = time.time()
-        last_progress_time = start_time
-        progress_update_interval = 5  # 延长进度更新间隔（秒）减少日志量
-        submitted_batches = 0  # 已提交的批次
-        completed_batches = 0  # 已完成的批次
-        
-        # 进度更新函数
-        def update_progress():
-            nonlocal last_progress_time
-            current_time = time.time()
-            if current_time - last_progress_time >= progress_update_interval:
-                with result_lock:
-                    total_processed = success_count + failed_count
-                    progress = total_processed / total_points * 100
-                    elapsed = current_time - start_time
-                    
-                    if elapsed > 0 and total_processed > 0:
-                        points_per_second = total_processed / elapsed
-                        remaining_points = total_points - total_processed
-                        remaining_seconds = remaining_points / points_per_second if points_per_second > 0 else 0
-                        
-                        logger.info(f"导入进度: {progress:.1f}% ({total_processed:,}/{total_points:,} 点), "
-                                    f"批次: {completed_batches}/{total_batches}, "
-                                    f"速率: {points_per_second:.1f} 点/秒, "
-                                    f"剩余: {remaining_seconds/60:.1f} 分钟")
-                
-                last_progress_time = current_time
-        
-        # 线程状态监控 - 新增函数，用于定期打印线程状态
-        def monitor_status():
-            while not all_tasks_completed.is_set():
-                with result_lock:
-                    logger.info(f"线程状态: 已提交批次={submitted_batches}/{total_batches}, "
-                               f"已完成批次={completed_batches}, 进行中={in_progress}, "
-                               f"队列大小={task_queue.qsize()}")
-                time.sleep(30)  # 每30秒更新一次状态
-        
-        # 启动监控线程
-        monitor_thread = threading.Thread(target=monitor_status, daemon=True, name="monitor-thread")
-        monitor_thread.start()
-        
-        # 消费者函数：从队列获取任务并执行
         def worker():
-            nonlocal success_count, failed_count, completed_batches, in_progress
-            
-            # 从连接池获取一个客户端
-            client = None
-            with result_lock:
-                if client_pool:
-                    client = client_pool.pop()
-            
-            # 如果无法获取连接，创建新连接
-            if client is None:
-                try:
-                    client = InfluxDBManager(
-                        url=config["url"],
-                        token=config["token"],
-                        org=config["org"],
-                        bucket=config["bucket"]
-                    )
-                    client.connect()
-                except Exception as e:
-                    logger.error(f"工作线程无法创建InfluxDB连接: {str(e)}")
-                    return
-            
+            client = InfluxDBManager(
+                url=config["url"],
+                token=config["token"],
+                org=config["org"],
+                bucket=config["bucket"]
+            )
             try:
-                while not (task_queue.empty() and all_tasks_submitted.is_set()):
-                    try:
-                        # 尝试从队列获取任务，设置超时避免一直等待
-                        batch_index, points, retry_count = task_queue.get(timeout=5)  # 增大超时时间
-                        
-                        # 标记一个任务正在处理
-                        with result_lock:
-                            in_progress += 1
-                        
-                        try:
-                            # 写入数据
-                            success = client.write_metrics_batch(points)
-                            
-                            with result_lock:
-                                if success:
-                                    success_count += len(points)
-                                    logger.debug(f"批次 {batch_index+1}/{total_batches} 导入成功: {len(points)} 点")
-                                else:
-                                    # 写入失败，但可能需要重试
-                                    if retry_count < max_retries:
-                                        logger.warning(f"批次 {batch_index+1}/{total_batches} 导入失败，将重试 ({retry_count+1}/{max_retries})")
-                                        # 延迟后重新放入队列
-                                        threading.Timer(
-                                            retry_delay * (retry_count + 1), 
-                                            lambda: task_queue.put((batch_index, points, retry_count + 1))
-                                        ).start()
-                                    else:
-                                        # 超过最大重试次数，标记为失败
-                                        failed_count += len(points)
-                                        logger.error(f"批次 {batch_index+1}/{total_batches} 在 {max_retries} 次尝试后导入失败")
-                                
-                                # 记录完成的批次
-                                completed_batches += 1
-                                in_progress -= 1
-                                
-                                # 每完成5个批次更新一次进度，减少锁竞争
-                                if completed_batches % 5 == 0:
-                                    update_progress()
-                                
-                                # 检查是否所有任务都已完成
-                                if completed_batches >= total_batches:
-                                    all_tasks_completed.set()
-                                    
-                        except Exception as e:
-                            with result_lock:
-                                # 处理异常
-                                logger.error(f"批次 {batch_index+1}/{total_batches} 导入异常: {str(e)}")
-                                
-                                # 如果是可恢复的错误(如网络问题)则重试，否则标记失败
-                                recoverable = "timeout" in str(e).lower() or "connection" in str(e).lower()
-                                if recoverable and retry_count < max_retries:
-                                    logger.warning(f"可恢复错误，批次 {batch_index+1}/{total_batches} 将重试 ({retry_count+1}/{max_retries})")
-                                    # 指数退避重试
-                                    delay = retry_delay * (2 ** retry_count) * (0.5 + random.random())
-                                    threading.Timer(
-                                        delay, 
-                                        lambda: task_queue.put((batch_index, points, retry_count + 1))
-                                    ).start()
-                                else:
-                                    # 不可恢复或达到最大重试次数
-                                    failed_count += len(points)
-                                    logger.error(f"批次 {batch_index+1}/{total_batches} 最终导入失败")
-                                    completed_batches += 1
-                                
-                                in_progress -= 1
-                        
-                        # 标记任务完成
-                        task_queue.task_done()
-                        
-                    except Empty:
-                        # 队列暂时为空，但可能有新任务加入，继续循环
-                        pass
-                    except Exception as e:
-                        # 处理其他异常
-                        logger.error(f"工作线程遇到未预期的错误: {str(e)}")
-                        with result_lock:
-                            in_progress -= 1
+                while True:
+                    item = task_queue.get()
+                    if item is None:
                         break
+                    key, lines = item
+                    success = client.write_line_protocol(lines)
+                    with result_lock:
+                        success_count, failed_count = counts.get(key, (0, 0))
+                        if success:
+                            counts[key] = (success_count + len(lines), failed_count)
+                        else:
+                            counts[key] = (success_count, failed_count + len(lines))
             finally:
-                # 放回连接时确保连接是可用的
-                try:
-                    # 不关闭连接，只检查健康状态
-                    if client.verify_connection():
-                        with result_lock:
-                            client_pool.append(client)
-                    else:
-                        logger.warning("连接不可用，不放回连接池")
-                except:
-                    logger.warning("检查连接状态时出错，不放回连接池")
-        
-        # 启动工作线程
-        threads = []
-        for i in range(max_workers):
-            thread = threading.Thread(target=worker, daemon=True, name=f"influx-worker-{i}")
-            thread.start()
-            threads.append(thread)
+                client.close()
         
-        logger.info(f"启动了 {len(threads)} 个工作线程")
+        threads = [threading.Thread(target=worker, daemon=True, name=f"influx-writer-{i}")
+                   for i in range(max_workers)]
+        for thread in threads:
+            thread.start()
         
-        # 生产者：将数据批次放入队列
+        start_time = time.time()
+        last_progress_time = start_time
+        submitted = 0
         try:
-            # 提交所有批次到队列
-            for i, batch in enumerate(batches):
-                # 限制队列大小，避免内存占用过多
-                while task_queue.qsize() >= max_workers:
-                    time.sleep(0.5)  # 增加等待时间，减少CPU使用
+            for key, lines in items:
+                task_queue.put((key, lines))
+                submitted += len(lines)
                 
-                # 提交一个批次 (批次索引, 数据点列表, 重试次数)
-                task_queue.put((i, batch, 0))
-                submitted_batches += 1
-                
-                # 每提交50个批次更新一次进度
-                if i % 50 == 0 or i == len(batches) - 1:
-                    logger.info(f"已提交 {submitted_batches}/{total_batches} 个批次到队列")
-            
-            logger.info(f"所有 {total_batches} 个批次已提交到队列")
-            all_tasks_submitted.set()
-            
-            # 等待所有任务完成
-            # 设置超时，避免无限等待
-            total_timeout = max(3600, total_points * 0.0005)  # 调整超时计算，至少1小时
-            logger.info(f"等待所有批次导入完成，超时时间: {total_timeout/60:.1f} 分钟")
-            
-            # 等待所有任务完成，同时更新进度
-            wait_start = time.time()
-            while not all_tasks_completed.is_set():
-                # 检查超时
-                if time.time() - wait_start > total_timeout:
-                    logger.warning("等待任务完成超时，强制退出")
-                    break
-                
-                # 检查是否所有任务已提交且已完成
-                with result_lock:
-                    if (completed_batches >= total_batches) or (task_queue.empty() and in_progress == 0):
-                        all_tasks_completed.set()
-                        break
-                
-                # 定期更新进度
-                update_progress()
-                time.sleep(5)  # 增加睡眠时间，减少CPU使用
-            
-        except KeyboardInterrupt:
-            logger.warning("用户中断，正在优雅停止...")
-        except Exception as e:
-            logger.error(f"导入过程中发生错误: {str(e)}")
+                current_time = time.time()
+                if current_time - last_progress_time >= 5:
+                    with result_lock:
+                        written = sum(success_count for success_count, _ in counts.values())
+                    logger.info(f"导入进度: 已提交 {submitted:,} 点, 已写入 {written:,} 点, "
+                                f"速率: {written / (current_time - start_time):.1f} 点/秒")
+                    last_progress_time = current_time
         finally:
-            # 导入完成或出错时，确保释放资源
-            
-            # 等待所有线程完成当前任务
-            logger.info("等待工作线程完成当前任务...")
-            all_tasks_completed.set()  # 确保设置完成标志
-            for _ in range(10):  # 最多等待10秒
-                with result_lock:
-                    if in_progress == 0:
-                        break
-                time.sleep(1)
-            
-            # 关闭所有连接 - 只在最后操作完成时关闭
-            logger.info("正在关闭所有InfluxDB连接...")
-            for client in client_pool:
-                try:
-                    client.close()
-                except Exception as e:
-                    logger.error(f"关闭连接时出错: {str(e)}")
-                    pass
+            for _ in threads:
+                task_queue.put(None)
+            for thread in threads:
+                thread.join()
+        
+        return counts
+    
+    def import_to_influxdb(self, metrics_data: Union[Dict, pd.DataFrame, Iterable[pd.DataFrame]],
+                           batch_size: int = 5000, max_workers: Optional[int] = None) -> int:
+        """将生成的指标数据导入到InfluxDB
+        
+        数据按列编码为行协议后由写线程分批发送，不为每个数据点构建Point对象，
+        也不会一次性在内存中生成全部数据点。
+        
+        Args:
+            metrics_data: 生成的指标数据，可以是 {node_id: {metric_name: DataFrame}} 格式，
+                          也可以是长格式DataFrame或其迭代器（见iter_metrics_frames）
+            batch_size: 每次写请求的点数量
+            max_workers: 写线程数量，默认为 min(8, CPU核数)
             
-            # 最后关闭主连接
-            try:
-                # 确保最后才关闭主连接
-                if self.influxdb_client:
-                    self.influxdb_client.close()
-            except Exception as e:
-                logger.error(f"关闭主连接时出错: {str(e)}")
-                pass
+        Returns:
+            成功导入的数据点数量
+        """
+        if metrics_data is None or (isinstance(metrics_data, (dict, pd.DataFrame)) and len(metrics_data) == 0):
+            logger.warning("没有数据可导入InfluxDB")
+            return 0
+        
+        # 检查InfluxDB是否可用
+        if not self.influxdb_available or self.influxdb_client is None:
+            logger.warning("InfluxDB不可用，跳过导入")
+            return 0
+        
+        # 连接到InfluxDB
+        if not self.influxdb_client.connect():
+            logger.error("无法连接到InfluxDB，跳过导入")
+            return 0
+        
+        config = INFLUXDB_CONFIG
+        max_workers = max_workers or min(8, os.cpu_count() or 1)
+        logger.info(f"开始导入数据到InfluxDB - 地址: {config['url']}, 桶: {config['bucket']}, "
+                    f"批大小: {batch_size}, 写线程: {max_workers}")
+        
+        batches = iter_line_protocol_batches(self._iter_import_frames(metrics_data), batch_size=batch_size,
+                                             **METRICS_LINE_PROTOCOL)
+        
+        start_time = time.time()
+        success_count, failed_count = self.write_line_batches(batches, max_workers=max_workers)
         
         # 导入完成，显示摘要
         total_elapsed = time.time() - start_time
@@ -820,11 +861,16 @@ class TimeSeriesGenerator:
         
         return success_count
     
-    def import_logs_to_influxdb(self, logs_data: Dict) -> int:
+    def import_logs_to_influxdb(self, logs_data: Dict, batch_size: int = 5000,
+                                max_workers: Optional[int] = None) -> int:
         """将生成的日志数据导入到InfluxDB
         
+        日志按列编码为行协议后，与指标数据一样由写线程分批发送。
+        
         Args:
             logs_data: 生成的日志数据，格式为 {node_id: DataFrame}
+            batch_size: 每次写请求的日志条数
+            max_workers: 写线程数量，默认为 min(8, CPU核数)
             
         Returns:
             成功导入的日志条目数量
@@ -838,106 +884,22 @@ class TimeSeriesGenerator:
             logger.warning("InfluxDB不可用，跳过日志导入")
             return 0
         
-        # 创建一个新的连接，不复用可能已经关闭的连接
-        influxdb_client = None
         try:
-            config = INFLUXDB_CONFIG
-            logger.info(f"为日志导入创建新的InfluxDB连接: {config['url']}")
-            influxdb_client = InfluxDBManager(
-                url=config["url"],
-                token=config["token"],
-                org=config["org"],
-                bucket=config["bucket"]
-            )
-            if not influxdb_client.connect():
-                logger.error("无法为日志导入创建InfluxDB连接")
-                return 0
-        except Exception as e:
-            logger.error(f"创建InfluxDB连接时出错: {str(e)}")
-            return 0
-        
-        try:
-            # 计算总日志条目
-            total_logs = sum(len(df) for df in logs_data.values())
-            logger.info(f"准备导入 {total_logs} 条日志记录到InfluxDB")
-            
-            # 使用日志生成器准备Point对象
-            log_generator = LogGenerator()
-            points = log_generator.prepare_logs_for_influxdb(logs_data)
-            
-            # 如果没有点，直接返回
-            if not points:
+            lines = LogGenerator().prepare_logs_for_influxdb(logs_data)
+            if not lines:
                 logger.warning("没有日志数据点可导入")
                 return 0
             
-            # 使用优化的批处理方法导入日志
-            batch_size = 2000  # 增大日志批次大小
-            
-            # 分割成更大的批次
-            batches = []
-            for i in range(0, len(points), batch_size):
-                batches.append(points[i:i+batch_size])
+            max_workers = max_workers or min(8, os.cpu_count() or 1)
+            logger.info(f"准备导入 {len(lines)} 条日志记录到InfluxDB")
             
-            total_batches = len(batches)
-            logger.info(f"将 {len(points)} 条日志记录分成 {total_batches} 个批次进行导入")
-            
-            # 设置进度跟踪
             start_time = time.time()
-            success_count = 0
-            
-            # 导入每个批次
-            for i, batch in enumerate(batches):
-                batch_num = i + 1
-                retry_count = 0
-                max_retries = 3
-                batch_success = False
-                
-                # 重试循环
-                while retry_count <= max_retries and not batch_success:
-                    try:
-                        # 写入数据
-                        if retry_count > 0:
-                            logger.info(f"重试日志批次 {batch_num}/{total_batches} (尝试 {retry_count}/{max_retries})")
-                        
-                        # 写入批次
-                        success = influxdb_client.write_metrics_batch(batch)
-                        if success:
-                            success_count += len(batch)
-                            batch_success = True
-                            # 减少日志输出频率
-                            if batch_num % 5 == 0 or batch_num == 1 or batch_num == total_batches:
-                                logger.info(f"成功导入日志批次: {batch_num}/{total_batches}, "
-                                           f"{success_count}/{len(points)} 条记录 "
-                                           f"({success_count/len(points)*100:.1f}%)")
-                            break  # 成功，退出重试循环
-                        else:
-                            logger.warning(f"日志批次 {batch_num}/{total_batches} 导入失败")
-                            retry_count += 1
-                            time.sleep(retry_count * 2)  # 指数退避
-                    except Exception as e:
-                        error_msg = str(e)
-                        logger.error(f"导入日志批次 {batch_num} 时出错: {error_msg}")
-                        
-                        # 判断是否可重试
-                        if ("timeout" in error_msg.lower() or "connection" in error_msg.lower()) and retry_count < max_retries:
-                            retry_count += 1
-                            delay = retry_count * 2
-                            logger.warning(f"将在 {delay} 秒后重试日志批次 {batch_num}...")
-                            time.sleep(delay)
-                        else:
-                            # 不可重试或达到最大重试次数
-                            if retry_count < max_retries:
-                                retry_count += 1
-                                time.sleep(2)
-                            else:
-                                logger.error(f"日志批次 {batch_num} 在 {max_retries} 次尝试后仍然失败")
-                                break  # 放弃这个批次
-            
-            # 计算时间和统计
+            success_count, failed_count = self.write_line_batches(
+                (lines[i:i + batch_size] for i in range(0, len(lines), batch_size)), max_workers=max_workers)
             total_elapsed = time.time() - start_time
             
             if success_count:
-                logger.info(f"总计成功导入 {success_count}/{len(points)} 条日志记录到InfluxDB")
+                logger.info(f"总计成功导入 {success_count}/{len(lines)} 条日志记录到InfluxDB")
                 logger.info(f"日志导入耗时: {total_elapsed:.1f} 秒，平均速率: {success_count/total_elapsed:.1f} 条/秒")
             else:
                 logger.error("所有日志导入失败")
@@ -946,23 +908,250 @@ class TimeSeriesGenerator:
         except Exception as e:
             logger.error(f"导入日志过程中发生未预期的错误: {str(e)}")
             return 0
-        finally:
-            # 确保在函数结束前关闭连接
-            if influxdb_client:
-                try:
-                    # 确保所有数据都已写入
-                    if hasattr(influxdb_client.write_api, 'flush'):
-                        influxdb_client.write_api.flush()
-                    
-                    # 可选：添加短暂延时
-                    time.sleep(1)
-                    
-                    # 关闭连接
-                    influxdb_client.close()
-                    logger.info("日志导入完成，已关闭InfluxDB连接")
-                except Exception as e:
-                    logger.warning(f"关闭InfluxDB连接时出错: {str(e)}")
-                    
+    
+    def process_shard(self,
+                      node_type: str,
+                      node_ids: List[str],
+                      start_time: datetime,
+                      end_time: datetime,
+                      seed_sequence: np.random.SeedSequence,
+                      include_anomalies: bool = True,
+                      generate_logs: bool = True,
+                      encode: bool = True,
+                      batch_size: int = 5000,
+                      output_dir: Optional[str] = None) -> Dict:
+        """
+        生成一个分片（同一类型的一批节点）的指标和日志，并编码为行协议批次
+        
+        分片的结果只由seed_sequence决定，与由哪个进程处理、处理顺序无关。
+        
+        Args:
+            node_type: 节点类型
+            node_ids: 分片中的节点ID
+            start_time: 开始时间
+            end_time: 结束时间
+            seed_sequence: 分片的随机种子序列
+            include_anomalies: 是否包含异常数据
+            generate_logs: 是否生成日志
+            encode: 是否编码为行协议
+            batch_size: 每个行协议批次的点数量
+            output_dir: 导出CSV的输出目录，为None时不导出
+            
+        Returns:
+            分片统计和行协议批次，包含node_count、metrics_count、data_points、logs_count、
+            metric_batches、log_batches以及导出的CSV文件数量
+        """
+        metrics_seed, logs_seed = seed_sequence.spawn(2)
+        time_range = self.build_time_range(node_type, start_time, end_time)
+        metric_names, values = self.generate_metrics_tensor(node_type, len(node_ids), time_range,
+                                                            include_anomalies=include_anomalies,
+                                                            rng=np.random.default_rng(metrics_seed))
+        result = {
+            'node_count': len(node_ids),
+            'metrics_count': len(node_ids) * len(metric_names),
+            'data_points': int(values.size),
+            'logs_count': 0,
+            'metric_batches': [],
+            'log_batches': [],
+            'metrics_csv_count': 0,
+            'logs_csv_count': 0
+        }
+        
+        if encode:
+            frames = self._iter_import_frames(
+                self.tensor_to_frame(node_type, node_ids, metric_names, time_range, values))
+            result['metric_batches'] = list(iter_line_protocol_batches(frames, batch_size=batch_size,
+                                                                       **METRICS_LINE_PROTOCOL))
+        
+        if not generate_logs and output_dir is None:
+            return result
+        
+        metrics_data = self._tensor_to_metrics_dict(node_type, node_ids, metric_names, time_range, values)
+        if output_dir is not None:
+            result['metrics_csv_count'] = len(self.export_to_csv(metrics_data, os.path.join(output_dir, 'metrics')))
+        
+        if generate_logs:
+            log_generator = LogGenerator(seed=logs_seed)
+            logs_data = log_generator.generate_logs_for_metrics(
+                metrics_data=metrics_data,
+                nodes_info=[{'id': node_id, 'type': node_type} for node_id in node_ids],
+                random_events=True,
+                info_log_frequency=15
+            )
+            result['logs_count'] = sum(len(df) for df in logs_data.values())
+            if output_dir is not None and logs_data:
+                result['logs_csv_count'] = len(self.export_logs_to_csv(logs_data, os.path.join(output_dir, 'logs')))
+            if encode and logs_data:
+                lines = log_generator.prepare_logs_for_influxdb(logs_data)
+                result['log_batches'] = [lines[i:i + batch_size] for i in range(0, len(lines), batch_size)]
+        
+        return result
+    
+    def iter_shard_results(self,
+                           start_time: datetime,
+                           end_time: datetime,
+                           workers: int,
+                           shard_size: int = DEFAULT_SHARD_SIZE,
+                           **shard_kwargs) -> Iterator[Dict]:
+        """
+        使用进程池并行处理所有节点分片，按分片顺序产出结果
+        
+        每个分片的种子由生成器的seed派生（SeedSequence.spawn），结果与工作进程数量无关。
+        同时在途的分片最多为 2 * workers 个，下游消费变慢时不再提交新分片。
+        
+        Args:
+            start_time: 开始时间
+            end_time: 结束时间
+            workers: 工作进程数量
+            shard_size: 每个分片的最大节点数
+            **shard_kwargs: 传给process_shard的其他参数
+            
+        Yields:
+            process_shard的结果
+        """
+        shards = [
+            (node_type, node_ids[offset:offset + shard_size])
+            for node_type, node_ids in self._group_nodes_by_type(self.nodes_info).items()
+            for offset in range(0, len(node_ids), shard_size)
+        ]
+        if not shards:
+            return
+        seeds = np.random.SeedSequence(self.seed).spawn(len(shards))
+        logger.info(f"将 {sum(len(node_ids) for _, node_ids in shards)} 个节点分为 {len(shards)} 个分片，"
+                    f"使用 {workers} 个进程并行生成")
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_shard_worker,
+                                 initargs=(self.metrics_config, self.sample_intervals)) as executor:
+            pending = deque()
+            next_shard = 0
+            while next_shard < len(shards) or pending:
+                while next_shard < len(shards) and len(pending) < workers * 2:
+                    node_type, node_ids = shards[next_shard]
+                    pending.append(executor.submit(_run_shard, dict(
+                        shard_kwargs, node_type=node_type, node_ids=node_ids, start_time=start_time,
+                        end_time=end_time, seed_sequence=seeds[next_shard])))
+                    next_shard += 1
+                yield pending.popleft().result()
+    
+    def run_parallel(self,
+                     start_time: Optional[datetime] = None,
+                     end_time: Optional[datetime] = None,
+                     export_csv: bool = False,
+                     import_influxdb: bool = True,
+                     output_dir: str = './output',
+                     include_anomalies: bool = True,
+                     generate_logs: bool = True,
+                     workers: Optional[int] = None,
+                     writers: Optional[int] = None,
+                     shard_size: int = DEFAULT_SHARD_SIZE,
+                     batch_size: int = 5000) -> Dict:
+        """
+        并行运行数据生成过程：多进程按分片生成并编码，多线程写入InfluxDB
+        
+        分片在工作进程中生成指标张量、日志并编码为行协议，主进程只负责把批次放入有界写入队列，
+        写入变慢时主进程阻塞并停止提交新分片。返回结果的格式与run()一致。
+        
+        Args:
+            start_time: 开始时间，默认为当前时间前30天
+            end_time: 结束时间，默认为当前时间
+            export_csv: 是否导出为CSV（在工作进程中按分片导出）
+            import_influxdb: 是否导入到InfluxDB
+            output_dir: 导出CSV的输出目录
+            include_anomalies: 是否包含异常数据
+            generate_logs: 是否生成对应的日志状态数据
+            workers: 生成进程数量，默认为CPU核数
+            writers: 写线程数量，默认为 min(8, CPU核数)
+            shard_size: 每个分片的最大节点数
+            batch_size: 每次写请求的点数量
+            
+        Returns:
+            运行结果统计
+        """
+        if end_time is None:
+            end_time = datetime.now()
+        if start_time is None:
+            start_time = end_time - timedelta(days=30)
+        workers = workers or os.cpu_count() or 1
+        writers = writers or min(8, os.cpu_count() or 1)
+        
+        if import_influxdb and (not self.influxdb_available or not self.influxdb_client.connect()):
+            logger.warning("InfluxDB不可用，跳过导入")
+            import_error = 'InfluxDB连接不可用'
+            import_influxdb = False
+        else:
+            import_error = None
+        
+        totals = {'node_count': 0, 'metrics_count': 0, 'data_points': 0, 'logs_count': 0,
+                  'metrics_csv_count': 0, 'logs_csv_count': 0}
+        shard_results = self.iter_shard_results(
+            start_time, end_time, workers, shard_size=shard_size,
+            include_anomalies=include_anomalies, generate_logs=generate_logs, encode=import_influxdb,
+            batch_size=batch_size, output_dir=output_dir if export_csv else None
+        )
+        
+        def iter_batches():
+            """汇总分片统计，并逐批产出待写入的行协议"""
+            for shard in shard_results:
+                for key in totals:
+                    totals[key] += shard[key]
+                for lines in shard['metric_batches']:
+                    yield 'metrics', lines
+                for lines in shard['log_batches']:
+                    yield 'logs', lines
+        
+        start = time.time()
+        counts = {}
+        if import_influxdb:
+            logger.info(f"开始并行生成并导入数据 - 生成进程: {workers}, 写线程: {writers}, 批大小: {batch_size}")
+            counts = self.write_keyed_line_batches(iter_batches(), max_workers=writers)
+        else:
+            for _ in iter_batches():
+                pass
+        elapsed = time.time() - start
+        logger.info(f"并行生成完成: {totals['data_points']:,} 个数据点, {totals['logs_count']:,} 条日志, "
+                    f"耗时 {elapsed:.1f} 秒")
+        
+        result = {
+            'status': 'success',
+            'node_count': len(self.nodes_info),
+            'metrics_count': totals['metrics_count'],
+            'data_points': totals['data_points'],
+            'time_range': {
+                'start': start_time,
+                'end': end_time
+            }
+        }
+        if generate_logs:
+            result['logs_count'] = totals['logs_count']
+        if export_csv:
+            result['csv_files'] = {
+                'metrics': {
+                    'count': totals['metrics_csv_count'],
+                    'directory': os.path.join(output_dir, 'metrics')
+                },
+                'logs': {
+                    'count': totals['logs_csv_count'],
+                    'directory': os.path.join(output_dir, 'logs')
+                } if totals['logs_csv_count'] else None
+            }
+        if import_influxdb:
+            imported_metrics = counts.get('metrics', (0, 0))[0]
+            imported_logs = counts.get('logs', (0, 0))[0]
+            result['influxdb_import'] = {
+                'metrics_count': imported_metrics,
+                'logs_count': imported_logs,
+                'success': imported_metrics > 0 or imported_logs > 0
+            }
+            self.influxdb_client.close()
+        elif import_error:
+            result['influxdb_import'] = {
+                'metrics_count': 0,
+                'logs_count': 0,
+                'success': False,
+                'error': import_error
+            }
+        return result
+    
     def run(self, 
            start_time: Optional[datetime] = None,
            end_time: Optional[datetime] = None,
@@ -971,7 +1160,9 @@ class TimeSeriesGenerator:
            output_dir: str = './output',
            include_anomalies: bool = True,
            generate_logs: bool = True,   # 新增参数：是否生成日志
-           test_mode: bool = False      # 新增参数：测试模式，只处理少量数据点
+           test_mode: bool = False,      # 新增参数：测试模式，只处理少量数据点
+           workers: int = 1,
+           writers: Optional[int] = None
           ) -> Dict:
         """
         运行数据生成过程
@@ -985,6 +1176,8 @@ class TimeSeriesGenerator:
             include_anomalies: 是否包含异常数据
             generate_logs: 是否生成对应的日志状态数据
             test_mode: 测试模式，只处理少量数据进行验证
+            workers: 生成进程数量，大于1时使用run_parallel按分片并行生成和导入
+            writers: 并行模式下的InfluxDB写线程数量
             
         Returns:
             运行结果统计
@@ -1006,6 +1199,19 @@ class TimeSeriesGenerator:
             if len(self.nodes_info) > max_test_nodes:
                 logger.info(f"测试模式：将只处理 {max_test_nodes} 个节点")
                 self.nodes_info = self.nodes_info[:max_test_nodes]
+        
+        if workers > 1:
+            return self.run_parallel(
+                start_time=start_time,
+                end_time=end_time,
+                export_csv=export_csv,
+                import_influxdb=import_influxdb,
+                output_dir=output_dir,
+                include_anomalies=include_anomalies,
+                generate_logs=generate_logs,
+                workers=workers,
+                writers=writers
+            )
             
         # 生成时序数据
         metrics_data = self.generate_metrics_data(
@@ -1030,7 +1236,7 @@ class TimeSeriesGenerator:
         logs_data = {}
         if generate_logs:
             logger.info("开始生成对应的日志状态数据...")
-            log_generator = LogGenerator()
+            log_generator = LogGenerator(seed=self.seed)
             logs_data = log_generator.generate_logs_for_metrics(
                 metrics_data=metrics_data,
                 nodes_info=self.nodes_info,
@@ -1051,16 +1257,7 @@ class TimeSeriesGenerator:
             # 导出日志数据
             logs_csv_files = []
             if generate_logs and logs_data:
-                # 创建日志输出目录
-                logs_output_dir = os.path.join(output_dir, 'logs')
-                os.makedirs(logs_output_dir, exist_ok=True)
-                
-                # 导出每个节点的日志
-                for node_id, logs_df in logs_data.items():
-                    file_path = os.path.join(logs_output_dir, f"{node_id}_logs.csv")
-                    logs_df.to_csv(file_path, index=False)
-                    logs_csv_files.append(file_path)
-                    logger.info(f"已导出日志到 {file_path}")
+                logs_csv_files = self.export_logs_to_csv(logs_data, os.path.join(output_dir, 'logs'))
             
             result['csv_files'] = {
                 'metrics': {
@@ -1119,6 +1316,17 @@ class TimeSeriesGenerator:
             
         return result
 
+def _init_shard_worker(metrics_config: Dict, sample_intervals: Dict):
+    """进程池初始化函数：在工作进程中创建不连接数据库的生成器，并沿用主进程的指标和采样配置"""
+    global _shard_generator
+    _shard_generator = TimeSeriesGenerator(connect_databases=False)
+    _shard_generator.metrics_config = metrics_config
+    _shard_generator.sample_intervals = sample_intervals
+
+def _run_shard(task: Dict) -> Dict:
+    """在工作进程中处理一个分片，见TimeSeriesGenerator.process_shard"""
+    return _shard_generator.process_shard(**task)
+
 def parse_arguments():
     """解析命令行参数"""
     parser = argparse.ArgumentParser(description='生成模拟时序数据')
@@ -1141,6 +1349,11 @@ def parse_arguments():
                        help='数据采样间隔（分钟），增大此值可减少数据点数量，提高导入速度')
     parser.add_argument('--no-logs', action='store_true', help='不生成日志状态数据')
     parser.add_argument('--test', action='store_true', help='测试模式，仅处理少量数据验证功能')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='生成进程数量，大于1时按节点分片多进程并行生成和编码')
+    parser.add_argument('--writers', type=int, default=None,
+                       help='并行模式下写入InfluxDB的线程数量，默认为min(8, CPU核数)')
+    parser.add_argument('--seed', type=int, default=None, help='随机种子，指定后生成结果可复现')
     
     return parser.parse_args()
 
@@ -1190,7 +1403,7 @@ def main():
         print("节点类型: 全部可用类型")
     
     # 创建生成器实例
-    generator = TimeSeriesGenerator()
+    generator = TimeSeriesGenerator(seed=args.seed)
     
     # 设置采样间隔
     if args.sample_interval:
@@ -1220,7 +1433,9 @@ def main():
         output_dir=args.output_dir,
         include_anomalies=not args.no_anomalies,
         generate_logs=not args.no_logs,
-        test_mode=args.test
+        test_mode=args.test,
+        workers=args.workers,
+        writers=args.writers
     )
     
     # 打印结果
@@ -82,7 +82,8 @@ class TimeSeriesGenerator:
                 user=GRAPH_DB_CONFIG["user"],
                 password=GRAPH_DB_CONFIG["password"]
             )
-            self.neo4j_available = True
+            # 连接器创建时不连接数据库，这里主动检测连接是否可用
+            self.neo4j_available = self.neo4j_connector.verify_connectivity()
         except Exception as e:
             logger.warning(f"无法初始化Neo4j连接器: {str(e)}")
             self.neo4j_available = False
@@ -158,25 +159,14 @@ class TimeSeriesGenerator:
             # 对每个节点类型执行查询
             for node_type in node_types:
                 try:
-                    # 查询Neo4j获取指定类型的节点
-                    with self.neo4j_connector.driver.session() as session:
-                        result = session.run(f"""
-                            MATCH (n:{node_type})
-                            RETURN n.id as id, '{node_type}' as type, 
-                                   COALESCE(n.name, n.id) as name
-                        """)
-                        
-                        count = 0
-                        for record in result:
-                            node_info = {
-                                'id': record['id'],
-                                'type': record['type'],
-                                'name': record['name']
-                            }
-                            loaded_nodes.append(node_info)
-                            count += 1
-                        
-                        logger.info(f"已加载 {count} 个 {node_type} 类型的节点")
+                    # 查询Neo4j获取指定类型的节点（使用共享驱动的连接池）
+                    records = self.neo4j_connector.execute_query(f"""
+                        MATCH (n:{node_type})
+                        RETURN n.id as id, '{node_type}' as type, 
+                               COALESCE(n.name, n.id) as name
+                    """)
+                    loaded_nodes.extend(records)
+                    logger.info(f"已加载 {len(records)} 个 {node_type} 类型的节点")
                     
                 except Exception as e:
                     logger.error(f"加载 {node_type} 类型节点失败: {str(e)}")
@@ -232,7 +222,7 @@ class TimeSeriesGenerator:
         # 添加日变化模式
         if daily_pattern:
             # 创建基于一天24小时的周期性变化
-            hours = np.array([t.hour for t in time_range])
+            hours = time_range.hour.to_numpy()
             # 工作时间（8-18点）负载较高
             daily_pattern = np.sin(hours * (2 * np.pi / 24) - np.pi/2) * 0.2 + 0.1
             values += base_value * daily_pattern
@@ -240,7 +230,7 @@ class TimeSeriesGenerator:
         # 添加周变化模式
         if weekly_pattern:
             # 创建基于一周7天的周期性变化
-            days = np.array([t.dayofweek for t in time_range])
+            days = time_range.dayofweek.to_numpy()
             # 工作日（0-4）负载较高，周末（5-6）负载较低
             weekly_factor = np.where(days < 5, 0.1, -0.1)
             values += base_value * weekly_factor
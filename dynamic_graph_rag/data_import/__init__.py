@@ -5,4 +5,4 @@
 from pathlib import Path
 
 # 确保所有模块可以被正确导入
-__all__ = ['graph_data_importer'] 
\ No newline at end of file
+__all__ = ['graph_data_importer', 'import_checkpoint', 'streaming_loader'] 
\ No newline at end of file
@@ -9,7 +9,9 @@ import json
 import logging
 import os
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 import click
@@ -21,8 +23,13 @@ from tqdm import tqdm
 # 添加项目根目录到路径
 sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
 
-from dynamic_graph_rag.config.settings import GRAPH_DB_CONFIG
+from dynamic_graph_rag.config.settings import GRAPH_DB_CONFIG, GRAPH_IMPORT_CONFIG, NODE_TYPES
+from dynamic_graph_rag.data_import.import_checkpoint import AdaptiveBatchSizer, ImportCheckpoint
+from dynamic_graph_rag.data_import.streaming_loader import (
+    JSON_LINES_SUFFIXES, iter_batches, iter_graph_items, normalize_edge, normalize_node
+)
 from dynamic_graph_rag.db.neo4j_connector import Neo4jConnector
+from dynamic_graph_rag.models.topology_cache import invalidate_topology_caches
 
 # 配置日志
 logging.basicConfig(
@@ -38,7 +45,8 @@ logger = logging.getLogger('graph_importer')
 class GraphDataImporter:
     """处理图数据导入的类"""
 
-    def __init__(self, uri=None, user=None, password=None, database=None):
+    def __init__(self, uri=None, user=None, password=None, database=None,
+                 workers=None, batch_size=None, checkpoint_file=None):
         """
         初始化导入器
         
@@ -47,6 +55,9 @@ class GraphDataImporter:
             user: 用户名
             password: 密码
             database: 数据库名
+            workers: 并发导入的会话数，1表示顺序导入，默认从配置读取
+            batch_size: 初始批大小，实际批大小会根据每批耗时自适应调整
+            checkpoint_file: 检查点文件路径，提供时支持中断后续传
         """
         # 使用传入参数或默认配置
         self.uri = uri or GRAPH_DB_CONFIG["uri"]
@@ -63,6 +74,14 @@ class GraphDataImporter:
         )
         self.driver = self.connector.driver
         
+        # 并发和批大小配置
+        self.workers = workers or GRAPH_IMPORT_CONFIG["workers"]
+        self.batch_size = batch_size or GRAPH_IMPORT_CONFIG["batch_size"]
+        self.max_retries = GRAPH_IMPORT_CONFIG["max_retries"]
+        self.checkpoint_file = checkpoint_file
+        self.checkpoint = None
+        self._stats_lock = threading.Lock()
+        
         # 统计信息
         self.stats = {
             "nodes_total": 0,
@@ -71,8 +90,12 @@ class GraphDataImporter:
             "edges_imported": 0,
             "node_types": {},
             "edge_types": {},
+            "throughput": {},
             "errors": 0
         }
+        
+        # 节点ID到标签的映射，导入边时用于生成带标签的MATCH
+        self.node_labels = {}
     
     def load_json_data(self, json_file_path):
         """
@@ -104,29 +127,7 @@ class GraphDataImporter:
         Returns:
             list: 处理后的节点列表
         """
-        processed_nodes = []
-        for node in nodes:
-            # 创建新节点对象，包含基本字段
-            processed_node = {
-                "id": node["id"],
-                "type": node["type"],  # 保留type属性，用于统计
-                "level": node["level"]
-            }
-            
-            # 处理属性字段
-            if "properties" in node and isinstance(node["properties"], dict):
-                # 如果有properties子对象，将其展平到节点对象中
-                for key, value in node["properties"].items():
-                    processed_node[key] = value
-            
-            # 复制其他直接属性（除了已处理的基本字段和properties外）
-            for key, value in node.items():
-                if key not in ["id", "type", "level", "properties"]:
-                    processed_node[key] = value
-            
-            processed_nodes.append(processed_node)
-        
-        return processed_nodes
+        return [normalize_node(node) for node in nodes]
     
     def preprocess_edges(self, edges):
         """
@@ -138,29 +139,7 @@ class GraphDataImporter:
         Returns:
             list: 处理后的边列表
         """
-        processed_edges = []
-        for edge in edges:
-            # 创建新边对象，包含基本字段
-            processed_edge = {
-                "source": edge["source"],
-                "target": edge["target"],
-                "type": edge["type"]  # 保留type属性，用于统计
-            }
-            
-            # 处理属性字段
-            if "properties" in edge and isinstance(edge["properties"], dict):
-                # 如果有properties子对象，将其展平到边对象中
-                for key, value in edge["properties"].items():
-                    processed_edge[key] = value
-            
-            # 复制其他直接属性（除了已处理的基本字段和properties外）
-            for key, value in edge.items():
-                if key not in ["source", "target", "type", "properties"]:
-                    processed_edge[key] = value
-            
-            processed_edges.append(processed_edge)
-        
-        return processed_edges
+        return [normalize_edge(edge) for edge in edges]
     
     def clear_database(self):
         """清空数据库中的所有节点和关系，同时删除所有索引和约束"""
@@ -168,6 +147,8 @@ class GraphDataImporter:
         with self.driver.session(database=self.database) as session:
             # 删除所有节点和关系
             session.run("MATCH (n) DETACH DELETE n")
+            self.node_labels.clear()
+            self.connector.clear_label_cache()
             
             # 删除所有索引和约束
             try:
@@ -192,21 +173,16 @@ class GraphDataImporter:
         """创建必要的约束和索引以提高性能"""
         logger.info("创建约束和索引...")
         
-        # 获取所有可能的节点类型，用于创建约束
-        node_types = ["DC", "TENANT", "NE", "VM", "HOST", "HOSTGROUP", "TRU"]
-        
         constraints_and_indexes = []
         
-        # 为每种节点类型创建ID唯一性约束
-        for node_type in node_types:
+        # 为每种节点类型创建ID唯一性约束和等级索引（索引只能建立在具体标签上）
+        for node_type in NODE_TYPES:
             constraints_and_indexes.append(
                 f"CREATE CONSTRAINT {node_type.lower()}_id_unique IF NOT EXISTS FOR (n:{node_type}) REQUIRE n.id IS UNIQUE"
             )
-        
-        # 创建等级索引
-        constraints_and_indexes.append(
-            "CREATE INDEX level_index IF NOT EXISTS FOR (n) ON (n.level)"
-        )
+            constraints_and_indexes.append(
+                f"CREATE INDEX {node_type.lower()}_level_index IF NOT EXISTS FOR (n:{node_type}) ON (n.level)"
+            )
         
         with self.driver.session(database=self.database) as session:
             for query in constraints_and_indexes:
@@ -217,10 +193,159 @@ class GraphDataImporter:
         
         logger.info("约束和索引创建完成")
 
+    def _node_import_query(self, node_type):
+        """
+        生成节点批量导入查询，使用节点类型作为标签
+        
+        启用检查点时使用MERGE，使重启后重放最后一批未记录进度的数据不会产生重复节点。
+        """
+        if self.checkpoint is not None:
+            return f"""
+            UNWIND $batch AS node
+            MERGE (n:{node_type} {{id: node.id}})
+            SET n = node
+            RETURN count(n) AS imported
+            """
+        return f"""
+        UNWIND $batch AS node
+        CREATE (n:{node_type})
+        SET n = node
+        RETURN count(n) AS imported
+        """
+
+    def _edge_import_query(self, edge_type, source_label, target_label):
+        """
+        生成边批量导入查询，端点带标签以使用索引查找
+
+        启用检查点时使用MERGE，理由同 _node_import_query。
+        """
+        write_clause = "MERGE" if self.checkpoint is not None else "CREATE"
+        return f"""
+        UNWIND $batch AS edge
+        MATCH (source:{source_label} {{id: edge.source}})
+        MATCH (target:{target_label} {{id: edge.target}})
+        {write_clause} (source)-[r:{edge_type}]->(target)
+        SET r = edge
+        RETURN count(r) AS imported
+        """
+
+    @staticmethod
+    def _write_batch(tx, query, batch):
+        """在写事务中提交一批数据"""
+        return tx.run(query, batch=batch).single()["imported"]
+
+    def _import_task(self, task_key, segments, imported_key, progress=None):
+        """
+        执行一个导入任务
+        
+        任务在单个会话中按自适应批大小依次提交各段数据，每批提交后更新检查点。
+        失败的批次减小批大小后重试，重试耗尽时停止该任务并保留检查点，以便之后续传。
+        
+        Args:
+            task_key: 任务标识，如 nodes:VM、edges:NE
+            segments: (查询, 行列表) 列表，任务内按顺序执行
+            imported_key: 累加导入数量的统计字段
+            progress: 可选的tqdm进度条
+        """
+        done = self.checkpoint.get(task_key) if self.checkpoint is not None else 0
+        sizer = AdaptiveBatchSizer(
+            initial=self.batch_size,
+            minimum=GRAPH_IMPORT_CONFIG["min_batch_size"],
+            maximum=GRAPH_IMPORT_CONFIG["max_batch_size"],
+            target_seconds=GRAPH_IMPORT_CONFIG["target_batch_seconds"]
+        )
+        total_rows = sum(len(rows) for _, rows in segments)
+        resumed = min(done, total_rows)
+        imported = 0
+        failed = False
+        start_time = time.time()
+        
+        if progress is not None and resumed:
+            progress.update(resumed)
+        
+        with self.driver.session(database=self.database) as session:
+            offset = 0
+            for query, rows in segments:
+                position = max(done - offset, 0)
+                attempts = 0
+                while position < len(rows) and not failed:
+                    batch = rows[position:position + sizer.size]
+                    batch_start = time.time()
+                    try:
+                        # execute_write会自动重试死锁等瞬时错误
+                        imported += session.execute_write(self._write_batch, query, batch)
+                    except Exception as e:
+                        attempts += 1
+                        logger.warning(f"{task_key} 批次(偏移 {offset + position}, {len(batch)} 行)导入失败 "
+                                       f"(第{attempts}次): {str(e)}")
+                        if attempts > self.max_retries:
+                            logger.error(f"{task_key} 重试次数已用尽，任务停止于偏移 {offset + position}")
+                            failed = True
+                        else:
+                            sizer.shrink()
+                        continue
+                    
+                    attempts = 0
+                    sizer.record(len(batch), time.time() - batch_start)
+                    position += len(batch)
+                    if self.checkpoint is not None:
+                        self.checkpoint.update(task_key, offset + position)
+                    if progress is not None:
+                        progress.update(len(batch))
+                offset += len(rows)
+        
+        elapsed = time.time() - start_time
+        with self._stats_lock:
+            # 断点跳过的行在之前的运行中已导入，计入导入数量以便完整性验证
+            self.stats[imported_key] += imported + resumed
+            if failed:
+                self.stats["errors"] += 1
+            self.stats["throughput"][task_key] = {
+                "rows": imported,
+                "resumed": resumed,
+                "seconds": elapsed,
+                "rows_per_second": imported / elapsed if elapsed > 0 else 0.0,
+                "final_batch_size": sizer.size,
+                "completed": not failed
+            }
+
+    def _run_import_tasks(self, tasks, imported_key, desc):
+        """
+        使用有界线程池并发执行导入任务，每个工作线程使用独立会话
+        
+        Args:
+            tasks: (任务标识, 段列表) 列表
+            imported_key: 累加导入数量的统计字段
+            desc: 进度条描述
+        """
+        total_rows = sum(len(rows) for _, segments in tasks for _, rows in segments)
+        workers = max(1, min(self.workers, len(tasks)))
+        
+        with tqdm(total=total_rows, desc=desc) as progress:
+            if workers == 1:
+                for task_key, segments in tasks:
+                    self._import_task(task_key, segments, imported_key, progress)
+                return
+            
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(self._import_task, task_key, segments, imported_key, progress): task_key
+                    for task_key, segments in tasks
+                }
+                for future in as_completed(futures):
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"导入任务 {futures[future]} 出错: {str(e)}")
+                        with self._stats_lock:
+                            self.stats["errors"] += 1
+
     def import_nodes(self, nodes):
         """
         导入节点数据，使用正确的Neo4j标签
         
+        每种节点类型作为一个导入任务，不同类型并发导入。
+        
         Args:
             nodes: 节点列表
             
@@ -240,47 +365,60 @@ class GraphDataImporter:
             if node_type not in nodes_by_type:
                 nodes_by_type[node_type] = []
             nodes_by_type[node_type].append(node)
+            self.node_labels[node["id"]] = node_type
             
             # 更新节点类型统计
             if node_type not in self.stats["node_types"]:
                 self.stats["node_types"][node_type] = 0
             self.stats["node_types"][node_type] += 1
         
-        # 为每种节点类型执行导入
-        for node_type, type_nodes in tqdm(nodes_by_type.items(), desc="导入节点类型"):
-            # 按批次导入节点
-            batch_size = 500
-            batches = [type_nodes[i:i + batch_size] for i in range(0, len(type_nodes), batch_size)]
-            
-            for batch_idx, batch in enumerate(tqdm(batches, desc=f"导入{node_type}类型节点", leave=False)):
-                with self.driver.session(database=self.database) as session:
-                    try:
-                        # 准备批量导入的参数
-                        batch_params = {"batch": batch}
-                        
-                        # 创建批量导入的Cypher查询，使用节点类型作为标签
-                        query = f"""
-                        UNWIND $batch AS node
-                        CREATE (n:{node_type})
-                        SET n = node
-                        RETURN count(n) AS imported
-                        """
-                        
-                        result = session.run(query, batch_params)
-                        imported = result.single()["imported"]
-                        self.stats["nodes_imported"] += imported
-                        
-                    except Exception as e:
-                        logger.error(f"导入{node_type}节点批次 {batch_idx+1} 时出错: {str(e)}")
-                        self.stats["errors"] += 1
+        # 为每种节点类型创建导入任务并并发执行
+        tasks = [
+            (f"nodes:{node_type}", [(self._node_import_query(node_type), type_nodes)])
+            for node_type, type_nodes in nodes_by_type.items()
+        ]
+        self._run_import_tasks(tasks, "nodes_imported", desc="导入节点")
         
+        self.connector.cache_node_labels(self.node_labels)
         logger.info(f"节点导入完成. 成功导入: {self.stats['nodes_imported']}/{self.stats['nodes_total']}")
         return self.stats["nodes_imported"]
 
+    def resolve_edge_labels(self, edges):
+        """
+        确定每条边源节点和目标节点的标签
+        
+        依次使用边上的source_type/target_type、本次导入的节点类型，
+        最后对仍未知的节点ID向数据库批量查询。
+        
+        Args:
+            edges: 边列表
+            
+        Returns:
+            list: 与edges一一对应的 (源标签, 目标标签) 列表，无法确定的标签为None
+        """
+        missing = set()
+        for edge in edges:
+            if not edge.get("source_type") and edge["source"] not in self.node_labels:
+                missing.add(edge["source"])
+            if not edge.get("target_type") and edge["target"] not in self.node_labels:
+                missing.add(edge["target"])
+        
+        if missing:
+            self.node_labels.update(self.connector.resolve_node_labels(list(missing), NODE_TYPES))
+        
+        return [
+            (edge.get("source_type") or self.node_labels.get(edge["source"]),
+             edge.get("target_type") or self.node_labels.get(edge["target"]))
+            for edge in edges
+        ]
+
     def import_edges(self, edges):
         """
         导入边数据，使用正确的Neo4j关系类型
         
+        边按源节点标签划分为导入任务，各任务并发执行。同一源节点的边总在同一任务中
+        顺序提交，避免多个事务争用同一源节点的锁而产生死锁。
+        
         Args:
             edges: 边列表
             
@@ -293,51 +431,159 @@ class GraphDataImporter:
         # 预处理边
         processed_edges = self.preprocess_edges(edges)
         
-        # 按边类型分组，以便为每种类型使用不同的导入查询
-        edges_by_type = {}
+        # 更新边类型统计
         for edge in processed_edges:
             edge_type = edge.get("type", "UNKNOWN")
-            if edge_type not in edges_by_type:
-                edges_by_type[edge_type] = []
-            edges_by_type[edge_type].append(edge)
-            
-            # 更新边类型统计
             if edge_type not in self.stats["edge_types"]:
                 self.stats["edge_types"][edge_type] = 0
             self.stats["edge_types"][edge_type] += 1
         
-        # 为每种边类型执行导入
-        for edge_type, type_edges in tqdm(edges_by_type.items(), desc="导入边类型"):
-            # 按批次导入边
-            batch_size = 500
-            batches = [type_edges[i:i + batch_size] for i in range(0, len(type_edges), batch_size)]
-            
-            for batch_idx, batch in enumerate(tqdm(batches, desc=f"导入{edge_type}类型边", leave=False)):
+        # 按源标签分区，分区内再按 (边类型, 目标标签) 分组，使MATCH命中各标签上的id唯一约束索引
+        edges_by_source = {}
+        for edge, (source_label, target_label) in zip(processed_edges, self.resolve_edge_labels(processed_edges)):
+            if not source_label or not target_label:
+                logger.warning(f"无法确定边 {edge['source']} -> {edge['target']} 端点的节点类型，已跳过")
+                self.stats["errors"] += 1
+                continue
+            patterns = edges_by_source.setdefault(source_label, {})
+            key = (edge.get("type", "UNKNOWN"), target_label)
+            if key not in patterns:
+                patterns[key] = []
+            patterns[key].append(edge)
+        
+        # 为每个源标签分区创建导入任务并并发执行
+        tasks = [
+            (f"edges:{source_label}", [
+                (self._edge_import_query(edge_type, source_label, target_label), pattern_edges)
+                for (edge_type, target_label), pattern_edges in patterns.items()
+            ])
+            for source_label, patterns in edges_by_source.items()
+        ]
+        self._run_import_tasks(tasks, "edges_imported", desc="导入边")
+        
+        logger.info(f"边导入完成. 成功导入: {self.stats['edges_imported']}/{self.stats['edges_total']}")
+        return self.stats["edges_imported"]
+
+    def _write_stream_batch(self, task_key, query, batch, imported_key):
+        """
+        在独立会话中提交一批流式数据，失败时按配置重试
+
+        Args:
+            task_key: 吞吐量统计的任务标识
+            query: 导入查询
+            batch: 批数据
+            imported_key: 累加导入数量的统计字段
+        """
+        start_time = time.time()
+        imported = None
+        for attempt in range(self.max_retries + 1):
+            try:
                 with self.driver.session(database=self.database) as session:
-                    try:
-                        # 准备批量导入的参数
-                        batch_params = {"batch": batch}
-                        
-                        # 创建批量导入的Cypher查询，使用边类型作为关系类型
-                        query = f"""
-                        UNWIND $batch AS edge
-                        MATCH (source {{id: edge.source}})
-                        MATCH (target {{id: edge.target}})
-                        CREATE (source)-[r:{edge_type}]->(target)
-                        SET r = edge
-                        RETURN count(r) AS imported
-                        """
-                        
-                        result = session.run(query, batch_params)
-                        imported = result.single()["imported"]
-                        self.stats["edges_imported"] += imported
-                        
-                    except Exception as e:
-                        logger.error(f"导入{edge_type}边批次 {batch_idx+1} 时出错: {str(e)}")
+                    imported = session.execute_write(self._write_batch, query, batch)
+                break
+            except Exception as e:
+                logger.warning(f"{task_key} 批次({len(batch)} 行)导入失败 (第{attempt + 1}次): {str(e)}")
+        elapsed = time.time() - start_time
+        
+        with self._stats_lock:
+            if imported is None:
+                logger.error(f"{task_key} 批次重试次数已用尽，已放弃 {len(batch)} 行")
+                self.stats["errors"] += 1
+                return
+            self.stats[imported_key] += imported
+            # 流式模式下seconds为各批写入耗时之和
+            task_stats = self.stats["throughput"].setdefault(task_key, {
+                "rows": 0, "resumed": 0, "seconds": 0.0, "rows_per_second": 0.0,
+                "final_batch_size": self.batch_size, "completed": True
+            })
+            task_stats["rows"] += imported
+            task_stats["seconds"] += elapsed
+            task_stats["rows_per_second"] = task_stats["rows"] / task_stats["seconds"] if task_stats["seconds"] > 0 else 0.0
+
+    def _stream_to_writers(self, batches, imported_key):
+        """
+        将 (任务标识, 查询, 批数据) 交给有界线程池写入
+
+        同时在途的批次数不超过工作线程数的两倍，读取速度快于写入时读取端阻塞，
+        从而使内存占用与文件大小无关。
+        """
+        in_flight = threading.BoundedSemaphore(self.workers * 2)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for task_key, query, batch in batches:
+                in_flight.acquire()
+                future = executor.submit(self._write_stream_batch, task_key, query, batch, imported_key)
+                future.add_done_callback(lambda _: in_flight.release())
+
+    def _iter_node_stream_batches(self, file_path):
+        """流式读取节点，按类型缓冲，满批后产出 (任务标识, 查询, 批数据)"""
+        buffers = {}
+        for node in iter_graph_items(file_path, "nodes"):
+            node_type = node.get("type", "UNKNOWN")
+            self.stats["nodes_total"] += 1
+            self.stats["node_types"][node_type] = self.stats["node_types"].get(node_type, 0) + 1
+            self.node_labels[node["id"]] = node_type
+            
+            buffer = buffers.setdefault(node_type, [])
+            buffer.append(node)
+            if len(buffer) >= self.batch_size:
+                yield f"nodes:{node_type}", self._node_import_query(node_type), buffer
+                buffers[node_type] = []
+        
+        for node_type, buffer in buffers.items():
+            if buffer:
+                yield f"nodes:{node_type}", self._node_import_query(node_type), buffer
+
+    def _iter_edge_stream_batches(self, file_path):
+        """流式读取边，按 (边类型, 源标签, 目标标签) 缓冲，满批后产出 (任务标识, 查询, 批数据)"""
+        buffers = {}
+        for chunk in iter_batches(iter_graph_items(file_path, "edges"), self.batch_size):
+            for edge, (source_label, target_label) in zip(chunk, self.resolve_edge_labels(chunk)):
+                edge_type = edge.get("type", "UNKNOWN")
+                self.stats["edges_total"] += 1
+                self.stats["edge_types"][edge_type] = self.stats["edge_types"].get(edge_type, 0) + 1
+                if not source_label or not target_label:
+                    logger.warning(f"无法确定边 {edge['source']} -> {edge['target']} 端点的节点类型，已跳过")
+                    with self._stats_lock:
                         self.stats["errors"] += 1
+                    continue
+                
+                key = (edge_type, source_label, target_label)
+                buffer = buffers.setdefault(key, [])
+                buffer.append(edge)
+                if len(buffer) >= self.batch_size:
+                    yield f"edges:{source_label}", self._edge_import_query(*key), buffer
+                    buffers[key] = []
+        
+        for key, buffer in buffers.items():
+            if buffer:
+                yield f"edges:{key[1]}", self._edge_import_query(*key), buffer
+
+    def import_stream(self, file_path):
+        """
+        流式导入JSON或JSON Lines拓扑文件
+        
+        节点和边边读取边规范化，满批即提交，不构建完整的数据副本。
+        常驻内存的只有节点ID到标签的映射、每种模式一个未满的批次和有限个在途批次。
+        全部节点写入完成后才开始导入边，以保证边的端点已存在。
+        
+        Args:
+            file_path: 拓扑文件路径
+            
+        Returns:
+            tuple: (成功导入的节点数量, 成功导入的边数量)
+        """
+        if self.checkpoint is not None:
+            logger.warning("流式导入不支持检查点续传，本次导入将忽略检查点")
+            self.checkpoint = None
+        
+        logger.info(f"开始流式导入 {file_path}")
+        self._stream_to_writers(self._iter_node_stream_batches(file_path), "nodes_imported")
+        self.connector.cache_node_labels(self.node_labels)
+        logger.info(f"节点导入完成. 成功导入: {self.stats['nodes_imported']}/{self.stats['nodes_total']}")
         
+        self._stream_to_writers(self._iter_edge_stream_batches(file_path), "edges_imported")
         logger.info(f"边导入完成. 成功导入: {self.stats['edges_imported']}/{self.stats['edges_total']}")
-        return self.stats["edges_imported"]
+        return self.stats["nodes_imported"], self.stats["edges_imported"]
 
     def verify_data_integrity(self):
         """
@@ -461,6 +707,18 @@ class GraphDataImporter:
             report.append(f"- {edge_type}: {count}")
         report.append("")
         
+        if self.stats.get("throughput"):
+            report.append("## 导入吞吐量")
+            for task_key, task_stats in self.stats["throughput"].items():
+                line = (f"- {task_key}: {task_stats['rows']} 行, {task_stats['seconds']:.2f} 秒, "
+                        f"{task_stats['rows_per_second']:.0f} 行/秒")
+                if task_stats["resumed"]:
+                    line += f" (从检查点跳过 {task_stats['resumed']} 行)"
+                if not task_stats["completed"]:
+                    line += " ⚠ 未完成"
+                report.append(line)
+            report.append("")
+        
         report.append("## 数据完整性验证")
         report.append(f"- 节点数量匹配: {'✓' if verification_results['nodes_count_match'] else '✗'}")
         report.append(f"- 边数量匹配: {'✓' if verification_results['edges_count_match'] else '✗'}")
@@ -851,41 +1109,60 @@ class GraphDataImporter:
         logger.info(f"图数据导出完成，文件已保存到目录: {output_dir}")
         return (stats["nodes_exported"], stats["edges_exported"])
 
-    def import_data(self, json_file_path, clear_existing=False, report_file=None):
+    def import_data(self, json_file_path, clear_existing=False, report_file=None, streaming=None):
         """
         执行完整的导入过程
         
         Args:
-            json_file_path: JSON文件路径
+            json_file_path: JSON或JSON Lines文件路径
             clear_existing: 是否清除现有数据
             report_file: 报告文件路径
+            streaming: 是否使用流式导入，默认仅对JSON Lines文件启用
             
         Returns:
             dict: 导入结果统计
         """
         start_time = time.time()
+        if streaming is None:
+            streaming = Path(json_file_path).suffix.lower() in JSON_LINES_SUFFIXES
         
         try:
-            # 1. 加载JSON数据
-            graph_data = self.load_json_data(json_file_path)
+            # 1. 加载JSON数据（流式导入时在写入过程中逐条读取）
+            if not streaming:
+                graph_data = self.load_json_data(json_file_path)
+                
+                if not isinstance(graph_data, dict) or "nodes" not in graph_data or "edges" not in graph_data:
+                    raise ValueError("JSON数据格式不正确，应包含 'nodes' 和 'edges' 键")
             
-            if not isinstance(graph_data, dict) or "nodes" not in graph_data or "edges" not in graph_data:
-                raise ValueError("JSON数据格式不正确，应包含 'nodes' 和 'edges' 键")
+            # 2. 加载检查点，输入文件变化时旧进度作废
+            if self.checkpoint_file and not streaming:
+                file_stat = Path(json_file_path).stat()
+                fingerprint = f"{Path(json_file_path).resolve()}:{file_stat.st_size}:{int(file_stat.st_mtime)}"
+                self.checkpoint = ImportCheckpoint(self.checkpoint_file, fingerprint)
             
-            # 2. 可选：清空现有数据库
+            # 可选：清空现有数据库（续传时保留已导入的数据）
             if clear_existing:
-                self.clear_database()
+                if self.checkpoint is not None and self.checkpoint.has_progress:
+                    logger.warning("检查点中存在已导入的进度，跳过清空数据库以便续传")
+                else:
+                    self.clear_database()
             
             # 3. 创建约束和索引
             self.create_constraints_and_indexes()
             
-            # 4. 导入节点数据
-            nodes = graph_data["nodes"]
-            self.import_nodes(nodes)
-            
-            # 5. 导入边数据
-            edges = graph_data["edges"]
-            self.import_edges(edges)
+            if streaming:
+                # 4-5. 流式导入节点和边
+                self.import_stream(json_file_path)
+            else:
+                # 4. 导入节点数据
+                nodes = graph_data.pop("nodes")
+                self.import_nodes(nodes)
+                del nodes
+                
+                # 5. 导入边数据
+                edges = graph_data.pop("edges")
+                self.import_edges(edges)
+                del edges
             
             # 6. 验证导入数据的完整性
             verification_results = self.verify_data_integrity()
@@ -894,7 +1171,15 @@ class GraphDataImporter:
             report_path = report_file or Path(json_file_path).with_suffix('.report.md')
             self.generate_import_report(verification_results, report_path)
             
-            # 8. 完成并返回统计信息
+            # 8. 拓扑已变化，使进程内的拓扑快照失效
+            invalidate_topology_caches()
+            
+            # 所有任务都完成后删除检查点
+            if self.checkpoint is not None and all(
+                    task["completed"] for task in self.stats["throughput"].values()):
+                self.checkpoint.clear()
+            
+            # 9. 完成并返回统计信息
             end_time = time.time()
             self.stats["duration"] = end_time - start_time
             self.stats["verification"] = verification_results
@@ -919,14 +1204,23 @@ class GraphDataImporter:
 @click.option('--report', type=click.Path(), help='导入报告输出路径')
 @click.option('--export-schema', is_flag=True, help='导出数据库Schema')
 @click.option('--schema-dir', type=click.Path(), help='Schema导出目录路径')
-def main(json_file, clear, uri, user, password, database, report, export_schema, schema_dir):
+@click.option('--workers', type=int, help='并发导入的会话数，1表示顺序导入')
+@click.option('--batch-size', type=int, help='初始批大小（根据每批耗时自适应调整）')
+@click.option('--checkpoint', type=click.Path(), help='检查点文件路径，中断后使用同一路径重新运行即可续传')
+@click.option('--stream/--no-stream', default=None,
+              help='流式读取拓扑文件，内存占用与文件大小无关（JSON Lines文件默认启用）')
+def main(json_file, clear, uri, user, password, database, report, export_schema, schema_dir,
+         workers, batch_size, checkpoint, stream):
     """从JSON文件导入图数据到Neo4j数据库"""
     try:
         importer = GraphDataImporter(
             uri=uri,
             user=user,
             password=password,
-            database=database
+            database=database,
+            workers=workers,
+            batch_size=batch_size,
+            checkpoint_file=checkpoint
         )
         
         if export_schema:
@@ -940,6 +1234,7 @@ def main(json_file, clear, uri, user, password, database, report, export_schema,
         stats = importer.import_data(
             json_file_path=json_file,
             clear_existing=clear,
+            streaming=stream,
             report_file=report
         )
         
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+图数据导入辅助模块 - 自适应批大小和断点续传检查点
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger('graph_importer')
+
+
+class AdaptiveBatchSizer:
+    """根据每批的实际耗时调整批大小，使每批耗时接近目标值"""
+
+    def __init__(self, initial=500, minimum=50, maximum=20000, target_seconds=1.0):
+        """
+        初始化批大小调节器
+
+        Args:
+            initial: 初始批大小
+            minimum: 最小批大小
+            maximum: 最大批大小
+            target_seconds: 每批的目标耗时（秒）
+        """
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.target_seconds = target_seconds
+        self.size = min(max(initial, self.minimum), self.maximum)
+
+    def record(self, rows, elapsed):
+        """
+        记录一批的耗时并计算下一批的大小
+
+        按耗时比例缩放，每次最多放大一倍，避免单次抖动导致批大小剧烈变化。
+
+        Args:
+            rows: 本批行数
+            elapsed: 本批耗时（秒）
+        """
+        if rows <= 0:
+            return
+        if elapsed <= 0:
+            scaled = rows * 2
+        else:
+            scaled = int(rows * min(self.target_seconds / elapsed, 2.0))
+        self.size = min(max(scaled, self.minimum), self.maximum)
+
+    def shrink(self):
+        """批次失败后将批大小减半"""
+        self.size = max(self.size // 2, self.minimum)
+
+
+class ImportCheckpoint:
+    """
+    导入检查点，按任务记录已提交的行数
+
+    每个任务（如某类节点、某个源标签下的边）内的行顺序是确定的，
+    因此记录已提交的行数即可在重启后跳过已导入的部分。
+    """
+
+    def __init__(self, path, fingerprint=None):
+        """
+        初始化检查点
+
+        Args:
+            path: 检查点文件路径
+            fingerprint: 输入数据指纹，与文件中记录的指纹不一致时丢弃旧进度
+        """
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.progress = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """加载已有检查点"""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"读取检查点文件 {self.path} 失败，将重新开始导入: {str(e)}")
+            return
+
+        if self.fingerprint is not None and data.get("fingerprint") != self.fingerprint:
+            logger.warning(f"检查点 {self.path} 与当前输入数据不匹配，将重新开始导入")
+            return
+        self.progress = data.get("progress", {})
+        logger.info(f"从检查点 {self.path} 恢复导入进度: {self.progress}")
+
+    @property
+    def has_progress(self):
+        """是否存在已提交的进度"""
+        return any(self.progress.values())
+
+    def get(self, task_key):
+        """获取任务已提交的行数"""
+        return self.progress.get(task_key, 0)
+
+    def update(self, task_key, rows_done):
+        """
+        更新任务进度并原子地写回文件
+
+        Args:
+            task_key: 任务标识
+            rows_done: 任务中已提交的总行数
+        """
+        with self._lock:
+            self.progress[task_key] = rows_done
+            data = {
+                "fingerprint": self.fingerprint,
+                "updated_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+                "progress": self.progress
+            }
+            tmp_path = self.path.with_name(self.path.name + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """导入全部完成后删除检查点"""
+        with self._lock:
+            self.progress = {}
+            if self.path.exists():
+                self.path.unlink()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+流式拓扑数据加载模块 - 增量读取大型JSON/JSON Lines拓扑文件
+
+JSON文件格式与load_json_data相同（包含nodes和edges数组的对象），逐个元素解析，
+内存占用与文件大小无关；JSON Lines文件每行一个节点或边对象，包含source和target的行视为边。
+安装ijson时使用其C后端解析JSON，否则使用基于json.JSONDecoder.raw_decode的增量解析。
+"""
+
+import json
+import logging
+from itertools import islice
+from pathlib import Path
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+logger = logging.getLogger('graph_importer')
+
+# 每次从文件读取的字符数
+READ_CHUNK_SIZE = 1 << 16
+
+JSON_LINES_SUFFIXES = ('.jsonl', '.ndjson')
+
+
+def normalize_node(node):
+    """
+    规范化单个节点，将properties子对象展平到节点对象中
+
+    Args:
+        node: 原始节点
+
+    Returns:
+        dict: 处理后的节点
+    """
+    processed_node = {
+        "id": node["id"],
+        "type": node["type"],
+        "level": node["level"]
+    }
+    if isinstance(node.get("properties"), dict):
+        processed_node.update(node["properties"])
+    for key, value in node.items():
+        if key not in ("id", "type", "level", "properties"):
+            processed_node[key] = value
+    return processed_node
+
+
+def normalize_edge(edge):
+    """
+    规范化单条边，将properties子对象展平到边对象中
+
+    Args:
+        edge: 原始边
+
+    Returns:
+        dict: 处理后的边
+    """
+    processed_edge = {
+        "source": edge["source"],
+        "target": edge["target"],
+        "type": edge["type"]
+    }
+    if isinstance(edge.get("properties"), dict):
+        processed_edge.update(edge["properties"])
+    for key, value in edge.items():
+        if key not in ("source", "target", "type", "properties"):
+            processed_edge[key] = value
+    return processed_edge
+
+
+class _JSONStreamReader:
+    """基于raw_decode的增量JSON读取器，只缓存尚未解析的文本"""
+
+    def __init__(self, f):
+        self.f = f
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        """丢弃已解析的文本并读取下一块，到达文件末尾时返回False"""
+        if self.eof:
+            return False
+        chunk = self.f.read(READ_CHUNK_SIZE)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        if not chunk:
+            self.eof = True
+        return bool(chunk)
+
+    def peek(self):
+        """跳过空白并返回下一个字符，文件结束时返回空字符串"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        """读取指定的结构字符"""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON格式错误: 期望 '{char}'，实际为 '{found or 'EOF'}'")
+        self.pos += 1
+
+    def value(self):
+        """解析下一个完整的JSON值，缓冲区中的值不完整时继续读取"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # 数字可能被块边界截断，在文件未结束时读取更多内容后重新解析
+            if end == len(self.buffer) and not self.eof:
+                self._fill()
+                continue
+            self.pos = end
+            return value
+
+    def iter_array(self):
+        """逐个解析数组元素，不将整个数组读入内存"""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == "]":
+                self.pos += 1
+                return
+            self.expect(",")
+
+
+def _iter_json_array_fallback(f, key):
+    """不依赖ijson的流式解析：在顶层对象中定位key对应的数组并逐个返回元素"""
+    reader = _JSONStreamReader(f)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        name = reader.value()
+        reader.expect(":")
+        if reader.peek() == "[":
+            if name == key:
+                yield from reader.iter_array()
+                return
+            # 跳过其他数组时同样逐个解析，避免整体读入内存
+            for _ in reader.iter_array():
+                pass
+        else:
+            reader.value()
+        if reader.peek() == "}":
+            return
+        reader.expect(",")
+
+
+def iter_json_array(path, key):
+    """
+    流式读取JSON文件顶层对象中某个数组的元素
+
+    Args:
+        path: JSON文件路径
+        key: 数组字段名，如nodes、edges
+
+    Yields:
+        dict: 数组元素
+    """
+    if ijson is not None:
+        with open(path, 'rb') as f:
+            # use_float避免ijson将小数解析为Decimal，Neo4j驱动不支持Decimal参数
+            yield from ijson.items(f, f"{key}.item", use_float=True)
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        yield from _iter_json_array_fallback(f, key)
+
+
+def iter_json_lines(path, kind):
+    """
+    流式读取JSON Lines文件中的节点或边
+
+    Args:
+        path: JSON Lines文件路径
+        kind: 'nodes' 或 'edges'
+
+    Yields:
+        dict: 节点或边
+    """
+    want_edges = kind == "edges"
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path} 第{line_no}行不是合法的JSON: {str(e)}") from e
+            if ("source" in item and "target" in item) == want_edges:
+                yield item
+
+
+def iter_graph_items(path, kind):
+    """
+    流式读取拓扑文件中的节点或边，并即时规范化
+
+    Args:
+        path: JSON或JSON Lines文件路径
+        kind: 'nodes' 或 'edges'
+
+    Yields:
+        dict: 规范化后的节点或边
+    """
+    if kind not in ("nodes", "edges"):
+        raise ValueError(f"不支持的数据类型: {kind}")
+    normalize = normalize_node if kind == "nodes" else normalize_edge
+    if Path(path).suffix.lower() in JSON_LINES_SUFFIXES:
+        items = iter_json_lines(path, kind)
+    else:
+        items = iter_json_array(path, kind)
+    for item in items:
+        yield normalize(item)
+
+
+def iter_batches(items, batch_size):
+    """
+    将迭代器切分为固定大小的批次
+
+    Args:
+        items: 可迭代对象
+        batch_size: 批大小
+
+    Yields:
+        list: 批次
+    """
+    iterator = iter(items)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
@@ -16,6 +16,8 @@ from unittest.mock import MagicMock, patch
 sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
 
 from dynamic_graph_rag.data_import.graph_data_importer import GraphDataImporter
+from dynamic_graph_rag.data_import.import_checkpoint import AdaptiveBatchSizer, ImportCheckpoint
+from dynamic_graph_rag.data_import.streaming_loader import iter_graph_items, normalize_node
 
 
 class TestGraphDataImporter(unittest.TestCase):
@@ -81,11 +83,10 @@ class TestGraphDataImporter(unittest.TestCase):
         # 设置模拟对象
         mock_driver = MagicMock()
         mock_session = MagicMock()
-        mock_result = MagicMock()
-        mock_result.single.return_value = {"imported": 5}
+        # 每批在写事务中提交，返回本批导入的行数
+        mock_session.execute_write.side_effect = lambda fn, query, batch: len(batch)
         
         mock_driver.session.return_value.__enter__.return_value = mock_session
-        mock_session.run.return_value = mock_result
         
         mock_connector.return_value.driver = mock_driver
         
@@ -112,11 +113,13 @@ class TestGraphDataImporter(unittest.TestCase):
         # 设置模拟对象
         mock_driver = MagicMock()
         mock_session = MagicMock()
-        mock_result = MagicMock()
-        mock_result.single.return_value = {"imported": 4}
+        # 每批在写事务中提交，返回本批导入的行数
+        mock_session.execute_write.side_effect = lambda fn, query, batch: len(batch)
         
         mock_driver.session.return_value.__enter__.return_value = mock_session
-        mock_session.run.return_value = mock_result
+        mock_connector.return_value.resolve_node_labels.return_value = {
+            node["id"]: node["type"] for node in self.test_data["nodes"]
+        }
         
         mock_connector.return_value.driver = mock_driver
         
@@ -222,6 +225,105 @@ class TestGraphDataImporter(unittest.TestCase):
         self.assertTrue(verification_results["edge_types_consistent"])
         self.assertEqual(verification_results["orphan_edges"], 0)
     
+    @patch('dynamic_graph_rag.data_import.graph_data_importer.Neo4jConnector')
+    def test_import_nodes_resumes_from_checkpoint(self, mock_connector):
+        """测试从检查点续传时跳过已提交的行"""
+        mock_driver = MagicMock()
+        mock_session = MagicMock()
+        mock_session.execute_write.side_effect = lambda fn, query, batch: len(batch)
+        mock_driver.session.return_value.__enter__.return_value = mock_session
+        mock_connector.return_value.driver = mock_driver
+        
+        checkpoint_file = Path(__file__).parent / "test_import.checkpoint.json"
+        try:
+            ImportCheckpoint(checkpoint_file).update("nodes:VM", 2)
+            
+            importer = GraphDataImporter(
+                uri="bolt://localhost:7688",
+                user="neo4j",
+                password="test",
+                database="neo4j",
+                workers=2
+            )
+            importer.checkpoint = ImportCheckpoint(checkpoint_file)
+            nodes = [{"id": f"vm{i}", "type": "VM", "level": 4} for i in range(3)]
+            nodes.append({"id": "host1", "type": "HOST", "level": 5})
+            
+            nodes_imported = importer.import_nodes(nodes)
+            
+            # VM只提交剩余的1个节点，已续传的节点仍计入导入数量
+            written = sorted(
+                [node["id"] for node in call.args[2]] for call in mock_session.execute_write.call_args_list
+            )
+            self.assertEqual(written, [["host1"], ["vm2"]])
+            self.assertEqual(nodes_imported, 4)
+            self.assertIn("MERGE", mock_session.execute_write.call_args_list[0].args[1])
+            self.assertEqual(importer.stats["throughput"]["nodes:VM"]["resumed"], 2)
+            self.assertEqual(importer.checkpoint.get("nodes:VM"), 3)
+        finally:
+            if checkpoint_file.exists():
+                checkpoint_file.unlink()
+    
+    def test_adaptive_batch_sizer(self):
+        """测试批大小随每批耗时调整"""
+        sizer = AdaptiveBatchSizer(initial=500, minimum=50, maximum=2000, target_seconds=1.0)
+        
+        sizer.record(500, 0.1)
+        self.assertEqual(sizer.size, 1000)  # 每次最多放大一倍
+        sizer.record(1000, 4.0)
+        self.assertEqual(sizer.size, 250)
+        sizer.shrink()
+        self.assertEqual(sizer.size, 125)
+        sizer.record(125, 100.0)
+        self.assertEqual(sizer.size, 50)
+    
+    @patch('dynamic_graph_rag.data_import.streaming_loader.READ_CHUNK_SIZE', 16)
+    @patch('dynamic_graph_rag.data_import.streaming_loader.ijson', None)
+    def test_iter_graph_items_streams_json(self):
+        """测试不依赖ijson的增量JSON解析，块边界落在元素内部时仍能正确解析"""
+        nodes = list(iter_graph_items(self.test_data_file, "nodes"))
+        edges = list(iter_graph_items(self.test_data_file, "edges"))
+        
+        self.assertEqual(nodes, [normalize_node(node) for node in self.test_data["nodes"]])
+        self.assertEqual([edge["type"] for edge in edges], ["HAS_TENANT", "HAS_NE", "HAS_VM", "DEPLOYED_ON"])
+    
+    @patch('dynamic_graph_rag.data_import.graph_data_importer.Neo4jConnector')
+    def test_import_stream_json_lines(self, mock_connector):
+        """测试流式导入JSON Lines文件，按批写入且边查询带端点标签"""
+        mock_driver = MagicMock()
+        mock_session = MagicMock()
+        mock_session.execute_write.side_effect = lambda fn, query, batch: len(batch)
+        mock_driver.session.return_value.__enter__.return_value = mock_session
+        mock_connector.return_value.driver = mock_driver
+        
+        jsonl_file = Path(__file__).parent / "test_data.jsonl"
+        try:
+            with open(jsonl_file, "w", encoding="utf-8") as f:
+                for item in self.test_data["nodes"] + self.test_data["edges"]:
+                    f.write(json.dumps(item, ensure_ascii=False) + "\n")
+            
+            importer = GraphDataImporter(
+                uri="bolt://localhost:7688",
+                user="neo4j",
+                password="test",
+                database="neo4j",
+                workers=2,
+                batch_size=2
+            )
+            nodes_imported, edges_imported = importer.import_stream(jsonl_file)
+            
+            self.assertEqual(nodes_imported, 5)
+            self.assertEqual(edges_imported, 4)
+            self.assertEqual(importer.stats["nodes_total"], 5)
+            self.assertEqual(importer.stats["edge_types"]["HAS_VM"], 1)
+            queries = [call.args[1] for call in mock_session.execute_write.call_args_list]
+            self.assertTrue(any("MATCH (source:NE {id: edge.source})" in query for query in queries))
+            self.assertIn("nodes:VM", importer.stats["throughput"])
+            mock_connector.return_value.resolve_node_labels.assert_not_called()
+        finally:
+            if jsonl_file.exists():
+                jsonl_file.unlink()
+    
     def test_import_data(self):
         """测试完整导入过程（集成测试，跳过mock）"""
         
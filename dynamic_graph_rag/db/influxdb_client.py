@@ -3,11 +3,13 @@ InfluxDB时序数据库连接模块
 提供时序数据库连接和基本操作功能
 """
 
+import json
 import logging
 import pandas as pd
-from influxdb_client import InfluxDBClient, Point
+from influxdb_client import BucketRetentionRules, InfluxDBClient, Point, TaskCreateRequest
 from influxdb_client.client.write_api import SYNCHRONOUS
-from ..config.settings import get_influxdb_config, NODE_TYPES
+from ..config.settings import get_influxdb_config, NODE_TYPES, ROLLUP_CONFIG
+from .line_protocol import DEFAULT_CHUNK_SIZE, iter_line_protocol_batches
 import time
 
 # 配置日志
@@ -33,6 +35,7 @@ class InfluxDBManager:
         self.bucket = bucket or config["bucket"]
         self.client = None
         self.write_api = None
+        self.sync_write_api = None
         self.query_api = None
         
     def connect(self):
@@ -63,6 +66,8 @@ class InfluxDBManager:
                 exponential_base=2
             )
             self.write_api = self.client.write_api(write_options=write_options)
+            # 同步写API：由调用方控制批大小，一次请求提交一整批行协议
+            self.sync_write_api = self.client.write_api(write_options=SYNCHRONOUS)
             
             # 其他API
             self.query_api = self.client.query_api()
@@ -219,7 +224,71 @@ class InfluxDBManager:
             logger.error(f"写入批次时发生未预期的错误: {str(e)}")
             return False
     
-    def query_metrics(self, measurement, node_id=None, fields=None, start_time=None, end_time=None):
+    def write_line_protocol(self, lines, retry_count=3, retry_delay=2):
+        """
+        同步写入一批行协议字符串
+        
+        Args:
+            lines: 行协议字符串列表
+            retry_count: 重试次数
+            retry_delay: 重试延迟（秒），按尝试次数递增
+            
+        Returns:
+            bool: 成功返回True，失败返回False
+        """
+        if not lines:
+            return True
+        
+        if not self.client:
+            if not self.connect():
+                logger.error("无法连接到InfluxDB，写入失败")
+                return False
+        
+        for attempt in range(1, retry_count + 2):
+            try:
+                self.sync_write_api.write(bucket=self.bucket, record=lines)
+                return True
+            except Exception as e:
+                if attempt > retry_count:
+                    logger.error(f"写入 {len(lines)} 行数据在{attempt}次尝试后失败: {str(e)}")
+                    return False
+                logger.warning(f"写入 {len(lines)} 行数据失败，将在{retry_delay * attempt}秒后重试 "
+                               f"({attempt}/{retry_count}): {str(e)}")
+                time.sleep(retry_delay * attempt)
+        return False
+    
+    def write_dataframe(self, data, measurement=None, measurement_column=None, tag_columns=(),
+                        field_columns=('value',), time_column='timestamp', batch_size=5000,
+                        chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        将DataFrame（或DataFrame迭代器）编码为行协议并分批写入
+        
+        按chunk_size逐块编码、按batch_size逐批发送，内存中只保留当前块。
+        
+        Args:
+            data: DataFrame或DataFrame迭代器
+            measurement: 固定的度量名称
+            measurement_column: 从该列读取每行的度量名称（与measurement二选一）
+            tag_columns: 标签列
+            field_columns: 字段列
+            time_column: 时间列
+            batch_size: 每次写请求的行数
+            chunk_size: 每次编码的DataFrame行数
+            
+        Returns:
+            成功写入的点数量
+        """
+        written = 0
+        for lines in iter_line_protocol_batches(data, batch_size=batch_size, chunk_size=chunk_size,
+                                                measurement=measurement, measurement_column=measurement_column,
+                                                tag_columns=tag_columns, field_columns=field_columns,
+                                                time_column=time_column):
+            if self.write_line_protocol(lines):
+                written += len(lines)
+        return written
+    
+    def query_metrics(self, measurement, node_id=None, fields=None, start_time=None, end_time=None,
+                      interval=None):
         """查询指标数据
         
         Args:
@@ -228,6 +297,7 @@ class InfluxDBManager:
             fields: 需要查询的字段列表（可选）
             start_time: 开始时间，如 "-1h"（可选）
             end_time: 结束时间（可选）
+            interval: 需要的数据分辨率，如 "1h" 或 "auto"，由plan_query选择数据层级（可选，默认原始数据）
             
         Returns:
             包含查询结果的DataFrame
@@ -238,19 +308,18 @@ class InfluxDBManager:
         
         try:
             # 构建Flux查询
-            query = f'from(bucket: "{self.bucket}") |> range(start: {start_time or "-1h"})'
-            
-            if end_time:
-                query += f', stop: {end_time}'
-                
-            query += f' |> filter(fn: (r) => r._measurement == "{measurement}")'
+            filters = f' |> filter(fn: (r) => r._measurement == "{measurement}")'
             
             if node_id:
-                query += f' |> filter(fn: (r) => r.node_id == "{node_id}")'
+                filters += f' |> filter(fn: (r) => r.node_id == "{node_id}")'
                 
+            field_filter = ""
             if fields:
                 field_filters = ' or '.join([f'r._field == "{field}"' for field in fields])
-                query += f' |> filter(fn: (r) => {field_filters})'
+                field_filter = f' |> filter(fn: (r) => {field_filters})'
+                
+            tier = self.plan_query(start_time, end_time, interval) if interval else self.get_rollup_tiers()[0]
+            query = self._build_source(tier, start_time, end_time, filters, field_filter)
                 
             # 执行查询
             tables = self.query_api.query_data_frame(query=query)
@@ -269,7 +338,434 @@ class InfluxDBManager:
         except Exception as e:
             logger.error(f"查询指标失败: {str(e)}")
             return None
-    
+
+    @staticmethod
+    def get_measurement(node_type):
+        """获取节点类型对应的度量名称（与时序数据生成器的写入约定一致，如 VM -> vm_metrics）
+
+        Args:
+            node_type: 节点类型，如'VM', 'HOST'
+
+        Returns:
+            度量名称
+        """
+        return f"{node_type.lower()}_metrics"
+
+    @staticmethod
+    def _build_range_clause(start_time=None, end_time=None):
+        """构建Flux的range子句"""
+        if end_time:
+            return f' |> range(start: {start_time or "-1h"}, stop: {end_time})'
+        return f' |> range(start: {start_time or "-1h"})'
+
+    @staticmethod
+    def _build_set_filter(column, values):
+        """构建基于contains()的集合过滤子句，一次匹配多个标签值"""
+        value_set = json.dumps(sorted(str(value) for value in values), ensure_ascii=False)
+        return f' |> filter(fn: (r) => contains(value: r.{column}, set: {value_set}))'
+
+    def get_rollup_tiers(self):
+        """获取数据层级列表（原始数据层级使用当前存储桶），按分辨率从细到粗排列"""
+        tiers = [dict(tier) for tier in ROLLUP_CONFIG["tiers"]]
+        tiers[0]["bucket"] = self.bucket
+        return tiers
+
+    @staticmethod
+    def _to_timestamp(value, now):
+        """将相对时间（如 "-7d"）或RFC3339时间转换为UTC时间戳"""
+        if value is None:
+            return now
+        value = str(value)
+        if value.startswith("-"):
+            return now - pd.Timedelta(value[1:])
+        timestamp = pd.Timestamp(value)
+        return timestamp.tz_convert("UTC") if timestamp.tzinfo else timestamp.tz_localize("UTC")
+
+    def plan_query(self, start_time=None, end_time=None, interval="auto"):
+        """为查询选择数据层级
+
+        在保留期覆盖查询起点的层级中选择满足需求的最粗层级：指定interval时要求层级分辨率
+        不粗于interval；interval为"auto"时要求查询窗口内每条序列至少有min_points个点。
+        没有层级满足分辨率要求时退回可用的最细层级。
+
+        Args:
+            start_time: 开始时间，如 "-7d" 或RFC3339时间（可选，默认 "-1h"）
+            end_time: 结束时间（可选，默认当前时间）
+            interval: 需要的数据分辨率，如 "1h"，或 "auto"
+
+        Returns:
+            层级配置字典（name、bucket、resolution、retention_days）
+        """
+        tiers = self.get_rollup_tiers()
+        if not ROLLUP_CONFIG["enabled"]:
+            return tiers[0]
+
+        try:
+            now = pd.Timestamp.now(tz="UTC")
+            start = self._to_timestamp(start_time or "-1h", now)
+            span = self._to_timestamp(end_time, now) - start
+            age = now - start
+            required = pd.Timedelta(interval) if interval != "auto" else None
+        except (ValueError, TypeError) as e:
+            logger.warning(f"无法解析查询时间范围，使用原始数据: {str(e)}")
+            return tiers[0]
+
+        available = [tier for tier in tiers if pd.Timedelta(days=tier["retention_days"]) >= age] or tiers[-1:]
+        if required is not None:
+            suitable = [tier for tier in available if pd.Timedelta(tier["resolution"]) <= required]
+        else:
+            suitable = [tier for tier in available
+                        if span / pd.Timedelta(tier["resolution"]) >= ROLLUP_CONFIG["min_points"]]
+        return (suitable or available)[-1 if suitable else 0]
+
+    def _build_source(self, tier, start_time=None, end_time=None, filters="", field_filter=""):
+        """构建指定层级上的数据源查询
+
+        原始数据层级直接查询；汇总层级读取mean字段并以value字段返回，与原始数据的结构一致。
+        未指定结束时间时，汇总任务尚未覆盖的最近窗口从原始数据实时聚合补齐。
+
+        Args:
+            tier: plan_query返回的层级
+            start_time: 开始时间
+            end_time: 结束时间
+            filters: 作用于标签的过滤子句（在range之后，可下推到存储层）
+            field_filter: 作用于_field的过滤子句
+
+        Returns:
+            Flux查询字符串
+        """
+        if tier["name"] == "raw":
+            return f'from(bucket: "{tier["bucket"]}")' + self._build_range_clause(start_time, end_time) + filters + field_filter
+
+        if end_time:
+            range_clause = self._build_range_clause(start_time, end_time)
+        else:
+            range_clause = f' |> range(start: {start_time or "-1h"}, stop: boundary)'
+        rollup = (f'from(bucket: "{tier["bucket"]}"){range_clause}'
+                  f' |> filter(fn: (r) => r._field == "mean"){filters}'
+                  f' |> set(key: "_field", value: "value"){field_filter}')
+        if end_time:
+            return rollup
+
+        resolution = tier["resolution"]
+        recent = (f'from(bucket: "{self.bucket}") |> range(start: boundary)'
+                  f' |> filter(fn: (r) => r._field == "value"){filters}{field_filter}'
+                  f' |> aggregateWindow(every: {resolution}, fn: mean, createEmpty: false, timeSrc: "_start")')
+        return (f'import "date"\n'
+                f'boundary = date.truncate(t: date.sub(d: {ROLLUP_CONFIG["task_offset"]}, from: now()), unit: {resolution})\n'
+                f'rollup = {rollup}\n'
+                f'recent = {recent}\n'
+                f'union(tables: [rollup, recent])')
+
+    def _build_rollup_flux(self, tier, range_clause):
+        """构建将原始数据汇总写入层级存储桶的Flux脚本
+
+        每个窗口写入mean/min/max/count四个字段，时间戳为窗口起点。
+        """
+        aggregates = ",\n".join(
+            f'  data |> aggregateWindow(every: {tier["resolution"]}, fn: {fn}, createEmpty: false, timeSrc: "_start")'
+            f' |> set(key: "_field", value: "{fn}")'
+            for fn in ("mean", "min", "max", "count")
+        )
+        return (f'data = from(bucket: "{self.bucket}"){range_clause}\n'
+                f'  |> filter(fn: (r) => r._field == "value")\n'
+                f'union(tables: [\n{aggregates}\n])\n'
+                f'  |> to(bucket: "{tier["bucket"]}", org: "{self.org}")')
+
+    def ensure_rollups(self):
+        """创建汇总层级的存储桶（按保留策略设置过期时间）和定时汇总任务，已存在的跳过
+
+        Returns:
+            是否全部创建成功
+        """
+        if not self.client:
+            if not self.connect():
+                return False
+
+        try:
+            buckets_api = self.client.buckets_api()
+            tasks_api = self.client.tasks_api()
+            for tier in self.get_rollup_tiers()[1:]:
+                if buckets_api.find_bucket_by_name(tier["bucket"]) is None:
+                    logger.info(f"创建汇总存储桶: {tier['bucket']}（保留 {tier['retention_days']} 天）")
+                    buckets_api.create_bucket(
+                        bucket_name=tier["bucket"],
+                        retention_rules=BucketRetentionRules(type="expire",
+                                                             every_seconds=tier["retention_days"] * 86400),
+                        org=self.org
+                    )
+
+                task_name = f"rollup_{tier['name']}"
+                if tasks_api.find_tasks(name=task_name):
+                    continue
+                flux = (f'option task = {{name: "{task_name}", every: {tier["resolution"]}, '
+                        f'offset: {ROLLUP_CONFIG["task_offset"]}}}\n\n'
+                        + self._build_rollup_flux(tier, " |> range(start: -task.every)"))
+                logger.info(f"创建汇总任务: {task_name}")
+                tasks_api.create_task(task_create_request=TaskCreateRequest(
+                    org=self.org, flux=flux, status="active",
+                    description=f"将 {self.bucket} 的原始指标按 {tier['resolution']} 汇总到 {tier['bucket']}"
+                ))
+            return True
+        except Exception as e:
+            logger.error(f"创建汇总层级失败: {str(e)}")
+            return False
+
+    def run_rollup(self, tier_name, start_time, end_time=None):
+        """在服务端执行一次汇总，用于回填历史数据或在未启用定时任务时降采样
+
+        时间范围按层级分辨率对齐到完整窗口，避免写入不完整窗口的汇总值。
+
+        Args:
+            tier_name: 层级名称，如 "hourly"
+            start_time: 开始时间，如 "-30d" 或RFC3339时间
+            end_time: 结束时间（可选，默认当前时间）
+
+        Returns:
+            是否执行成功
+        """
+        tier = next((tier for tier in self.get_rollup_tiers()[1:] if tier["name"] == tier_name), None)
+        if tier is None:
+            logger.error(f"未知的汇总层级: {tier_name}")
+            return False
+
+        if not self.client:
+            if not self.connect():
+                return False
+
+        try:
+            now = pd.Timestamp.now(tz="UTC")
+            resolution = pd.Timedelta(tier["resolution"])
+            start = self._to_timestamp(start_time, now).floor(resolution)
+            stop = self._to_timestamp(end_time, now).floor(resolution)
+            if stop <= start:
+                logger.warning(f"汇总时间范围不足一个 {tier['resolution']} 窗口")
+                return True
+
+            range_clause = self._build_range_clause(start.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                                                    stop.strftime("%Y-%m-%dT%H:%M:%SZ"))
+            self.query_api.query(query=self._build_rollup_flux(tier, range_clause))
+            logger.info(f"已汇总 {start} 至 {stop} 的数据到 {tier['bucket']}")
+            return True
+        except Exception as e:
+            logger.error(f"执行汇总失败: {str(e)}")
+            return False
+
+    def query_metrics_bulk(self, measurement, node_ids, fields=None, metrics=None,
+                           start_time=None, end_time=None, chunk_size=None, interval=None):
+        """批量查询多个节点的指标数据
+
+        使用contains()集合过滤在一次Flux查询中取回多个节点的数据，
+        节点数量超过chunk_size时拆分为少量分块查询，避免逐节点往返。
+
+        Args:
+            measurement: 度量名称
+            node_ids: 节点ID集合
+            fields: 需要查询的字段列表（可选）
+            metrics: 需要查询的指标名称列表，对应metric标签（可选）
+            start_time: 开始时间，如 "-1h"（可选）
+            end_time: 结束时间（可选）
+            chunk_size: 每次查询包含的最大节点数，默认从配置读取
+            interval: 需要的数据分辨率，如 "1h" 或 "auto"，由plan_query选择数据层级（可选，默认原始数据）
+
+        Returns:
+            按节点分组的结果字典 {node_id: DataFrame}，没有数据的节点对应空DataFrame；
+            查询失败时返回None
+        """
+        node_ids = sorted({str(node_id) for node_id in node_ids if node_id})
+        if not node_ids:
+            return {}
+
+        if not self.client:
+            if not self.connect():
+                return None
+
+        chunk_size = chunk_size or get_influxdb_config().get("bulk_chunk_size", 500)
+        tier = self.plan_query(start_time, end_time, interval) if interval else self.get_rollup_tiers()[0]
+
+        try:
+            frames = []
+            for i in range(0, len(node_ids), chunk_size):
+                chunk = node_ids[i:i + chunk_size]
+
+                # 构建Flux查询
+                filters = f' |> filter(fn: (r) => r._measurement == "{measurement}")'
+                filters += self._build_set_filter("node_id", chunk)
+
+                if metrics:
+                    filters += self._build_set_filter("metric", metrics)
+
+                field_filter = self._build_set_filter("_field", fields) if fields else ""
+                query = self._build_source(tier, start_time, end_time, filters, field_filter)
+
+                # 执行查询
+                tables = self.query_api.query_data_frame(query=query)
+
+                if isinstance(tables, list):
+                    frames.extend(table for table in tables if not table.empty)
+                elif tables is not None and not tables.empty:
+                    frames.append(tables)
+
+            # 按节点分组结果
+            grouped = {node_id: pd.DataFrame() for node_id in node_ids}
+            if frames:
+                result = pd.concat(frames, ignore_index=True)
+                if "node_id" in result.columns:
+                    for node_id, node_df in result.groupby("node_id", sort=False):
+                        grouped[node_id] = node_df.reset_index(drop=True)
+
+            return grouped
+        except Exception as e:
+            logger.error(f"批量查询指标失败: {str(e)}")
+            return None
+
+    def query_points(self, measurement, start_time=None, metrics=None, node_ids=None, end_time=None,
+                     interval=None):
+        """以单个列式结果集查询一个度量下所有节点的指标点
+
+        数据在Flux中合并为一张表并只保留四列，一次往返取回整个节点类型的窗口数据，
+        适合在客户端用NumPy做分组统计。
+
+        Args:
+            measurement: 度量名称
+            start_time: 开始时间，如 "-1h" 或RFC3339时间（可选）
+            metrics: 需要查询的指标名称列表，对应metric标签（可选）
+            node_ids: 限定的节点ID集合（可选）
+            end_time: 结束时间（可选）
+            interval: 需要的数据分辨率，如 "1h" 或 "auto"，由plan_query选择数据层级（可选，默认原始数据）
+
+        Returns:
+            包含node_id、metric、_time、_value列的DataFrame；查询失败时返回None
+        """
+        if not self.client:
+            if not self.connect():
+                return None
+
+        filters = f' |> filter(fn: (r) => r._measurement == "{measurement}")'
+        if metrics:
+            filters += self._build_set_filter("metric", metrics)
+        if node_ids:
+            filters += self._build_set_filter("node_id", node_ids)
+        tier = self.plan_query(start_time, end_time, interval) if interval else self.get_rollup_tiers()[0]
+        # 汇总层级只返回value字段，只有原始数据需要过滤字段
+        field_filter = ' |> filter(fn: (r) => r._field == "value")' if tier["name"] == "raw" else ""
+        query = self._build_source(tier, start_time, end_time, filters, field_filter)
+        query += ' |> keep(columns: ["node_id", "metric", "_time", "_value"]) |> group()'
+
+        columns = ["node_id", "metric", "_time", "_value"]
+        try:
+            tables = self.query_api.query_data_frame(query=query)
+            if isinstance(tables, list):
+                tables = pd.concat(tables, ignore_index=True) if tables else None
+            if tables is None or tables.empty:
+                return pd.DataFrame(columns=columns)
+            return tables.loc[:, columns].reset_index(drop=True)
+        except Exception as e:
+            logger.error(f"查询指标点失败: {str(e)}")
+            return None
+
+    @staticmethod
+    def compute_zscore_anomalies(df, threshold=2.0, group_columns=("node_id",)):
+        """在单个列式DataFrame上向量化计算Z分数并筛选异常点
+
+        Args:
+            df: InfluxDB查询结果格式的DataFrame，需包含_value列
+            threshold: 异常阈值（标准差的倍数）
+            group_columns: 计算均值/标准差的分组列
+
+        Returns:
+            仅包含异常点的DataFrame，附加mean、stddev、z_score列
+        """
+        if df is None or df.empty or "_value" not in df.columns:
+            return pd.DataFrame()
+
+        group_columns = [column for column in group_columns if column in df.columns]
+        values = pd.to_numeric(df["_value"], errors="coerce")
+        if group_columns:
+            grouped = values.groupby([df[column] for column in group_columns], sort=False)
+            mean = grouped.transform("mean")
+            stddev = grouped.transform("std")
+        else:
+            mean = pd.Series(values.mean(), index=df.index)
+            stddev = pd.Series(values.std(), index=df.index)
+
+        z_score = (values - mean) / stddev.where(stddev > 0)
+        mask = z_score.abs() > threshold
+
+        result = df.loc[mask].copy()
+        result["_value"] = values[mask]
+        result["mean"] = mean[mask]
+        result["stddev"] = stddev[mask]
+        result["z_score"] = z_score[mask]
+        return result.reset_index(drop=True)
+
+    def detect_anomalies_bulk(self, measurement, metric, threshold=2.0, window="1h",
+                              node_ids=None, pushdown=True):
+        """批量检测一个度量下所有节点的异常点
+
+        pushdown=True时在Flux中按node_id分组计算窗口均值/标准差并直接过滤异常点，
+        只返回异常数据；pushdown=False时取回一个列式结果集后用pandas向量化计算。
+        两种方式都只需一次查询往返，与节点数量无关。
+
+        Args:
+            measurement: 度量名称
+            metric: 指标名称，对应metric标签
+            threshold: 异常阈值（标准差的倍数）
+            window: 时间窗口，如 "1h"
+            node_ids: 限定的节点ID集合（可选，默认检测该度量下所有节点）
+            pushdown: 是否将统计计算下推到InfluxDB
+
+        Returns:
+            异常点DataFrame，包含node_id、_time、_value、mean、stddev、z_score列；
+            查询失败时返回None
+        """
+        if not self.client:
+            if not self.connect():
+                return None
+
+        # 构建基础数据流
+        data_query = f'from(bucket: "{self.bucket}")'
+        data_query += self._build_range_clause(f"-{window}")
+        data_query += f' |> filter(fn: (r) => r._measurement == "{measurement}")'
+        data_query += f' |> filter(fn: (r) => r.metric == "{metric}" and r._field == "value")'
+        if node_ids:
+            data_query += self._build_set_filter("node_id", node_ids)
+
+        try:
+            if not pushdown:
+                tables = self.query_api.query_data_frame(query=data_query)
+                if isinstance(tables, list):
+                    tables = pd.concat(tables, ignore_index=True) if tables else pd.DataFrame()
+                return self.compute_zscore_anomalies(tables, threshold)
+
+            query = f'''data = {data_query}
+  |> group(columns: ["node_id"])
+  |> keep(columns: ["_time", "_value", "node_id"])
+
+stats = join(
+  tables: {{mean: data |> mean(), stddev: data |> stddev()}},
+  on: ["node_id"]
+)
+
+join(tables: {{d: data, s: stats}}, on: ["node_id"])
+  |> map(fn: (r) => ({{r with
+      mean: r._value_mean,
+      stddev: r._value_stddev,
+      z_score: if r._value_stddev > 0.0 then (r._value - r._value_mean) / r._value_stddev else 0.0
+  }}))
+  |> filter(fn: (r) => r.z_score > {float(threshold)} or r.z_score < -{float(threshold)})
+  |> keep(columns: ["_time", "_value", "node_id", "mean", "stddev", "z_score"])'''
+
+            tables = self.query_api.query_data_frame(query=query)
+            if isinstance(tables, list):
+                tables = pd.concat(tables, ignore_index=True) if tables else pd.DataFrame()
+            if tables is None:
+                return pd.DataFrame()
+            return tables.reset_index(drop=True)
+        except Exception as e:
+            logger.error(f"批量检测异常失败: {str(e)}")
+            return None
+
     def delete_metrics(self, measurement=None, node_id=None, start_time=None, end_time=None):
         """删除指标数据
         
@@ -336,53 +832,37 @@ class InfluxDBManager:
                 return 0
         
         try:
-            # 读取CSV文件
-            df = pd.read_csv(csv_file)
-            
-            # 确保时间列是datetime类型
-            df[time_column] = pd.to_datetime(df[time_column])
-            
-            # 默认标签和字段列
-            if tag_columns is None:
-                tag_columns = ['node_id', 'node_type']
-            
-            if field_columns is None:
-                # 除了时间列和标签列以外的所有列都作为字段
-                field_columns = [col for col in df.columns if col != time_column and col not in tag_columns]
-            
-            # 创建Point对象列表
-            points = []
-            for _, row in df.iterrows():
-                point = Point(measurement)
+            # 分块读取CSV文件，逐块编码为行协议并写入
+            total_points = 0
+            for df in pd.read_csv(csv_file, chunksize=DEFAULT_CHUNK_SIZE):
+                # 确保时间列是datetime类型
+                df[time_column] = pd.to_datetime(df[time_column])
                 
-                # 添加标签
-                for tag_col in tag_columns:
-                    if tag_col in row and not pd.isna(row[tag_col]):
-                        point = point.tag(tag_col, str(row[tag_col]))
+                # 默认标签和字段列
+                if tag_columns is None:
+                    tag_columns = ['node_id', 'node_type']
                 
-                # 添加字段
-                for field_col in field_columns:
-                    if field_col in row and not pd.isna(row[field_col]):
-                        # 尝试转换为适当的类型
-                        value = row[field_col]
-                        if isinstance(value, (int, float)):
-                            point = point.field(field_col, value)
-                        elif isinstance(value, str) and value.lower() in ('true', 'false'):
-                            point = point.field(field_col, value.lower() == 'true')
-                        else:
-                            point = point.field(field_col, str(value))
+                if field_columns is None:
+                    # 除了时间列和标签列以外的所有列都作为字段
+                    field_columns = [col for col in df.columns if col != time_column and col not in tag_columns]
                 
-                # 设置时间戳
-                point = point.time(row[time_column])
+                # 字符串形式的布尔值转换为布尔字段
+                for field_col in field_columns:
+                    if df[field_col].dtype == object:
+                        lowered = df[field_col].str.lower()
+                        if lowered.dropna().isin(['true', 'false']).all() and lowered.notna().any():
+                            df[field_col] = lowered.map({'true': True, 'false': False})
                 
-                points.append(point)
-            
-            # 批量写入
-            if points:
-                self.write_api.write(bucket=self.bucket, record=points)
+                total_points += self.write_dataframe(
+                    df,
+                    measurement=measurement,
+                    tag_columns=[col for col in tag_columns if col in df.columns],
+                    field_columns=[col for col in field_columns if col in df.columns],
+                    time_column=time_column
+                )
                 
-            logger.info(f"从CSV导入了 {len(points)} 个数据点到 {measurement}")
-            return len(points)
+            logger.info(f"从CSV导入了 {total_points} 个数据点到 {measurement}")
+            return total_points
         except Exception as e:
             logger.error(f"从CSV导入指标失败: {str(e)}")
             return 0
@@ -0,0 +1,166 @@
+"""
+InfluxDB行协议编码模块
+将DataFrame按列向量化编码为行协议字符串，避免逐行构建Point对象
+"""
+
+import logging
+from typing import Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+# 配置日志
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 与influxdb_client.Point一致的转义规则
+_ESCAPE_MEASUREMENT = str.maketrans({',': r'\,', ' ': r'\ ', '\n': r'\n', '\t': r'\t', '\r': r'\r'})
+_ESCAPE_KEY = str.maketrans({',': r'\,', '=': r'\=', ' ': r'\ ', '\n': r'\n', '\t': r'\t', '\r': r'\r'})
+_ESCAPE_STRING = str.maketrans({'"': r'\"', '\\': r'\\'})
+
+# 默认每批编码的行数
+DEFAULT_CHUNK_SIZE = 50000
+
+
+def _escape_tag_value(value: str) -> str:
+    """转义标签值，以反斜杠结尾时追加空格（与Point一致）"""
+    escaped = value.translate(_ESCAPE_KEY)
+    return escaped + ' ' if escaped.endswith('\\') else escaped
+
+
+def _map_strings(series: pd.Series, func) -> pd.Series:
+    """对字符串列逐个不同取值应用func；Categorical列只处理类别，不逐行计算"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = pd.Index([func(str(value)) for value in series.cat.categories], dtype=object)
+        codes = series.cat.codes.to_numpy()
+        result = np.where(codes >= 0, categories.to_numpy()[np.maximum(codes, 0)], None)
+        return pd.Series(result, index=series.index, dtype=object)
+    return series.map(lambda value: None if pd.isna(value) else func(str(value)))
+
+
+def _encode_timestamps(series: pd.Series) -> np.ndarray:
+    """将时间列转换为纳秒整数（无时区的时间按UTC处理）"""
+    timestamps = pd.to_datetime(series)
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_convert('UTC').dt.tz_localize(None)
+    return timestamps.astype('datetime64[ns]').astype('int64').to_numpy()
+
+
+def _encode_value(value) -> Optional[str]:
+    """编码单个字段值，非有限浮点数返回None"""
+    if isinstance(value, (bool, np.bool_)):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, np.integer)):
+        return f'{value}i'
+    if isinstance(value, (float, np.floating)):
+        if not np.isfinite(value):
+            return None
+        text = str(value)
+        return text[:-2] if text.endswith('.0') else text
+    return '"' + str(value).translate(_ESCAPE_STRING) + '"'
+
+
+def _encode_field(series: pd.Series, key: str) -> pd.Series:
+    """
+    编码一个字段列为 key=value 片段，空值和非有限浮点数为空字符串
+
+    浮点数去掉多余的 .0，整数追加 i，布尔值为 true/false，其余按字符串加引号转义。
+    """
+    prefix = key.translate(_ESCAPE_KEY) + '='
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = np.array([_encode_value(value) for value in series.cat.categories] + [None], dtype=object)
+        encoded = pd.Series(categories[series.cat.codes.to_numpy()], index=series.index, dtype=object)
+        return (prefix + encoded).fillna('')
+    if pd.api.types.is_bool_dtype(series.dtype):
+        values = np.where(series.to_numpy(dtype=bool), 'true', 'false')
+        return pd.Series(prefix + values.astype(object), index=series.index)
+    if pd.api.types.is_integer_dtype(series.dtype) and not series.isna().any():
+        return prefix + series.astype('int64').astype(str) + 'i'
+    if pd.api.types.is_float_dtype(series.dtype):
+        finite = np.isfinite(series.to_numpy(dtype=float, na_value=np.nan))
+        text = series.astype(str).str.replace(r'\.0$', '', regex=True)
+        return (prefix + text).where(finite, '')
+
+    encoded = series.map(lambda value: None if pd.isna(value) else _encode_value(value))
+    return (prefix + encoded).fillna('')
+
+
+def encode_line_protocol(df: pd.DataFrame,
+                         measurement: Optional[str] = None,
+                         measurement_column: Optional[str] = None,
+                         tag_columns: Sequence[str] = (),
+                         field_columns: Sequence[str] = ('value',),
+                         time_column: Optional[str] = 'timestamp') -> List[str]:
+    """
+    将DataFrame按列向量化编码为行协议
+
+    输出与对每行构建influxdb_client.Point后调用to_line_protocol()一致：
+    标签和字段按名称排序，空标签值省略，空字段省略，没有任何字段的行被丢弃。
+
+    Args:
+        df: 数据
+        measurement: 固定的度量名称
+        measurement_column: 从该列读取每行的度量名称（与measurement二选一）
+        tag_columns: 标签列
+        field_columns: 字段列
+        time_column: 时间列，为None时不写时间戳
+
+    Returns:
+        行协议字符串列表
+    """
+    if df.empty:
+        return []
+    if (measurement is None) == (measurement_column is None):
+        raise ValueError("measurement和measurement_column必须且只能提供一个")
+
+    if measurement_column is not None:
+        lines = _map_strings(df[measurement_column], lambda value: value.translate(_ESCAPE_MEASUREMENT))
+    else:
+        lines = pd.Series(measurement.translate(_ESCAPE_MEASUREMENT), index=df.index, dtype=object)
+
+    for tag in sorted(tag_columns):
+        values = _map_strings(df[tag], _escape_tag_value).fillna('')
+        lines = lines + (',' + tag.translate(_ESCAPE_KEY) + '=' + values).where(values != '', '')
+
+    fields = None
+    for field in sorted(field_columns):
+        part = _encode_field(df[field], field)
+        if fields is None:
+            fields = part
+        else:
+            # 任一侧为空时直接拼接即为非空的一侧
+            fields = (fields + ',' + part).where((fields != '') & (part != ''), fields + part)
+    lines = lines + ' ' + fields
+
+    if time_column is not None:
+        lines = lines + ' ' + pd.Series(_encode_timestamps(df[time_column]), index=df.index).astype(str)
+
+    return lines[fields != ''].tolist()
+
+
+def iter_line_protocol_batches(data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+                               batch_size: int = 5000,
+                               chunk_size: int = DEFAULT_CHUNK_SIZE,
+                               **encode_kwargs) -> Iterator[List[str]]:
+    """
+    将一个或多个DataFrame分块编码并按批产出行协议，内存中只保留当前块
+
+    Args:
+        data: DataFrame或DataFrame迭代器
+        batch_size: 每批行数
+        chunk_size: 每次编码的DataFrame行数
+        **encode_kwargs: 传给encode_line_protocol的参数
+
+    Yields:
+        行协议字符串列表
+    """
+    frames = [data] if isinstance(data, pd.DataFrame) else data
+    pending = []
+    for frame in frames:
+        for start in range(0, len(frame), chunk_size):
+            pending.extend(encode_line_protocol(frame.iloc[start:start + chunk_size], **encode_kwargs))
+            while len(pending) >= batch_size:
+                yield pending[:batch_size]
+                pending = pending[batch_size:]
+    if pending:
+        yield pending
@@ -5,99 +5,363 @@
 Neo4j数据库连接器模块
 """
 
+import asyncio
+import atexit
 import logging
-from neo4j import GraphDatabase
-from neo4j.exceptions import ServiceUnavailable
+import re
+import threading
+import weakref
+from collections.abc import Mapping, Sequence, Set
+
+from neo4j import AsyncGraphDatabase, GraphDatabase, RoutingControl
+from neo4j.graph import Node, Path, Relationship
+
+from ..config.settings import GRAPH_DB_CONFIG
 
 logger = logging.getLogger(__name__)
 
+# 含有写操作子句的查询路由到写节点，其余查询路由到读节点
+_WRITE_PATTERN = re.compile(r'\b(CREATE|MERGE|DELETE|SET|REMOVE|DROP|FOREACH|LOAD\s+CSV)\b', re.IGNORECASE)
+
+# 结果转换时无需递归处理的值类型
+_SCALAR_TYPES = (str, int, float, bool, type(None), bytes)
+
+# 共享驱动注册表：同一连接参数的所有连接器共用一个带连接池的驱动
+_drivers = {}
+# 异步驱动按事件循环对象注册（弱引用键，循环被回收时条目随之移除），
+# 每个循环对应一个监视器，循环关闭时负责关闭该循环的驱动
+_async_drivers = weakref.WeakKeyDictionary()
+_loop_watchers = weakref.WeakKeyDictionary()
+_registry_lock = threading.Lock()
+
+
+def _driver_config():
+    """从配置读取连接池参数"""
+    return {
+        "max_connection_pool_size": GRAPH_DB_CONFIG["max_pool_size"],
+        "connection_acquisition_timeout": GRAPH_DB_CONFIG["acquisition_timeout"],
+        "max_connection_lifetime": GRAPH_DB_CONFIG["max_connection_lifetime"]
+    }
+
+
+def get_driver(uri=None, user=None, password=None):
+    """
+    获取共享的同步驱动，首次使用时创建（创建驱动不会建立连接）
+    
+    Args:
+        uri: Neo4j连接URI，默认从配置读取
+        user: 用户名，默认从配置读取
+        password: 密码，默认从配置读取
+        
+    Returns:
+        neo4j.Driver
+    """
+    key = (uri or GRAPH_DB_CONFIG["uri"], user or GRAPH_DB_CONFIG["user"], password or GRAPH_DB_CONFIG["password"])
+    with _registry_lock:
+        driver = _drivers.get(key)
+        if driver is None:
+            driver = _drivers[key] = GraphDatabase.driver(key[0], auth=key[1:], **_driver_config())
+            logger.info(f"已初始化Neo4j驱动: {key[0]}")
+        return driver
+
+
+def get_async_driver(uri=None, user=None, password=None):
+    """
+    获取共享的异步驱动，首次使用时创建
+    
+    异步驱动绑定到创建它的事件循环，因此按事件循环分别注册；
+    事件循环关闭时（asyncio.run结束）自动关闭并移除该循环的驱动。
+    
+    Args:
+        uri: Neo4j连接URI，默认从配置读取
+        user: 用户名，默认从配置读取
+        password: 密码，默认从配置读取
+        
+    Returns:
+        neo4j.AsyncDriver
+    """
+    key = (uri or GRAPH_DB_CONFIG["uri"], user or GRAPH_DB_CONFIG["user"], password or GRAPH_DB_CONFIG["password"])
+    loop = asyncio.get_running_loop()
+    with _registry_lock:
+        drivers = _async_drivers.get(loop)
+        if drivers is None:
+            drivers = _async_drivers[loop] = {}
+            _loop_watchers[loop] = _watch_loop_shutdown(weakref.ref(loop), drivers)
+        driver = drivers.get(key)
+        if driver is None:
+            driver = drivers[key] = AsyncGraphDatabase.driver(key[0], auth=key[1:], **_driver_config())
+            logger.info(f"已初始化Neo4j异步驱动: {key[0]}")
+        return driver
+
+
+async def _close_on_loop_shutdown(loop_ref, drivers):
+    """
+    停在yield处的异步生成器，事件循环在shutdown_asyncgens()中关闭它时执行finally，
+    在循环仍可用时关闭该循环注册的驱动
+    """
+    try:
+        yield
+    finally:
+        with _registry_lock:
+            loop = loop_ref()
+            if loop is not None and _async_drivers.get(loop) is drivers:
+                del _async_drivers[loop]
+            pending = list(drivers.values())
+            drivers.clear()
+        for driver in pending:
+            await driver.close()
+
+
+def _watch_loop_shutdown(loop_ref, drivers):
+    """创建并启动循环关闭监视器
+    
+    第一次迭代异步生成器时事件循环会登记它（用于关闭时清理）；
+    生成器直接运行到yield，不需要调度任务。
+    """
+    watcher = _close_on_loop_shutdown(loop_ref, drivers)
+    try:
+        watcher.__anext__().send(None)
+    except StopIteration:
+        pass
+    return watcher
+
+
+def close_drivers():
+    """关闭注册表中的所有同步驱动（进程退出时自动调用）"""
+    with _registry_lock:
+        drivers = list(_drivers.values())
+        _drivers.clear()
+    for driver in drivers:
+        driver.close()
+
+
+async def close_async_drivers():
+    """关闭当前事件循环注册的所有异步驱动"""
+    loop = asyncio.get_running_loop()
+    with _registry_lock:
+        drivers = _async_drivers.pop(loop, {})
+        pending = list(drivers.values())
+        drivers.clear()
+    for driver in pending:
+        await driver.close()
+
+
+atexit.register(close_drivers)
+
+
+def _to_native(value):
+    """将查询结果中的值转换为Python原生类型（与Record.data()的转换规则一致）"""
+    if isinstance(value, _SCALAR_TYPES):
+        return value
+    if isinstance(value, Node):
+        return {key: _to_native(item) for key, item in value.items()}
+    if isinstance(value, Relationship):
+        return (_to_native(value.start_node), type(value).__name__, _to_native(value.end_node))
+    if isinstance(value, Path):
+        path = [_to_native(value.start_node)]
+        for relationship, node in zip(value.relationships, value.nodes[1:]):
+            path.append(type(relationship).__name__)
+            path.append(_to_native(node))
+        return path
+    if isinstance(value, Mapping):
+        return type(value)((key, _to_native(item)) for key, item in value.items())
+    if isinstance(value, (Sequence, Set)):
+        return type(value)(map(_to_native, value))
+    return value
+
+
+def _records_to_dicts(result):
+    """同步结果转换器：一次取出所有行的值并按列名组装为字典"""
+    keys = result.keys()
+    return [dict(zip(keys, map(_to_native, values))) for values in result.values()]
+
+
+async def _async_records_to_dicts(result):
+    """异步结果转换器"""
+    keys = await result.keys()
+    return [dict(zip(keys, map(_to_native, values))) for values in await result.values()]
+
+
+def _routing(query, access_mode):
+    """确定查询的路由（"read"/"write"，未指定时按查询内容判断）"""
+    if access_mode is None:
+        access_mode = "write" if _WRITE_PATTERN.search(query) else "read"
+    return RoutingControl.WRITE if access_mode == "write" else RoutingControl.READ
+
+
 class Neo4jConnector:
-    """Neo4j数据库连接器类"""
+    """Neo4j数据库连接器类
     
-    def __init__(self, uri, user, password, database=None):
+    连接器本身是轻量对象，底层使用注册表中的共享驱动及其连接池；
+    驱动在第一次执行查询时才建立连接。
+    """
+    
+    def __init__(self, uri=None, user=None, password=None, database=None, enable_label_cache=True):
         """
         初始化Neo4j连接器
         
         Args:
-            uri: Neo4j连接URI
-            user: 用户名
-            password: 密码
+            uri: Neo4j连接URI，默认从配置读取
+            user: 用户名，默认从配置读取
+            password: 密码，默认从配置读取
             database: 数据库名
+            enable_label_cache: 是否缓存节点ID到标签的解析结果
         """
-        self.uri = uri
-        self.user = user
-        self.password = password
+        self.uri = uri or GRAPH_DB_CONFIG["uri"]
+        self.user = user or GRAPH_DB_CONFIG["user"]
+        self.password = password or GRAPH_DB_CONFIG["password"]
         self.database = database
-        self.driver = None
+        self._driver = None
+        self.label_cache = {} if enable_label_cache else None
+    
+    @property
+    def driver(self):
+        """共享的同步驱动"""
+        if self._driver is None:
+            self._driver = get_driver(self.uri, self.user, self.password)
+        return self._driver
+    
+    @driver.setter
+    def driver(self, driver):
+        self._driver = driver
+    
+    @property
+    def async_driver(self):
+        """当前事件循环的共享异步驱动"""
+        return get_async_driver(self.uri, self.user, self.password)
+    
+    def verify_connectivity(self):
+        """
+        测试数据库连接
         
+        Returns:
+            bool: 连接是否可用
+        """
         try:
-            self.driver = GraphDatabase.driver(
-                self.uri, 
-                auth=(self.user, self.password)
-            )
-            logger.info(f"已初始化Neo4j连接: {self.uri}")
-            
-            # 测试连接
-            self._test_connection()
-            
+            self.driver.verify_connectivity()
+            logger.info("Neo4j连接测试成功")
+            return True
         except Exception as e:
-            logger.error(f"连接Neo4j时出错: {str(e)}")
-            raise
-    
-    def _test_connection(self):
-        """测试数据库连接"""
-        try:
-            with self.driver.session(database=self.database) as session:
-                result = session.run("RETURN 1 AS test")
-                record = result.single()
-                assert record["test"] == 1
-                logger.info("Neo4j连接测试成功")
-                
-                # 获取数据库版本
-                version_result = session.run("CALL dbms.components() YIELD name, versions RETURN name, versions")
-                for record in version_result:
-                    if record["name"] == "Neo4j Kernel":
-                        logger.info(f"Neo4j版本: {record['versions'][0]}")
-                        break
-                
-        except ServiceUnavailable as e:
             logger.error(f"Neo4j服务不可用: {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"测试Neo4j连接时出错: {str(e)}")
-            raise
+            return False
     
     def close(self):
-        """关闭Neo4j连接"""
-        if self.driver:
-            self.driver.close()
-            logger.info("Neo4j连接已关闭")
+        """释放连接器对共享驱动的引用（驱动由注册表统一关闭）"""
+        self._driver = None
     
-    def execute_query(self, query, parameters=None, database=None):
+    def execute_query(self, query, parameters=None, database=None, access_mode=None):
         """
         执行Cypher查询
         
+        使用驱动的托管事务执行（连接从连接池获取，瞬时错误自动重试），
+        并按access_mode把查询路由到读节点或写节点。
+        
         Args:
             query: Cypher查询语句
             parameters: 查询参数
             database: 数据库名（覆盖默认值）
+            access_mode: "read" 或 "write"，默认根据查询是否包含写子句判断
             
         Returns:
             list: 查询结果记录列表
         """
-        db = database or self.database
-        
         try:
-            with self.driver.session(database=db) as session:
-                result = session.run(query, parameters or {})
-                return [record.data() for record in result]
-                
+            return self.driver.execute_query(
+                query, parameters or {},
+                routing_=_routing(query, access_mode),
+                database_=database or self.database,
+                result_transformer_=_records_to_dicts
+            )
+        except Exception as e:
+            logger.error(f"执行查询时出错: {str(e)}")
+            logger.error(f"查询: {query}")
+            logger.error(f"参数: {parameters}")
+            raise
+    
+    async def execute_query_async(self, query, parameters=None, database=None, access_mode=None):
+        """
+        异步执行Cypher查询，参数和返回值与execute_query相同
+        """
+        try:
+            return await self.async_driver.execute_query(
+                query, parameters or {},
+                routing_=_routing(query, access_mode),
+                database_=database or self.database,
+                result_transformer_=_async_records_to_dicts
+            )
         except Exception as e:
             logger.error(f"执行查询时出错: {str(e)}")
             logger.error(f"查询: {query}")
             logger.error(f"参数: {parameters}")
             raise
     
+    def cache_node_labels(self, labels_by_id):
+        """
+        写入节点ID到标签的缓存
+        
+        Args:
+            labels_by_id: 节点ID到标签的字典
+        """
+        if self.label_cache is not None:
+            self.label_cache.update(labels_by_id)
+    
+    def clear_label_cache(self):
+        """清空节点标签缓存"""
+        if self.label_cache is not None:
+            self.label_cache.clear()
+    
+    def resolve_node_labels(self, node_ids, labels, database=None):
+        """
+        解析节点ID对应的标签
+        
+        对每个候选标签分别按 (n:Label {id: ...}) 匹配，使每个分支都命中该标签的id唯一约束索引，
+        多个分支以UNION ALL合并为一次查询。
+        
+        Args:
+            node_ids: 节点ID列表
+            labels: 候选标签列表
+            database: 数据库名（覆盖默认值）
+            
+        Returns:
+            dict: 节点ID到标签的字典，无法解析的节点不包含在内
+        """
+        resolved, unresolved = self._cached_labels(node_ids)
+        if unresolved and labels:
+            records = self.execute_query(self._label_query(labels), {"ids": unresolved}, database=database)
+            self._store_labels(resolved, unresolved, records)
+        return resolved
+    
+    async def resolve_node_labels_async(self, node_ids, labels, database=None):
+        """
+        异步解析节点ID对应的标签，参数和返回值与resolve_node_labels相同
+        """
+        resolved, unresolved = self._cached_labels(node_ids)
+        if unresolved and labels:
+            records = await self.execute_query_async(self._label_query(labels), {"ids": unresolved}, database=database)
+            self._store_labels(resolved, unresolved, records)
+        return resolved
+    
+    def _cached_labels(self, node_ids):
+        """从缓存取出已知标签，返回(已解析的字典, 未解析的节点ID列表)"""
+        cache = self.label_cache if self.label_cache is not None else {}
+        resolved = {node_id: cache[node_id] for node_id in node_ids if node_id in cache}
+        unresolved = [node_id for node_id in dict.fromkeys(node_ids) if node_id not in resolved]
+        return resolved, unresolved
+    
+    @staticmethod
+    def _label_query(labels):
+        """构建按候选标签逐一匹配节点ID的UNION ALL查询"""
+        return "\nUNION ALL\n".join(
+            f"UNWIND $ids AS id MATCH (n:`{label}` {{id: id}}) RETURN id, '{label}' AS label"
+            for label in labels
+        )
+    
+    def _store_labels(self, resolved, unresolved, records):
+        """合并标签查询结果并写入缓存"""
+        for record in records:
+            resolved[record["id"]] = record["label"]
+        self.cache_node_labels({node_id: resolved[node_id] for node_id in unresolved if node_id in resolved})
+    
     def execute_write_transaction(self, tx_function, *args, database=None):
         """
         执行写入事务
@@ -3,13 +3,16 @@
 集成图数据和时序数据，提供动态图的查询和分析功能
 """
 
+import asyncio
 import logging
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Union, Any, Tuple
 
 from .graph_data import GraphData
-from ..db.influxdb_client import InfluxDBClient
+from .fleet_health import FleetHealthMonitor
+from .metric_analytics import MetricAnalytics
+from ..db.influxdb_client import InfluxDBManager
 from ..config.settings import NODE_TYPES, INFLUXDB_CONFIG
 
 # 配置日志
@@ -30,16 +33,89 @@ class DynamicGraph:
         self.graph = graph_data or GraphData()
         
         # 初始化时序数据组件
-        self.influxdb = influxdb_client or InfluxDBClient(
+        self.influxdb = influxdb_client or InfluxDBManager(
             url=INFLUXDB_CONFIG["url"],
             token=INFLUXDB_CONFIG["token"],
             org=INFLUXDB_CONFIG["org"],
             bucket=INFLUXDB_CONFIG["bucket"]
         )
         
+        # 节点类型健康状态，在刷新之间保留窗口数据
+        self.fleet_health = FleetHealthMonitor(self.influxdb)
+        
+        # 指标趋势与预测，按节点类型批量查询和计算
+        self.analytics = MetricAnalytics(self.influxdb)
+        
         # 设置日志级别
         self.logger = logging.getLogger(__name__)
     
+    def _query_metrics_by_type(self, node_ids_by_type: Dict[str, set], metrics: List[str] = None,
+                               start_time: str = None, end_time: str = None) -> Dict[str, pd.DataFrame]:
+        """按节点类型批量查询指标数据
+        
+        Args:
+            node_ids_by_type: 节点类型到节点ID集合的映射
+            metrics: 指标名称列表（可选）
+            start_time: 开始时间
+            end_time: 结束时间
+            
+        Returns:
+            节点ID到指标DataFrame的映射
+        """
+        metrics_by_node = {}
+        for node_type, node_ids in node_ids_by_type.items():
+            grouped = self.influxdb.query_metrics_bulk(
+                measurement=self.influxdb.get_measurement(node_type),
+                node_ids=node_ids,
+                metrics=metrics,
+                start_time=start_time,
+                end_time=end_time
+            )
+            if grouped is None:
+                logger.warning(f"批量查询 {node_type} 类型节点的指标失败")
+                continue
+            metrics_by_node.update(grouped)
+            
+        return metrics_by_node
+    
+    @staticmethod
+    def _detect_anomalies_in_frame(df: pd.DataFrame, threshold: float) -> List[Dict]:
+        """基于Z分数检测单个节点指标数据中的异常点
+        
+        Args:
+            df: 节点的指标数据（InfluxDB查询结果格式）
+            threshold: 异常阈值（标准差的倍数）
+            
+        Returns:
+            异常点列表
+        """
+        if df is None or len(df) == 0 or '_value' not in df.columns:
+            return []
+            
+        metric_column = 'metric' if 'metric' in df.columns else '_field'
+        anomalies_df = InfluxDBManager.compute_zscore_anomalies(df, threshold, group_columns=(metric_column,))
+        return DynamicGraph._anomaly_records(anomalies_df, metric_column)
+    
+    @staticmethod
+    def _anomaly_records(anomalies_df: pd.DataFrame, metric_column: str = 'metric', 
+                         metric: str = None) -> List[Dict]:
+        """将异常点DataFrame转换为异常记录列表"""
+        if anomalies_df is None or anomalies_df.empty:
+            return []
+            
+        metrics = anomalies_df[metric_column] if metric_column in anomalies_df.columns else [metric] * len(anomalies_df)
+        return [
+            {
+                'metric': metric_name,
+                'timestamp': timestamp,
+                'value': float(value),
+                'z_score': float(z_score)
+            }
+            for metric_name, timestamp, value, z_score in zip(
+                metrics, anomalies_df['_time'], anomalies_df['_value'], anomalies_df['z_score']
+            )
+        ]
+    
     def get_node_with_metrics(self, node_id: str, start_time: str = None, 
                              end_time: str = None) -> Dict:
         """获取节点及其时序指标数据
@@ -97,30 +173,27 @@ class DynamicGraph:
             logger.warning(f"找不到以 {center_node_id} 为中心的子图")
             return {}
             
-        # 为每个节点添加指标数据
-        nodes_with_metrics = []
+        # 按节点类型分组，每种类型只发起一次（或少量分块）批量查询
+        node_ids_by_type = {}
         for node in subgraph['nodes']:
             node_id = node.get('id')
             node_type = node.get('type')
-            
             if node_id and node_type and node_type.upper() in NODE_TYPES:
-                # 获取该节点的指标数据
-                metrics = self.influxdb.query_metrics(
-                    node_id=node_id,
-                    node_type=node_type,
-                    start_time=start_time,
-                    end_time=end_time
-                )
+                node_ids_by_type.setdefault(node_type, set()).add(node_id)
                 
-                # 复制节点属性并添加指标数据
-                node_with_metrics = dict(node)
-                node_with_metrics['metrics'] = metrics
-                nodes_with_metrics.append(node_with_metrics)
-            else:
-                # 对于没有时序数据的节点，直接添加
-                node_with_metrics = dict(node)
-                node_with_metrics['metrics'] = []
-                nodes_with_metrics.append(node_with_metrics)
+        metrics_by_node = self._query_metrics_by_type(
+            node_ids_by_type,
+            start_time=start_time,
+            end_time=end_time
+        )
+        
+        # 为每个节点添加指标数据
+        nodes_with_metrics = []
+        for node in subgraph['nodes']:
+            # 复制节点属性并添加指标数据，对于没有时序数据的节点置为空列表
+            node_with_metrics = dict(node)
+            node_with_metrics['metrics'] = metrics_by_node.get(node.get('id'), [])
+            nodes_with_metrics.append(node_with_metrics)
         
         # 构建结果
         result = {
@@ -149,20 +222,24 @@ class DynamicGraph:
             logger.warning(f"找不到类型为 {node_type} 的节点")
             return []
             
+        # 在InfluxDB中按节点分组计算窗口统计并过滤异常点，一次往返覆盖该类型的所有节点
+        anomalies_df = self.influxdb.detect_anomalies_bulk(
+            measurement=self.influxdb.get_measurement(node_type),
+            metric=metric,
+            threshold=threshold,
+            window=window
+        )
+        if anomalies_df is None or anomalies_df.empty:
+            return []
+            
+        anomalies_by_node = {
+            node_id: self._anomaly_records(group, metric=metric)
+            for node_id, group in anomalies_df.groupby('node_id', sort=False)
+        }
+        
         anomalous_nodes = []
         for node in nodes:
-            node_id = node.get('id')
-            if not node_id:
-                continue
-                
-            # 检测异常
-            anomalies = self.influxdb.detect_anomalies(
-                node_id=node_id,
-                node_type=node_type,
-                metric=metric,
-                threshold=threshold,
-                window=window
-            )
+            anomalies = anomalies_by_node.get(node.get('id'))
             
             if anomalies:
                 # 复制节点属性并添加异常信息
@@ -232,22 +309,28 @@ class DynamicGraph:
             logger.warning(f"找不到与节点 {node_id} 相关的节点")
             return []
             
-        anomalous_nodes = []
+        # 按节点类型分组后批量查询相关节点的指标数据
+        node_ids_by_type = {}
         for related_node in related_nodes:
             related_id = related_node.get('id')
             related_type = related_node.get('type')
-            
-            if not related_id or not related_type or related_type.upper() not in NODE_TYPES:
+            if related_id and related_type and related_type.upper() in NODE_TYPES:
+                node_ids_by_type.setdefault(related_type, set()).add(related_id)
+                
+        metrics_by_node = self._query_metrics_by_type(
+            node_ids_by_type,
+            metrics=[metric] if metric else None,
+            start_time=f"-{window}"
+        )
+        
+        anomalous_nodes = []
+        for related_node in related_nodes:
+            related_id = related_node.get('id')
+            if related_id not in metrics_by_node:
                 continue
                 
             # 检测异常
-            anomalies = self.influxdb.detect_anomalies(
-                node_id=related_id,
-                node_type=related_type,
-                metric=metric,
-                threshold=threshold,
-                window=window
-            )
+            anomalies = self._detect_anomalies_in_frame(metrics_by_node[related_id], threshold)
             
             if anomalies:
                 # 复制节点属性并添加异常信息
@@ -258,15 +341,26 @@ class DynamicGraph:
         return anomalous_nodes
     
     def analyze_impact_propagation(self, anomalous_node_id: str, 
-                                 max_depth: int = 3) -> Dict:
+                                 max_depth: int = 3, include_paths: bool = True,
+                                 weight_by_severity: bool = False, metric: str = None,
+                                 window: str = "1h", threshold: float = 2.0) -> Dict:
         """分析异常影响传播
         
+        一次获取传播图（下游节点、最短深度和传播前驱），再按深度逐层动态规划
+        计算每个受影响节点的路径数，不再对每个下游节点逐一枚举路径。
+        
         Args:
             anomalous_node_id: 异常节点ID
             max_depth: 最大传播深度
+            include_paths: 是否在本地展开传播路径列表
+            weight_by_severity: 是否按受影响节点的实时指标严重度加权传播
+            metric: 计算严重度使用的指标名称（可选，默认使用所有指标）
+            window: 计算严重度的时间窗口
+            threshold: 严重度归一化阈值（Z分数达到该值时严重度为1）
             
         Returns:
-            影响传播分析结果
+            影响传播分析结果；受影响节点附带depth、predecessors和paths_from_source，
+            加权时另附severity和impact_score
         """
         # 获取节点信息
         anomalous_node = self.graph.get_node_by_id(anomalous_node_id)
@@ -274,8 +368,10 @@ class DynamicGraph:
             logger.warning(f"找不到节点: {anomalous_node_id}")
             return {}
             
-        # 获取下游节点
-        descendants = self.graph.get_node_descendants(anomalous_node_id, max_depth=max_depth)
+        # 获取传播图
+        descendants = self.graph.get_propagation_graph(
+            anomalous_node_id, max_depth=max_depth, node_type=anomalous_node.get('type')
+        )
         if not descendants:
             logger.info(f"节点 {anomalous_node_id} 没有下游节点")
             return {
@@ -284,41 +380,112 @@ class DynamicGraph:
                 'propagation_paths': []
             }
             
-        # 分析每个下游节点
+        predecessors = {node['id']: node['predecessors'] for node in descendants if node.get('id')}
+        severities = self._node_severities(descendants, metric, window, threshold) if weight_by_severity else {}
+        
+        # 按深度逐层传播：第d层的路径数为各前驱在第d-1层的路径数之和（对DAG即简单路径数）
+        path_counts = dict.fromkeys(predecessors, 0)
+        impact_scores = dict.fromkeys(predecessors, 0.0)
+        layer_counts = {anomalous_node_id: 1}
+        layer_scores = {anomalous_node_id: 1.0}
+        for _ in range(max_depth):
+            next_counts, next_scores = {}, {}
+            for node_id, node_predecessors in predecessors.items():
+                count = sum(layer_counts.get(predecessor, 0) for predecessor in node_predecessors)
+                if not count:
+                    continue
+                next_counts[node_id] = count
+                next_scores[node_id] = severities.get(node_id, 1.0) * sum(
+                    layer_scores.get(predecessor, 0.0) for predecessor in node_predecessors
+                )
+                path_counts[node_id] += count
+                impact_scores[node_id] += next_scores[node_id]
+            if not next_counts:
+                break
+            layer_counts, layer_scores = next_counts, next_scores
+            
         impacted_nodes = []
         for descendant in descendants:
             descendant_id = descendant.get('id')
-            descendant_type = descendant.get('type')
-            
-            if not descendant_id or not descendant_type:
+            if not descendant_id or not descendant.get('type'):
                 continue
                 
-            # 获取从异常节点到该节点的路径
-            paths = self.graph.get_path_between_nodes(anomalous_node_id, descendant_id, max_depth)
-            
-            # 添加到受影响节点列表
             impacted_node = dict(descendant)
-            impacted_node['paths_from_source'] = len(paths)
+            impacted_node['paths_from_source'] = path_counts[descendant_id]
+            if weight_by_severity:
+                impacted_node['severity'] = severities.get(descendant_id, 1.0)
+                impacted_node['impact_score'] = impact_scores[descendant_id]
             impacted_nodes.append(impacted_node)
             
-        # 获取传播路径
-        propagation_paths = []
-        for descendant in descendants:
-            descendant_id = descendant.get('id')
-            if not descendant_id:
-                continue
-                
-            paths = self.graph.get_path_between_nodes(anomalous_node_id, descendant_id, max_depth)
-            propagation_paths.extend(paths)
+        if weight_by_severity:
+            impacted_nodes.sort(key=lambda node: node['impact_score'], reverse=True)
             
         result = {
             'source': anomalous_node,
             'impacted_nodes': impacted_nodes,
-            'propagation_paths': propagation_paths
+            'propagation_paths': (
+                self._expand_propagation_paths(anomalous_node_id, predecessors, max_depth)
+                if include_paths else []
+            )
         }
         
         return result
     
+    @staticmethod
+    def _expand_propagation_paths(source_id: str, predecessors: Dict[str, List[str]],
+                                  max_depth: int) -> List[List[str]]:
+        """在本地传播图上展开从源节点出发、长度不超过max_depth的所有简单路径"""
+        successors = {}
+        for node_id, node_predecessors in predecessors.items():
+            for predecessor in node_predecessors:
+                successors.setdefault(predecessor, []).append(node_id)
+                
+        paths = []
+        stack = [[source_id]]
+        while stack:
+            path = stack.pop()
+            if len(path) > max_depth:
+                continue
+            for successor in successors.get(path[-1], []):
+                if successor not in path:
+                    paths.append(path + [successor])
+                    stack.append(path + [successor])
+        return paths
+    
+    def _node_severities(self, nodes: List[Dict], metric: str = None, window: str = "1h",
+                         threshold: float = 2.0) -> Dict[str, float]:
+        """批量计算节点的实时指标严重度
+        
+        严重度为各指标最新值相对窗口均值的Z分数绝对值的最大值除以threshold，截断到[0, 1]；
+        没有指标数据的节点不出现在结果中（按严重度1处理，不衰减传播）。
+        """
+        node_ids_by_type = {}
+        for node in nodes:
+            node_id = node.get('id')
+            node_type = node.get('type')
+            if node_id and node_type and node_type.upper() in NODE_TYPES:
+                node_ids_by_type.setdefault(node_type, set()).add(node_id)
+                
+        metrics_by_node = self._query_metrics_by_type(
+            node_ids_by_type,
+            metrics=[metric] if metric else None,
+            start_time=f"-{window}"
+        )
+        
+        severities = {}
+        for node_id, df in metrics_by_node.items():
+            if df is None or len(df) == 0 or '_value' not in df.columns:
+                continue
+            if '_time' in df.columns:
+                df = df.sort_values('_time')
+            metric_column = 'metric' if 'metric' in df.columns else '_field'
+            grouped = pd.to_numeric(df['_value'], errors='coerce').groupby(df[metric_column], sort=False)
+            stddev = grouped.std()
+            z_scores = ((grouped.last() - grouped.mean()) / stddev.where(stddev > 0)).abs().dropna()
+            severities[node_id] = min(1.0, float(z_scores.max()) / threshold) if len(z_scores) else 0.0
+            
+        return severities
+    
     def correlate_metrics(self, node_id: str, related_node_id: str, 
                         metrics: List[Tuple[str, str]], start_time: str = None, 
                         end_time: str = None) -> Dict:
@@ -487,28 +654,21 @@ class DynamicGraph:
             health_status = dict(node)
             
             if include_metrics:
-                recent_metrics = self.influxdb.query_metrics(
-                    node_id=node_id,
-                    node_type=node_type,
-                    limit=1
-                )
-                if not recent_metrics.empty:
+                # 一次查询取回该节点窗口内所有指标，按指标计算稳健Z分数
+                health_table = self.fleet_health.node_health(node_type, node_id)
+                if health_table is not None and not health_table.empty:
                     # 提取最新的指标值
-                    metrics = recent_metrics.iloc[0].to_dict()
-                    health_status['current_metrics'] = metrics
+                    health_status['current_metrics'] = dict(
+                        zip(health_table['metric'], health_table['value'].tolist())
+                    )
                     
-                    # 检查是否有异常
-                    for metric in NODE_TYPES[node_type.upper()]["metrics"]:
-                        if metric in recent_metrics.columns:
-                            anomalies = self.influxdb.detect_anomalies(
-                                node_id=node_id,
-                                node_type=node_type,
-                                metric=metric
-                            )
-                            if anomalies:
-                                if 'anomalies' not in health_status:
-                                    health_status['anomalies'] = {}
-                                health_status['anomalies'][metric] = anomalies
+                    # 窗口内出现异常点的指标及异常点数
+                    anomalous = health_table.loc[health_table['status'] == 'anomalous']
+                    if not anomalous.empty:
+                        health_status['anomalies'] = dict(
+                            zip(anomalous['metric'], anomalous['anomalies'].astype(int).tolist())
+                        )
+                    health_status['status'] = 'anomalous' if not anomalous.empty else 'normal'
             
             return health_status
         elif node_type:
@@ -527,65 +687,52 @@ class DynamicGraph:
                     'nodes': []
                 }
                 
-            # 检查每个节点的健康状态
-            nodes_health = []
-            anomalous_count = 0
-            
-            for node in nodes:
-                node_id = node.get('id')
-                if not node_id:
-                    continue
-                    
-                node_health = {'id': node_id}
-                
-                if include_metrics:
-                    has_anomaly = False
-                    for metric in NODE_TYPES[node_type.upper()]["metrics"]:
-                        anomalies = self.influxdb.detect_anomalies(
-                            node_id=node_id,
-                            node_type=node_type,
-                            metric=metric
-                        )
-                        if anomalies:
-                            has_anomaly = True
-                            if 'anomalies' not in node_health:
-                                node_health['anomalies'] = {}
-                            node_health['anomalies'][metric] = len(anomalies)
-                            
-                    if has_anomaly:
-                        anomalous_count += 1
-                        node_health['status'] = 'anomalous'
-                    else:
-                        node_health['status'] = 'normal'
-                
-                nodes_health.append(node_health)
-                
             overall_health = {
                 'type': node_type,
                 'count': len(nodes),
-                'anomalous_count': anomalous_count,
-                'normal_count': len(nodes) - anomalous_count,
-                'nodes': nodes_health
+                'nodes': [{'id': node.get('id')} for node in nodes if node.get('id')]
             }
+            if not include_metrics:
+                return overall_health
+                
+            # 一次列式查询取回该类型所有节点、所有已写入指标的窗口数据，按(节点, 指标)计算稳健Z分数
+            health_table = self.fleet_health.refresh(node_type)
+            if health_table is None:
+                return overall_health
+                
+            anomalous = health_table.loc[health_table['status'] == 'anomalous']
+            anomalies_by_node = {
+                node_id: dict(zip(group['metric'], group['anomalies'].astype(int).tolist()))
+                for node_id, group in anomalous.groupby('node_id', sort=False)
+            }
+            for node_health in overall_health['nodes']:
+                anomalies = anomalies_by_node.get(node_health['id'])
+                if anomalies:
+                    node_health['anomalies'] = anomalies
+                node_health['status'] = 'anomalous' if anomalies else 'normal'
+                
+            anomalous_count = sum(1 for node_health in overall_health['nodes'] if node_health['status'] == 'anomalous')
+            overall_health['anomalous_count'] = anomalous_count
+            overall_health['normal_count'] = len(nodes) - anomalous_count
+            overall_health['health_table'] = health_table.to_dict('records')
             
             return overall_health
         else:
             logger.error("必须提供node_id或node_type")
             return {}
     
-    def get_metric_trend(self, node_id: str, metric: str, window: str = "7d") -> Dict:
-        """获取节点指标的趋势分析
-        
-        Args:
-            node_id: 节点ID
-            metric: 指标名称
-            window: 分析时间窗口
-            
-        Returns:
-            趋势分析结果字典
-        """
-        # 获取节点信息
-        node = self.graph.get_node_by_id(node_id)
+    @staticmethod
+    def _node_summary(node: Dict) -> Dict:
+        """构建分析结果中附带的节点信息"""
+        return {
+            "id": node.get("id"),
+            "type": node.get("type"),
+            "level": node.get("level"),
+            "properties": {k: v for k, v in node.items() if k not in ['id', 'type', 'level']}
+        }
+    
+    def _validate_node(self, node_id: str, node: Optional[Dict]) -> Optional[Dict]:
+        """检查节点存在且类型有效，返回错误结果字典；节点有效时返回None"""
         if not node:
             logger.warning(f"找不到节点: {node_id}")
             return {
@@ -593,7 +740,6 @@ class DynamicGraph:
                 "message": f"找不到节点: {node_id}"
             }
             
-        # 获取节点类型
         node_type = node.get('type')
         if not node_type or node_type.upper() not in NODE_TYPES:
             logger.warning(f"节点 {node_id} 没有有效的类型信息")
@@ -601,25 +747,48 @@ class DynamicGraph:
                 "status": "error",
                 "message": f"节点类型无效: {node_type}"
             }
-            
-        # 获取趋势分析
-        trend_analysis = self.influxdb.analyze_trend(
-            node_id=node_id,
-            node_type=node_type,
-            metric=metric,
-            window=window
-        )
+        return None
+    
+    def get_metric_trend(self, node_id: str, metric: str, window: str = "7d") -> Dict:
+        """获取节点指标的趋势分析
         
-        # 如果分析成功，添加节点信息
-        if trend_analysis.get("status") == "success":
-            trend_analysis["node"] = {
-                "id": node_id,
-                "type": node_type,
-                "level": node.get("level"),
-                "properties": {k: v for k, v in node.items() if k not in ['id', 'type', 'level']}
-            }
+        Args:
+            node_id: 节点ID
+            metric: 指标名称
+            window: 分析时间窗口
             
-        return trend_analysis
+        Returns:
+            趋势分析结果字典
+        """
+        return self._analyze_node_trends([node_id], metric, window)[node_id]
+    
+    def _analyze_node_trends(self, node_ids: List[str], metric: str, window: str) -> Dict[str, Dict]:
+        """批量分析多个节点的指标趋势
+        
+        节点信息一次查询获取，指标序列按节点类型各查询一次，趋势拟合对所有序列一次完成。
+        
+        Returns:
+            节点ID到趋势分析结果的映射
+        """
+        nodes = self.graph.get_nodes_by_ids(node_ids)
+        
+        results = {}
+        node_ids_by_type = {}
+        for node_id in node_ids:
+            error = self._validate_node(node_id, nodes.get(node_id))
+            if error:
+                results[node_id] = error
+            else:
+                node_ids_by_type.setdefault(nodes[node_id]['type'], []).append(node_id)
+                
+        trends = self.analytics.analyze_trends(node_ids_by_type, metric, window)
+        for node_id, trend_analysis in trends.items():
+            # 如果分析成功，添加节点信息
+            if trend_analysis.get("status") == "success":
+                trend_analysis["node"] = self._node_summary(nodes[node_id])
+            results[node_id] = trend_analysis
+            
+        return results
     
     def predict_node_metrics(self, node_id: str, metric: str, 
                           prediction_horizon: str = "24h", 
@@ -637,82 +806,54 @@ class DynamicGraph:
         """
         # 获取节点信息
         node = self.graph.get_node_by_id(node_id)
-        if not node:
-            logger.warning(f"找不到节点: {node_id}")
-            return {
-                "status": "error",
-                "message": f"找不到节点: {node_id}"
-            }
-            
-        # 获取节点类型
-        node_type = node.get('type')
-        if not node_type or node_type.upper() not in NODE_TYPES:
-            logger.warning(f"节点 {node_id} 没有有效的类型信息")
-            return {
-                "status": "error",
-                "message": f"节点类型无效: {node_type}"
-            }
+        error = self._validate_node(node_id, node)
+        if error:
+            return error
             
         # 获取预测结果
-        prediction = self.influxdb.predict_metrics(
-            node_id=node_id,
-            node_type=node_type,
+        prediction = self.analytics.forecast(
+            node_type=node['type'],
+            node_ids=[node_id],
             metric=metric,
-            prediction_horizon=prediction_horizon,
-            history_window=history_window
-        )
+            horizon=prediction_horizon,
+            window=history_window
+        )[node_id]
         
         # 如果预测成功，添加节点信息
         if prediction.get("status") == "success":
-            prediction["node"] = {
-                "id": node_id,
-                "type": node_type,
-                "level": node.get("level"),
-                "properties": {k: v for k, v in node.items() if k not in ['id', 'type', 'level']}
-            }
+            prediction["node"] = self._node_summary(node)
             
             # 获取相关节点，了解潜在影响
-            related_nodes = []
-            relations = self.graph.get_node_relationships(node_id, direction="both")
-            
-            for relation in relations:
-                related_id = relation.get("other_id")
-                if related_id:
-                    related_node = self.graph.get_node_by_id(related_id)
-                    if related_node:
-                        related_nodes.append({
-                            "id": related_id,
-                            "type": related_node.get("type"),
-                            "relation": relation.get("rel_type")
-                        })
+            relations = self.graph.get_node_relationships(node_id, direction="both", node_type=node["type"])
+            related_nodes = [{
+                "id": relation["other_id"],
+                "type": relation.get("other_type"),
+                "relation": relation.get("rel_type")
+            } for relation in relations if relation.get("other_id")]
             
             prediction["related_nodes"] = related_nodes
             
             # 如果有异常预测值，分析可能的影响传播
-            predicted_values = [p["predicted_value"] for p in prediction["predictions"]]
-            current_stats = self.influxdb.get_metric_statistics(node_type, metric, f"-{history_window}")
-            
-            if current_stats and "mean" in current_stats and "stddev" in current_stats:
-                mean = current_stats["mean"]
-                stddev = current_stats["stddev"] or 0.1
-                
-                # 检查是否有预测值超出正常范围(均值±2个标准差)
-                anomaly_threshold = 2.0
-                upper_limit = mean + (anomaly_threshold * stddev)
-                lower_limit = mean - (anomaly_threshold * stddev)
-                
-                potential_anomalies = [p for p in prediction["predictions"] 
-                                    if p["predicted_value"] > upper_limit or p["predicted_value"] < lower_limit]
-                
-                if potential_anomalies:
-                    # 如果有潜在异常，分析可能的影响
-                    prediction["potential_anomalies"] = potential_anomalies
-                    prediction["impact_analysis"] = {
-                        "threshold": anomaly_threshold,
-                        "upper_limit": upper_limit,
-                        "lower_limit": lower_limit,
-                        "affected_nodes": self.find_related_anomalies(node_id, metric=metric)
-                    }
+            mean = prediction["statistics"]["mean"]
+            stddev = prediction["statistics"]["stddev"] or 0.1
+            
+            # 检查是否有预测值超出正常范围(均值±2个标准差)
+            anomaly_threshold = 2.0
+            upper_limit = mean + (anomaly_threshold * stddev)
+            lower_limit = mean - (anomaly_threshold * stddev)
+            
+            potential_anomalies = [p for p in prediction["predictions"] 
+                                if p["predicted_value"] > upper_limit or p["predicted_value"] < lower_limit]
+            
+            if potential_anomalies:
+                # 如果有潜在异常，分析可能的影响
+                prediction["potential_anomalies"] = potential_anomalies
+                prediction["impact_analysis"] = {
+                    "threshold": anomaly_threshold,
+                    "upper_limit": upper_limit,
+                    "lower_limit": lower_limit,
+                    "affected_nodes": self.find_related_anomalies(node_id, metric=metric)
+                }
         
         return prediction
     
@@ -727,9 +868,7 @@ class DynamicGraph:
         Returns:
             比较结果字典
         """
-        results = {}
-        for node_id in node_ids:
-            results[node_id] = self.get_metric_trend(node_id, metric, window)
+        results = self._analyze_node_trends(node_ids, metric, window)
             
         # 比较结果分析
         valid_results = {k: v for k, v in results.items() if v.get("status") == "success"}
@@ -774,6 +913,30 @@ class DynamicGraph:
             }
         }
     
+    async def get_neighborhoods_async(self, node_ids: List[str], relationship_type: str = None,
+                                      direction: str = "both") -> Dict[str, Dict]:
+        """并发获取多个节点及其相邻节点
+        
+        节点信息一次查询获取，各节点的相邻节点查询通过异步驱动并发发出。
+        
+        Args:
+            node_ids: 节点ID列表
+            relationship_type: 关系类型（可选）
+            direction: 关系方向
+            
+        Returns:
+            节点ID到 {"node": 节点, "neighbors": 相邻节点列表} 的映射，不存在的节点不包含在结果中
+        """
+        nodes = await self.graph.get_nodes_by_ids_async(node_ids)
+        neighbors = await asyncio.gather(*(
+            self.graph.get_connected_nodes_async(node_id, relationship_type, direction, node_type=node.get('type'))
+            for node_id, node in nodes.items()
+        ))
+        return {
+            node_id: {"node": node, "neighbors": node_neighbors}
+            for (node_id, node), node_neighbors in zip(nodes.items(), neighbors)
+        }
+    
     def __enter__(self):
         """上下文管理器入口"""
         return self
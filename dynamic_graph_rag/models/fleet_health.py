@@ -0,0 +1,239 @@
+"""
+节点类型健康状态模块
+一次列式查询取回某类型全部节点的窗口数据，用NumPy按(节点, 指标)分组计算稳健Z分数，
+并在内存中保留窗口数据，后续刷新只查询和合并新到达的数据点
+"""
+
+import logging
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ..config.settings import FLEET_HEALTH_CONFIG
+
+# 配置日志
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# MAD换算为标准差的系数（正态分布下 sigma ≈ 1.4826 * MAD）
+_MAD_SCALE = 0.6745
+# MAD为0时退回平均绝对偏差，对应的换算系数
+_MEAN_AD_SCALE = 1.253314
+
+HEALTH_TABLE_COLUMNS = ["node_id", "metric", "value", "z_score", "anomalies", "status"]
+
+
+def robust_health_table(node_ids: np.ndarray, metrics: np.ndarray, times: np.ndarray,
+                        values: np.ndarray, threshold: float) -> pd.DataFrame:
+    """按(节点, 指标)分组计算稳健Z分数，生成健康状态表
+
+    Z分数以组内中位数为中心、MAD为尺度（MAD为0时使用平均绝对偏差），
+    窗口内|Z|超过阈值的点计为异常点。
+
+    Args:
+        node_ids: 每个数据点的节点ID
+        metrics: 每个数据点的指标名称
+        times: 每个数据点的时间戳（int64纳秒）
+        values: 每个数据点的值
+        threshold: 稳健Z分数阈值
+
+    Returns:
+        每个(节点, 指标)一行的DataFrame，包含最新值、最新值的Z分数、窗口内异常点数和状态
+    """
+    if len(values) == 0:
+        return pd.DataFrame(columns=HEALTH_TABLE_COLUMNS)
+
+    # 分别编码节点和指标后组合为整数组编码，避免构造元组
+    node_codes, node_uniques = pd.factorize(node_ids)
+    metric_codes, metric_uniques = pd.factorize(metrics)
+    group_codes, groups = pd.factorize(node_codes.astype(np.int64) * len(metric_uniques) + metric_codes)
+
+    # 按组排列数据点（InfluxDB按序列返回时数据已基本有序，稳定排序很快）
+    order = np.argsort(group_codes, kind='stable')
+    group_codes, times, values = group_codes[order], times[order], values[order]
+    counts = np.bincount(group_codes, minlength=len(groups))
+    starts = np.cumsum(counts) - counts
+
+    median = np.repeat(_group_median(values, group_codes, counts, starts), counts)
+    deviations = np.abs(values - median)
+    mad = _group_median(deviations, group_codes, counts, starts)
+    scale = np.repeat(
+        np.where(mad > 0, mad / _MAD_SCALE, np.add.reduceat(deviations, starts) / counts * _MEAN_AD_SCALE),
+        counts
+    )
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_scores = np.where(scale > 0, (values - median) / scale, 0.0)
+    anomalies = np.add.reduceat((np.abs(z_scores) > threshold).astype(np.int64), starts)
+
+    # 每组的最新点：组内时间等于组内最大时间的最后一个位置
+    positions = np.arange(len(values))
+    is_latest = times == np.repeat(np.maximum.reduceat(times, starts), counts)
+    latest = np.maximum.reduceat(np.where(is_latest, positions, -1), starts)
+
+    return pd.DataFrame({
+        "node_id": node_uniques[groups // len(metric_uniques)],
+        "metric": metric_uniques[groups % len(metric_uniques)],
+        "value": values[latest],
+        "z_score": z_scores[latest],
+        "anomalies": anomalies,
+        "status": np.where(anomalies > 0, "anomalous", "normal")
+    })
+
+
+def _group_median(keys: np.ndarray, group_codes: np.ndarray, counts: np.ndarray,
+                  starts: np.ndarray) -> np.ndarray:
+    """计算按组连续排列的数据的组内中位数
+
+    各组点数相同（固定采样间隔的常见情况）时按行排序，否则用全局秩和组编码组合为
+    单个整数键排序。
+    """
+    if (counts == counts[0]).all():
+        sorted_keys = np.sort(keys.reshape(len(counts), counts[0]), axis=1).ravel()
+    else:
+        ranks = np.empty(len(keys), dtype=np.int64)
+        ranks[np.argsort(keys)] = np.arange(len(keys))
+        sorted_keys = keys[np.argsort(group_codes.astype(np.int64) * len(keys) + ranks)]
+    return (sorted_keys[starts + (counts - 1) // 2] + sorted_keys[starts + counts // 2]) / 2
+
+
+class FleetHealthMonitor:
+    """按节点类型维护窗口数据和健康状态表，支持增量刷新"""
+
+    def __init__(self, influxdb, window: Optional[str] = None, threshold: Optional[float] = None):
+        """初始化健康状态监视器
+
+        Args:
+            influxdb: InfluxDBManager实例
+            window: 统计窗口，如 "1h"，默认从配置读取
+            threshold: 稳健Z分数阈值，默认从配置读取
+        """
+        self.influxdb = influxdb
+        self.window = window or FLEET_HEALTH_CONFIG["window"]
+        self.threshold = threshold if threshold is not None else FLEET_HEALTH_CONFIG["threshold"]
+        self._states: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def reset(self, node_type: Optional[str] = None):
+        """丢弃内存中的窗口数据，下次刷新时重新查询完整窗口"""
+        with self._lock:
+            if node_type:
+                self._states.pop(node_type.upper(), None)
+            else:
+                self._states.clear()
+
+    def refresh(self, node_type: str, metrics: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """刷新并返回节点类型的健康状态表
+
+        首次刷新查询完整窗口；之后只查询上次见到的最新时间之后的数据点，合并后丢弃
+        移出窗口的旧点。没有新点且没有点过期时直接返回上次的结果。
+        时间戳早于上次最新时间的迟到数据点不会被补取，需要时可调用reset。
+
+        Args:
+            node_type: 节点类型
+            metrics: 指标名称列表（可选，默认所有指标）
+
+        Returns:
+            健康状态表（见robust_health_table）；查询失败时返回None
+        """
+        key = node_type.upper()
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None and state["metric_filter"] != metrics:
+                state = None
+
+            start_time = f"-{self.window}"
+            if state is not None and state["last_time"] is not None:
+                start_time = pd.Timestamp(state["last_time"], tz="UTC").strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+            points = self.influxdb.query_points(
+                measurement=self.influxdb.get_measurement(node_type),
+                start_time=start_time,
+                metrics=metrics
+            )
+            if points is None:
+                logger.warning(f"查询 {node_type} 类型节点的窗口数据失败")
+                return None
+
+            if state is None:
+                state = {"metric_filter": metrics, "last_time": None, "table": None,
+                         "node_labels": pd.Index([], dtype=object), "metric_labels": pd.Index([], dtype=object),
+                         "node_ids": np.empty(0, dtype=np.int64), "metrics": np.empty(0, dtype=np.int64),
+                         "times": np.empty(0, dtype=np.int64), "values": np.empty(0, dtype=float)}
+                self._states[key] = state
+
+            values = pd.to_numeric(points["_value"], errors="coerce").to_numpy(dtype=float)
+            times = pd.to_datetime(points["_time"], utc=True).to_numpy(dtype="datetime64[ns]").view(np.int64)
+            keep = ~np.isnan(values)
+            if state["last_time"] is not None:
+                keep &= times > state["last_time"]
+            points = points.loc[keep]
+
+            # 节点和指标在窗口数据中以整数编码保存，每次只编码新到达的点
+            new = {
+                "node_ids": self._encode(state, "node_labels", points["node_id"].astype(str)),
+                "metrics": self._encode(state, "metric_labels", points["metric"].astype(str)),
+                "times": times[keep],
+                "values": values[keep]
+            }
+
+            # 合并新点并丢弃移出窗口的旧点
+            cutoff = (pd.Timestamp.now(tz="UTC") - pd.Timedelta(self.window)).value
+            in_window = state["times"] >= cutoff
+            if not len(new["values"]) and in_window.all() and state["table"] is not None:
+                return state["table"]
+
+            for name, column in new.items():
+                state[name] = np.concatenate([state[name][in_window], column])
+            if len(new["times"]):
+                state["last_time"] = int(new["times"].max())
+
+            table = robust_health_table(
+                state["node_ids"], state["metrics"], state["times"], state["values"], self.threshold
+            )
+            table["node_id"] = state["node_labels"][table["node_id"].to_numpy(dtype=np.int64)]
+            table["metric"] = state["metric_labels"][table["metric"].to_numpy(dtype=np.int64)]
+            state["table"] = table
+            logger.info(f"已刷新 {node_type} 类型健康状态: 新增 {len(new['values'])} 个数据点, "
+                        f"窗口内共 {len(state['values'])} 个")
+            return state["table"]
+
+    def node_health(self, node_type: str, node_id: str) -> Optional[pd.DataFrame]:
+        """查询单个节点的窗口数据并返回其健康状态表
+
+        只查询该节点的数据点，不读写类型级的窗口状态。
+
+        Args:
+            node_type: 节点类型
+            node_id: 节点ID
+
+        Returns:
+            该节点每个指标一行的健康状态表（见robust_health_table）；查询失败时返回None
+        """
+        points = self.influxdb.query_points(
+            measurement=self.influxdb.get_measurement(node_type),
+            start_time=f"-{self.window}",
+            node_ids=[node_id]
+        )
+        if points is None:
+            logger.warning(f"查询节点 {node_id} 的窗口数据失败")
+            return None
+
+        values = pd.to_numeric(points["_value"], errors="coerce").to_numpy(dtype=float)
+        times = pd.to_datetime(points["_time"], utc=True).to_numpy(dtype="datetime64[ns]").view(np.int64)
+        keep = ~np.isnan(values)
+        return robust_health_table(
+            points["node_id"].astype(str).to_numpy()[keep], points["metric"].astype(str).to_numpy()[keep],
+            times[keep], values[keep], self.threshold
+        )
+
+    @staticmethod
+    def _encode(state: Dict, labels_key: str, labels: pd.Series) -> np.ndarray:
+        """将标签编码为状态中词表的下标，新标签追加到词表末尾"""
+        vocabulary = state[labels_key]
+        unseen = pd.Index(labels.unique()).difference(vocabulary)
+        if len(unseen):
+            vocabulary = state[labels_key] = vocabulary.append(unseen)
+        return vocabulary.get_indexer(labels)
@@ -4,22 +4,34 @@
 """
 
 import logging
+import re
 from typing import Dict, List, Optional, Union, Any
 from ..db.neo4j_connector import Neo4jConnector
-from ..config.settings import GRAPH_DB_CONFIG
+from ..config.settings import GRAPH_DB_CONFIG, TOPOLOGY_CACHE_CONFIG, NODE_TYPES, EDGE_TYPES
+from .topology_cache import TopologyCache
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 合法的标签/关系类型名称，用于拼接Cypher前校验
+_IDENTIFIER_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
 class GraphData:
-    """图数据模型，提供对Neo4j图数据的查询和分析功能"""
+    """图数据模型，提供对Neo4j图数据的查询和分析功能
     
-    def __init__(self, neo4j_client=None):
+    所有按ID定位节点的查询都带有节点标签，以命中各标签上的id唯一约束索引。
+    调用方可以直接传入node_type；未传入时通过连接器的ID→标签解析缓存获得标签。
+    """
+
+    def __init__(self, neo4j_client=None, use_snapshot: Optional[bool] = None,
+                 snapshot_ttl: Optional[float] = None):
         """初始化图数据模型
         
         Args:
             neo4j_client: 可选的Neo4j客户端实例，如果不提供则创建新实例
+            use_snapshot: 是否启用拓扑快照模式，启用后拓扑查询在本地完成，默认从配置读取
+            snapshot_ttl: 快照有效期（秒），默认从配置读取
         """
         self.client = neo4j_client or Neo4jConnector(
             uri=GRAPH_DB_CONFIG["uri"],
@@ -28,21 +40,144 @@ class GraphData:
             database=GRAPH_DB_CONFIG["database"]
         )
     
-    def get_node_by_id(self, node_id: str) -> Optional[Dict]:
+        if use_snapshot is None:
+            use_snapshot = TOPOLOGY_CACHE_CONFIG["enabled"]
+        self.topology_cache = None
+        if use_snapshot:
+            self.topology_cache = TopologyCache(
+                loader=self._load_topology,
+                ttl=snapshot_ttl if snapshot_ttl is not None else TOPOLOGY_CACHE_CONFIG["ttl"],
+                version_probe=self._probe_topology_version,
+                max_renewals=TOPOLOGY_CACHE_CONFIG["max_renewals"]
+            )
+
+    @staticmethod
+    def _identifier(name: str) -> str:
+        """校验并转义标签或关系类型名称"""
+        if not name or not _IDENTIFIER_PATTERN.match(name):
+            raise ValueError(f"非法的标签或关系类型: {name}")
+        return f"`{name}`"
+
+    @staticmethod
+    def _union_over_labels(template: str) -> str:
+        """按所有已知节点标签展开查询模板，并以UNION ALL合并"""
+        return "\nUNION ALL\n".join(
+            template.format(label=GraphData._identifier(label), label_name=label)
+            for label in NODE_TYPES
+        )
+
+    def _resolve_labels(self, node_ids: List[str]) -> Dict[str, str]:
+        """解析节点ID对应的标签"""
+        return self.client.resolve_node_labels(node_ids, NODE_TYPES)
+
+    def _resolve_label(self, node_id: str, node_type: Optional[str] = None) -> Optional[str]:
+        """获取节点标签，优先使用调用方传入的类型
+
+        Returns:
+            转义后的标签，节点不存在时返回None
+        """
+        if node_type:
+            return self._identifier(node_type)
+        label = self._resolve_labels([node_id]).get(node_id)
+        return self._identifier(label) if label else None
+
+    def _load_topology(self):
+        """从Neo4j加载完整拓扑，用于构建快照
+
+        Returns:
+            (节点列表, 边列表)
+        """
+        nodes_query = self._union_over_labels("""
+        MATCH (n:{label})
+        RETURN properties(n) AS node
+        """)
+        edges_query = self._union_over_labels("""
+        MATCH (a:{label})-[r]->(b)
+        RETURN a.id AS source, b.id AS target, type(r) AS type, properties(r) AS properties
+        """)
+        nodes = [record["node"] for record in self.client.execute_query(nodes_query)]
+        edges = self.client.execute_query(edges_query)
+
+        # 快照中已有全部节点的类型，顺便填充标签缓存
+        self.client.cache_node_labels({node["id"]: node["type"] for node in nodes if node.get("type")})
+        return nodes, edges
+
+    def _probe_topology_version(self):
+        """获取拓扑的轻量指纹（节点数和关系数，均由计数存储直接返回）
+
+        计数不反映属性修改和等量的边重连，由TopologyCache的续期上限兜底
+        """
+        node_count = self.client.execute_query("MATCH (n) RETURN count(n) AS count")[0]["count"]
+        rel_count = self.client.execute_query("MATCH ()-[r]->() RETURN count(r) AS count")[0]["count"]
+        return node_count, rel_count
+
+    def _snapshot(self):
+        """获取拓扑快照，未启用快照模式时返回None"""
+        return self.topology_cache.get() if self.topology_cache else None
+
+    def invalidate_snapshot(self):
+        """使拓扑快照失效，下次查询时重新加载"""
+        if self.topology_cache:
+            self.topology_cache.invalidate()
+
+    def get_node_by_id(self, node_id: str, node_type: Optional[str] = None) -> Optional[Dict]:
         """通过ID获取节点
         
         Args:
             node_id: 节点ID
+            node_type: 可选的节点类型，提供时省去标签解析
             
         Returns:
             节点数据字典或None
         """
-        query = """
-        MATCH (n {id: $id}) 
+        snapshot = self._snapshot()
+        if snapshot:
+            return snapshot.get_node(node_id)
+
+        label = self._resolve_label(node_id, node_type)
+        if not label:
+            return None
+
+        results = self.client.execute_query(self._node_by_id_query(label), {"id": node_id})
+        return results[0]["n"] if results else None
+
+    @staticmethod
+    def _node_by_id_query(label: str) -> str:
+        """构建按ID获取节点的查询"""
+        return f"""
+        MATCH (n:{label} {{id: $id}})
         RETURN n
         """
-        results = self.client.execute_query(query, {"id": node_id})
-        return results[0]["n"] if results else None
+
+    def get_nodes_by_ids(self, node_ids: List[str]) -> Dict[str, Dict]:
+        """一次查询获取多个节点
+
+        Args:
+            node_ids: 节点ID列表
+
+        Returns:
+            节点ID到节点数据字典的映射，不存在的节点不包含在结果中
+        """
+        node_ids = list(dict.fromkeys(node_ids))
+        if not node_ids:
+            return {}
+
+        snapshot = self._snapshot()
+        if snapshot:
+            nodes = (snapshot.get_node(node_id) for node_id in node_ids)
+            return {node["id"]: node for node in nodes if node}
+
+        results = self.client.execute_query(self._nodes_by_ids_query(), {"ids": node_ids})
+        return {record["node"]["id"]: record["node"] for record in results}
+
+    @staticmethod
+    def _nodes_by_ids_query() -> str:
+        """构建按ID批量获取节点的查询"""
+        return GraphData._union_over_labels("""
+        MATCH (n:{label})
+        WHERE n.id IN $ids
+        RETURN properties(n) AS node
+        """)
     
     def get_nodes_by_type(self, node_type: str) -> List[Dict]:
         """获取特定类型的所有节点
@@ -53,13 +188,20 @@ class GraphData:
         Returns:
             节点列表
         """
-        query = """
-        MATCH (n) 
-        WHERE n.type = $type 
+        snapshot = self._snapshot()
+        if snapshot:
+            return snapshot.get_nodes_by_type(node_type)
+
+        results = self.client.execute_query(self._nodes_by_type_query(node_type))
+        return [record["n"] for record in results]
+
+    @staticmethod
+    def _nodes_by_type_query(node_type: str) -> str:
+        """构建按类型获取节点的查询"""
+        return f"""
+        MATCH (n:{GraphData._identifier(node_type)})
         RETURN n
         """
-        results = self.client.execute_query(query, {"type": node_type})
-        return [record["n"] for record in results]
     
     def get_nodes_by_level(self, level: int) -> List[Dict]:
         """获取特定层级的所有节点
@@ -70,103 +212,247 @@ class GraphData:
         Returns:
             节点列表
         """
-        query = """
-        MATCH (n) 
+        query = self._union_over_labels("""
+        MATCH (n:{label})
         WHERE n.level = $level 
         RETURN n
-        """
+        """)
         results = self.client.execute_query(query, {"level": level})
         return [record["n"] for record in results]
     
-    def get_node_relationships(self, node_id: str, direction: str = "both") -> List[Dict]:
+    def get_node_relationships(self, node_id: str, direction: str = "both",
+                               node_type: Optional[str] = None) -> List[Dict]:
         """获取节点的关系
         
         Args:
             node_id: 节点ID
             direction: 关系方向，'in', 'out' 或 'both'
+            node_type: 可选的节点类型，提供时省去标签解析
             
         Returns:
-            关系列表
+            关系列表，每项包含rel_type、other_id、other_type和properties
         """
+        label = self._resolve_label(node_id, node_type)
+        if not label:
+            return []
+
+        return self.client.execute_query(self._relationships_query(label, direction), {"id": node_id})
+
+    @staticmethod
+    def _relationships_query(label: str, direction: str) -> str:
+        """构建节点关系查询"""
         if direction == "out":
-            query = """
-            MATCH (n {id: $id})-[r]->() 
-            RETURN r
-            """
+            pattern = "-[r]->"
         elif direction == "in":
-            query = """
-            MATCH (n {id: $id})<-[r]-() 
-            RETURN r
-            """
+            pattern = "<-[r]-"
         else:
-            query = """
-            MATCH (n {id: $id})-[r]-() 
-            RETURN r
-            """
-        results = self.client.execute_query(query, {"id": node_id})
-        return [record["r"] for record in results]
+            pattern = "-[r]-"
+
+        return f"""
+        MATCH (n:{label} {{id: $id}}){pattern}(m)
+        RETURN type(r) AS rel_type, m.id AS other_id, m.type AS other_type, properties(r) AS properties
+        """
     
     def get_connected_nodes(self, node_id: str, relationship_type: Optional[str] = None, 
-                          direction: str = "out") -> List[Dict]:
+                          direction: str = "out", node_type: Optional[str] = None) -> List[Dict]:
         """获取与指定节点相连的节点
         
         Args:
             node_id: 源节点ID
             relationship_type: 可选的关系类型
             direction: 关系方向，'in', 'out' 或 'both'
+            node_type: 可选的源节点类型，提供时省去标签解析
             
         Returns:
             节点列表
         """
+        snapshot = self._snapshot()
+        if snapshot:
+            return snapshot.neighbors(node_id, relationship_type, direction)
+            
+        label = self._resolve_label(node_id, node_type)
+        if not label:
+            return []
+            
+        query = self._connected_nodes_query(label, relationship_type, direction)
+        results = self.client.execute_query(query, {"nodeId": node_id})
+        return [record["b"] for record in results]
+    
+    @staticmethod
+    def _connected_nodes_query(label: str, relationship_type: Optional[str], direction: str) -> str:
+        """构建相连节点查询"""
+        relationship_clause = ""
+        if relationship_type:
+            relationship_clause = f":{GraphData._identifier(relationship_type)}"
+
         direction_clause = ""
         if direction == "out":
-            direction_clause = "-[r]->"
+            direction_clause = f"-[r{relationship_clause}]->"
         elif direction == "in":
-            direction_clause = "<-[r]-"
+            direction_clause = f"<-[r{relationship_clause}]-"
         else:
-            direction_clause = "-[r]-"
-            
-        relationship_clause = ""
-        if relationship_type:
-            relationship_clause = f":{relationship_type}"
-            
-        query = f"""
-        MATCH (a {{id: $nodeId}}){direction_clause}(b)
-        WHERE type(r){relationship_clause}
+            direction_clause = f"-[r{relationship_clause}]-"
+
+        return f"""
+        MATCH (a:{label} {{id: $nodeId}}){direction_clause}(b)
         RETURN b
         """
+
+    def get_node_descendants(self, node_id: str, max_depth: int = 3,
+                             node_type: Optional[str] = None) -> List[Dict]:
+        """沿出边获取节点的下游节点
+
+        Args:
+            node_id: 起始节点ID
+            max_depth: 最大遍历深度
+            node_type: 可选的起始节点类型，提供时省去标签解析
+
+        Returns:
+            下游节点列表，每个节点附带到起始节点的最短深度depth
+        """
+        snapshot = self._snapshot()
+        if snapshot:
+            return snapshot.descendants(node_id, max_depth)
+
+        label = self._resolve_label(node_id, node_type)
+        if not label:
+            return []
+
+        results = self.client.execute_query(self._descendants_query(label, max_depth), {"nodeId": node_id})
+        return [dict(record["b"], depth=record["depth"]) for record in results]
+
+    @staticmethod
+    def _descendants_query(label: str, max_depth: int) -> str:
+        """构建下游节点查询"""
+        return f"""
+        MATCH path = (a:{label} {{id: $nodeId}})-[*1..{int(max_depth)}]->(b)
+        WITH b, min(length(path)) AS depth
+        RETURN b, depth
+        ORDER BY depth
+        """
+
+    def get_propagation_graph(self, node_id: str, max_depth: int = 3,
+                              node_type: Optional[str] = None) -> List[Dict]:
+        """获取影响传播图：下游节点、最短深度及传播前驱，一次查询往返
+
+        Args:
+            node_id: 起始节点ID
+            max_depth: 最大传播深度
+            node_type: 可选的起始节点类型，提供时省去标签解析
+
+        Returns:
+            下游节点列表，每个节点附带depth和predecessors（在max_depth-1步内可达、
+            且有出边指向该节点的节点ID，含起点），按深度排序
+        """
+        snapshot = self._snapshot()
+        if snapshot:
+            return snapshot.propagation_graph(node_id, max_depth)
+
+        label = self._resolve_label(node_id, node_type)
+        if not label:
+            return []
+
+        max_depth = int(max_depth)
+        query = f"""
+        MATCH path = (a:{label} {{id: $nodeId}})-[*1..{max_depth}]->(b)
+        WHERE b <> a
+        WITH a, b, min(length(path)) AS depth
+        WITH a, collect({{node: b, depth: depth}}) AS reached
+        WITH reached, [a] + [r IN reached WHERE r.depth < {max_depth} | r.node] AS scope
+        UNWIND reached AS r
+        WITH r.node AS b, r.depth AS depth, scope
+        OPTIONAL MATCH (u)-->(b)
+        WHERE u IN scope
+        RETURN properties(b) AS node, depth, collect(DISTINCT u.id) AS predecessors
+        ORDER BY depth
+        """
         results = self.client.execute_query(query, {"nodeId": node_id})
-        return [record["b"] for record in results]
-    
-    def find_subgraph(self, node_id: str, depth: int = 1) -> Dict:
+        return [
+            dict(record["node"], depth=record["depth"], predecessors=record["predecessors"])
+            for record in results
+        ]
+
+    def get_path_between_nodes(self, source_id: str, target_id: str, max_depth: int = 3,
+                               source_type: Optional[str] = None,
+                               target_type: Optional[str] = None) -> List[List[str]]:
+        """获取两个节点之间沿出边方向的所有路径
+
+        Args:
+            source_id: 源节点ID
+            target_id: 目标节点ID
+            max_depth: 最大路径长度
+            source_type: 可选的源节点类型
+            target_type: 可选的目标节点类型
+
+        Returns:
+            路径列表，每条路径为节点ID列表
+        """
+        snapshot = self._snapshot()
+        if snapshot:
+            return snapshot.paths(source_id, target_id, max_depth)
+
+        unresolved = [node_id for node_id, node_type in ((source_id, source_type), (target_id, target_type))
+                      if not node_type]
+        resolved = self._resolve_labels(unresolved) if unresolved else {}
+        source_type = source_type or resolved.get(source_id)
+        target_type = target_type or resolved.get(target_id)
+        if not source_type or not target_type:
+            return []
+
+        query = f"""
+        MATCH path = (a:{self._identifier(source_type)} {{id: $sourceId}})-[*1..{int(max_depth)}]->(b:{self._identifier(target_type)} {{id: $targetId}})
+        RETURN [n IN nodes(path) | n.id] AS path
+        """
+        results = self.client.execute_query(query, {"sourceId": source_id, "targetId": target_id})
+        return [record["path"] for record in results]
+
+    def find_subgraph(self, node_id: str, depth: int = 1, node_type: Optional[str] = None) -> Dict:
         """查找以节点为中心的子图
         
         Args:
             node_id: 中心节点ID
             depth: 遍历深度
+            node_type: 可选的中心节点类型，提供时省去标签解析
             
         Returns:
             子图数据（包含节点和边）
         """
+        snapshot = self._snapshot()
+        if snapshot:
+            return snapshot.subgraph(node_id, depth)
+
+        label = self._resolve_label(node_id, node_type)
+        if not label:
+            return {"nodes": [], "relationships": []}
+
         query = f"""
-        MATCH path = (n {{id: $nodeId}})-[*0..{depth}]-(related)
-        RETURN path
+        MATCH path = (n:{label} {{id: $nodeId}})-[*0..{int(depth)}]-(related)
+        WITH collect(path) AS paths
+        RETURN
+            [node IN reduce(acc = [], p IN paths | acc + nodes(p)) | properties(node)] AS nodes,
+            [rel IN reduce(acc = [], p IN paths | acc + relationships(p)) | {{
+                source: startNode(rel).id,
+                target: endNode(rel).id,
+                type: type(rel),
+                properties: properties(rel)
+            }}] AS relationships
         """
         results = self.client.execute_query(query, {"nodeId": node_id})
+        if not results:
+            return {"nodes": [], "relationships": []}
         
-        nodes = set()
-        relationships = set()
+        # 路径之间存在重复的节点和边，按标识去重
+        nodes = {}
+        for node in results[0]["nodes"]:
+            nodes.setdefault(node.get("id"), node)
         
-        for record in results:
-            path = record["path"]
-            for node in path.nodes:
-                nodes.add(node)
-            for rel in path.relationships:
-                relationships.add(rel)
+        relationships = {}
+        for rel in results[0]["relationships"]:
+            relationships.setdefault((rel["source"], rel["target"], rel["type"]), rel)
         
         return {
-            "nodes": list(nodes),
-            "relationships": list(relationships)
+            "nodes": list(nodes.values()),
+            "relationships": list(relationships.values())
         }
     
     def get_graph_statistics(self) -> Dict:
@@ -177,20 +463,108 @@ class GraphData:
         """
         stats = {}
         
-        # 获取节点统计
-        node_stats_query = """
-        MATCH (n)
-        RETURN n.type as type, count(*) as count
-        """
+        # 获取节点统计（按标签计数，由计数存储直接返回）
+        node_stats_query = self._union_over_labels("""
+        MATCH (n:{label})
+        RETURN '{label_name}' as type, count(n) as count
+        """)
         results = self.client.execute_query(node_stats_query)
-        stats["nodes"] = {record["type"]: record["count"] for record in results}
-        
-        # 获取关系统计
-        rel_stats_query = """
-        MATCH ()-[r]->()
-        RETURN type(r) as type, count(*) as count
+        stats["nodes"] = {record["type"]: record["count"] for record in results if record["count"]}
+
+        # 获取关系统计（按关系类型计数，由计数存储直接返回）
+        rel_stats_query = "\nUNION ALL\n".join(
+            f"""
+        MATCH ()-[r:{self._identifier(edge_type)}]->()
+        RETURN '{edge_type}' as type, count(r) as count
         """
+            for edge_type in EDGE_TYPES
+        )
         results = self.client.execute_query(rel_stats_query)
-        stats["relationships"] = {record["type"]: record["count"] for record in results}
+        stats["relationships"] = {record["type"]: record["count"] for record in results if record["count"]}
         
-        return stats 
\ No newline at end of file
+        return stats 
+
+    # 异步查询：结果与同名同步方法相同，通过连接器的共享异步驱动执行，
+    # 可以用asyncio.gather并发发出多个查询
+
+    async def _resolve_label_async(self, node_id: str, node_type: Optional[str] = None) -> Optional[str]:
+        """异步获取节点标签，优先使用调用方传入的类型"""
+        if node_type:
+            return self._identifier(node_type)
+        labels = await self.client.resolve_node_labels_async([node_id], NODE_TYPES)
+        label = labels.get(node_id)
+        return self._identifier(label) if label else None
+
+    async def get_node_by_id_async(self, node_id: str, node_type: Optional[str] = None) -> Optional[Dict]:
+        """通过ID获取节点（异步）"""
+        snapshot = self._snapshot()
+        if snapshot:
+            return snapshot.get_node(node_id)
+
+        label = await self._resolve_label_async(node_id, node_type)
+        if not label:
+            return None
+
+        results = await self.client.execute_query_async(self._node_by_id_query(label), {"id": node_id})
+        return results[0]["n"] if results else None
+
+    async def get_nodes_by_ids_async(self, node_ids: List[str]) -> Dict[str, Dict]:
+        """一次查询获取多个节点（异步）"""
+        node_ids = list(dict.fromkeys(node_ids))
+        if not node_ids:
+            return {}
+
+        snapshot = self._snapshot()
+        if snapshot:
+            nodes = (snapshot.get_node(node_id) for node_id in node_ids)
+            return {node["id"]: node for node in nodes if node}
+
+        results = await self.client.execute_query_async(self._nodes_by_ids_query(), {"ids": node_ids})
+        return {record["node"]["id"]: record["node"] for record in results}
+
+    async def get_nodes_by_type_async(self, node_type: str) -> List[Dict]:
+        """获取特定类型的所有节点（异步）"""
+        snapshot = self._snapshot()
+        if snapshot:
+            return snapshot.get_nodes_by_type(node_type)
+
+        results = await self.client.execute_query_async(self._nodes_by_type_query(node_type))
+        return [record["n"] for record in results]
+
+    async def get_node_relationships_async(self, node_id: str, direction: str = "both",
+                                           node_type: Optional[str] = None) -> List[Dict]:
+        """获取节点的关系（异步）"""
+        label = await self._resolve_label_async(node_id, node_type)
+        if not label:
+            return []
+
+        return await self.client.execute_query_async(self._relationships_query(label, direction), {"id": node_id})
+
+    async def get_connected_nodes_async(self, node_id: str, relationship_type: Optional[str] = None,
+                                        direction: str = "out", node_type: Optional[str] = None) -> List[Dict]:
+        """获取与指定节点相连的节点（异步）"""
+        snapshot = self._snapshot()
+        if snapshot:
+            return snapshot.neighbors(node_id, relationship_type, direction)
+
+        label = await self._resolve_label_async(node_id, node_type)
+        if not label:
+            return []
+
+        query = self._connected_nodes_query(label, relationship_type, direction)
+        results = await self.client.execute_query_async(query, {"nodeId": node_id})
+        return [record["b"] for record in results]
+
+    async def get_node_descendants_async(self, node_id: str, max_depth: int = 3,
+                                         node_type: Optional[str] = None) -> List[Dict]:
+        """沿出边获取节点的下游节点（异步）"""
+        snapshot = self._snapshot()
+        if snapshot:
+            return snapshot.descendants(node_id, max_depth)
+
+        label = await self._resolve_label_async(node_id, node_type)
+        if not label:
+            return []
+
+        results = await self.client.execute_query_async(self._descendants_query(label, max_depth), {"nodeId": node_id})
+        return [dict(record["b"], depth=record["depth"]) for record in results]
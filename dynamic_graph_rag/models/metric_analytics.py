@@ -0,0 +1,354 @@
+"""
+指标趋势与预测分析模块
+一次查询取回多个节点的指标序列并对齐为矩阵，按行批量拟合线性趋势和R²，
+并对所有序列同时做季节朴素/Holt-Winters预测
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..config.settings import METRIC_ANALYTICS_CONFIG
+
+# 配置日志
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 预测区间对应的正态分位数（95%）
+_INTERVAL_Z = 1.96
+
+
+def build_series_matrix(series_keys: Iterable, times: np.ndarray, values: np.ndarray,
+                        step: pd.Timedelta) -> Tuple[pd.Index, pd.DatetimeIndex, np.ndarray]:
+    """将数据点按序列和时间步对齐为矩阵
+
+    时间步内的多个点取均值，没有数据的时间步为NaN。
+
+    Args:
+        series_keys: 每个数据点所属的序列（如节点ID）
+        times: 每个数据点的时间戳（int64纳秒）
+        values: 每个数据点的值
+        step: 时间步长
+
+    Returns:
+        (序列标签, 各时间步的起点, 形状为(序列数, 时间步数)的矩阵)
+    """
+    codes, labels = pd.factorize(np.asarray(series_keys))
+    if len(values) == 0:
+        return pd.Index(labels), pd.DatetimeIndex([], tz="UTC"), np.empty((0, 0))
+
+    step_ns = step.value
+    origin = times.min() // step_ns * step_ns
+    columns = (times - origin) // step_ns
+    n_steps = int(columns.max()) + 1
+
+    flat = codes.astype(np.int64) * n_steps + columns
+    size = len(labels) * n_steps
+    sums = np.bincount(flat, weights=values, minlength=size)
+    counts = np.bincount(flat, minlength=size)
+    with np.errstate(invalid='ignore'):
+        matrix = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan).reshape(len(labels), n_steps)
+
+    grid = pd.to_datetime(origin + np.arange(n_steps, dtype=np.int64) * step_ns, utc=True)
+    return pd.Index(labels), grid, matrix
+
+
+def fit_trends(matrix: np.ndarray) -> Dict[str, np.ndarray]:
+    """对矩阵的每一行拟合线性趋势 y = intercept + slope * t
+
+    缺失值不参与拟合。所有序列的正规方程堆叠为(序列数, 2, 2)的数组一次求解。
+
+    Args:
+        matrix: 形状为(序列数, 时间步数)的矩阵，缺失值为NaN
+
+    Returns:
+        各序列的slope（每时间步）、intercept、r_squared、start_value、end_value、
+        relative_change、mean、stddev、points数组，以及标记数据点是否足够的valid数组
+    """
+    n_series, n_steps = matrix.shape
+    x = np.arange(n_steps, dtype=float)
+    observed = ~np.isnan(matrix)
+    weights = observed.astype(float)
+    y = np.where(observed, matrix, 0.0)
+
+    n = weights.sum(axis=1)
+    sum_x = weights @ x
+    sum_xx = weights @ (x * x)
+    sum_y = y.sum(axis=1)
+    sum_xy = y @ x
+
+    normal = np.empty((n_series, 2, 2))
+    normal[:, 0, 0], normal[:, 0, 1], normal[:, 1, 0], normal[:, 1, 1] = n, sum_x, sum_x, sum_xx
+    rhs = np.stack([sum_y, sum_xy], axis=1)
+
+    # 少于两个不同时间点的序列无法拟合，用单位矩阵占位
+    valid = n * sum_xx - sum_x * sum_x > 0
+    normal[~valid] = np.eye(2)
+    rhs[~valid] = 0.0
+    intercept, slope = np.linalg.solve(normal, rhs[..., None])[..., 0].T
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(n > 0, sum_y / n, np.nan)
+        centered = np.where(observed, matrix - mean[:, None], 0.0)
+        residuals = np.where(observed, matrix - (intercept[:, None] + slope[:, None] * x), 0.0)
+        ss_tot = (centered ** 2).sum(axis=1)
+        ss_res = (residuals ** 2).sum(axis=1)
+        r_squared = np.where(valid & (ss_tot > 0), 1 - ss_res / ss_tot, 0.0)
+
+        first = observed.argmax(axis=1)
+        last = n_steps - 1 - observed[:, ::-1].argmax(axis=1)
+        start_value = intercept + slope * first
+        end_value = intercept + slope * last
+        relative_change = np.where(start_value != 0, (end_value - start_value) / np.abs(start_value), 0.0)
+
+    return {
+        "slope": slope,
+        "intercept": intercept,
+        "r_squared": r_squared,
+        "start_value": start_value,
+        "end_value": end_value,
+        "relative_change": np.where(valid, relative_change, 0.0),
+        "mean": mean,
+        "stddev": np.sqrt(np.where(n > 0, ss_tot / np.maximum(n, 1), np.nan)),
+        "residual_std": np.sqrt(np.where(n > 2, ss_res / np.maximum(n - 2, 1), 0.0)),
+        "points": n.astype(int),
+        "valid": valid
+    }
+
+
+def _fill_gaps(matrix: np.ndarray) -> np.ndarray:
+    """按行前向填充缺失值，序列开头的缺失值用第一个观测值填充"""
+    n_series, n_steps = matrix.shape
+    observed = ~np.isnan(matrix)
+    rows = np.arange(n_series)[:, None]
+
+    last_seen = np.where(observed, np.arange(n_steps), 0)
+    np.maximum.accumulate(last_seen, axis=1, out=last_seen)
+    filled = matrix[rows, last_seen]
+
+    first = observed.argmax(axis=1)
+    leading = np.arange(n_steps) < first[:, None]
+    return np.where(leading, matrix[np.arange(n_series), first][:, None], filled)
+
+
+def forecast_series(matrix: np.ndarray, horizon: int, season_length: int, alpha: float = 0.3,
+                    beta: float = 0.05, gamma: float = 0.2) -> Tuple[np.ndarray, np.ndarray, str]:
+    """对矩阵的所有行同时做预测
+
+    历史长度至少两个季节周期时使用加法Holt-Winters，至少一个周期时使用季节朴素预测，
+    否则按线性趋势外推。平滑递推沿时间轴进行，每一步对所有序列向量化计算。
+
+    Args:
+        matrix: 形状为(序列数, 时间步数)的矩阵，缺失值为NaN
+        horizon: 预测的时间步数
+        season_length: 季节周期包含的时间步数
+        alpha: 水平平滑系数
+        beta: 趋势平滑系数
+        gamma: 季节平滑系数
+
+    Returns:
+        (形状为(序列数, horizon)的预测值, 各序列的一步预测残差标准差, 使用的方法名)
+    """
+    n_series, n_steps = matrix.shape
+    steps = np.arange(1, horizon + 1)
+
+    if season_length < 2 or n_steps <= season_length:
+        fit = fit_trends(matrix)
+        predictions = fit["intercept"][:, None] + fit["slope"][:, None] * (n_steps - 1 + steps)
+        return predictions, fit["residual_std"], "linear"
+
+    y = _fill_gaps(matrix)
+    m = season_length
+
+    if n_steps < 2 * m:
+        predictions = y[:, n_steps - m + (steps - 1) % m]
+        residual_std = np.std(y[:, m:] - y[:, :-m], axis=1)
+        return predictions, residual_std, "seasonal_naive"
+
+    # 用前两个周期的均值初始化趋势，季节分量从第一个周期去除趋势后得到
+    first_mean = y[:, :m].mean(axis=1)
+    trend = (y[:, m:2 * m].mean(axis=1) - first_mean) / m
+    offsets = np.arange(m) - (m - 1) / 2
+    seasonal = y[:, :m] - (first_mean[:, None] + trend[:, None] * offsets)
+    level = first_mean + trend * (m - 1) / 2
+    errors = np.empty((n_series, n_steps - m))
+
+    for t in range(m, n_steps):
+        season = seasonal[:, t % m]
+        errors[:, t - m] = y[:, t] - (level + trend + season)
+        new_level = alpha * (y[:, t] - season) + (1 - alpha) * (level + trend)
+        trend = beta * (new_level - level) + (1 - beta) * trend
+        seasonal[:, t % m] = gamma * (y[:, t] - new_level) + (1 - gamma) * season
+        level = new_level
+
+    predictions = level[:, None] + trend[:, None] * steps + seasonal[:, (n_steps - 1 + steps) % m]
+    return predictions, errors.std(axis=1), "holt_winters"
+
+
+def classify_trend(relative_change: float, r_squared: float, stable_change: float) -> Tuple[str, str]:
+    """根据相对变化和拟合优度判断趋势方向和强度"""
+    if relative_change > stable_change:
+        trend = "increasing"
+    elif relative_change < -stable_change:
+        trend = "decreasing"
+    else:
+        trend = "stable"
+
+    if r_squared >= 0.7:
+        strength = "strong"
+    elif r_squared >= 0.3:
+        strength = "moderate"
+    else:
+        strength = "weak"
+    return trend, strength
+
+
+class MetricAnalytics:
+    """批量计算节点指标的趋势和预测"""
+
+    def __init__(self, influxdb, interval: Optional[str] = None, season: Optional[str] = None):
+        """初始化分析器
+
+        Args:
+            influxdb: InfluxDBManager实例
+            interval: 序列对齐的时间步长，如 "1h"，默认从配置读取
+            season: 季节周期，如 "1d"，默认从配置读取
+        """
+        self.influxdb = influxdb
+        self.interval = interval or METRIC_ANALYTICS_CONFIG["interval"]
+        self.season = season or METRIC_ANALYTICS_CONFIG["season"]
+
+    def load_series(self, node_type: str, node_ids: List[str], metric: str,
+                    window: str) -> Optional[Tuple[pd.Index, pd.DatetimeIndex, np.ndarray]]:
+        """一次查询取回一种类型多个节点的指标序列并对齐为矩阵
+
+        查询按时间步长选择数据层级，启用汇总层级时长窗口直接读取汇总数据。
+
+        Returns:
+            build_series_matrix的结果；查询失败时返回None
+        """
+        points = self.influxdb.query_points(
+            measurement=self.influxdb.get_measurement(node_type),
+            start_time=f"-{window}",
+            metrics=[metric],
+            node_ids=node_ids,
+            interval=self.interval
+        )
+        if points is None:
+            logger.warning(f"查询 {node_type} 类型节点的 {metric} 序列失败")
+            return None
+
+        values = pd.to_numeric(points["_value"], errors="coerce").to_numpy(dtype=float)
+        times = pd.to_datetime(points["_time"], utc=True).to_numpy(dtype="datetime64[ns]").view(np.int64)
+        keep = ~np.isnan(values)
+        return build_series_matrix(points["node_id"].astype(str).to_numpy()[keep], times[keep], values[keep],
+                                   pd.Timedelta(self.interval))
+
+    def analyze_trends(self, node_ids_by_type: Dict[str, List[str]], metric: str,
+                       window: str = "7d") -> Dict[str, Dict]:
+        """批量分析多个节点指标的线性趋势
+
+        每种节点类型一次查询，所有序列的拟合在一次矩阵求解中完成。
+
+        Args:
+            node_ids_by_type: 节点类型到节点ID列表的映射
+            metric: 指标名称
+            window: 分析时间窗口
+
+        Returns:
+            节点ID到趋势分析结果的映射，没有足够数据的节点status为error
+        """
+        step_hours = pd.Timedelta(self.interval) / pd.Timedelta(hours=1)
+        stable_change = METRIC_ANALYTICS_CONFIG["stable_change"]
+
+        results = {}
+        for node_type, node_ids in node_ids_by_type.items():
+            loaded = self.load_series(node_type, node_ids, metric, window)
+            if loaded is None:
+                results.update({node_id: {"status": "error", "message": "查询指标数据失败"} for node_id in node_ids})
+                continue
+
+            labels, grid, matrix = loaded
+            fit = fit_trends(matrix) if len(labels) else None
+            for i, node_id in enumerate(labels):
+                if not fit["valid"][i]:
+                    continue
+                trend, strength = classify_trend(fit["relative_change"][i], fit["r_squared"][i], stable_change)
+                results[node_id] = {
+                    "status": "success",
+                    "metric": metric,
+                    "window": window,
+                    "interval": self.interval,
+                    "points": int(fit["points"][i]),
+                    "trend": trend,
+                    "strength": strength,
+                    "slope": float(fit["slope"][i] / step_hours),  # 每小时的变化量
+                    "r_squared": float(fit["r_squared"][i]),
+                    "relative_change": float(fit["relative_change"][i]),
+                    "start_value": float(fit["start_value"][i]),
+                    "end_value": float(fit["end_value"][i]),
+                    "mean": float(fit["mean"][i]),
+                    "stddev": float(fit["stddev"][i])
+                }
+
+            for node_id in node_ids:
+                results.setdefault(node_id, {"status": "error", "message": f"节点 {node_id} 在 {window} 内的 {metric} 数据点不足"})
+
+        return results
+
+    def forecast(self, node_type: str, node_ids: List[str], metric: str, horizon: str = "24h",
+                 window: str = "7d") -> Dict[str, Dict]:
+        """批量预测同一类型多个节点的指标值
+
+        Args:
+            node_type: 节点类型
+            node_ids: 节点ID列表
+            metric: 指标名称
+            horizon: 预测时间范围
+            window: 历史数据窗口
+
+        Returns:
+            节点ID到预测结果的映射，没有足够数据的节点status为error
+        """
+        loaded = self.load_series(node_type, node_ids, metric, window)
+        if loaded is None:
+            return {node_id: {"status": "error", "message": "查询指标数据失败"} for node_id in node_ids}
+
+        labels, grid, matrix = loaded
+        step = pd.Timedelta(self.interval)
+        steps = max(1, int(np.ceil(pd.Timedelta(horizon) / step)))
+        results = {}
+        if len(labels):
+            season_length = int(pd.Timedelta(self.season) / step)
+            config = METRIC_ANALYTICS_CONFIG
+            predictions, residual_std, method = forecast_series(
+                matrix, steps, season_length, config["alpha"], config["beta"], config["gamma"]
+            )
+            fit = fit_trends(matrix)
+            timestamps = [(grid[-1] + step * h).isoformat() for h in range(1, steps + 1)]
+
+            for i, node_id in enumerate(labels):
+                if not fit["valid"][i]:
+                    continue
+                margin = _INTERVAL_Z * residual_std[i]
+                results[node_id] = {
+                    "status": "success",
+                    "metric": metric,
+                    "method": method,
+                    "interval": self.interval,
+                    "history_window": window,
+                    "prediction_horizon": horizon,
+                    "history_points": int(fit["points"][i]),
+                    "statistics": {"mean": float(fit["mean"][i]), "stddev": float(fit["stddev"][i])},
+                    "predictions": [
+                        {"timestamp": timestamp, "predicted_value": float(value),
+                         "lower_bound": float(value - margin), "upper_bound": float(value + margin)}
+                        for timestamp, value in zip(timestamps, predictions[i])
+                    ]
+                }
+
+        for node_id in node_ids:
+            results.setdefault(node_id, {"status": "error", "message": f"节点 {node_id} 在 {window} 内的 {metric} 数据点不足"})
+        return results
@@ -0,0 +1,305 @@
+"""
+拓扑快照缓存模块
+将整个拓扑一次性加载到进程内，使用数组形式的CSR邻接表在本地回答邻居、下游、子图和路径查询
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# 配置日志
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# 进程内拓扑版本号，导入器完成导入后递增以使所有快照失效
+_topology_version = 0
+_version_lock = threading.Lock()
+
+
+def invalidate_topology_caches():
+    """使进程内所有拓扑快照失效，下次访问时重新加载"""
+    global _topology_version
+    with _version_lock:
+        _topology_version += 1
+    logger.info(f"拓扑快照已失效，当前版本: {_topology_version}")
+
+
+def get_topology_version() -> int:
+    """获取进程内拓扑版本号"""
+    return _topology_version
+
+
+class TopologySnapshot:
+    """拓扑快照，使用CSR邻接表存储有向图"""
+
+    def __init__(self, nodes: List[Dict], edges: List[Dict]):
+        """构建拓扑快照
+
+        Args:
+            nodes: 节点属性字典列表，每个字典必须包含id
+            edges: 边字典列表，包含source、target、type和可选的properties
+        """
+        # 节点ID到数组下标的映射
+        self.nodes = []
+        self.id_to_index = {}
+        for node in nodes:
+            node_id = node.get('id')
+            if node_id is None or node_id in self.id_to_index:
+                continue
+            self.id_to_index[node_id] = len(self.nodes)
+            self.nodes.append(node)
+
+        # 关系类型编码
+        self.rel_types = []
+        rel_type_codes = {}
+
+        sources, targets, type_codes, self.edge_properties = [], [], [], []
+        for edge in edges:
+            source_idx = self.id_to_index.get(edge.get('source'))
+            target_idx = self.id_to_index.get(edge.get('target'))
+            if source_idx is None or target_idx is None:
+                continue
+            rel_type = edge.get('type')
+            if rel_type not in rel_type_codes:
+                rel_type_codes[rel_type] = len(self.rel_types)
+                self.rel_types.append(rel_type)
+            sources.append(source_idx)
+            targets.append(target_idx)
+            type_codes.append(rel_type_codes[rel_type])
+            self.edge_properties.append(edge.get('properties') or {})
+
+        self.rel_type_codes = rel_type_codes
+        self.edge_sources = np.asarray(sources, dtype=np.int32)
+        self.edge_targets = np.asarray(targets, dtype=np.int32)
+        self.edge_types = np.asarray(type_codes, dtype=np.int16)
+
+        # 出边和入边CSR：indptr[i]:indptr[i+1]为节点i的邻接边在edge_ids中的范围
+        self.out_indptr, self.out_edges = self._build_csr(self.edge_sources)
+        self.in_indptr, self.in_edges = self._build_csr(self.edge_targets)
+
+    def _build_csr(self, endpoints: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """按端点构建CSR索引"""
+        counts = np.bincount(endpoints, minlength=len(self.nodes)) if len(endpoints) else np.zeros(len(self.nodes), dtype=np.int64)
+        indptr = np.zeros(len(self.nodes) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        edge_ids = np.argsort(endpoints, kind='stable').astype(np.int32)
+        return indptr, edge_ids
+
+    @property
+    def node_count(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edge_sources)
+
+    def _adjacent_edges(self, index: int, direction: str, rel_type: Optional[str] = None) -> List[Tuple[int, int]]:
+        """获取节点的邻接边
+
+        Returns:
+            (边下标, 邻居节点下标) 列表
+        """
+        result = []
+        if direction in ('out', 'both'):
+            edge_ids = self.out_edges[self.out_indptr[index]:self.out_indptr[index + 1]]
+            result.extend(zip(edge_ids.tolist(), self.edge_targets[edge_ids].tolist()))
+        if direction in ('in', 'both'):
+            edge_ids = self.in_edges[self.in_indptr[index]:self.in_indptr[index + 1]]
+            result.extend(zip(edge_ids.tolist(), self.edge_sources[edge_ids].tolist()))
+        if rel_type is not None:
+            code = self.rel_type_codes.get(rel_type)
+            result = [(edge, neighbor) for edge, neighbor in result if self.edge_types[edge] == code]
+        return result
+
+    def edge_to_dict(self, edge: int) -> Dict:
+        """将边转换为字典表示"""
+        return {
+            'source': self.nodes[self.edge_sources[edge]]['id'],
+            'target': self.nodes[self.edge_targets[edge]]['id'],
+            'type': self.rel_types[self.edge_types[edge]],
+            'properties': self.edge_properties[edge]
+        }
+
+    def get_node(self, node_id: str) -> Optional[Dict]:
+        """通过ID获取节点"""
+        index = self.id_to_index.get(node_id)
+        return self.nodes[index] if index is not None else None
+
+    def get_nodes_by_type(self, node_type: str) -> List[Dict]:
+        """获取特定类型的所有节点"""
+        return [node for node in self.nodes if node.get('type') == node_type]
+
+    def neighbors(self, node_id: str, rel_type: Optional[str] = None, direction: str = "out") -> List[Dict]:
+        """获取与指定节点相连的节点"""
+        index = self.id_to_index.get(node_id)
+        if index is None:
+            return []
+        return [self.nodes[neighbor] for _, neighbor in self._adjacent_edges(index, direction, rel_type)]
+
+    def descendants(self, node_id: str, max_depth: int = 3) -> List[Dict]:
+        """沿出边广度优先获取下游节点（不含起点），每个节点附带depth深度"""
+        distances = self.bfs_distances(node_id, max_depth, direction='out')
+        return [
+            dict(self.nodes[index], depth=depth)
+            for index, depth in distances.items() if depth > 0
+        ]
+
+    def propagation_graph(self, node_id: str, max_depth: int = 3) -> List[Dict]:
+        """沿出边获取下游节点及其传播前驱，一次遍历完成
+
+        Returns:
+            下游节点列表（不含起点），每个节点附带最短深度depth，以及predecessors：
+            指向该节点、且本身在max_depth-1步内可达的节点ID（含起点）
+        """
+        distances = self.bfs_distances(node_id, max_depth, direction='out')
+        result = []
+        for index, depth in distances.items():
+            if depth == 0:
+                continue
+            predecessors = [
+                self.nodes[neighbor]['id']
+                for _, neighbor in self._adjacent_edges(index, 'in')
+                if distances.get(neighbor, max_depth) < max_depth
+            ]
+            result.append(dict(self.nodes[index], depth=depth,
+                               predecessors=list(dict.fromkeys(predecessors))))
+        return result
+
+    def bfs_distances(self, node_id: str, max_depth: int, direction: str = 'out') -> Dict[int, int]:
+        """广度优先计算节点到起点的距离
+
+        Returns:
+            {节点下标: 距离}，包含起点（距离0）
+        """
+        start = self.id_to_index.get(node_id)
+        if start is None:
+            return {}
+        distances = {start: 0}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            depth = distances[current]
+            if depth >= max_depth:
+                continue
+            for _, neighbor in self._adjacent_edges(current, direction):
+                if neighbor not in distances:
+                    distances[neighbor] = depth + 1
+                    queue.append(neighbor)
+        return distances
+
+    def subgraph(self, node_id: str, depth: int = 1) -> Dict:
+        """查找以节点为中心、不考虑方向的子图"""
+        distances = self.bfs_distances(node_id, depth, direction='both')
+        if not distances:
+            return {"nodes": [], "relationships": []}
+
+        edges = set()
+        for index, distance in distances.items():
+            if distance >= depth:
+                continue
+            for edge, neighbor in self._adjacent_edges(index, 'both'):
+                if neighbor in distances:
+                    edges.add(edge)
+
+        return {
+            "nodes": [self.nodes[index] for index in distances],
+            "relationships": [self.edge_to_dict(edge) for edge in sorted(edges)]
+        }
+
+    def paths(self, source_id: str, target_id: str, max_depth: int = 3) -> List[List[str]]:
+        """枚举从源节点沿出边到目标节点、长度不超过max_depth的所有简单路径"""
+        source = self.id_to_index.get(source_id)
+        target = self.id_to_index.get(target_id)
+        if source is None or target is None:
+            return []
+
+        paths = []
+        stack = [(source, [source])]
+        while stack:
+            current, path = stack.pop()
+            if current == target and len(path) > 1:
+                paths.append([self.nodes[index]['id'] for index in path])
+                continue
+            if len(path) > max_depth:
+                continue
+            for _, neighbor in self._adjacent_edges(current, 'out'):
+                if neighbor not in path:
+                    stack.append((neighbor, path + [neighbor]))
+        return paths
+
+
+class TopologyCache:
+    """拓扑快照缓存，按TTL、版本探测或显式失效刷新"""
+
+    def __init__(self, loader: Callable[[], Tuple[List[Dict], List[Dict]]], ttl: float = 300,
+                 version_probe: Optional[Callable[[], object]] = None, max_renewals: int = 3):
+        """初始化拓扑缓存
+
+        Args:
+            loader: 加载拓扑的函数，返回 (节点列表, 边列表)
+            ttl: 快照有效期（秒），过期后先探测版本，版本变化才重新加载
+            version_probe: 可选的版本探测函数，返回可比较的拓扑指纹
+            max_renewals: 探测版本未变化时最多续期的次数；指纹无法反映属性修改或
+                          等量的边重连，续期达到上限后强制重新加载
+        """
+        self.loader = loader
+        self.ttl = ttl
+        self.version_probe = version_probe
+        self.max_renewals = max_renewals
+        self._snapshot = None
+        self._loaded_at = 0.0
+        self._renewals = 0
+        self._local_version = None
+        self._probe_version = None
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """使当前快照失效"""
+        with self._lock:
+            self._snapshot = None
+
+    def _probe(self) -> Optional[object]:
+        """探测拓扑版本，探测失败时返回None（视为版本未知，下次检查时重新加载）"""
+        try:
+            return self.version_probe()
+        except Exception as e:
+            logger.warning(f"拓扑版本探测失败: {str(e)}")
+            return None
+
+    def _is_stale(self) -> bool:
+        """检查快照是否需要重新加载"""
+        if self._snapshot is None or self._local_version != get_topology_version():
+            return True
+        if time.time() - self._loaded_at < self.ttl:
+            return False
+        if self.version_probe is None or self._renewals >= self.max_renewals:
+            return True
+
+        # TTL过期后使用轻量版本探测，拓扑未变化时只续期
+        probe_version = self._probe()
+        if probe_version is not None and probe_version == self._probe_version:
+            self._loaded_at = time.time()
+            self._renewals += 1
+            return False
+        return True
+
+    def get(self) -> TopologySnapshot:
+        """获取当前有效的拓扑快照，必要时重新加载"""
+        with self._lock:
+            if self._is_stale():
+                start = time.time()
+                local_version = get_topology_version()
+                probe_version = self._probe() if self.version_probe else None
+                nodes, edges = self.loader()
+                self._snapshot = TopologySnapshot(nodes, edges)
+                self._loaded_at = time.time()
+                self._renewals = 0
+                self._local_version = local_version
+                self._probe_version = probe_version
+                logger.info(f"已加载拓扑快照: {self._snapshot.node_count} 个节点, "
+                            f"{self._snapshot.edge_count} 条边, 用时 {self._loaded_at - start:.2f} 秒")
+            return self._snapshot
@@ -18,8 +18,8 @@ from graphrag.language_model.providers.fnllm.models import OpenAIChatFNLLM
 from graphrag.data_model.text_unit import TextUnit
 
 # 导入Neo4j和InfluxDB客户端
-from neo4j import GraphDatabase
 from influxdb_client import InfluxDBClient
+from ..db.neo4j_connector import Neo4jConnector
 
 # 导入本地LLM客户端
 from ..llm.vllm_client import VLLMClient
@@ -64,14 +64,17 @@ class GraphRAGAdapter:
         self._init_llm_client()
             
         # 初始化数据库连接（如果提供了配置）
-        self.neo4j_driver = None
+        self.neo4j_connector = None
         self.influx_client = None
         self.query_api = None
         
         if neo4j_config:
-            self.neo4j_driver = GraphDatabase.driver(
-                neo4j_config["uri"],
-                auth=(neo4j_config["user"], neo4j_config["password"])
+            # 与GraphData等组件共用同一连接参数的驱动和连接池
+            self.neo4j_connector = Neo4jConnector(
+                uri=neo4j_config["uri"],
+                user=neo4j_config["user"],
+                password=neo4j_config["password"],
+                database=neo4j_config.get("database")
             )
             
         if influxdb_config:
@@ -164,11 +167,11 @@ class GraphRAGAdapter:
         Returns:
             包含查询结果的字典
         """
-        if not self.neo4j_driver:
+        if not self.neo4j_connector:
             return {"success": False, "error": "Neo4j连接未初始化"}
             
         try:
-            with self.neo4j_driver.session() as session:
+            with self.neo4j_connector.driver.session(database=self.neo4j_connector.database) as session:
                 # 添加LIMIT子句，防止结果过多
                 if "LIMIT" not in query.upper() and limit > 0:
                     query += f" LIMIT {limit}"
@@ -486,8 +489,8 @@ class GraphRAGAdapter:
         
     def __exit__(self, exc_type, exc_val, exc_tb):
         """上下文管理器退出，关闭所有连接"""
-        if self.neo4j_driver:
-            self.neo4j_driver.close()
+        if self.neo4j_connector:
+            self.neo4j_connector.close()
             
         if self.influx_client:
             self.influx_client.close() 
\ No newline at end of file
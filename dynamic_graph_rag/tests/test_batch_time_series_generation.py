@@ -0,0 +1,104 @@
+"""
+测试时序数据生成器的批量（张量）生成功能
+"""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dynamic_graph_rag.data.simulated.generators.time_series_generator import TimeSeriesGenerator
+from dynamic_graph_rag.db.influxdb_client import InfluxDBManager
+
+
+@pytest.fixture
+def generator():
+    """包含两种节点类型和一个无指标节点的生成器"""
+    nodes = [{"id": f"VM_{i:03d}", "type": "VM"} for i in range(3)]
+    nodes += [{"id": "HOST_001", "type": "HOST"}, {"id": "DC_001", "type": "DC"}]
+    generator = TimeSeriesGenerator(nodes_info=nodes, seed=42)
+    generator.influxdb_available = False
+    return generator
+
+
+def test_metrics_tensor_shape_and_range(generator):
+    """测试张量形状以及取值在指标范围内"""
+    time_range = pd.date_range("2025-01-01", periods=96, freq="15min")
+    metric_names, values = generator.generate_metrics_tensor("VM", 10, time_range)
+
+    assert metric_names == list(generator.metrics_config["VM"])
+    assert values.shape == (10, 4, 96)
+    for index, metric_name in enumerate(metric_names):
+        config = generator.metrics_config["VM"][metric_name]
+        assert values[:, index].min() >= config["min"]
+        assert values[:, index].max() <= config["max"]
+
+
+def test_apply_anomalies_batch_matches_sequential_semantics(generator):
+    """测试向量化异常注入与逐起点注入的结果一致"""
+    values = np.ones((50, 2, 40), dtype=np.float32)
+    generator.apply_anomalies_batch(values, anomaly_probability=0.2, anomaly_duration=4,
+                                    rng=np.random.default_rng(7))
+
+    draws = np.random.default_rng(7).random((50, 2, 36), dtype=np.float32)
+    expected = np.ones((50, 2, 40))
+    for index in np.ndindex(50, 2):
+        for start in range(36):
+            if draws[index][start] < 0.1:
+                expected[index][start:start + 4] *= 2.5
+            elif draws[index][start] < 0.2:
+                expected[index][start:start + 4] /= 2.5
+
+    np.testing.assert_allclose(values, expected, rtol=1e-5)
+
+
+def test_generate_metrics_frame_long_format(generator):
+    """测试长格式输出覆盖所有节点、指标和时间点"""
+    end_time = datetime(2025, 1, 2)
+    frame = generator.generate_metrics_frame(end_time - timedelta(days=1), end_time)
+
+    timesteps = 97
+    assert list(frame.columns) == ["timestamp", "node_id", "node_type", "metric", "value", "unit"]
+    assert len(frame) == (3 * 4 + 1 * 4) * timesteps
+    assert "DC_001" not in set(frame["node_id"])
+    cpu = frame[(frame["node_id"] == "VM_001") & (frame["metric"] == "cpu_usage")]
+    assert len(cpu) == timesteps
+    assert set(cpu["unit"]) == {"%"}
+
+
+def test_generate_metrics_data_keeps_nested_format(generator):
+    """测试嵌套字典格式与原有逐节点生成的格式一致"""
+    end_time = datetime(2025, 1, 2)
+    metrics_data = generator.generate_metrics_data(end_time - timedelta(hours=1), end_time)
+
+    assert metrics_data["DC_001"] == {}
+    df = metrics_data["HOST_001"]["temperature"]
+    assert list(df.columns) == ["timestamp", "value", "node_id", "node_type", "unit"]
+    assert len(df) == 5
+    assert (df["node_type"] == "HOST").all()
+
+
+def test_parallel_shards_independent_of_worker_count(generator):
+    """测试并行分片生成的结果只由种子决定，与进程数量无关"""
+    end_time = datetime(2025, 1, 2)
+    kwargs = dict(shard_size=2, generate_logs=False, encode=True, batch_size=50)
+
+    one = list(generator.iter_shard_results(end_time - timedelta(hours=2), end_time, workers=1, **kwargs))
+    two = list(generator.iter_shard_results(end_time - timedelta(hours=2), end_time, workers=2, **kwargs))
+
+    assert [shard["node_count"] for shard in one] == [2, 1, 1]
+    assert [shard["metric_batches"] for shard in one] == [shard["metric_batches"] for shard in two]
+    assert sum(len(lines) for shard in one for lines in shard["metric_batches"]) == 16 * 9
+
+
+def test_write_keyed_line_batches_counts_per_key(generator, monkeypatch):
+    """测试写入阶段按类别统计成功和失败的点数"""
+    def fake_write(self, lines, retry_count=3, retry_delay=2):
+        return not lines[0].startswith("bad")
+
+    monkeypatch.setattr(InfluxDBManager, "write_line_protocol", fake_write)
+    items = [("metrics", ["m 1", "m 2"]), ("logs", ["bad 1"]), ("metrics", ["bad 2"]), ("logs", ["l 1"])] * 10
+
+    counts = generator.write_keyed_line_batches(iter(items), max_workers=3)
+
+    assert counts == {"metrics": (20, 10), "logs": (10, 10)}
@@ -0,0 +1,23 @@
+"""
+测试增量更新时只对受影响区域重新聚类
+"""
+import networkx as nx
+
+from graphrag.index.operations.cluster_graph import cluster_graph, update_clusters
+
+
+def test_update_clusters_handles_region_without_edges():
+    """测试受影响区域内没有边时（新增孤立节点、节点的边被删除）不调用Leiden，每个节点单独成社区"""
+    graph = nx.Graph()
+    graph.add_edges_from([("A", "B"), ("B", "C"), ("C", "A"), ("D", "E")])
+    previous = cluster_graph(graph, max_cluster_size=10, use_lcc=False, seed=1)
+
+    graph.add_nodes_from(["X", "Y"])
+    graph.remove_edge("D", "E")
+    communities, created = update_clusters(graph, previous, ["X", "Y", "D", "E"],
+                                           max_cluster_size=10, use_lcc=False, seed=1)
+
+    members = sorted(sorted(nodes) for _, _, _, nodes in communities)
+    assert members == [["A", "B", "C"], ["D"], ["E"], ["X"], ["Y"]]
+    assert len(created) == 4
+    assert all(parent == -1 for _, community, parent, _ in communities if community in created)
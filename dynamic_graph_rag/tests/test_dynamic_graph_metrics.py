@@ -0,0 +1,280 @@
+"""
+测试动态图模型的批量指标查询功能
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import Mock
+
+from dynamic_graph_rag.config.settings import ROLLUP_CONFIG
+from dynamic_graph_rag.db.influxdb_client import InfluxDBManager
+from dynamic_graph_rag.db.neo4j_connector import Neo4jConnector
+from dynamic_graph_rag.models.dynamic_graph import DynamicGraph
+from dynamic_graph_rag.models.graph_data import GraphData
+from dynamic_graph_rag.models.metric_analytics import forecast_series
+
+
+def make_frame(node_values, metric="cpu_usage"):
+    """构造InfluxDB查询结果格式的DataFrame"""
+    rows = []
+    for node_id, values in node_values.items():
+        for i, value in enumerate(values):
+            rows.append({
+                "_time": pd.Timestamp("2025-01-01") + pd.Timedelta(minutes=15 * i),
+                "_value": value,
+                "_field": "value",
+                "metric": metric,
+                "node_id": node_id
+            })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def influxdb_manager():
+    """使用模拟query_api的InfluxDB管理器"""
+    manager = InfluxDBManager(url="http://localhost:8087", token="test", org="test", bucket="metrics")
+    manager.client = Mock()
+    manager.query_api = Mock()
+    return manager
+
+
+def test_query_metrics_bulk_groups_by_node(influxdb_manager):
+    """测试批量查询按节点分组，并使用contains()集合过滤"""
+    influxdb_manager.query_api.query_data_frame.return_value = make_frame({
+        "VM_001": [1.0, 2.0],
+        "VM_002": [3.0]
+    })
+
+    result = influxdb_manager.query_metrics_bulk("vm_metrics", ["VM_001", "VM_002", "VM_003"],
+                                                 metrics=["cpu_usage"])
+
+    assert influxdb_manager.query_api.query_data_frame.call_count == 1
+    query = influxdb_manager.query_api.query_data_frame.call_args.kwargs["query"]
+    assert 'contains(value: r.node_id, set: ["VM_001", "VM_002", "VM_003"])' in query
+    assert 'contains(value: r.metric, set: ["cpu_usage"])' in query
+    assert len(result["VM_001"]) == 2
+    assert len(result["VM_002"]) == 1
+    assert result["VM_003"].empty
+
+
+def test_query_metrics_bulk_chunks_large_sets(influxdb_manager):
+    """测试节点数量超过分块大小时拆分为少量查询"""
+    influxdb_manager.query_api.query_data_frame.return_value = pd.DataFrame()
+    node_ids = [f"VM_{i:03d}" for i in range(25)]
+
+    result = influxdb_manager.query_metrics_bulk("vm_metrics", node_ids, chunk_size=10)
+
+    assert influxdb_manager.query_api.query_data_frame.call_count == 3
+    assert set(result.keys()) == set(node_ids)
+
+
+def test_detect_anomalies_bulk_without_pushdown(influxdb_manager):
+    """测试列式结果集上的向量化Z分数计算"""
+    influxdb_manager.query_api.query_data_frame.return_value = make_frame({
+        "VM_001": [10.0] * 20 + [90.0],
+        "VM_002": [10.0, 11.0] * 10
+    })
+
+    anomalies = influxdb_manager.detect_anomalies_bulk("vm_metrics", "cpu_usage", threshold=2.0,
+                                                       pushdown=False)
+
+    assert influxdb_manager.query_api.query_data_frame.call_count == 1
+    assert anomalies["node_id"].tolist() == ["VM_001"]
+    assert anomalies["_value"].tolist() == [90.0]
+    assert anomalies["z_score"].iloc[0] > 2.0
+
+
+def test_find_anomalous_nodes_uses_single_query(influxdb_manager):
+    """测试异常节点查找将统计计算下推，只发起一次查询"""
+    graph = Mock()
+    graph.get_nodes_by_type.return_value = [{"id": "VM_001", "type": "VM"}, {"id": "VM_002", "type": "VM"}]
+    influxdb_manager.query_api.query_data_frame.return_value = pd.DataFrame([{
+        "_time": pd.Timestamp("2025-01-01"),
+        "_value": 90.0,
+        "node_id": "VM_001",
+        "mean": 13.8,
+        "stddev": 17.4,
+        "z_score": 4.4
+    }])
+
+    dynamic_graph = DynamicGraph(graph_data=graph, influxdb_client=influxdb_manager)
+    anomalous = dynamic_graph.find_anomalous_nodes("VM", "cpu_usage", threshold=2.0)
+
+    assert influxdb_manager.query_api.query_data_frame.call_count == 1
+    query = influxdb_manager.query_api.query_data_frame.call_args.kwargs["query"]
+    assert 'group(columns: ["node_id"])' in query and "stddev()" in query
+    assert [node["id"] for node in anomalous] == ["VM_001"]
+    assert anomalous[0]["anomalies"] == [{
+        "metric": "cpu_usage",
+        "timestamp": pd.Timestamp("2025-01-01"),
+        "value": 90.0,
+        "z_score": 4.4
+    }]
+
+
+def test_fleet_health_uses_single_query_and_refreshes_incrementally(influxdb_manager):
+    """测试类型健康状态一次查询整个类型，之后只查询上次最新时间之后的新数据点"""
+    graph = Mock()
+    graph.get_nodes_by_type.return_value = [{"id": "VM_001", "type": "VM"}, {"id": "VM_002", "type": "VM"}]
+    now = pd.Timestamp.now(tz="UTC").floor("min")
+    window = make_frame({"VM_001": [10.0, 11.0] * 10 + [90.0], "VM_002": [10.0, 11.0] * 10 + [10.5]})
+    window["_time"] = now - pd.Timedelta(minutes=30) + pd.to_timedelta(window.index % 21, unit="min")
+    influxdb_manager.query_api.query_data_frame.return_value = window
+
+    dynamic_graph = DynamicGraph(graph_data=graph, influxdb_client=influxdb_manager)
+    health = dynamic_graph.get_health_status(node_type="VM")
+
+    assert influxdb_manager.query_api.query_data_frame.call_count == 1
+    assert health["anomalous_count"] == 1
+    assert {node["id"]: node["status"] for node in health["nodes"]} == {"VM_001": "anomalous", "VM_002": "normal"}
+    assert health["nodes"][0]["anomalies"] == {"cpu_usage": 1}
+
+    # 只返回新数据点；上次的最新点在range起点处被重复返回时应被忽略
+    update = make_frame({"VM_002": [10.5, 95.0]})
+    update["_time"] = [now - pd.Timedelta(minutes=10), now]
+    influxdb_manager.query_api.query_data_frame.return_value = update
+    health = dynamic_graph.get_health_status(node_type="VM")
+
+    query = influxdb_manager.query_api.query_data_frame.call_args.kwargs["query"]
+    assert (now - pd.Timedelta(minutes=10)).strftime("range(start: %Y-%m-%dT%H:%M") in query
+    assert {node["id"]: node["status"] for node in health["nodes"]} == {"VM_001": "anomalous", "VM_002": "anomalous"}
+    latest = {(row["node_id"], row["metric"]): row["value"] for row in health["health_table"]}
+    assert latest == {("VM_001", "cpu_usage"): 90.0, ("VM_002", "cpu_usage"): 95.0}
+
+
+def test_fleet_health_scores_every_written_metric(influxdb_manager):
+    """测试类型健康状态覆盖生成器实际写入的所有指标，不因指标命名不同而丢弃"""
+    written_metrics = {
+        "VM": ["cpu_usage", "memory_usage", "disk_io", "network_throughput"],
+        "HOSTGROUP": ["aggregate_cpu", "aggregate_memory", "load_balance"]
+    }
+    now = pd.Timestamp.now(tz="UTC").floor("min")
+    for node_type, metrics in written_metrics.items():
+        node_id = f"{node_type}_001"
+        graph = Mock()
+        graph.get_nodes_by_type.return_value = [{"id": node_id, "type": node_type}]
+        window = pd.concat([make_frame({node_id: [10.0, 11.0] * 10 + [90.0]}, metric=metric) for metric in metrics],
+                           ignore_index=True)
+        window["_time"] = now - pd.Timedelta(minutes=30) + pd.to_timedelta(window.index % 21, unit="min")
+        influxdb_manager.query_api.query_data_frame.return_value = window
+
+        dynamic_graph = DynamicGraph(graph_data=graph, influxdb_client=influxdb_manager)
+        health = dynamic_graph.get_health_status(node_type=node_type)
+
+        query = influxdb_manager.query_api.query_data_frame.call_args.kwargs["query"]
+        if "r.metric" in query:
+            assert all(f'"{metric}"' in query for metric in metrics), query
+        assert health["nodes"][0]["anomalies"] == {metric: 1 for metric in metrics}
+
+
+def test_node_health_status_scores_single_node(influxdb_manager):
+    """测试单节点健康状态只查询该节点一次，并返回最新指标值和异常指标"""
+    graph = Mock()
+    graph.get_node_by_id.return_value = {"id": "VM_001", "type": "VM"}
+    now = pd.Timestamp.now(tz="UTC").floor("min")
+    window = pd.concat([
+        make_frame({"VM_001": [10.0, 11.0] * 10 + [90.0]}, metric="cpu_usage"),
+        make_frame({"VM_001": [50.0, 51.0] * 10 + [50.5]}, metric="memory_usage")
+    ], ignore_index=True)
+    window["_time"] = now - pd.Timedelta(minutes=30) + pd.to_timedelta(window.index % 21, unit="min")
+    influxdb_manager.query_api.query_data_frame.return_value = window
+
+    dynamic_graph = DynamicGraph(graph_data=graph, influxdb_client=influxdb_manager)
+    health = dynamic_graph.get_health_status(node_id="VM_001")
+
+    assert influxdb_manager.query_api.query_data_frame.call_count == 1
+    query = influxdb_manager.query_api.query_data_frame.call_args.kwargs["query"]
+    assert 'contains(value: r.node_id, set: ["VM_001"])' in query
+    assert health["current_metrics"] == {"cpu_usage": 90.0, "memory_usage": 50.5}
+    assert health["anomalies"] == {"cpu_usage": 1}
+    assert health["status"] == "anomalous"
+
+
+def test_query_planner_routes_to_coarsest_rollup_tier(influxdb_manager, monkeypatch):
+    """测试查询规划器按窗口和分辨率选择汇总层级，未启用时始终查询原始数据"""
+    assert influxdb_manager.plan_query("-30d")["name"] == "raw"
+
+    monkeypatch.setitem(ROLLUP_CONFIG, "enabled", True)
+    assert influxdb_manager.plan_query("-1h")["name"] == "raw"
+    assert influxdb_manager.plan_query("-7d")["name"] == "hourly"
+    assert influxdb_manager.plan_query("-30d")["name"] == "daily"
+    assert influxdb_manager.plan_query("-7d", interval="15m")["name"] == "raw"
+    # 超出原始数据保留期时即使要求细分辨率也只能使用汇总数据
+    assert influxdb_manager.plan_query("-60d", interval="15m")["name"] == "hourly"
+
+    influxdb_manager.query_api.query_data_frame.return_value = pd.DataFrame()
+    influxdb_manager.query_points("vm_metrics", start_time="-30d", metrics=["cpu_usage"], interval="auto")
+    query = influxdb_manager.query_api.query_data_frame.call_args.kwargs["query"]
+    assert 'from(bucket: "metrics_daily") |> range(start: -30d, stop: boundary)' in query
+    assert 'from(bucket: "metrics") |> range(start: boundary)' in query
+    assert "union(tables: [rollup, recent])" in query
+
+
+def test_compare_node_trends_uses_single_query(influxdb_manager):
+    """测试多节点趋势比较只查询一次节点信息和一次指标数据"""
+    steps = np.arange(7 * 24)
+    frame = pd.concat([
+        pd.DataFrame({"node_id": node_id, "metric": "cpu_usage", "_value": 50 + slope * steps,
+                      "_time": pd.Timestamp("2025-01-01", tz="UTC") + pd.to_timedelta(steps, unit="h")})
+        for node_id, slope in [("VM_001", 0.1), ("VM_002", -0.1), ("VM_003", 0.0)]
+    ], ignore_index=True)
+    influxdb_manager.query_api.query_data_frame.return_value = frame
+    graph = Mock()
+    graph.get_nodes_by_ids.return_value = {node_id: {"id": node_id, "type": "VM"}
+                                           for node_id in ["VM_001", "VM_002", "VM_003"]}
+
+    dynamic_graph = DynamicGraph(graph_data=graph, influxdb_client=influxdb_manager)
+    result = dynamic_graph.compare_node_trends(["VM_001", "VM_002", "VM_003", "VM_404"], "cpu_usage")
+
+    assert influxdb_manager.query_api.query_data_frame.call_count == 1
+    assert graph.get_nodes_by_ids.call_count == 1
+    assert result["node_count"] == 3
+    assert result["comparative_analysis"]["trends"] == {
+        "VM_001": "increasing", "VM_002": "decreasing", "VM_003": "stable"
+    }
+    assert result["comparative_analysis"]["slopes"]["VM_001"] == pytest.approx(0.1)
+    assert result["results"]["VM_001"]["r_squared"] == pytest.approx(1.0)
+    assert result["results"]["VM_404"]["status"] == "error"
+
+
+def test_forecast_series_follows_seasonal_pattern():
+    """测试Holt-Winters对多条序列同时预测出季节形态"""
+    steps = np.arange(4 * 24)
+    matrix = np.stack([10 + np.sin(2 * np.pi * steps / 24), 20 + 0.5 * steps + np.cos(2 * np.pi * steps / 24)])
+    matrix[0, 30] = np.nan
+
+    predictions, residual_std, method = forecast_series(matrix, horizon=24, season_length=24)
+
+    future = np.arange(4 * 24, 5 * 24)
+    expected = np.stack([10 + np.sin(2 * np.pi * future / 24), 20 + 0.5 * future + np.cos(2 * np.pi * future / 24)])
+    assert method == "holt_winters"
+    assert predictions.shape == (2, 24)
+    assert np.abs(predictions - expected).max() < 1.0
+
+
+def test_predict_node_metrics_lists_related_nodes(influxdb_manager):
+    """测试有关系的节点预测时返回相关节点及关系类型"""
+    steps = np.arange(2 * 24)
+    influxdb_manager.query_api.query_data_frame.return_value = pd.DataFrame({
+        "node_id": "VM_001", "metric": "cpu_usage", "_value": 50 + 0.1 * steps,
+        "_time": pd.Timestamp("2025-01-01", tz="UTC") + pd.to_timedelta(steps, unit="h")
+    })
+
+    class TopologyConnector(Neo4jConnector):
+        def execute_query(self, query, parameters=None, database=None, access_mode=None):
+            if "AS label" in query:
+                return [{"id": node_id, "label": "VM"} for node_id in parameters["ids"]]
+            if "AS rel_type" in query:
+                return [{"rel_type": "DEPLOYED_ON", "other_id": "HOST_001", "other_type": "HOST",
+                         "properties": {}}]
+            if "RETURN n" in query:
+                return [{"n": {"id": "VM_001", "type": "VM", "name": "vm-1"}}]
+            return []
+
+    graph = GraphData(neo4j_client=TopologyConnector(uri="bolt://graph:7687"), use_snapshot=False)
+
+    dynamic_graph = DynamicGraph(graph_data=graph, influxdb_client=influxdb_manager)
+    prediction = dynamic_graph.predict_node_metrics("VM_001", "cpu_usage")
+
+    assert prediction["status"] == "success"
+    assert prediction["related_nodes"] == [{"id": "HOST_001", "type": "HOST", "relation": "DEPLOYED_ON"}]
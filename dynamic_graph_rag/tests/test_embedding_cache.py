@@ -0,0 +1,45 @@
+"""
+测试嵌入缓存命中与新计算的嵌入结果类型一致
+"""
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from graphrag.cache.memory_pipeline_cache import InMemoryCache
+from graphrag.index.operations.embed_text.strategies import openai
+
+
+class WholeTextSplitter:
+    """不切分文本、按字符计数的分词器，避免加载tiktoken编码"""
+
+    def split_text(self, text):
+        return [text]
+
+    def num_tokens(self, text):
+        return len(text)
+
+
+def test_cached_embeddings_round_trip_through_run():
+    """测试缓存命中的嵌入与首次计算的一样是list[float]，且重复文本不计为缓存命中"""
+    model = Mock()
+    model.aembed_batch = AsyncMock(side_effect=lambda chunk: [[0.1, 0.2, 0.3] for _ in chunk])
+    manager = Mock()
+    manager.return_value.get_or_create_embedding_model.return_value = model
+    cache = InMemoryCache()
+    args = {"llm": {"type": "openai_embedding", "api_key": "test", "model": "text-embedding-3-small"}}
+
+    with patch.object(openai, "ModelManager", manager), \
+            patch.object(openai, "_get_splitter", return_value=WholeTextSplitter()), \
+            patch.object(openai.log, "info") as log_info:
+        cold = asyncio.run(openai.run(["alpha", "beta", "alpha"], Mock(), cache, args)).embeddings
+        assert log_info.call_args.args[3] == 0
+        warm = asyncio.run(openai.run(["alpha", "beta", "alpha"], Mock(), cache, args)).embeddings
+        assert log_info.call_args.args[3] == 3
+
+    assert model.aembed_batch.call_count == 1
+    assert model.aembed_batch.call_args.args[0] == ["alpha", "beta"]
+    for embeddings in (cold, warm):
+        assert all(type(embedding) is list for embedding in embeddings)
+        assert all(type(value) is float for embedding in embeddings for value in embedding)
+    assert warm == [pytest.approx(embedding) for embedding in cold]
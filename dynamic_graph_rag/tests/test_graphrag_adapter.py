@@ -123,7 +123,7 @@ def test_error_handling(adapter):
 
 def test_resource_management(adapter):
     """测试资源管理"""
-    with patch.object(adapter.neo4j_driver, 'close') as mock_neo4j_close, \
+    with patch.object(adapter.neo4j_connector, 'close') as mock_neo4j_close, \
          patch.object(adapter.influx_client, 'close') as mock_influx_close:
         
         with adapter:
@@ -0,0 +1,104 @@
+"""
+测试DataFrame到InfluxDB行协议的向量化编码和流式写入
+"""
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+import pytest
+from influxdb_client import Point
+
+from dynamic_graph_rag.db.influxdb_client import InfluxDBManager
+from dynamic_graph_rag.db.line_protocol import encode_line_protocol, iter_line_protocol_batches
+
+
+def point_lines(df, measurement_column, tag_columns, field_columns):
+    """逐行构建Point得到的行协议，作为对照"""
+    lines = []
+    for _, row in df.iterrows():
+        point = Point(row[measurement_column])
+        for tag in tag_columns:
+            if not pd.isna(row[tag]):
+                point = point.tag(tag, row[tag])
+        for field in field_columns:
+            value = row[field]
+            if isinstance(value, (bool, np.bool_)):
+                value = bool(value)
+            elif isinstance(value, np.integer):
+                value = int(value)
+            elif isinstance(value, np.floating):
+                value = float(value)
+            if value is not None and not (isinstance(value, float) and np.isnan(value)):
+                point = point.field(field, value)
+        line = point.time(row["timestamp"]).to_line_protocol()
+        if line:
+            lines.append(line)
+    return lines
+
+
+@pytest.fixture
+def frame():
+    """包含需要转义的标签、各种字段类型和空值的数据"""
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2025-01-01", periods=6, freq="15min", tz="Asia/Shanghai"),
+        "measurement": ["vm_metrics", "vm metrics", "host,metrics", "vm_metrics", "vm_metrics", "vm_metrics"],
+        "node_id": ["VM_001", "VM 002", "VM=003", "VM,004", "VM\\", None],
+        "metric": pd.Categorical(["cpu", "mem", "cpu", "disk", "cpu", "cpu"]),
+        "value": [1.0, 2.5, np.nan, np.inf, 1e-7, 3.0],
+        "count": [1, 2, 3, 4, 5, 6],
+        "ok": [True, False, True, True, False, True],
+        "unit": ["%", 'say "hi"', "back\\slash", None, "MB", "%"],
+    })
+
+
+def test_encode_matches_point(frame):
+    """测试编码结果与Point.to_line_protocol一致"""
+    tags = ["node_id", "metric"]
+    fields = ["value", "count", "ok", "unit"]
+
+    encoded = encode_line_protocol(frame, measurement_column="measurement", tag_columns=tags, field_columns=fields)
+
+    assert encoded == point_lines(frame, "measurement", tags, fields)
+
+
+def test_rows_without_fields_are_dropped(frame):
+    """测试没有任何有效字段的行被丢弃"""
+    encoded = encode_line_protocol(frame, measurement="m", field_columns=["value"])
+
+    assert len(encoded) == 4
+    assert all(" value=" in line for line in encoded)
+
+
+def test_requires_single_measurement_source(frame):
+    """测试measurement和measurement_column必须且只能提供一个"""
+    with pytest.raises(ValueError):
+        encode_line_protocol(frame)
+    with pytest.raises(ValueError):
+        encode_line_protocol(frame, measurement="m", measurement_column="measurement")
+
+
+def test_batches_span_frames(frame):
+    """测试批次跨越多个DataFrame和编码块时不丢失、不重复"""
+    frames = [frame, frame.iloc[:3]]
+    batches = list(iter_line_protocol_batches(frames, batch_size=4, chunk_size=2, measurement="m",
+                                              tag_columns=["node_id"], field_columns=["count"]))
+
+    assert [len(batch) for batch in batches] == [4, 4, 1]
+    expected = encode_line_protocol(pd.concat(frames), measurement="m", tag_columns=["node_id"],
+                                    field_columns=["count"])
+    assert sum(batches, []) == expected
+
+
+def test_write_dataframe_sends_batches(frame, monkeypatch):
+    """测试write_dataframe按批同步写入、失败时重试，并返回成功写入的点数"""
+    monkeypatch.setattr("dynamic_graph_rag.db.influxdb_client.time.sleep", lambda seconds: None)
+    manager = InfluxDBManager(url="http://localhost:8086", token="t", org="o", bucket="b")
+    manager.client = MagicMock()
+    manager.sync_write_api = MagicMock()
+    manager.sync_write_api.write.side_effect = [None] + [Exception("boom")] * 4
+
+    written = manager.write_dataframe(frame, measurement="m", field_columns=["count"], batch_size=4)
+
+    assert written == 4
+    assert manager.sync_write_api.write.call_count == 5
+    assert len(manager.sync_write_api.write.call_args_list[0].kwargs["record"]) == 4
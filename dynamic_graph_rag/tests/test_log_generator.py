@@ -0,0 +1,106 @@
+"""
+测试日志状态数据生成器的向量化实现
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from influxdb_client import Point
+
+from dynamic_graph_rag.data.simulated.generators.log_generator import LogGenerator, STATE_NAMES
+
+
+def sequential_states(values, config):
+    """逐点状态机，作为对照"""
+    inverse = config.get('inverse', False)
+    state = 'normal'
+    states = []
+    for value in values:
+        if not inverse:
+            if value >= config['error']:
+                state = 'error'
+            elif value >= config['warning']:
+                state = 'warning'
+            elif value <= config['recovery'] and state in ('warning', 'error'):
+                state = 'recovery'
+        else:
+            if value <= config['error']:
+                state = 'error'
+            elif value <= config['warning']:
+                state = 'warning'
+            elif value >= config['recovery'] and state in ('warning', 'error'):
+                state = 'recovery'
+        states.append(state)
+    return states
+
+
+@pytest.mark.parametrize("metric", [("VM", "cpu_usage"), ("NE", "success_rate")])
+def test_threshold_states_match_state_machine(metric):
+    """测试向量化状态计算与逐点状态机一致（包括反向指标）"""
+    generator = LogGenerator(seed=0)
+    config = generator.thresholds[metric[0]][metric[1]]
+    values = np.random.default_rng(1).uniform(0, 100, 2000)
+
+    states = generator.threshold_states(values, config)
+
+    assert [STATE_NAMES[state] for state in states] == sequential_states(values, config)
+
+
+def metrics_frame(values):
+    """构造15分钟采样的单指标数据"""
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2025-01-01", periods=len(values), freq="15min"),
+        "value": values
+    })
+
+
+def test_logs_for_transitions_and_anomalies():
+    """测试状态变化日志，以及与同一采样点阈值日志重复的异常日志被去除"""
+    values = np.full(200, 50.0)
+    values[100] = 99.0   # 同时是错误阈值和异常点，只生成阈值日志
+    values[101] = 50.0   # 恢复
+    values[150] = 1.0    # 低异常
+    nodes = [{"id": "VM_1", "type": "VM"}, {"id": "DC_1", "type": "DC"}]
+    metrics = {"VM_1": {"cpu_usage": metrics_frame(values)}, "DC_1": {}}
+
+    logs = LogGenerator(seed=0).generate_logs_for_metrics(metrics, nodes, random_events=False,
+                                                         info_log_frequency=50)
+
+    assert list(logs) == ["VM_1"]
+    df = logs["VM_1"]
+    assert list(df.columns) == ["timestamp", "node_id", "node_type", "level", "message", "source", "metric",
+                                "metric_value"]
+    assert df["timestamp"].is_monotonic_increasing
+    assert df.loc[df["source"] == "threshold", "level"].tolist() == ["ERROR", "INFO"]
+    anomalies = df[df["source"] == "anomaly"]
+    assert anomalies["metric_value"].tolist() == [1.0]
+    assert "异常下降" in anomalies["message"].iloc[0]
+    assert (df["source"] == "info").sum() == 4
+
+
+def test_seeded_generation_is_reproducible():
+    """测试指定种子时日志（含时间抖动和随机事件）可复现"""
+    values = np.random.default_rng(3).uniform(0, 100, 500)
+    metrics = {"HOST_1": {"cpu_usage": metrics_frame(values), "temperature": metrics_frame(values)}}
+    nodes = [{"id": "HOST_1", "type": "HOST"}]
+
+    first = LogGenerator(seed=7).generate_logs_for_metrics(metrics, nodes)
+    second = LogGenerator(seed=7).generate_logs_for_metrics(metrics, nodes)
+
+    pd.testing.assert_frame_equal(first["HOST_1"], second["HOST_1"])
+
+
+def test_prepare_logs_matches_point():
+    """测试日志行协议与逐行构建Point的结果一致"""
+    values = np.random.default_rng(5).uniform(0, 100, 300)
+    metrics = {"VM_1": {"cpu_usage": metrics_frame(values)}}
+    generator = LogGenerator(seed=1)
+    logs = generator.generate_logs_for_metrics(metrics, [{"id": "VM_1", "type": "VM"}])
+
+    expected = []
+    for _, row in logs["VM_1"].iterrows():
+        point = Point("node_logs").tag("node_id", row["node_id"]).tag("node_type", row["node_type"]) \
+            .tag("level", row["level"]).tag("source", row["source"]).tag("metric", row["metric"]) \
+            .field("message", row["message"]).field("value", float(row["metric_value"])).time(row["timestamp"])
+        expected.append(point.to_line_protocol())
+
+    assert generator.prepare_logs_for_influxdb(logs) == expected
@@ -0,0 +1,98 @@
+"""
+测试Neo4j连接器的共享驱动、读写路由和异步查询
+"""
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+from neo4j import RoutingControl
+
+from dynamic_graph_rag.db import neo4j_connector
+from dynamic_graph_rag.db.neo4j_connector import Neo4jConnector
+from dynamic_graph_rag.models.dynamic_graph import DynamicGraph
+from dynamic_graph_rag.models.graph_data import GraphData
+
+
+def test_connectors_share_one_lazy_driver():
+    """测试相同连接参数的连接器共用一个驱动，且创建连接器时不连接数据库"""
+    with patch.object(neo4j_connector.GraphDatabase, "driver") as create_driver, \
+            patch.dict(neo4j_connector._drivers, clear=True):
+        first = Neo4jConnector(uri="bolt://graph:7687", user="neo4j", password="secret")
+        second = Neo4jConnector(uri="bolt://graph:7687", user="neo4j", password="secret")
+        assert create_driver.call_count == 0
+
+        assert first.driver is second.driver
+        assert create_driver.call_count == 1
+        assert create_driver.call_args.kwargs["max_connection_pool_size"] > 0
+
+
+def test_execute_query_routes_reads_and_writes():
+    """测试只读查询路由到读节点，包含写子句的查询路由到写节点"""
+    connector = Neo4jConnector(uri="bolt://graph:7687", user="neo4j", password="secret", database="neo4j")
+    connector.driver = Mock()
+
+    connector.execute_query("MATCH (n:`VM` {id: $id}) RETURN n", {"id": "VM_001"})
+    assert connector.driver.execute_query.call_args.kwargs["routing_"] == RoutingControl.READ
+    assert connector.driver.execute_query.call_args.kwargs["database_"] == "neo4j"
+
+    connector.execute_query("MERGE (n:`VM` {id: $id}) SET n.name = $name", {"id": "VM_001", "name": "vm"})
+    assert connector.driver.execute_query.call_args.kwargs["routing_"] == RoutingControl.WRITE
+
+    connector.execute_query("MATCH (n) RETURN n", access_mode="write")
+    assert connector.driver.execute_query.call_args.kwargs["routing_"] == RoutingControl.WRITE
+
+
+def test_async_driver_is_closed_and_evicted_with_its_loop():
+    """测试异步驱动在所属事件循环结束时被关闭并移出注册表，新的事件循环获得新驱动"""
+    def create_driver(*args, **kwargs):
+        driver = Mock()
+        driver.close = AsyncMock()
+        return driver
+
+    async def acquire():
+        connector = Neo4jConnector(uri="bolt://graph:7687", user="neo4j", password="secret")
+        driver = connector.async_driver
+        assert connector.async_driver is driver
+        assert len(neo4j_connector._async_drivers) == 1
+        return driver
+
+    with patch.object(neo4j_connector.AsyncGraphDatabase, "driver", side_effect=create_driver):
+        first = asyncio.run(acquire())
+        assert first.close.await_count == 1
+        assert len(neo4j_connector._async_drivers) == 0
+
+        second = asyncio.run(acquire())
+        assert second is not first
+        assert second.close.await_count == 1
+        assert len(neo4j_connector._async_drivers) == 0
+
+
+class AsyncRecordingConnector(Neo4jConnector):
+    """记录异步查询并统计同时进行的查询数的连接器"""
+
+    def __init__(self):
+        super().__init__(uri="bolt://graph:7687", user="neo4j", password="secret")
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def execute_query_async(self, query, parameters=None, database=None, access_mode=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+        if "n.id IN $ids" in query:
+            return [{"node": {"id": node_id, "type": "VM"}} for node_id in parameters["ids"]]
+        return [{"b": {"id": f"HOST_{parameters['nodeId']}", "type": "HOST"}}]
+
+
+def test_neighborhood_queries_fan_out_concurrently():
+    """测试多个节点的相邻节点查询在asyncio中并发执行"""
+    connector = AsyncRecordingConnector()
+    graph = GraphData(neo4j_client=connector, use_snapshot=False)
+    dynamic_graph = DynamicGraph(graph_data=graph, influxdb_client=Mock())
+
+    neighborhoods = asyncio.run(dynamic_graph.get_neighborhoods_async(["VM_001", "VM_002", "VM_003"]))
+
+    assert set(neighborhoods) == {"VM_001", "VM_002", "VM_003"}
+    assert neighborhoods["VM_002"]["neighbors"] == [{"id": "HOST_VM_002", "type": "HOST"}]
+    assert connector.max_in_flight == 3
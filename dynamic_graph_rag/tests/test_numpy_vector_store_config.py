@@ -0,0 +1,42 @@
+"""
+测试numpy向量存储默认持久化到输出目录，索引与查询在不同进程中也能共享向量
+"""
+import pytest
+
+from graphrag.config.create_graphrag_config import create_graphrag_config
+from graphrag.vector_stores.base import VectorStoreDocument
+from graphrag.vector_stores.numpy_store import NumpyVectorStore
+
+
+def _config_values(**overrides):
+    values = {
+        "models": {
+            "default_chat_model": {"type": "openai_chat", "model": "gpt-4o", "api_key": "x"},
+            "default_embedding_model": {
+                "type": "openai_embedding", "model": "text-embedding-3-small", "api_key": "x"},
+        },
+        "vector_store": {"default_vector_store": {"type": "numpy"}},
+    }
+    values.update(overrides)
+    return values
+
+
+def test_numpy_db_uri_defaults_to_output_dir(tmp_path):
+    """测试未设置db_uri时默认使用输出目录，写入的向量可被新的存储实例读取"""
+    config = create_graphrag_config(_config_values(), root_dir=str(tmp_path))
+    db_uri = config.vector_store["default_vector_store"].db_uri
+    assert db_uri == str((tmp_path / "output").resolve())
+
+    writer = NumpyVectorStore(collection_name="entities")
+    writer.connect(db_uri=db_uri)
+    writer.load_documents([VectorStoreDocument(id="a", text="a", vector=[1.0, 0.0])])
+
+    reader = NumpyVectorStore(collection_name="entities")
+    reader.connect(db_uri=db_uri)
+    assert reader.search_by_id("a").id == "a"
+
+
+def test_numpy_without_db_uri_fails_for_non_file_output(tmp_path):
+    """测试输出不是文件时必须显式设置db_uri"""
+    with pytest.raises(ValueError, match="numpy vector store"):
+        create_graphrag_config(_config_values(output={"type": "memory"}), root_dir=str(tmp_path))
@@ -0,0 +1,112 @@
+"""
+测试图数据模型生成的Cypher查询都能使用标签索引
+
+静态检查确认所有按ID定位节点的模式都带有标签；
+连接到Neo4j时对每条查询执行EXPLAIN，查询计划中出现AllNodesScan即视为失败。
+"""
+import re
+
+import pytest
+
+from dynamic_graph_rag.config.settings import GRAPH_DB_CONFIG
+from dynamic_graph_rag.db.neo4j_connector import Neo4jConnector
+from dynamic_graph_rag.models.graph_data import GraphData
+
+# 不带标签、按id属性匹配的节点模式，例如 (n {id: $id})
+UNLABELED_ID_PATTERN = re.compile(r'\(\s*\w*\s*\{\s*id\s*:')
+
+
+class RecordingConnector(Neo4jConnector):
+    """记录所有查询而不连接数据库的连接器"""
+
+    def __init__(self):
+        self.database = None
+        self.driver = None
+        self.label_cache = {}
+        self.queries = []
+
+    def execute_query(self, query, parameters=None, database=None):
+        self.queries.append((query, parameters or {}))
+        if "AS label" in query:
+            return [{"id": node_id, "label": "VM"} for node_id in parameters["ids"]]
+        if "count(" in query:
+            return [{"type": "VM", "count": 0}]
+        return []
+
+
+def capture_graph_data_queries():
+    """调用GraphData的所有查询方法并返回生成的查询"""
+    connector = RecordingConnector()
+    graph = GraphData(neo4j_client=connector, use_snapshot=False)
+
+    graph.get_node_by_id("VM_001")
+    graph.get_nodes_by_ids(["VM_001", "HOST_001"])
+    graph.get_nodes_by_type("VM")
+    graph.get_nodes_by_level(4)
+    graph.get_node_relationships("VM_001")
+    graph.get_connected_nodes("VM_001", relationship_type="DEPLOYED_ON")
+    graph.get_node_descendants("VM_001", max_depth=2)
+    graph.get_propagation_graph("VM_001", max_depth=3)
+    graph.get_path_between_nodes("VM_001", "HOST_001", source_type="VM", target_type="HOST")
+    graph.find_subgraph("VM_001", depth=2)
+    graph.get_graph_statistics()
+    graph._load_topology()
+    return connector.queries
+
+
+def test_graph_data_queries_are_labeled():
+    """测试所有按ID定位节点的查询都带有标签"""
+    queries = capture_graph_data_queries()
+
+    assert queries
+    for query, _ in queries:
+        assert not UNLABELED_ID_PATTERN.search(query), query
+
+
+def test_label_resolution_is_cached():
+    """测试节点标签只解析一次"""
+    connector = RecordingConnector()
+    graph = GraphData(neo4j_client=connector, use_snapshot=False)
+
+    graph.get_node_by_id("VM_001")
+    graph.get_connected_nodes("VM_001")
+
+    resolution_queries = [query for query, _ in connector.queries if "AS label" in query]
+    assert len(resolution_queries) == 1
+    assert "(a:`VM` {id: $nodeId})" in connector.queries[-1][0]
+
+
+def test_invalid_node_type_is_rejected():
+    """测试非法的节点类型不会被拼接进查询"""
+    graph = GraphData(neo4j_client=RecordingConnector(), use_snapshot=False)
+
+    with pytest.raises(ValueError):
+        graph.get_nodes_by_type("VM) DETACH DELETE (n")
+
+
+def iter_plan_operators(plan):
+    """深度优先遍历查询计划中的所有算子"""
+    yield plan["operatorType"]
+    for child in plan.get("children", []):
+        yield from iter_plan_operators(child)
+
+
+def test_graph_data_query_plans_avoid_all_nodes_scan():
+    """测试所有查询的执行计划都不包含AllNodesScan"""
+    connector = Neo4jConnector(
+        uri=GRAPH_DB_CONFIG["uri"],
+        user=GRAPH_DB_CONFIG["user"],
+        password=GRAPH_DB_CONFIG["password"],
+        database=GRAPH_DB_CONFIG["database"]
+    )
+    if not connector.verify_connectivity():
+        pytest.skip("Neo4j不可用")
+
+    try:
+        with connector.driver.session(database=connector.database) as session:
+            for query, parameters in capture_graph_data_queries():
+                plan = session.run("EXPLAIN " + query, parameters).consume().plan
+                operators = list(iter_plan_operators(plan))
+                assert not any("AllNodesScan" in operator for operator in operators), (query, operators)
+    finally:
+        connector.close()
@@ -0,0 +1,68 @@
+"""
+测试实体和关系描述摘要
+"""
+import asyncio
+import importlib
+import json
+from unittest.mock import AsyncMock, Mock, patch
+
+import pandas as pd
+
+from graphrag.index.operations.summarize_descriptions import description_summary_extractor
+from graphrag.index.operations.summarize_descriptions.description_summary_extractor import (
+    SummarizationResult,
+    SummarizeExtractor,
+)
+
+# 包的__init__导出了同名函数，按模块路径导入以便替换load_strategy
+summarize_module = importlib.import_module(
+    "graphrag.index.operations.summarize_descriptions.summarize_descriptions"
+)
+
+
+def make_response(content):
+    """构造模型返回对象"""
+    return Mock(output=Mock(content=content))
+
+
+def test_summarize_batch_falls_back_on_malformed_entries():
+    """测试summaries中的非字典条目不会中断流程，缺失的条目逐项摘要"""
+    model = Mock()
+    model.achat = AsyncMock(side_effect=[
+        make_response(json.dumps({"summaries": ["not a summary", {"id": 1, "description": "B summary"}]})),
+        make_response("A summary")
+    ])
+    errors = []
+    extractor = SummarizeExtractor(model_invoker=model, on_error=lambda e, s, d: errors.append(e))
+
+    # 逐项摘要按token数切分输入，这里用字符数代替以免加载分词器
+    with patch.object(description_summary_extractor, "num_tokens_from_string", len):
+        results = asyncio.run(extractor.summarize_batch([
+            ("A", ["a1", "a2"]),
+            ("B", ["b1", "b2"])
+        ]))
+
+    assert [(result.id, result.description) for result in results] == [("A", "A summary"), ("B", "B summary")]
+    assert model.achat.call_count == 2
+    assert not errors
+
+
+def test_items_with_identical_descriptions_are_summarized_separately():
+    """测试描述相同的不同实体各自摘要，摘要中的实体名称不会串用"""
+    async def strategy(id, descriptions, callbacks, cache, config):
+        return SummarizationResult(id=id, description=f"{id}: {' '.join(descriptions)}")
+
+    strategy_exec = AsyncMock(side_effect=strategy)
+    entities = pd.DataFrame({
+        "title": ["ALPHA", "BETA", "GAMMA"],
+        "description": [["shared", "text"], ["shared", "text"], ["only"]]
+    })
+    relationships = pd.DataFrame(columns=["source", "target", "description"])
+
+    with patch.object(summarize_module, "load_strategy", return_value=strategy_exec):
+        entity_descriptions, _ = asyncio.run(summarize_module.summarize_descriptions(
+            entities, relationships, Mock(), Mock()
+        ))
+
+    assert strategy_exec.call_count == 2
+    assert entity_descriptions["description"].tolist() == ["ALPHA: shared text", "BETA: shared text", "only"]
@@ -0,0 +1,142 @@
+"""
+测试拓扑快照缓存
+"""
+import pytest
+from unittest.mock import Mock
+
+from dynamic_graph_rag.models.dynamic_graph import DynamicGraph
+from dynamic_graph_rag.models.graph_data import GraphData
+from dynamic_graph_rag.models.topology_cache import TopologyCache, TopologySnapshot, invalidate_topology_caches
+
+
+NODES = [
+    {"id": "DC_1", "type": "DC"},
+    {"id": "TENANT_1", "type": "TENANT"},
+    {"id": "NE_1", "type": "NE"},
+    {"id": "VM_1", "type": "VM"},
+    {"id": "VM_2", "type": "VM"},
+    {"id": "HOST_1", "type": "HOST"}
+]
+
+EDGES = [
+    {"source": "DC_1", "target": "TENANT_1", "type": "HAS_TENANT"},
+    {"source": "TENANT_1", "target": "NE_1", "type": "HAS_NE"},
+    {"source": "NE_1", "target": "VM_1", "type": "HAS_VM"},
+    {"source": "NE_1", "target": "VM_2", "type": "HAS_VM"},
+    {"source": "VM_1", "target": "HOST_1", "type": "DEPLOYED_ON"},
+    {"source": "VM_2", "target": "HOST_1", "type": "DEPLOYED_ON"}
+]
+
+
+@pytest.fixture
+def snapshot():
+    return TopologySnapshot(NODES, EDGES)
+
+
+def test_neighbors(snapshot):
+    """测试邻居查询的方向和关系类型过滤"""
+    assert {n["id"] for n in snapshot.neighbors("NE_1")} == {"VM_1", "VM_2"}
+    assert {n["id"] for n in snapshot.neighbors("HOST_1", direction="in")} == {"VM_1", "VM_2"}
+    assert {n["id"] for n in snapshot.neighbors("NE_1", "HAS_NE", direction="both")} == {"TENANT_1"}
+
+
+def test_descendants_and_paths(snapshot):
+    """测试下游节点深度和路径枚举"""
+    depths = {n["id"]: n["depth"] for n in snapshot.descendants("TENANT_1", max_depth=3)}
+    assert depths == {"NE_1": 1, "VM_1": 2, "VM_2": 2, "HOST_1": 3}
+    assert sorted(snapshot.paths("NE_1", "HOST_1", max_depth=2)) == [
+        ["NE_1", "VM_1", "HOST_1"],
+        ["NE_1", "VM_2", "HOST_1"]
+    ]
+    assert snapshot.paths("NE_1", "HOST_1", max_depth=1) == []
+
+
+def test_propagation_graph(snapshot):
+    """测试传播图的前驱只包含max_depth-1步内可达的节点"""
+    graph = {n["id"]: (n["depth"], sorted(n["predecessors"]))
+             for n in snapshot.propagation_graph("TENANT_1", max_depth=2)}
+    assert graph == {"NE_1": (1, ["TENANT_1"]), "VM_1": (2, ["NE_1"]), "VM_2": (2, ["NE_1"])}
+    assert sorted(snapshot.propagation_graph("NE_1", max_depth=2)[-1]["predecessors"]) == ["VM_1", "VM_2"]
+
+
+def test_impact_propagation_counts_paths_in_one_pass():
+    """测试影响传播按层动态规划计数路径，且只获取一次传播图"""
+    graph = Mock()
+    graph.get_node_by_id.return_value = {"id": "NE_1", "type": "NE"}
+    graph.get_propagation_graph.return_value = TopologySnapshot(NODES, EDGES).propagation_graph("NE_1", 2)
+    result = DynamicGraph(graph_data=graph, influxdb_client=Mock()).analyze_impact_propagation("NE_1", max_depth=2)
+
+    assert graph.get_propagation_graph.call_count == 1
+    assert {n["id"]: n["paths_from_source"] for n in result["impacted_nodes"]} == {
+        "VM_1": 1, "VM_2": 1, "HOST_1": 2
+    }
+    assert sorted(result["propagation_paths"]) == [
+        ["NE_1", "VM_1"], ["NE_1", "VM_1", "HOST_1"], ["NE_1", "VM_2"], ["NE_1", "VM_2", "HOST_1"]
+    ]
+
+
+def test_subgraph(snapshot):
+    """测试子图只包含深度范围内的节点和边"""
+    subgraph = snapshot.subgraph("VM_1", depth=1)
+    assert {n["id"] for n in subgraph["nodes"]} == {"VM_1", "NE_1", "HOST_1"}
+    assert {(r["source"], r["target"]) for r in subgraph["relationships"]} == {
+        ("NE_1", "VM_1"), ("VM_1", "HOST_1")
+    }
+
+
+def test_graph_data_snapshot_mode_reloads_after_invalidation():
+    """测试快照模式只加载一次拓扑，并在导入失效后重新加载"""
+    client = Mock()
+
+    def execute_query(query, parameters=None):
+        if "count(" in query:
+            return [{"count": 1}]
+        if "properties(n) AS node" in query:
+            return [{"node": node} for node in NODES]
+        return EDGES
+
+    client.execute_query.side_effect = execute_query
+    graph = GraphData(neo4j_client=client, use_snapshot=True, snapshot_ttl=3600)
+
+    assert graph.get_node_by_id("VM_1")["type"] == "VM"
+    assert len(graph.get_connected_nodes("NE_1")) == 2
+    calls_after_load = client.execute_query.call_count
+
+    graph.get_node_descendants("DC_1")
+    assert client.execute_query.call_count == calls_after_load
+
+    invalidate_topology_caches()
+    graph.get_node_by_id("VM_1")
+    assert client.execute_query.call_count > calls_after_load
+
+
+def test_failed_version_probe_does_not_break_loading():
+    """测试首次加载时版本探测失败不影响快照，版本视为未知并在TTL过期后重新加载"""
+    loader = Mock(return_value=(NODES, EDGES))
+    probe = Mock(side_effect=RuntimeError("connection reset"))
+    cache = TopologyCache(loader, ttl=0, version_probe=probe)
+
+    assert cache.get().node_count == len(NODES)
+
+    probe.side_effect = None
+    probe.return_value = 1
+    cache.get()
+    assert loader.call_count == 2
+    cache.get()
+    assert loader.call_count == 2
+
+
+def test_snapshot_reloads_after_max_renewals_when_counts_unchanged():
+    """测试节点数和关系数不变但拓扑已变化时，续期达到上限后强制重新加载"""
+    rewired = [dict(edge, target="VM_2") if edge["source"] == "NE_1" else edge for edge in EDGES]
+    loader = Mock(side_effect=[(NODES, EDGES), (NODES, rewired)])
+    cache = TopologyCache(loader, ttl=0, version_probe=Mock(return_value=(len(NODES), len(EDGES))),
+                          max_renewals=2)
+
+    assert {n["id"] for n in cache.get().neighbors("NE_1")} == {"VM_1", "VM_2"}
+    cache.get()
+    cache.get()
+    assert loader.call_count == 1
+
+    assert {n["id"] for n in cache.get().neighbors("NE_1")} == {"VM_2"}
+    assert loader.call_count == 2
@@ -0,0 +1,96 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""A module containing the 'EmbeddingCache' model."""
+
+import hashlib
+import sqlite3
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+EMBEDDING_CACHE_FILE = "embeddings.sqlite"
+
+# keep each lookup below SQLite's bound-parameter limit
+_LOOKUP_BATCH_SIZE = 500
+
+
+class EmbeddingCache:
+    """Content-addressed cache of embedding vectors.
+
+    Vectors are keyed by (model, sha256 of the text) and stored as packed float32
+    blobs in a SQLite table with that key as its primary key, so a batch of texts is
+    resolved with a handful of indexed queries instead of one JSON document per text.
+    """
+
+    def __init__(self, path: str | Path = ":memory:"):
+        """Init method definition."""
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, key BLOB NOT NULL, vector BLOB NOT NULL, "
+            "PRIMARY KEY (model, key)) WITHOUT ROWID"
+        )
+        self._connection.commit()
+
+    def get_many(self, model: str, texts: Sequence[str]) -> list[list[float] | None]:
+        """Return the cached embedding of each text, or None for cache misses.
+
+        Embeddings are returned as lists of floats, like freshly computed ones.
+        """
+        keys = [text_key(text) for text in texts]
+        found: dict[bytes, list[float]] = {}
+        unique_keys = list(dict.fromkeys(keys))
+        for start in range(0, len(unique_keys), _LOOKUP_BATCH_SIZE):
+            batch = unique_keys[start : start + _LOOKUP_BATCH_SIZE]
+            rows = self._connection.execute(
+                "SELECT key, vector FROM embeddings WHERE model = ? AND key IN "
+                f"({','.join('?' * len(batch))})",
+                [model, *batch],
+            )
+            found.update(
+                (key, np.frombuffer(vector, dtype=np.float32).tolist())
+                for key, vector in rows
+            )
+        return [found.get(key) for key in keys]
+
+    def set_many(
+        self,
+        model: str,
+        texts: Sequence[str],
+        embeddings: Sequence[Sequence[float] | np.ndarray],
+    ) -> None:
+        """Store the embedding of each text."""
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO embeddings (model, key, vector) VALUES (?, ?, ?)",
+            [
+                (model, text_key(text), _pack(embedding))
+                for text, embedding in zip(texts, embeddings, strict=True)
+            ],
+        )
+        self._connection.commit()
+
+    def clear(self) -> None:
+        """Remove every cached embedding."""
+        self._connection.execute("DELETE FROM embeddings")
+        self._connection.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._connection.close()
+
+    def __len__(self) -> int:
+        """Return the number of cached embeddings."""
+        return self._connection.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+
+def text_key(text: str) -> bytes:
+    """Return the content address of a text."""
+    return hashlib.sha256(text.encode("utf-8")).digest()
+
+
+def _pack(embedding: Sequence[float] | np.ndarray) -> bytes:
+    return np.asarray(embedding, dtype=np.float32).tobytes()
@@ -5,6 +5,7 @@
 
 from __future__ import annotations
 
+from pathlib import Path
 from typing import TYPE_CHECKING, ClassVar
 
 from graphrag.config.enums import CacheType
@@ -18,6 +19,7 @@ if TYPE_CHECKING:
 from graphrag.cache.json_pipeline_cache import JsonPipelineCache
 from graphrag.cache.memory_pipeline_cache import InMemoryCache
 from graphrag.cache.noop_pipeline_cache import NoopPipelineCache
+from graphrag.cache.sqlite_pipeline_cache import SQLitePipelineCache
 
 
 class CacheFactory:
@@ -56,6 +58,12 @@ class CacheFactory:
                 return JsonPipelineCache(create_blob_storage(**kwargs))
             case CacheType.cosmosdb:
                 return JsonPipelineCache(create_cosmosdb_storage(**kwargs))
+            case CacheType.sqlite:
+                return SQLitePipelineCache(
+                    Path(root_dir) / kwargs["base_dir"],
+                    max_size_mb=kwargs.get("max_size_mb"),
+                    ttl=kwargs.get("ttl"),
+                )
             case _:
                 if cache_type in cls.cache_types:
                     return cls.cache_types[cache_type](**kwargs)
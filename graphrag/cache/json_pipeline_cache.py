@@ -4,9 +4,12 @@
 """A module containing 'JsonPipelineCache' model."""
 
 import json
+from pathlib import Path
 from typing import Any
 
+from graphrag.cache.embedding_cache import EMBEDDING_CACHE_FILE, EmbeddingCache
 from graphrag.cache.pipeline_cache import PipelineCache
+from graphrag.storage.file_pipeline_storage import FilePipelineStorage
 from graphrag.storage.pipeline_storage import PipelineStorage
 
 
@@ -15,11 +18,13 @@ class JsonPipelineCache(PipelineCache):
 
     _storage: PipelineStorage
     _encoding: str
+    _embedding_cache: EmbeddingCache | None
 
     def __init__(self, storage: PipelineStorage, encoding="utf-8"):
         """Init method definition."""
         self._storage = storage
         self._encoding = encoding
+        self._embedding_cache = None
 
     async def get(self, key: str) -> str | None:
         """Get method definition."""
@@ -58,8 +63,21 @@ class JsonPipelineCache(PipelineCache):
 
     async def clear(self) -> None:
         """Clear method definition."""
+        if self._embedding_cache is not None:
+            self._embedding_cache.close()
+            self._embedding_cache = None
         await self._storage.clear()
 
     def child(self, name: str) -> "JsonPipelineCache":
         """Child method definition."""
         return JsonPipelineCache(self._storage.child(name), encoding=self._encoding)
+
+    def embedding_cache(self) -> EmbeddingCache | None:
+        """Embedding cache method definition, kept alongside local file caches."""
+        if self._embedding_cache is None and isinstance(
+            self._storage, FilePipelineStorage
+        ):
+            self._embedding_cache = EmbeddingCache(
+                Path(self._storage._root_dir) / EMBEDDING_CACHE_FILE  # noqa: SLF001
+            )
+        return self._embedding_cache
@@ -5,6 +5,7 @@
 
 from typing import Any
 
+from graphrag.cache.embedding_cache import EmbeddingCache
 from graphrag.cache.pipeline_cache import PipelineCache
 
 
@@ -13,11 +14,13 @@ class InMemoryCache(PipelineCache):
 
     _cache: dict[str, Any]
     _name: str
+    _embedding_cache: EmbeddingCache | None
 
     def __init__(self, name: str | None = None):
         """Init method definition."""
         self._cache = {}
         self._name = name or ""
+        self._embedding_cache = None
 
     async def get(self, key: str) -> Any:
         """Get the value for the given key.
@@ -68,11 +71,19 @@ class InMemoryCache(PipelineCache):
     async def clear(self) -> None:
         """Clear the storage."""
         self._cache.clear()
+        if self._embedding_cache is not None:
+            self._embedding_cache.clear()
 
     def child(self, name: str) -> PipelineCache:
         """Create a sub cache with the given name."""
         return InMemoryCache(name)
 
+    def embedding_cache(self) -> EmbeddingCache:
+        """Return the in-memory embedding cache."""
+        if self._embedding_cache is None:
+            self._embedding_cache = EmbeddingCache()
+        return self._embedding_cache
+
     def _create_cache_key(self, key: str) -> str:
         """Create a cache key for the given key."""
         return f"{self._name}{key}"
@@ -6,7 +6,25 @@
 from __future__ import annotations
 
 from abc import ABCMeta, abstractmethod
-from typing import Any
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from graphrag.cache.embedding_cache import EmbeddingCache
+
+
+@dataclass
+class CacheStats:
+    """Counters of cache activity."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+    """Entries removed to keep the cache within its size bound."""
+
+    expirations: int = 0
+    """Entries found older than the cache TTL and removed."""
 
 
 class PipelineCache(metaclass=ABCMeta):
@@ -65,3 +83,15 @@ class PipelineCache(metaclass=ABCMeta):
         Args:
             - name - The name to create the sub cache with.
         """
+
+    def embedding_cache(self) -> EmbeddingCache | None:
+        """Return the binary embedding cache that accompanies this cache, if any.
+
+        Caches that cannot keep one (e.g. remote or no-op caches) return None, in
+        which case embeddings are cached per request through `get`/`set` only.
+        """
+        return None
+
+    def stats(self) -> CacheStats | None:
+        """Return the activity counters shared with child caches, if any are kept."""
+        return None
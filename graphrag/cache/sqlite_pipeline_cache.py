@@ -0,0 +1,246 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""A module containing 'SQLitePipelineCache' model."""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from graphrag.cache.embedding_cache import EMBEDDING_CACHE_FILE, EmbeddingCache
+from graphrag.cache.pipeline_cache import CacheStats, PipelineCache
+
+CACHE_FILE = "cache.sqlite"
+
+# once over the size bound, evict down to this fraction of it so evictions batch up
+_EVICTION_TARGET = 0.9
+_EVICTION_BATCH_SIZE = 1000
+
+
+class _CacheDatabase:
+    """The database, size accounting and counters shared by a cache and its children."""
+
+    def __init__(self, path: Path, max_size_mb: float | None, ttl: float | None):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_size = int(max_size_mb * 1024 * 1024) if max_size_mb else None
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self.lock = threading.Lock()
+        self.embedding_cache: EmbeddingCache | None = None
+        self.connection = sqlite3.connect(str(path), check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)"
+        )
+        self.connection.commit()
+        self.size = self.total_size()
+
+    def total_size(self) -> int:
+        """Return the summed size of the stored entries."""
+        return self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+    def file_size(self) -> int:
+        """Return the on-disk size of the database, including its write-ahead log."""
+        wal = self.path.with_name(f"{self.path.name}-wal")
+        return self.path.stat().st_size + (wal.stat().st_size if wal.exists() else 0)
+
+    def expired(self, created: float, now: float) -> bool:
+        return self.ttl is not None and now - created > self.ttl
+
+    def remove_expired(self) -> int:
+        """Remove every entry older than the TTL."""
+        if self.ttl is None:
+            return 0
+        removed = self.connection.execute(
+            "DELETE FROM entries WHERE created < ?", (time.time() - self.ttl,)
+        ).rowcount
+        self.stats.expirations += removed
+        self.size = self.total_size()
+        return removed
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache is within its bound."""
+        if self.max_size is None or self.size <= self.max_size:
+            return 0
+        target = self.max_size * _EVICTION_TARGET
+        evicted = 0
+        while self.size > target:
+            rows = self.connection.execute(
+                "SELECT key, size FROM entries ORDER BY accessed LIMIT ?",
+                (_EVICTION_BATCH_SIZE,),
+            ).fetchall()
+            if not rows:
+                break
+            keys = []
+            for key, size in rows:
+                keys.append((key,))
+                self.size -= size
+                if self.size <= target:
+                    break
+            self.connection.executemany("DELETE FROM entries WHERE key = ?", keys)
+            evicted += len(keys)
+        self.stats.evictions += evicted
+        return evicted
+
+
+class SQLitePipelineCache(PipelineCache):
+    """Single-file pipeline cache with size-bounded LRU and optional TTL eviction.
+
+    A cache and all of its children share one SQLite database under `base_dir` (child
+    names become key prefixes), so the cache holds one file however many entries it
+    has. Once the stored entries exceed `max_size_mb` the least recently read or
+    written ones are evicted, and entries older than `ttl` seconds count as misses.
+    """
+
+    _db: _CacheDatabase
+    _prefix: str
+
+    def __init__(
+        self,
+        base_dir: str | Path,
+        max_size_mb: float | None = None,
+        ttl: float | None = None,
+    ):
+        """Init method definition."""
+        self._db = _CacheDatabase(Path(base_dir) / CACHE_FILE, max_size_mb, ttl)
+        self._prefix = ""
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}{key}"
+
+    async def get(self, key: str) -> Any:
+        """Get method definition."""
+        db = self._db
+        now = time.time()
+        with db.lock:
+            row = db.connection.execute(
+                "SELECT value, size, created FROM entries WHERE key = ?",
+                (self._key(key),),
+            ).fetchone()
+            if row is not None and db.expired(row[2], now):
+                db.connection.execute(
+                    "DELETE FROM entries WHERE key = ?", (self._key(key),)
+                )
+                db.connection.commit()
+                db.size -= row[1]
+                db.stats.expirations += 1
+                row = None
+            if row is None:
+                db.stats.misses += 1
+                return None
+            db.connection.execute(
+                "UPDATE entries SET accessed = ? WHERE key = ?", (now, self._key(key))
+            )
+            db.connection.commit()
+            db.stats.hits += 1
+        return json.loads(row[0]).get("result")
+
+    async def set(self, key: str, value: Any, debug_data: dict | None = None) -> None:
+        """Set method definition."""
+        if value is None:
+            return
+        data = json.dumps(
+            {"result": value, **(debug_data or {})}, ensure_ascii=False
+        ).encode("utf-8")
+        db = self._db
+        now = time.time()
+        with db.lock:
+            previous = db.connection.execute(
+                "SELECT size FROM entries WHERE key = ?", (self._key(key),)
+            ).fetchone()
+            db.connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self._key(key), data, len(data), now, now),
+            )
+            db.size += len(data) - (previous[0] if previous else 0)
+            db.stats.writes += 1
+            db.evict()
+            db.connection.commit()
+
+    async def has(self, key: str) -> bool:
+        """Has method definition."""
+        with self._db.lock:
+            row = self._db.connection.execute(
+                "SELECT created FROM entries WHERE key = ?", (self._key(key),)
+            ).fetchone()
+        return row is not None and not self._db.expired(row[0], time.time())
+
+    async def delete(self, key: str) -> None:
+        """Delete method definition."""
+        db = self._db
+        with db.lock:
+            row = db.connection.execute(
+                "SELECT size FROM entries WHERE key = ?", (self._key(key),)
+            ).fetchone()
+            if row is not None:
+                db.connection.execute(
+                    "DELETE FROM entries WHERE key = ?", (self._key(key),)
+                )
+                db.connection.commit()
+                db.size -= row[0]
+
+    async def clear(self) -> None:
+        """Clear method definition."""
+        db = self._db
+        with db.lock:
+            db.connection.execute(
+                "DELETE FROM entries WHERE substr(key, 1, ?) = ?",
+                (len(self._prefix), self._prefix),
+            )
+            db.connection.commit()
+            db.size = db.total_size()
+            if not self._prefix and db.embedding_cache is not None:
+                db.embedding_cache.clear()
+
+    def child(self, name: str) -> "SQLitePipelineCache":
+        """Child method definition."""
+        child = SQLitePipelineCache.__new__(SQLitePipelineCache)
+        child._db = self._db
+        child._prefix = f"{self._prefix}{name}/"
+        return child
+
+    def stats(self) -> CacheStats:
+        """Stats method definition."""
+        return self._db.stats
+
+    def embedding_cache(self) -> EmbeddingCache:
+        """Embedding cache method definition, kept next to the cache database."""
+        db = self._db
+        if db.embedding_cache is None:
+            db.embedding_cache = EmbeddingCache(db.path.parent / EMBEDDING_CACHE_FILE)
+        return db.embedding_cache
+
+    def compact(self) -> dict[str, int]:
+        """Remove expired entries, evict down to the size bound and reclaim free pages.
+
+        Returns the number of entries removed and the database size before and after.
+        """
+        db = self._db
+        with db.lock:
+            size_before = db.file_size()
+            expired = db.remove_expired()
+            evicted = db.evict()
+            db.connection.commit()
+            db.connection.execute("VACUUM")
+            db.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            return {
+                "expired": expired,
+                "evicted": evicted,
+                "entries": db.connection.execute(
+                    "SELECT COUNT(*) FROM entries"
+                ).fetchone()[0],
+                "size_before": size_before,
+                "size_after": db.file_size(),
+            }
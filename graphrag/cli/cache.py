@@ -0,0 +1,31 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""CLI implementation of the cache subcommands."""
+
+from pathlib import Path
+
+from graphrag.cache.sqlite_pipeline_cache import SQLitePipelineCache
+from graphrag.config.load_config import load_config
+from graphrag.logger.print_progress import PrintProgressLogger
+from graphrag.utils.api import create_cache_from_config
+
+logger = PrintProgressLogger("")
+
+
+def compact_cli(root_dir: Path, config_filepath: Path | None) -> None:
+    """Compact the pipeline cache: drop expired entries, evict to size and vacuum."""
+    config = load_config(root_dir.resolve(), config_filepath)
+    cache = create_cache_from_config(config.cache, config.root_dir)
+    if not isinstance(cache, SQLitePipelineCache):
+        msg = f"cache compaction requires cache.type == sqlite, got {config.cache.type}"
+        raise ValueError(msg)
+
+    result = cache.compact()
+    megabytes_before = result["size_before"] / 2**20
+    megabytes_after = result["size_after"] / 2**20
+    logger.success(
+        f"Compacted cache: removed {result['expired']} expired and "
+        f"{result['evicted']} evicted entries, {result['entries']} remaining, "
+        f"{megabytes_before:.1f} MB -> {megabytes_after:.1f} MB"
+    )
@@ -23,6 +23,8 @@ app = typer.Typer(
     help="GraphRAG: A graph-based retrieval-augmented generation (RAG) system.",
     no_args_is_help=True,
 )
+cache_app = typer.Typer(help="Manage the pipeline cache.", no_args_is_help=True)
+app.add_typer(cache_app, name="cache")
 
 
 # A workaround for typer's lack of support for proper autocompletion of file/directory paths
@@ -483,3 +485,114 @@ def _query_cli(
             )
         case _:
             raise ValueError(INVALID_METHOD_ERROR)
+
+
+@app.command("serve")
+def _serve_cli(
+    config: Annotated[
+        Path | None,
+        typer.Option(
+            help="The configuration to use.",
+            exists=True,
+            file_okay=True,
+            readable=True,
+            autocompletion=path_autocomplete(
+                file_okay=True, dir_okay=False, match_wildcard="*"
+            ),
+        ),
+    ] = None,
+    data: Annotated[
+        Path | None,
+        typer.Option(
+            help="Indexing pipeline output directory (i.e. contains the parquet files).",
+            exists=True,
+            dir_okay=True,
+            readable=True,
+            resolve_path=True,
+            autocompletion=path_autocomplete(
+                file_okay=False, dir_okay=True, match_wildcard="*"
+            ),
+        ),
+    ] = None,
+    root: Annotated[
+        Path,
+        typer.Option(
+            help="The project root directory.",
+            exists=True,
+            dir_okay=True,
+            writable=True,
+            resolve_path=True,
+            autocompletion=path_autocomplete(
+                file_okay=False, dir_okay=True, match_wildcard="*"
+            ),
+        ),
+    ] = Path(),  # set default to current directory
+    host: Annotated[
+        str, typer.Option(help="The host interface to listen on.")
+    ] = "127.0.0.1",
+    port: Annotated[int, typer.Option(help="The TCP port to listen on.")] = 8765,
+    socket: Annotated[
+        Path | None,
+        typer.Option(help="Listen on this Unix socket instead of a TCP port."),
+    ] = None,
+    community_level: Annotated[
+        int,
+        typer.Option(
+            help="The default community level in the Leiden community hierarchy from which to load community reports. Queries can override it."
+        ),
+    ] = 2,
+    response_type: Annotated[
+        str,
+        typer.Option(
+            help="The default free form response type, e.g. Multiple Paragraphs. Queries can override it."
+        ),
+    ] = "Multiple Paragraphs",
+    refresh_interval: Annotated[
+        float,
+        typer.Option(
+            help="Minimum number of seconds between checks of the index storage timestamps for changes."
+        ),
+    ] = 5.0,
+):
+    """Serve queries from a resident query engine that keeps the index loaded."""
+    from graphrag.cli.serve import run_server
+
+    run_server(
+        config_filepath=config,
+        data_dir=data,
+        root_dir=root,
+        host=host,
+        port=port,
+        socket_path=socket,
+        community_level=community_level,
+        response_type=response_type,
+        refresh_interval=refresh_interval,
+    )
+
+
+@cache_app.command("compact")
+def _cache_compact_cli(
+    config: Annotated[
+        Path | None,
+        typer.Option(
+            help="The configuration to use.", exists=True, file_okay=True, readable=True
+        ),
+    ] = None,
+    root: Annotated[
+        Path,
+        typer.Option(
+            help="The project root directory.",
+            exists=True,
+            dir_okay=True,
+            writable=True,
+            resolve_path=True,
+            autocompletion=path_autocomplete(
+                file_okay=False, dir_okay=True, match_wildcard="*"
+            ),
+        ),
+    ] = Path(),  # set default to current directory
+):
+    """Compact a sqlite pipeline cache and reclaim its disk space."""
+    from graphrag.cli.cache import compact_cli
+
+    compact_cli(root_dir=root, config_filepath=config)
@@ -0,0 +1,456 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""CLI implementation of the serve subcommand.
+
+Runs a long-lived query service that loads the index once and keeps the
+search engines (and their context builders) resident between queries.
+Requests are JSON over a minimal HTTP/1.1 interface, on a TCP port or a
+Unix socket:
+
+ - GET /health: service status and the storage timestamps of the loaded tables.
+ - POST /reload: reload the index tables now.
+ - POST /query: run a query, e.g. {"method": "local", "query": "..."}.
+"""
+
+import asyncio
+import copy
+import json
+import logging
+import time
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from graphrag.config.embeddings import (
+    community_full_content_embedding,
+    entity_description_embedding,
+    text_unit_text_embedding,
+)
+from graphrag.config.enums import SearchMethod
+from graphrag.config.load_config import load_config
+from graphrag.config.models.graph_rag_config import GraphRagConfig
+from graphrag.logger.print_progress import PrintProgressLogger
+from graphrag.query.factory import (
+    get_basic_search_engine,
+    get_drift_search_engine,
+    get_global_search_engine,
+    get_local_search_engine,
+)
+from graphrag.query.indexer_adapters import (
+    read_indexer_communities,
+    read_indexer_covariates,
+    read_indexer_entities,
+    read_indexer_relationships,
+    read_indexer_report_embeddings,
+    read_indexer_reports,
+    read_indexer_text_units,
+)
+from graphrag.query.structured_search.base import BaseSearch, SearchResult
+from graphrag.query.structured_search.drift_search.search import DRIFTSearch
+from graphrag.query.structured_search.drift_search.state import QueryState
+from graphrag.utils.api import (
+    create_storage_from_config,
+    get_embedding_store,
+    load_search_prompt,
+)
+from graphrag.utils.storage import load_table_from_storage, storage_has_table
+
+log = logging.getLogger(__name__)
+logger = PrintProgressLogger("")
+
+INDEX_TABLES = [
+    "entities",
+    "communities",
+    "community_reports",
+    "text_units",
+    "relationships",
+]
+OPTIONAL_INDEX_TABLES = ["covariates"]
+
+MAX_REQUEST_BYTES = 1024 * 1024
+
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class QueryService:
+    """Keeps index tables, search engines and context builders resident between queries.
+
+    Tables are reloaded when their storage timestamps change (checked at most every
+    `refresh_interval` seconds). Engines are built lazily per method and query
+    options, and shared by concurrent queries.
+    """
+
+    def __init__(
+        self,
+        config: GraphRagConfig,
+        community_level: int | None = 2,
+        response_type: str = "Multiple Paragraphs",
+        refresh_interval: float = 5.0,
+    ):
+        self.config = config
+        self.community_level = community_level
+        self.response_type = response_type
+        self.refresh_interval = refresh_interval
+        self.storage = create_storage_from_config(config.output)
+        self.versions: dict[str, str] = {}
+        self._tables: dict[str, pd.DataFrame | None] = {}
+        self._cache: dict[tuple, Any] = {}
+        self._lock = asyncio.Lock()
+        self._last_check = 0.0
+
+    async def load(self, versions: dict[str, str] | None = None) -> None:
+        """(Re)load the index tables and drop every engine built from older tables."""
+        versions = versions or await self._storage_versions()
+        tables: dict[str, pd.DataFrame | None] = {}
+        for name in INDEX_TABLES:
+            tables[name] = await load_table_from_storage(
+                name=name, storage=self.storage
+            )
+        for name in OPTIONAL_INDEX_TABLES:
+            tables[name] = (
+                await load_table_from_storage(name=name, storage=self.storage)
+                if name in versions
+                else None
+            )
+        self._tables = tables
+        self._cache = {}
+        self.versions = versions
+        self._last_check = time.monotonic()
+        logger.success(f"Loaded index tables: {', '.join(sorted(versions))}")
+
+    async def refresh(self, force: bool = False) -> bool:
+        """Reload the index if forced or if any table changed in storage."""
+        if not force and time.monotonic() - self._last_check < self.refresh_interval:
+            return False
+        async with self._lock:
+            versions = await self._storage_versions()
+            self._last_check = time.monotonic()
+            if not force and versions == self.versions:
+                return False
+            await self.load(versions)
+            return True
+
+    async def search(
+        self,
+        method: SearchMethod,
+        query: str,
+        community_level: int | None = None,
+        response_type: str | None = None,
+        dynamic_community_selection: bool = False,
+    ) -> SearchResult:
+        """Answer a query with a resident search engine."""
+        await self.refresh()
+        key = (
+            method,
+            self.community_level if community_level is None else community_level,
+            response_type or self.response_type,
+            dynamic_community_selection,
+        )
+        engine = self._cache.get(key)
+        if engine is None:
+            async with self._lock:
+                engine = self._cache.get(key)
+                if engine is None:
+                    # reading tables into data objects is slow, keep the loop free
+                    engine = await asyncio.to_thread(self._create_engine, *key)
+                    self._cache[key] = engine
+        if isinstance(engine, DRIFTSearch):
+            # DRIFT keeps its search graph on the engine, give every query its own
+            engine = copy.copy(engine)
+            engine.query_state = QueryState()
+        return await engine.search(query=query)
+
+    async def _storage_versions(self) -> dict[str, str]:
+        versions = {}
+        for name in INDEX_TABLES + OPTIONAL_INDEX_TABLES:
+            if await storage_has_table(name, self.storage):
+                versions[name] = await self.storage.get_creation_date(f"{name}.parquet")
+        return versions
+
+    def _cached(self, key: tuple, create: Callable[[], Any]) -> Any:
+        """Share data objects and vector stores between the engines of one index version."""
+        if key not in self._cache:
+            self._cache[key] = create()
+        return self._cache[key]
+
+    def _embedding_store(self, embedding_name: str):
+        vector_store_args = {
+            index: store.model_dump()
+            for index, store in self.config.vector_store.items()
+        }
+        return self._cached(
+            ("vector_store", embedding_name),
+            lambda: get_embedding_store(
+                config_args=vector_store_args, embedding_name=embedding_name
+            ),
+        )
+
+    def _create_engine(
+        self,
+        method: SearchMethod,
+        community_level: int | None,
+        response_type: str,
+        dynamic_community_selection: bool,
+    ) -> BaseSearch:
+        config = self.config
+        tables = self._tables
+        text_units = self._cached(
+            ("text_units",), lambda: read_indexer_text_units(tables["text_units"])
+        )
+        if method == SearchMethod.BASIC:
+            return get_basic_search_engine(
+                config=config,
+                text_units=text_units,
+                text_unit_embeddings=self._embedding_store(text_unit_text_embedding),
+                system_prompt=load_search_prompt(
+                    config.root_dir, config.basic_search.prompt
+                ),
+            )
+
+        entities = self._cached(
+            ("entities", community_level),
+            lambda: read_indexer_entities(
+                tables["entities"], tables["communities"], community_level
+            ),
+        )
+        if method == SearchMethod.GLOBAL:
+            return get_global_search_engine(
+                config,
+                reports=read_indexer_reports(
+                    tables["community_reports"],
+                    tables["communities"],
+                    community_level=community_level,
+                    dynamic_community_selection=dynamic_community_selection,
+                ),
+                entities=entities,
+                communities=self._cached(
+                    ("communities",),
+                    lambda: read_indexer_communities(
+                        tables["communities"], tables["community_reports"]
+                    ),
+                ),
+                response_type=response_type,
+                dynamic_community_selection=dynamic_community_selection,
+                map_system_prompt=load_search_prompt(
+                    config.root_dir, config.global_search.map_prompt
+                ),
+                reduce_system_prompt=load_search_prompt(
+                    config.root_dir, config.global_search.reduce_prompt
+                ),
+                general_knowledge_inclusion_prompt=load_search_prompt(
+                    config.root_dir, config.global_search.knowledge_prompt
+                ),
+            )
+
+        relationships = self._cached(
+            ("relationships",),
+            lambda: read_indexer_relationships(tables["relationships"]),
+        )
+        description_embedding_store = self._embedding_store(
+            entity_description_embedding
+        )
+        if method == SearchMethod.LOCAL:
+            covariates = tables.get("covariates")
+            return get_local_search_engine(
+                config=config,
+                reports=read_indexer_reports(
+                    tables["community_reports"], tables["communities"], community_level
+                ),
+                text_units=text_units,
+                entities=entities,
+                relationships=relationships,
+                covariates={
+                    "claims": read_indexer_covariates(covariates)
+                    if covariates is not None
+                    else []
+                },
+                description_embedding_store=description_embedding_store,
+                response_type=response_type,
+                system_prompt=load_search_prompt(
+                    config.root_dir, config.local_search.prompt
+                ),
+            )
+
+        if method == SearchMethod.DRIFT:
+            reports = read_indexer_reports(
+                tables["community_reports"], tables["communities"], community_level
+            )
+            read_indexer_report_embeddings(
+                reports, self._embedding_store(community_full_content_embedding)
+            )
+            return get_drift_search_engine(
+                config=config,
+                reports=reports,
+                text_units=text_units,
+                entities=entities,
+                relationships=relationships,
+                description_embedding_store=description_embedding_store,
+                local_system_prompt=load_search_prompt(
+                    config.root_dir, config.drift_search.prompt
+                ),
+                reduce_system_prompt=load_search_prompt(
+                    config.root_dir, config.drift_search.reduce_prompt
+                ),
+                response_type=response_type,
+            )
+
+        msg = f"Unsupported search method: {method}"
+        raise ValueError(msg)
+
+
+def _to_json_records(value: Any) -> Any:
+    """Convert context data (DataFrames, lists or dicts of them) to JSON-ready values."""
+    if isinstance(value, pd.DataFrame):
+        return value.to_dict(orient="records")
+    if isinstance(value, dict):
+        return {key: _to_json_records(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_to_json_records(item) for item in value]
+    return value
+
+
+async def handle_request(
+    service: QueryService, method: str, path: str, body: bytes
+) -> tuple[int, dict[str, Any]]:
+    """Route one request to the query service and return (status, JSON payload)."""
+    if path == "/health":
+        return 200, {"status": "ok", "tables": service.versions}
+    if path not in ("/reload", "/query"):
+        return 404, {"error": f"unknown path {path}"}
+    if method != "POST":
+        return 405, {"error": f"{method} {path} is not supported"}
+    if path == "/reload":
+        await service.refresh(force=True)
+        return 200, {"status": "reloaded", "tables": service.versions}
+
+    try:
+        request = json.loads(body or b"{}")
+        search_method = SearchMethod(request["method"])
+        query = str(request["query"])
+        community_level = request.get("community_level")
+        if community_level is not None:
+            community_level = int(community_level)
+        response_type = request.get("response_type")
+        dynamic_community_selection = bool(
+            request.get("dynamic_community_selection", False)
+        )
+    except (ValueError, KeyError, TypeError) as e:
+        return 400, {"error": f"invalid query request: {e}"}
+
+    result = await service.search(
+        search_method,
+        query,
+        community_level=community_level,
+        response_type=response_type,
+        dynamic_community_selection=dynamic_community_selection,
+    )
+    return 200, {
+        "response": result.response,
+        "context_data": _to_json_records(result.context_data),
+        "completion_time": result.completion_time,
+        "llm_calls": result.llm_calls,
+        "prompt_tokens": result.prompt_tokens,
+        "output_tokens": result.output_tokens,
+    }
+
+
+async def _handle_connection(
+    service: QueryService, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    """Serve a single HTTP/1.1 request per connection."""
+    try:
+        request_line = (await reader.readline()).decode("latin-1").split()
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if len(request_line) < 2:
+            status, payload = 400, {"error": "malformed request line"}
+        elif int(headers.get("content-length", 0)) > MAX_REQUEST_BYTES:
+            status, payload = 413, {"error": "request body too large"}
+        else:
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            method, target = request_line[0].upper(), request_line[1]
+            try:
+                status, payload = await handle_request(
+                    service, method, target.split("?", 1)[0], body
+                )
+            except Exception as e:
+                log.exception("error serving %s %s", method, target)
+                status, payload = 500, {"error": str(e)}
+        content = json.dumps(payload, default=str).encode("utf-8")
+        writer.write(
+            (
+                f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(content)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("latin-1")
+            + content
+        )
+        await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        log.warning("dropping malformed or interrupted connection")
+    finally:
+        writer.close()
+
+
+async def serve(
+    service: QueryService,
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    socket_path: Path | None = None,
+) -> None:
+    """Load the index and serve queries until cancelled."""
+    await service.load()
+    handler = partial(_handle_connection, service)
+    if socket_path is not None:
+        server = await asyncio.start_unix_server(handler, path=str(socket_path))
+        address = f"unix://{socket_path}"
+    else:
+        server = await asyncio.start_server(handler, host, port)
+        address = f"http://{host}:{port}"
+    logger.success(f"Query service listening on {address}")
+    async with server:
+        await server.serve_forever()
+
+
+def run_server(
+    config_filepath: Path | None,
+    data_dir: Path | None,
+    root_dir: Path,
+    host: str,
+    port: int,
+    socket_path: Path | None,
+    community_level: int | None,
+    response_type: str,
+    refresh_interval: float,
+):
+    """Run the query service for a single index."""
+    root = root_dir.resolve()
+    cli_overrides = {}
+    if data_dir:
+        cli_overrides["output.base_dir"] = str(data_dir)
+    config = load_config(root, config_filepath, cli_overrides)
+    if config.outputs:
+        msg = "graphrag serve does not support multi-index configurations yet"
+        raise ValueError(msg)
+
+    service = QueryService(
+        config,
+        community_level=community_level,
+        response_type=response_type,
+        refresh_interval=refresh_interval,
+    )
+    asyncio.run(serve(service, host=host, port=port, socket_path=socket_path))
@@ -62,6 +62,8 @@ class CacheDefaults:
     container_name: None = None
     storage_account_blob_url: None = None
     cosmosdb_account_url: None = None
+    max_size_mb: None = None
+    ttl: None = None
 
 
 @dataclass
@@ -84,6 +86,7 @@ class ClusterGraphDefaults:
     max_cluster_size: int = 10
     use_lcc: bool = True
     seed: int = 0xDEADBEEF
+    incremental: bool = False
 
 
 @dataclass
@@ -364,6 +367,7 @@ class SummarizeDescriptionsDefaults:
 
     prompt: None = None
     max_length: int = 500
+    batch_size: int = 1
     strategy: None = None
     model_id: str = DEFAULT_CHAT_MODEL_ID
 
@@ -398,6 +402,9 @@ class VectorStoreDefaults:
     api_key: None = None
     audience: None = None
     database_name: None = None
+    nlist: int = 1024
+    nprobe: int = 16
+    rerank: int = 32
 
 
 @dataclass
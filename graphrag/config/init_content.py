@@ -76,7 +76,7 @@ output:
   base_dir: "{graphrag_config_defaults.output.base_dir}"
     
 cache:
-  type: {graphrag_config_defaults.cache.type.value} # [file, blob, cosmosdb]
+  type: {graphrag_config_defaults.cache.type.value} # [file, blob, cosmosdb, sqlite]
   base_dir: "{graphrag_config_defaults.cache.base_dir}"
 
 reporting:
@@ -36,3 +36,11 @@ class CacheConfig(BaseModel):
         description="The cosmosdb account url to use.",
         default=graphrag_config_defaults.cache.cosmosdb_account_url,
     )
+    max_size_mb: float | None = Field(
+        description="The maximum cache size in megabytes when type == sqlite; least recently used entries are evicted beyond it.",
+        default=graphrag_config_defaults.cache.max_size_mb,
+    )
+    ttl: float | None = Field(
+        description="The number of seconds cache entries stay valid when type == sqlite.",
+        default=graphrag_config_defaults.cache.ttl,
+    )
@@ -23,3 +23,7 @@ class ClusterGraphConfig(BaseModel):
         description="The seed to use for the clustering.",
         default=graphrag_config_defaults.cluster_graph.seed,
     )
+    incremental: bool = Field(
+        description="Whether update runs recluster only the communities touched by new or changed relationships and regenerate only their reports.",
+        default=graphrag_config_defaults.cluster_graph.incremental,
+    )
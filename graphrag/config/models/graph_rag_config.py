@@ -290,6 +290,21 @@ class GraphRagConfig(BaseModel):
                     msg = "Vector store URI is required for LanceDB. Please rerun `graphrag init` and set the vector store configuration."
                     raise ValueError(msg)
                 store.db_uri = str((Path(self.root_dir) / store.db_uri).resolve())
+            elif store.type == VectorStoreType.NumPy:
+                # the numpy store is persisted next to the output tables by default,
+                # so that `graphrag query` can read what indexing wrote
+                if not store.db_uri and self.output.type == defs.OutputType.file:
+                    store.db_uri = self.output.base_dir
+                if not store.db_uri or store.db_uri.strip() == "":
+                    msg = "Vector store URI is required for the numpy vector store when output is not file-based. Please set vector_store.db_uri."
+                    raise ValueError(msg)
+                store.db_uri = str((Path(self.root_dir) / store.db_uri).resolve())
+            elif store.type == VectorStoreType.IVF:
+                # the ivf index is persisted next to the output tables by default
+                if not store.db_uri and self.output.type == defs.OutputType.file:
+                    store.db_uri = self.output.base_dir
+                if store.db_uri:
+                    store.db_uri = str((Path(self.root_dir) / store.db_uri).resolve())
 
     def get_language_model_config(self, model_id: str) -> LanguageModelConfig:
         """Get a model configuration by ID.
@@ -26,6 +26,10 @@ class SummarizeDescriptionsConfig(BaseModel):
         description="The description summarization maximum length.",
         default=graphrag_config_defaults.summarize_descriptions.max_length,
     )
+    batch_size: int = Field(
+        description="The number of small summarization jobs packed into one prompt; 1 disables packing.",
+        default=graphrag_config_defaults.summarize_descriptions.batch_size,
+    )
     strategy: dict | None = Field(
         description="The override strategy to use.",
         default=graphrag_config_defaults.summarize_descriptions.strategy,
@@ -49,4 +53,5 @@ class SummarizeDescriptionsConfig(BaseModel):
             if self.prompt
             else None,
             "max_summary_length": self.max_length,
+            "batch_size": self.batch_size,
         }
@@ -29,10 +29,12 @@ class VectorStoreConfig(BaseModel):
         ):
             self.db_uri = vector_store_defaults.db_uri
 
-        if self.type != VectorStoreType.LanceDB.value and (
-            self.db_uri is not None and self.db_uri.strip() != ""
-        ):
-            msg = "vector_store.db_uri is only used when vector_store.type == lancedb. Please rerun `graphrag init` and select the correct vector store type."
+        if self.type not in (
+            VectorStoreType.LanceDB.value,
+            VectorStoreType.NumPy.value,
+            VectorStoreType.IVF.value,
+        ) and (self.db_uri is not None and self.db_uri.strip() != ""):
+            msg = "vector_store.db_uri is only used when vector_store.type == lancedb, numpy or ivf. Please rerun `graphrag init` and select the correct vector store type."
             raise ValueError(msg)
 
     url: str | None = Field(
@@ -54,7 +56,11 @@ class VectorStoreConfig(BaseModel):
             msg = "vector_store.url is required when vector_store.type == cosmos_db. Please rerun `graphrag init` and select the correct vector store type."
             raise ValueError(msg)
 
-        if self.type == VectorStoreType.LanceDB and (
+        if self.type in (
+            VectorStoreType.LanceDB,
+            VectorStoreType.NumPy,
+            VectorStoreType.IVF,
+        ) and (
             self.url is not None and self.url.strip() != ""
         ):
             msg = "vector_store.url is only used when vector_store.type == azure_ai_search or vector_store.type == cosmos_db. Please rerun `graphrag init` and select the correct vector store type."
@@ -85,6 +91,21 @@ class VectorStoreConfig(BaseModel):
         default=vector_store_defaults.overwrite,
     )
 
+    nlist: int = Field(
+        description="The number of inverted lists when type == ivf.",
+        default=vector_store_defaults.nlist,
+    )
+
+    nprobe: int = Field(
+        description="The number of inverted lists searched per query when type == ivf.",
+        default=vector_store_defaults.nprobe,
+    )
+
+    rerank: int = Field(
+        description="The number of candidates re-scored exactly per result when type == ivf.",
+        default=vector_store_defaults.rerank,
+    )
+
     @model_validator(mode="after")
     def _validate_model(self):
         """Validate the model."""
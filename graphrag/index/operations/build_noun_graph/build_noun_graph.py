@@ -3,8 +3,7 @@
 
 """Graph extraction using NLP."""
 
-import math
-
+import numpy as np
 import pandas as pd
 
 from graphrag.cache.noop_pipeline_cache import NoopPipelineCache
@@ -92,46 +91,37 @@ def _extract_edges(
     Input: nodes_df with schema [id, title, frequency, text_unit_ids]
     Returns: edges_df with schema [source, target, weight, text_unit_ids]
     """
-    text_units_df = nodes_df.explode("text_unit_ids")
-    text_units_df = text_units_df.rename(columns={"text_unit_ids": "text_unit_id"})
-    text_units_df = (
-        text_units_df.groupby("text_unit_id").agg({"title": list}).reset_index()
-    )
-    text_units_df["edges"] = text_units_df["title"].apply(
-        lambda x: _create_relationships(x)
-    )
-    edge_df = text_units_df.explode("edges").loc[:, ["edges", "text_unit_id"]]
+    occurrences = nodes_df.loc[:, ["title", "text_unit_ids"]].explode("text_unit_ids")
+    occurrences = occurrences.loc[occurrences["text_unit_ids"].notna()]
 
-    edge_df["source"] = edge_df["edges"].apply(
-        lambda x: x[0] if isinstance(x, tuple) else None
+    # integer-encode phrases in sorted order, so a smaller code is a smaller title
+    titles, phrase_codes = np.unique(
+        occurrences["title"].to_numpy(dtype=str), return_inverse=True
     )
-    edge_df["target"] = edge_df["edges"].apply(
-        lambda x: x[1] if isinstance(x, tuple) else None
+    text_unit_codes, text_unit_ids = pd.factorize(
+        occurrences["text_unit_ids"], sort=True
     )
-    edge_df = edge_df[(edge_df.source.notna()) & (edge_df.target.notna())]
-    edge_df = edge_df.drop(columns=["edges"])
-
-    # make sure source is always smaller than target
-    edge_df["source"], edge_df["target"] = zip(
-        *edge_df.apply(
-            lambda x: (x["source"], x["target"])
-            if x["source"] < x["target"]
-            else (x["target"], x["source"]),
-            axis=1,
-        ),
-        strict=False,
+    source, target, text_unit = _create_relationships(
+        phrase_codes.reshape(-1), text_unit_codes
     )
 
     # group by source and target, count the number of text units and collect their ids
-    grouped_edge_df = (
-        edge_df.groupby(["source", "target"]).agg({"text_unit_id": list}).reset_index()
-    )
-    grouped_edge_df = grouped_edge_df.rename(columns={"text_unit_id": "text_unit_ids"})
-    grouped_edge_df["weight"] = grouped_edge_df["text_unit_ids"].apply(len)
-
-    grouped_edge_df = grouped_edge_df.loc[
-        :, ["source", "target", "weight", "text_unit_ids"]
-    ]
+    order = np.lexsort((text_unit, target, source))
+    source, target, text_unit = source[order], target[order], text_unit[order]
+    boundaries = np.ones(len(source), dtype=bool)
+    boundaries[1:] = (source[1:] != source[:-1]) | (target[1:] != target[:-1])
+    starts = np.flatnonzero(boundaries)
+    ends = np.r_[starts[1:], len(source)] if len(starts) else starts
+    pair_text_unit_ids = np.asarray(text_unit_ids)[text_unit].tolist()
+    grouped_edge_df = pd.DataFrame({
+        "source": titles[source[starts]],
+        "target": titles[target[starts]],
+        "weight": ends - starts,
+        "text_unit_ids": [
+            pair_text_unit_ids[start:end]
+            for start, end in zip(starts.tolist(), ends.tolist(), strict=True)
+        ],
+    })
 
     if normalize_edge_weights:
         # use PMI weight instead of raw weight
@@ -141,15 +131,28 @@ def _extract_edges(
 
 
 def _create_relationships(
-    noun_phrases: list[str],
-) -> list[tuple[str, str]]:
-    """Create a (source, target) tuple pairwise for all noun phrases in a list."""
-    relationships = []
-    if len(noun_phrases) >= 2:
-        for i in range(len(noun_phrases) - 1):
-            for j in range(i + 1, len(noun_phrases)):
-                relationships.extend([(noun_phrases[i], noun_phrases[j])])
-    return relationships
+    phrases: np.ndarray,
+    text_units: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Create the (source, target) pairs of all phrases that share a text unit.
+
+    `phrases` and `text_units` are the integer codes of each (phrase, text unit)
+    occurrence. Returns the source and target phrase codes of every pair, with source
+    smaller than target, and the text unit code the pair was found in.
+    """
+    order = np.lexsort((phrases, text_units))
+    phrases, text_units = phrases[order], text_units[order]
+
+    # every occurrence pairs with the occurrences after it in the same text unit
+    unit_ends = np.r_[np.flatnonzero(text_units[1:] != text_units[:-1]) + 1, len(order)]
+    unit_sizes = np.diff(np.r_[0, unit_ends])
+    pair_counts = np.repeat(unit_ends, unit_sizes) - np.arange(len(order)) - 1
+    left = np.repeat(np.arange(len(order)), pair_counts)
+    pair_offsets = np.arange(len(left)) - np.repeat(
+        np.cumsum(pair_counts) - pair_counts, pair_counts
+    )
+    right = left + pair_offsets + 1
+    return phrases[left], phrases[right], text_units[left]
 
 
 def _calculate_pmi_edge_weights(
@@ -168,32 +171,17 @@ def _calculate_pmi_edge_weights(
     p(x,y) = edge_weight(x,y) / total_edge_weights
     p(x) = freq_occurrence(x) / total_freq_occurrences
     """
-    copied_nodes_df = nodes_df[[node_name_col, node_freq_col]]
-
-    total_edge_weights = edges_df[edge_weight_col].sum()
-    total_freq_occurrences = nodes_df[node_freq_col].sum()
-    copied_nodes_df["prop_occurrence"] = (
-        copied_nodes_df[node_freq_col] / total_freq_occurrences
-    )
-    copied_nodes_df = copied_nodes_df.loc[:, [node_name_col, "prop_occurrence"]]
-
-    edges_df["prop_weight"] = edges_df[edge_weight_col] / total_edge_weights
-    edges_df = (
-        edges_df.merge(
-            copied_nodes_df, left_on=edge_source_col, right_on=node_name_col, how="left"
-        )
-        .drop(columns=[node_name_col])
-        .rename(columns={"prop_occurrence": "source_prop"})
-    )
-    edges_df = (
-        edges_df.merge(
-            copied_nodes_df, left_on=edge_target_col, right_on=node_name_col, how="left"
-        )
-        .drop(columns=[node_name_col])
-        .rename(columns={"prop_occurrence": "target_prop"})
-    )
-    edges_df[edge_weight_col] = edges_df.apply(
-        lambda x: math.log2(x["prop_weight"] / (x["source_prop"] * x["target_prop"])),
-        axis=1,
+    prop_occurrence = (
+        nodes_df[node_freq_col] / nodes_df[node_freq_col].sum()
+    ).set_axis(nodes_df[node_name_col])
+
+    prop_weight = edges_df[edge_weight_col] / edges_df[edge_weight_col].sum()
+    source_prop = edges_df[edge_source_col].map(prop_occurrence)
+    target_prop = edges_df[edge_target_col].map(prop_occurrence)
+
+    edges_df = edges_df.copy()
+    edges_df[edge_weight_col] = np.log2(
+        prop_weight.to_numpy(dtype=float)
+        / (source_prop.to_numpy(dtype=float) * target_prop.to_numpy(dtype=float))
     )
-    return edges_df.drop(columns=["prop_weight", "source_prop", "target_prop"])
+    return edges_df
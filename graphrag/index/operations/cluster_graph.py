@@ -1,9 +1,11 @@
 # Copyright (c) 2024 Microsoft Corporation.
 # Licensed under the MIT License
 
-"""A module containing cluster_graph, apply_clustering and run_layout methods definition."""
+"""A module containing cluster_graph and update_clusters methods definition."""
 
+import itertools
 import logging
+from collections.abc import Iterable
 
 import networkx as nx
 
@@ -32,7 +34,99 @@ def cluster_graph(
         use_lcc=use_lcc,
         seed=seed,
     )
+    return _to_communities(node_id_to_community_map, parent_mapping)
 
+
+def update_clusters(
+    graph: nx.Graph,
+    previous: Communities,
+    touched_nodes: Iterable[str],
+    max_cluster_size: int,
+    use_lcc: bool,
+    seed: int | None = None,
+) -> tuple[Communities, set[int]]:
+    """Recluster only the parts of a previously clustered graph touched by an update.
+
+    A root community is affected when it contains a touched node (an endpoint of a new
+    or changed relationship) or a node that left the graph. The affected root
+    communities and any new nodes are reclustered together, with Leiden seeded from
+    their previous root partition; every other community tree is kept as-is.
+
+    Returns the updated communities and the ids of the communities that were created
+    by the reclustering (numbered after the largest previous id).
+    """
+    if use_lcc:
+        graph = stable_largest_connected_component(graph)
+
+    parents = {community: parent for _, community, parent, _ in previous}
+    roots = {community for community, parent in parents.items() if parent == -1}
+    root_of_node = {
+        node: community
+        for _, community, parent, nodes in previous
+        if community in roots
+        for node in nodes
+    }
+    affected_roots = {
+        root_of_node[node]
+        for node in itertools.chain(touched_nodes, root_of_node.keys() - graph.nodes)
+        if node in root_of_node
+    }
+    region = [
+        node
+        for node in graph.nodes
+        if node not in root_of_node or root_of_node[node] in affected_roots
+    ]
+
+    def root(community: int) -> int:
+        while parents[community] != -1:
+            community = parents[community]
+        return community
+
+    kept = [
+        cluster for cluster in previous if root(cluster[1]) not in affected_roots
+    ]
+    if not region:
+        return kept, set()
+
+    subgraph = graph.subgraph(region)
+    if subgraph.number_of_edges() == 0:
+        # Leiden rejects graphs without edges (e.g. only new isolated nodes), so
+        # every node of the region becomes a singleton community
+        node_id_to_community_map = {
+            0: {node: community for community, node in enumerate(region)}
+        }
+        parent_mapping = dict.fromkeys(range(len(region)), -1)
+    else:
+        node_id_to_community_map, parent_mapping = _compute_leiden_communities(
+            graph=subgraph,
+            max_cluster_size=max_cluster_size,
+            use_lcc=False,
+            seed=seed,
+            starting_communities={
+                node: root_of_node[node] for node in region if node in root_of_node
+            },
+        )
+    offset = max(parents, default=-1) + 1
+    reclustered = [
+        (level, community + offset, parent + offset if parent != -1 else -1, nodes)
+        for level, community, parent, nodes in _to_communities(
+            node_id_to_community_map, parent_mapping
+        )
+    ]
+    log.info(
+        "reclustered %d of %d root communities (%d nodes)",
+        len(affected_roots),
+        len(roots),
+        len(region),
+    )
+    return kept + reclustered, {community for _, community, _, _ in reclustered}
+
+
+def _to_communities(
+    node_id_to_community_map: dict[int, dict[str, int]],
+    parent_mapping: dict[int, int],
+) -> Communities:
+    """Group the per-level node assignments into communities."""
     levels = sorted(node_id_to_community_map.keys())
 
     clusters: dict[int, dict[int, list[str]]] = {}
@@ -58,6 +152,7 @@ def _compute_leiden_communities(
     max_cluster_size: int,
     use_lcc: bool,
     seed: int | None = None,
+    starting_communities: dict[str, int] | None = None,
 ) -> tuple[dict[int, dict[str, int]], dict[int, int]]:
     """Return Leiden root communities and their hierarchy mapping."""
     # NOTE: This import is done here to reduce the initial import time of the graphrag package
@@ -67,7 +162,10 @@ def _compute_leiden_communities(
         graph = stable_largest_connected_component(graph)
 
     community_mapping = hierarchical_leiden(
-        graph, max_cluster_size=max_cluster_size, random_seed=seed
+        graph,
+        max_cluster_size=max_cluster_size,
+        starting_communities=starting_communities,
+        random_seed=seed,
     )
     results: dict[int, dict[str, int]] = {}
     hierarchy: dict[int, int] = {}
@@ -48,16 +48,32 @@ async def run(
 
     # Break up the input texts. The sizes here indicate how many snippets are in each input text
     texts, input_sizes = _prepare_embed_texts(input, splitter)
+
+    # Only snippets missing from the embedding cache go to the model, once per text
+    embedding_cache = cache.embedding_cache() if cache is not None else None
+    cached = (
+        embedding_cache.get_many(llm_config.model, texts)
+        if embedding_cache is not None
+        else [None] * len(texts)
+    )
+    missing = list(
+        dict.fromkeys(
+            text
+            for text, embedding in zip(texts, cached, strict=True)
+            if embedding is None
+        )
+    )
     text_batches = _create_text_batches(
-        texts,
+        missing,
         batch_size,
         batch_max_tokens,
         splitter,
     )
     log.info(
-        "embedding %d inputs via %d snippets using %d batches. max_batch_size=%d, max_tokens=%d",
+        "embedding %d inputs via %d snippets (%d cached) using %d batches. max_batch_size=%d, max_tokens=%d",
         len(input),
         len(texts),
+        sum(embedding is not None for embedding in cached),
         len(text_batches),
         batch_size,
         batch_max_tokens,
@@ -65,8 +81,17 @@ async def run(
     ticker = progress_ticker(callbacks.progress, len(text_batches))
 
     # Embed each chunk of snippets
-    embeddings = await _execute(model, text_batches, ticker, semaphore)
-    embeddings = _reconstitute_embeddings(embeddings, input_sizes)
+    new_embeddings = await _execute(model, text_batches, ticker, semaphore)
+    if embedding_cache is not None and missing:
+        embedding_cache.set_many(llm_config.model, missing, new_embeddings)
+    embedded = dict(zip(missing, new_embeddings, strict=True))
+    embeddings = _reconstitute_embeddings(
+        [
+            embedding if embedding is not None else embedded[text]
+            for text, embedding in zip(texts, cached, strict=True)
+        ],
+        input_sizes,
+    )
 
     return TextEmbeddingResult(embeddings=embeddings)
 
@@ -96,7 +121,7 @@ async def _execute(
     futures = [embed(chunk) for chunk in chunks]
     results = await asyncio.gather(*futures)
     # merge results in a single list of lists (reduce the collect dimension)
-    return [item for sublist in results for item in sublist]
+    return [item for sublist in results for item in sublist.tolist()]
 
 
 def _create_text_batches(
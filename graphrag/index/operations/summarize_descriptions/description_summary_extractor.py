@@ -4,12 +4,16 @@
 """A module containing 'GraphExtractionResult' and 'GraphExtractor' models."""
 
 import json
+import traceback
 from dataclasses import dataclass
 
 from graphrag.index.typing.error_handler import ErrorHandlerFn
 from graphrag.index.utils.tokens import num_tokens_from_string
 from graphrag.language_model.protocol.base import ChatModel
-from graphrag.prompts.index.summarize_descriptions import SUMMARIZE_PROMPT
+from graphrag.prompts.index.summarize_descriptions import (
+    SUMMARIZE_BATCH_PROMPT,
+    SUMMARIZE_PROMPT,
+)
 
 # Max token size for input prompts
 DEFAULT_MAX_INPUT_TOKENS = 4_000
@@ -76,6 +80,45 @@ class SummarizeExtractor:
             description=result or "",
         )
 
+    async def summarize_batch(
+        self, items: list[tuple[str | tuple[str, str], list[str]]]
+    ) -> list[SummarizationResult]:
+        """Summarize the descriptions of several entities or relationships at once.
+
+        Items missing from the response, or all of them when it cannot be parsed, are
+        summarized one at a time.
+        """
+        summaries: dict[int, str] = {}
+        try:
+            response = await self._model.achat(
+                SUMMARIZE_BATCH_PROMPT.format(
+                    items=json.dumps(
+                        [
+                            {"id": index, "entities": id, "descriptions": descriptions}
+                            for index, (id, descriptions) in enumerate(items)
+                        ],
+                        ensure_ascii=False,
+                    )
+                ),
+                name="summarize_batch",
+                json=True,
+                model_parameters={"max_tokens": self._max_summary_length * len(items)},
+            )
+            summaries = {
+                int(summary["id"]): str(summary["description"])
+                for summary in json.loads(str(response.output.content))["summaries"]
+                if isinstance(summary, dict) and summary.get("description")
+            }
+        except (ValueError, KeyError, TypeError) as e:
+            self._on_error(e, traceback.format_exc(), {"items": len(items)})
+
+        return [
+            SummarizationResult(id=id, description=summaries[index])
+            if index in summaries
+            else await self(id, descriptions)
+            for index, (id, descriptions) in enumerate(items)
+        ]
+
     async def _summarize_descriptions(
         self, id: str | tuple[str, str], descriptions: list[str]
     ) -> str:
@@ -25,18 +25,24 @@ async def run_graph_intelligence(
     args: StrategyConfig,
 ) -> SummarizedDescriptionResult:
     """Run the graph intelligence entity extraction strategy."""
-    llm_config = LanguageModelConfig(**args["llm"])
-    llm = ModelManager().get_or_create_chat_model(
-        name="summarize_descriptions",
-        model_type=llm_config.type,
-        config=llm_config,
-        callbacks=callbacks,
-        cache=cache,
-    )
-
+    llm = _get_model(callbacks, cache, args)
     return await run_summarize_descriptions(llm, id, descriptions, callbacks, args)
 
 
+async def run_graph_intelligence_batch(
+    items: list[tuple[str | tuple[str, str], list[str]]],
+    callbacks: WorkflowCallbacks,
+    cache: PipelineCache,
+    args: StrategyConfig,
+) -> list[SummarizedDescriptionResult]:
+    """Run the graph intelligence strategy on several items packed into one prompt."""
+    extractor = _create_extractor(_get_model(callbacks, cache, args), callbacks, args)
+    return [
+        SummarizedDescriptionResult(id=result.id, description=result.description)
+        for result in await extractor.summarize_batch(items)
+    ]
+
+
 async def run_summarize_descriptions(
     model: ChatModel,
     id: str | tuple[str, str],
@@ -45,13 +51,34 @@ async def run_summarize_descriptions(
     args: StrategyConfig,
 ) -> SummarizedDescriptionResult:
     """Run the entity extraction chain."""
+    extractor = _create_extractor(model, callbacks, args)
+    result = await extractor(id=id, descriptions=descriptions)
+    return SummarizedDescriptionResult(id=result.id, description=result.description)
+
+
+def _get_model(
+    callbacks: WorkflowCallbacks, cache: PipelineCache, args: StrategyConfig
+) -> ChatModel:
+    llm_config = LanguageModelConfig(**args["llm"])
+    return ModelManager().get_or_create_chat_model(
+        name="summarize_descriptions",
+        model_type=llm_config.type,
+        config=llm_config,
+        callbacks=callbacks,
+        cache=cache,
+    )
+
+
+def _create_extractor(
+    model: ChatModel, callbacks: WorkflowCallbacks, args: StrategyConfig
+) -> SummarizeExtractor:
     # Extraction Arguments
     summarize_prompt = args.get("summarize_prompt", None)
     entity_name_key = args.get("entity_name_key", "entity_name")
     input_descriptions_key = args.get("input_descriptions_key", "description_list")
     max_tokens = args.get("max_tokens", None)
 
-    extractor = SummarizeExtractor(
+    return SummarizeExtractor(
         model_invoker=model,
         summarization_prompt=summarize_prompt,
         entity_name_key=entity_name_key,
@@ -64,6 +91,3 @@ async def run_summarize_descriptions(
         max_summary_length=args.get("max_summary_length", None),
         max_input_tokens=max_tokens,
     )
-
-    result = await extractor(id=id, descriptions=descriptions)
-    return SummarizedDescriptionResult(id=result.id, description=result.description)
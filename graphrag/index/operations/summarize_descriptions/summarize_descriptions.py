@@ -11,11 +11,16 @@ import pandas as pd
 
 from graphrag.cache.pipeline_cache import PipelineCache
 from graphrag.callbacks.workflow_callbacks import WorkflowCallbacks
+from graphrag.index.operations.summarize_descriptions.description_summary_extractor import (
+    DEFAULT_MAX_INPUT_TOKENS,
+)
 from graphrag.index.operations.summarize_descriptions.typing import (
+    BatchSummarizationStrategy,
     SummarizationStrategy,
     SummarizeStrategyType,
 )
-from graphrag.logger.progress import ProgressTicker, progress_ticker
+from graphrag.index.utils.tokens import num_tokens_from_string
+from graphrag.logger.progress import progress_ticker
 
 log = logging.getLogger(__name__)
 
@@ -54,6 +59,7 @@ async def summarize_descriptions(
     strategy:
         type: graph_intelligence
         summarize_prompt: # Optional, the prompt to use for extraction
+        batch_size: # Optional, the number of small summaries to request in one prompt, 1 (the default) disables packing
 
 
         llm: # The configuration for the LLM
@@ -71,83 +77,133 @@ async def summarize_descriptions(
     """
     log.debug("summarize_descriptions strategy=%s", strategy)
     strategy = strategy or {}
-    strategy_exec = load_strategy(
-        strategy.get("type", SummarizeStrategyType.graph_intelligence)
-    )
+    strategy_type = strategy.get("type", SummarizeStrategyType.graph_intelligence)
+    strategy_exec = load_strategy(strategy_type)
     strategy_config = {**strategy}
+    batch_size = strategy_config.get("batch_size") or 1
+
+    items: list[tuple[str | tuple[str, str], list[str]]] = [
+        (str(row.title), sorted(set(row.description)))  # type: ignore
+        for row in entities_df.itertuples(index=False)
+    ]
+    items.extend(
+        (
+            (str(row.source), str(row.target)),  # type: ignore
+            sorted(set(row.description)),  # type: ignore
+        )
+        for row in relationships_df.itertuples(index=False)
+    )
+
+    # items with a single distinct description need no summary; jobs are keyed by
+    # their position in items
+    summaries: dict[int, str] = {}
+    jobs: dict[int, tuple[str | tuple[str, str], list[str]]] = {}
+    for index, (id, descriptions) in enumerate(items):
+        if len(descriptions) <= 1:
+            summaries[index] = descriptions[0] if descriptions else ""
+        else:
+            jobs[index] = (id, descriptions)
+    log.info(
+        "summarizing %d of %d entities and relationships",
+        len(jobs),
+        len(items),
+    )
 
     # if max_retries is not set, inject a dynamically assigned value based on the maximum number of expected LLM calls to be made
     if strategy_config.get("llm") and strategy_config["llm"]["max_retries"] == -1:
         strategy_config["llm"]["max_retries"] = len(entities_df) + len(relationships_df)
 
-    async def get_summarized(
-        nodes: pd.DataFrame, edges: pd.DataFrame, semaphore: asyncio.Semaphore
-    ):
-        ticker_length = len(nodes) + len(edges)
-
-        ticker = progress_ticker(callbacks.progress, ticker_length)
+    ticker = progress_ticker(callbacks.progress, len(items))
+    ticker(len(items) - len(jobs))
+    semaphore = asyncio.Semaphore(num_threads)
 
-        node_futures = [
-            do_summarize_descriptions(
-                str(row.title),  # type: ignore
-                sorted(set(row.description)),  # type: ignore
-                ticker,
-                semaphore,
+    async def do_summarize_descriptions(key: int):
+        id, descriptions = jobs[key]
+        async with semaphore:
+            result = await strategy_exec(
+                id, descriptions, callbacks, cache, strategy_config
             )
-            for row in nodes.itertuples(index=False)
-        ]
+        summaries[key] = result.description
+        ticker(1)
 
-        node_results = await asyncio.gather(*node_futures)
-
-        node_descriptions = [
-            {
-                "title": result.id,
-                "description": result.description,
-            }
-            for result in node_results
-        ]
-
-        edge_futures = [
-            do_summarize_descriptions(
-                (str(row.source), str(row.target)),  # type: ignore
-                sorted(set(row.description)),  # type: ignore
-                ticker,
-                semaphore,
+    async def do_summarize_batch(keys: list[int]):
+        async with semaphore:
+            results = await load_batch_strategy(strategy_type)(
+                [jobs[key] for key in keys], callbacks, cache, strategy_config
             )
-            for row in edges.itertuples(index=False)
-        ]
+        for key, result in zip(keys, results, strict=True):
+            summaries[key] = result.description
+            ticker(1)
 
-        edge_results = await asyncio.gather(*edge_futures)
+    # nodes and edges are scheduled together so neither waits on the other
+    singles, batches = _pack_jobs(
+        jobs,
+        batch_size,
+        strategy_config.get("max_tokens") or DEFAULT_MAX_INPUT_TOKENS,
+    )
+    await asyncio.gather(
+        *(do_summarize_descriptions(key) for key in singles),
+        *(do_summarize_batch(keys) for keys in batches),
+    )
 
-        edge_descriptions = [
+    entity_count = len(entities_df)
+    entity_descriptions = pd.DataFrame(
+        [
+            {"title": id, "description": summaries[index]}
+            for index, (id, _) in enumerate(items[:entity_count])
+        ],
+        columns=["title", "description"],
+    )
+    relationship_descriptions = pd.DataFrame(
+        [
             {
-                "source": result.id[0],
-                "target": result.id[1],
-                "description": result.description,
+                "source": id[0],
+                "target": id[1],
+                "description": summaries[index],
             }
-            for result in edge_results
-        ]
-
-        entity_descriptions = pd.DataFrame(node_descriptions)
-        relationship_descriptions = pd.DataFrame(edge_descriptions)
-        return entity_descriptions, relationship_descriptions
-
-    async def do_summarize_descriptions(
-        id: str | tuple[str, str],
-        descriptions: list[str],
-        ticker: ProgressTicker,
-        semaphore: asyncio.Semaphore,
-    ):
-        async with semaphore:
-            results = await strategy_exec(
-                id, descriptions, callbacks, cache, strategy_config
-            )
-            ticker(1)
-        return results
+            for index, (id, _) in enumerate(items[entity_count:], start=entity_count)
+        ],
+        columns=["source", "target", "description"],
+    )
+    return entity_descriptions, relationship_descriptions
 
-    semaphore = asyncio.Semaphore(num_threads)
 
-    return await get_summarized(entities_df, relationships_df, semaphore)
+def _pack_jobs(
+    jobs: dict[int, tuple[str | tuple[str, str], list[str]]],
+    batch_size: int,
+    max_tokens: int,
+) -> tuple[list[int], list[list[int]]]:
+    """Split the jobs into ones summarized alone and batches packed into one prompt.
+
+    Jobs are packed, smallest first, while a batch holds fewer than `batch_size` jobs
+    and its descriptions fit in `max_tokens`; jobs too large to share a prompt run
+    alone.
+    """
+    if batch_size <= 1:
+        return list(jobs), []
+
+    sizes = {
+        key: sum(num_tokens_from_string(description) for description in descriptions)
+        for key, (_, descriptions) in jobs.items()
+    }
+    singles: list[int] = []
+    batches: list[list[int]] = []
+    batch: list[int] = []
+    batch_tokens = 0
+    for key in sorted(jobs, key=sizes.__getitem__):
+        if sizes[key] * 2 > max_tokens:
+            singles.append(key)
+            continue
+        if len(batch) == batch_size or batch_tokens + sizes[key] > max_tokens:
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(key)
+        batch_tokens += sizes[key]
+    if len(batch) == 1:
+        singles.extend(batch)
+    elif batch:
+        batches.append(batch)
+    return singles, batches
 
 
 def load_strategy(strategy_type: SummarizeStrategyType) -> SummarizationStrategy:
@@ -162,3 +218,19 @@ def load_strategy(strategy_type: SummarizeStrategyType) -> SummarizationStrategy
         case _:
             msg = f"Unknown strategy: {strategy_type}"
             raise ValueError(msg)
+
+
+def load_batch_strategy(
+    strategy_type: SummarizeStrategyType,
+) -> BatchSummarizationStrategy:
+    """Load the strategy that summarizes several items in one prompt."""
+    match strategy_type:
+        case SummarizeStrategyType.graph_intelligence:
+            from graphrag.index.operations.summarize_descriptions.graph_intelligence_strategy import (
+                run_graph_intelligence_batch,
+            )
+
+            return run_graph_intelligence_batch
+        case _:
+            msg = f"Unknown strategy: {strategy_type}"
+            raise ValueError(msg)
@@ -9,7 +9,7 @@ import re
 import time
 import traceback
 from collections.abc import AsyncIterable
-from dataclasses import asdict
+from dataclasses import asdict, replace
 
 import pandas as pd
 
@@ -34,6 +34,17 @@ from graphrag.utils.storage import load_table_from_storage, write_table_to_stora
 
 log = logging.getLogger(__name__)
 
+# workflows an incremental update run replaces by reclustering the merged graph
+_COMMUNITY_REPORT_WORKFLOWS = {
+    "create_community_reports",
+    "create_community_reports_text",
+}
+_RECLUSTERED_WORKFLOWS = {
+    "create_communities",
+    "generate_text_embeddings",
+    *_COMMUNITY_REPORT_WORKFLOWS,
+}
+
 
 async def run_pipeline(
     pipeline: Pipeline,
@@ -69,9 +80,25 @@ async def run_pipeline(
             previous_storage = timestamped_storage.child("previous")
             await _copy_previous_output(storage, previous_storage)
 
+            # when clustering incrementally, the communities and their reports are
+            # computed on the merged graph instead of on the new documents alone
+            community_report_workflows = None
+            delta_pipeline = pipeline
+            if config.cluster_graph.incremental:
+                community_report_workflows = [
+                    workflow
+                    for workflow in pipeline.run()
+                    if workflow[0] in _COMMUNITY_REPORT_WORKFLOWS
+                ]
+                delta_pipeline = Pipeline([
+                    workflow
+                    for workflow in pipeline.run()
+                    if workflow[0] not in _RECLUSTERED_WORKFLOWS
+                ])
+
             # Run the pipeline on the new documents
             async for table in _run_pipeline(
-                pipeline=pipeline,
+                pipeline=delta_pipeline,
                 config=config,
                 dataset=delta_dataset.new_inputs,
                 cache=cache,
@@ -91,6 +118,7 @@ async def run_pipeline(
                 cache=cache,
                 callbacks=NoopWorkflowCallbacks(),
                 progress_logger=logger,
+                community_report_workflows=community_report_workflows,
             )
 
     else:
@@ -140,6 +168,8 @@ async def _run_pipeline(
             progress = logger.child(name, transient=False)
             callbacks.workflow_start(name, None)
             work_time = time.time()
+            cache_stats = context.cache.stats()
+            cache_stats_before = replace(cache_stats) if cache_stats else None
             result = await workflow_function(config, context)
             progress(Progress(percent=1))
             callbacks.workflow_end(name, result)
@@ -148,6 +178,16 @@ async def _run_pipeline(
             )
 
             context.stats.workflows[name] = {"overall": time.time() - work_time}
+            if cache_stats and cache_stats_before:
+                cache_activity = {
+                    counter: count - getattr(cache_stats_before, counter)
+                    for counter, count in asdict(cache_stats).items()
+                }
+                callbacks.log(f"Cache activity for {name}", details=cache_activity)
+                context.stats.workflows[name].update({
+                    f"cache_{counter}": count
+                    for counter, count in cache_activity.items()
+                })
 
         context.stats.total_runtime = time.time() - start_time
         await _dump_json(context)
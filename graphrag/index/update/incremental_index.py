@@ -3,6 +3,7 @@
 
 """Dataframe operations and utils for Incremental Indexing."""
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 
 import numpy as np
@@ -12,6 +13,8 @@ from graphrag.cache.pipeline_cache import PipelineCache
 from graphrag.callbacks.workflow_callbacks import WorkflowCallbacks
 from graphrag.config.embeddings import get_embedded_fields, get_embedding_settings
 from graphrag.config.models.graph_rag_config import GraphRagConfig
+from graphrag.index.run.utils import create_run_context
+from graphrag.index.typing.workflow import Workflow
 from graphrag.index.update.communities import (
     _update_and_merge_communities,
     _update_and_merge_community_reports,
@@ -20,9 +23,11 @@ from graphrag.index.update.entities import (
     _group_and_resolve_entities,
 )
 from graphrag.index.update.relationships import _update_and_merge_relationships
+from graphrag.index.workflows.create_communities import update_communities
 from graphrag.index.workflows.extract_graph import get_summarized_entities_relationships
 from graphrag.index.workflows.generate_text_embeddings import generate_text_embeddings
 from graphrag.logger.print_progress import ProgressLogger
+from graphrag.storage.memory_pipeline_storage import MemoryPipelineStorage
 from graphrag.storage.pipeline_storage import PipelineStorage
 from graphrag.utils.storage import (
     load_table_from_storage,
@@ -87,6 +92,7 @@ async def update_dataframe_outputs(
     cache: PipelineCache,
     callbacks: WorkflowCallbacks,
     progress_logger: ProgressLogger,
+    community_report_workflows: Sequence[Workflow] | None = None,
 ) -> None:
     """Update the mergeable outputs.
 
@@ -98,6 +104,11 @@ async def update_dataframe_outputs(
         The storage used to store the subset of new dataframes in the update run.
     output_storage : PipelineStorage
         The storage used to store the updated dataframes (the final incremental output).
+    community_report_workflows : Sequence[Workflow] | None
+        The workflows that generate community reports. When given, the merged graph
+        is reclustered incrementally and only the reports of the reclustered
+        communities are regenerated with them, instead of merging the communities
+        and reports of a delta run.
     """
     progress_logger.info("Updating Documents")
     final_documents_df = await _concat_dataframes(
@@ -127,17 +138,33 @@ async def update_dataframe_outputs(
         progress_logger.info("Updating Covariates")
         await _update_covariates(previous_storage, delta_storage, output_storage)
 
-    # Merge final communities
-    progress_logger.info("Updating Communities")
-    community_id_mapping = await _update_communities(
-        previous_storage, delta_storage, output_storage
-    )
+    if community_report_workflows is not None:
+        # Recluster the communities touched by the delta and regenerate their reports
+        progress_logger.info("Reclustering Communities")
+        merged_community_reports = await _recluster_communities(
+            previous_storage,
+            delta_storage,
+            output_storage,
+            config,
+            cache,
+            callbacks,
+            merged_entities_df,
+            merged_relationships_df,
+            merged_text_units,
+            community_report_workflows,
+        )
+    else:
+        # Merge final communities
+        progress_logger.info("Updating Communities")
+        community_id_mapping = await _update_communities(
+            previous_storage, delta_storage, output_storage
+        )
 
-    # Merge community reports
-    progress_logger.info("Updating Community Reports")
-    merged_community_reports = await _update_community_reports(
-        previous_storage, delta_storage, output_storage, community_id_mapping
-    )
+        # Merge community reports
+        progress_logger.info("Updating Community Reports")
+        merged_community_reports = await _update_community_reports(
+            previous_storage, delta_storage, output_storage, community_id_mapping
+        )
 
     # Generate text embeddings
     progress_logger.info("Updating Text Embeddings")
@@ -163,6 +190,74 @@ async def update_dataframe_outputs(
             )
 
 
+async def _recluster_communities(
+    previous_storage: PipelineStorage,
+    delta_storage: PipelineStorage,
+    output_storage: PipelineStorage,
+    config: GraphRagConfig,
+    cache: PipelineCache,
+    callbacks: WorkflowCallbacks,
+    entities: pd.DataFrame,
+    relationships: pd.DataFrame,
+    text_units: pd.DataFrame,
+    community_report_workflows: Sequence[Workflow],
+) -> pd.DataFrame:
+    """Recluster the communities touched by the delta and regenerate their reports."""
+    delta_entities = await load_table_from_storage("entities", delta_storage)
+    delta_relationships = await load_table_from_storage("relationships", delta_storage)
+    touched = set(delta_entities["title"])
+    touched.update(delta_relationships["source"], delta_relationships["target"])
+
+    old_communities = await load_table_from_storage("communities", previous_storage)
+    communities, changed = update_communities(
+        entities,
+        relationships,
+        old_communities,
+        touched,
+        max_cluster_size=config.cluster_graph.max_cluster_size,
+        use_lcc=config.cluster_graph.use_lcc,
+        seed=config.cluster_graph.seed,
+    )
+    await write_table_to_storage(communities, "communities", output_storage)
+
+    # reports of the communities that were not reclustered are still accurate
+    old_community_reports = await load_table_from_storage(
+        "community_reports", previous_storage
+    )
+    community_reports = old_community_reports.loc[
+        old_community_reports["community"].isin(communities["community"])
+        & ~old_community_reports["community"].isin(changed)
+    ]
+    if changed:
+        storage = MemoryPipelineStorage()
+        await write_table_to_storage(entities, "entities", storage)
+        await write_table_to_storage(relationships, "relationships", storage)
+        await write_table_to_storage(text_units, "text_units", storage)
+        await write_table_to_storage(
+            communities.loc[communities["community"].isin(changed)],
+            "communities",
+            storage,
+        )
+        if await storage_has_table("covariates", output_storage):
+            covariates = await load_table_from_storage("covariates", output_storage)
+            await write_table_to_storage(covariates, "covariates", storage)
+
+        context = create_run_context(storage=storage, cache=cache, callbacks=callbacks)
+        for _, workflow_function in community_report_workflows:
+            await workflow_function(config, context)
+        community_reports = pd.concat(
+            [
+                community_reports,
+                await load_table_from_storage("community_reports", storage),
+            ],
+            ignore_index=True,
+        )
+
+    await write_table_to_storage(community_reports, "community_reports", output_storage)
+
+    return community_reports
+
+
 async def _update_community_reports(
     previous_storage: PipelineStorage,
     delta_storage: PipelineStorage,
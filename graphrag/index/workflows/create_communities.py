@@ -3,6 +3,7 @@
 
 """A module containing run_workflow method definition."""
 
+from collections.abc import Iterable
 from datetime import datetime, timezone
 from typing import cast
 from uuid import uuid4
@@ -12,7 +13,11 @@ import pandas as pd
 
 from graphrag.config.models.graph_rag_config import GraphRagConfig
 from graphrag.data_model.schemas import COMMUNITIES_FINAL_COLUMNS
-from graphrag.index.operations.cluster_graph import cluster_graph
+from graphrag.index.operations.cluster_graph import (
+    Communities,
+    cluster_graph,
+    update_clusters,
+)
 from graphrag.index.operations.create_graph import create_graph
 from graphrag.index.typing.context import PipelineRunContext
 from graphrag.index.typing.workflow import WorkflowFunctionOutput
@@ -61,6 +66,68 @@ def create_communities(
         seed=seed,
     )
 
+    return _finalize_communities(entities, relationships, clusters)
+
+
+def update_communities(
+    entities: pd.DataFrame,
+    relationships: pd.DataFrame,
+    previous_communities: pd.DataFrame,
+    touched_titles: Iterable[str],
+    max_cluster_size: int,
+    use_lcc: bool,
+    seed: int | None = None,
+) -> tuple[pd.DataFrame, set[int]]:
+    """Recluster only the communities touched by new or changed graph elements.
+
+    Returns the updated communities and the ids of the (re)created communities; the
+    rows of all other communities are carried over unchanged.
+    """
+    graph = create_graph(relationships)
+    titles = entities.set_index("id")["title"]
+    previous = [
+        (
+            int(level),
+            int(community),
+            int(parent),
+            titles.reindex(list(entity_ids)).dropna().tolist(),
+        )
+        for level, community, parent, entity_ids in previous_communities.loc[
+            :, ["level", "community", "parent", "entity_ids"]
+        ].itertuples(index=False)
+    ]
+    clusters, changed = update_clusters(
+        graph,
+        previous,
+        touched_titles,
+        max_cluster_size,
+        use_lcc,
+        seed=seed,
+    )
+
+    kept_ids = {community for _, community, _, _ in clusters} - changed
+    kept = previous_communities.loc[previous_communities["community"].isin(kept_ids)]
+    if not changed:
+        return kept.reset_index(drop=True), changed
+
+    reclustered = [cluster for cluster in clusters if cluster[1] in changed]
+    region = {title for *_, nodes in reclustered for title in nodes}
+    created = _finalize_communities(
+        entities,
+        relationships.loc[
+            relationships["source"].isin(region) & relationships["target"].isin(region)
+        ],
+        reclustered,
+    )
+    return pd.concat([kept, created], ignore_index=True), changed
+
+
+def _finalize_communities(
+    entities: pd.DataFrame,
+    relationships: pd.DataFrame,
+    clusters: Communities,
+) -> pd.DataFrame:
+    """Build the communities table from the clusters of a graph."""
     communities = pd.DataFrame(
         clusters, columns=pd.Index(["level", "community", "parent", "title"])
     ).explode("title")
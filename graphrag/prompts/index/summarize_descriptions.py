@@ -17,3 +17,18 @@ Description List: {description_list}
 #######
 Output:
 """
+
+SUMMARIZE_BATCH_PROMPT = """
+You are a helpful assistant responsible for generating comprehensive summaries of the data provided below.
+Each item below has one or two entities, and a list of descriptions, all related to the same entity or group of entities.
+For each item, please concatenate all of its descriptions into a single, comprehensive description. Make sure to include information collected from all the descriptions of that item, and nothing from the other items.
+If the descriptions of an item are contradictory, please resolve the contradictions and provide a single, coherent summary.
+Make sure each summary is written in third person, and include the entity names so we have the full context.
+Return a JSON object of the form {{"summaries": [{{"id": <item id>, "description": <summary>}}]}} with one summary per item.
+
+#######
+-Data-
+Items: {items}
+#######
+Output:
+"""
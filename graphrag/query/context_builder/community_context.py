@@ -203,11 +203,12 @@ def _compute_community_weights(
                     community_text_units[community_id] = []
                 community_text_units[community_id].extend(entity.text_unit_ids)
     for report in community_reports:
-        if not report.attributes:
-            report.attributes = {}
-        report.attributes[weight_attribute] = len(
-            set(community_text_units.get(report.community_id, []))
-        )
+        report.attributes = {
+            **(report.attributes or {}),
+            weight_attribute: len(
+                set(community_text_units.get(report.community_id, []))
+            ),
+        }
     if normalize:
         # normalize by max weight
         all_weights = [
@@ -218,9 +219,10 @@ def _compute_community_weights(
         max_weight = max(all_weights)
         for report in community_reports:
             if report.attributes:
-                report.attributes[weight_attribute] = (
-                    report.attributes[weight_attribute] / max_weight
-                )
+                report.attributes = {
+                    **report.attributes,
+                    weight_attribute: report.attributes[weight_attribute] / max_weight,
+                }
     return community_reports
 
 
@@ -18,6 +18,7 @@ from graphrag.query.input.retrieval.covariates import (
 )
 from graphrag.query.input.retrieval.entities import to_entity_dataframe
 from graphrag.query.input.retrieval.relationships import (
+    RelationshipIndex,
     get_candidate_relationships,
     get_entities_from_relationships,
     get_in_network_relationships,
@@ -154,7 +155,7 @@ def build_covariates_context(
 
 def build_relationship_context(
     selected_entities: list[Entity],
-    relationships: list[Relationship],
+    relationships: list[Relationship] | RelationshipIndex,
     token_encoder: tiktoken.Encoding | None = None,
     include_relationship_weight: bool = False,
     max_tokens: int = 8000,
@@ -227,7 +228,7 @@ def build_relationship_context(
 
 def _filter_relationships(
     selected_entities: list[Entity],
-    relationships: list[Relationship],
+    relationships: list[Relationship] | RelationshipIndex,
     top_k_relationships: int = 10,
     relationship_ranking_attribute: str = "rank",
 ) -> list[Relationship]:
@@ -251,43 +252,26 @@ def _filter_relationships(
 
     # within out-of-network relationships, prioritize mutual relationships
     # (i.e. relationships with out-network entities that are shared with multiple selected entities)
-    selected_entity_names = [entity.title for entity in selected_entities]
-    out_network_source_names = [
-        relationship.source
-        for relationship in out_network_relationships
-        if relationship.source not in selected_entity_names
-    ]
-    out_network_target_names = [
-        relationship.target
-        for relationship in out_network_relationships
-        if relationship.target not in selected_entity_names
-    ]
-    out_network_entity_names = list(
-        set(out_network_source_names + out_network_target_names)
-    )
-    out_network_entity_links = defaultdict(int)
-    for entity_name in out_network_entity_names:
-        targets = [
-            relationship.target
-            for relationship in out_network_relationships
-            if relationship.source == entity_name
-        ]
-        sources = [
-            relationship.source
-            for relationship in out_network_relationships
-            if relationship.target == entity_name
-        ]
-        out_network_entity_links[entity_name] = len(set(targets + sources))
+    selected_entity_names = {entity.title for entity in selected_entities}
+    out_network_entity_neighbors = defaultdict(set)
+    for relationship in out_network_relationships:
+        if relationship.source not in selected_entity_names:
+            out_network_entity_neighbors[relationship.source].add(relationship.target)
+        if relationship.target not in selected_entity_names:
+            out_network_entity_neighbors[relationship.target].add(relationship.source)
+    out_network_entity_links = {
+        entity_name: len(neighbors)
+        for entity_name, neighbors in out_network_entity_neighbors.items()
+    }
 
     # sort out-network relationships by number of links and rank_attributes
     for rel in out_network_relationships:
-        if rel.attributes is None:
-            rel.attributes = {}
-        rel.attributes["links"] = (
-            out_network_entity_links[rel.source]
+        rel.attributes = {
+            **(rel.attributes or {}),
+            "links": out_network_entity_links[rel.source]
             if rel.source in out_network_entity_links
-            else out_network_entity_links[rel.target]
-        )
+            else out_network_entity_links[rel.target],
+        }
 
     # sort by attributes[links] first, then by ranking_attribute
     if relationship_ranking_attribute == "rank":
@@ -316,7 +300,7 @@ def _filter_relationships(
 def get_candidate_context(
     selected_entities: list[Entity],
     entities: list[Entity],
-    relationships: list[Relationship],
+    relationships: list[Relationship] | RelationshipIndex,
     covariates: dict[str, list[Covariate]],
     include_entity_rank: bool = True,
     entity_rank_description: str = "number of relationships",
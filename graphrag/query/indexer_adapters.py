@@ -7,6 +7,7 @@ Ideally this is just a straight read-through into the object model.
 """
 
 import logging
+from collections.abc import Sequence
 from typing import cast
 
 import pandas as pd
@@ -20,6 +21,7 @@ from graphrag.data_model.relationship import Relationship
 from graphrag.data_model.text_unit import TextUnit
 from graphrag.language_model.manager import ModelManager
 from graphrag.language_model.protocol.base import EmbeddingModel
+from graphrag.query.input.loaders.columnar import ColumnarCollection
 from graphrag.query.input.loaders.dfs import (
     read_communities,
     read_community_reports,
@@ -33,7 +35,9 @@ from graphrag.vector_stores.base import BaseVectorStore
 log = logging.getLogger(__name__)
 
 
-def read_indexer_text_units(final_text_units: pd.DataFrame) -> list[TextUnit]:
+def read_indexer_text_units(
+    final_text_units: pd.DataFrame,
+) -> ColumnarCollection[TextUnit]:
     """Read in the Text Units from the raw indexing outputs."""
     return read_text_units(
         df=final_text_units,
@@ -42,7 +46,9 @@ def read_indexer_text_units(final_text_units: pd.DataFrame) -> list[TextUnit]:
     )
 
 
-def read_indexer_covariates(final_covariates: pd.DataFrame) -> list[Covariate]:
+def read_indexer_covariates(
+    final_covariates: pd.DataFrame,
+) -> ColumnarCollection[Covariate]:
     """Read in the Claims from the raw indexing outputs."""
     covariate_df = final_covariates
     covariate_df["id"] = covariate_df["id"].astype(str)
@@ -60,7 +66,9 @@ def read_indexer_covariates(final_covariates: pd.DataFrame) -> list[Covariate]:
     )
 
 
-def read_indexer_relationships(final_relationships: pd.DataFrame) -> list[Relationship]:
+def read_indexer_relationships(
+    final_relationships: pd.DataFrame,
+) -> ColumnarCollection[Relationship]:
     """Read in the Relationships from the raw indexing outputs."""
     return read_relationships(
         df=final_relationships,
@@ -78,7 +86,7 @@ def read_indexer_reports(
     dynamic_community_selection: bool = False,
     content_embedding_col: str = "full_content_embedding",
     config: GraphRagConfig | None = None,
-) -> list[CommunityReport]:
+) -> ColumnarCollection[CommunityReport]:
     """Read in the Community Reports from the raw indexing outputs.
 
     If not dynamic_community_selection, then select reports with the max community level that an entity belongs to.
@@ -128,10 +136,20 @@ def read_indexer_reports(
 
 
 def read_indexer_report_embeddings(
-    community_reports: list[CommunityReport],
+    community_reports: Sequence[CommunityReport],
     embeddings_store: BaseVectorStore,
 ):
     """Read in the Community Reports from the raw indexing outputs."""
+    if isinstance(community_reports, ColumnarCollection):
+        # write all vectors into the contiguous embedding matrix at once
+        community_reports.set_embeddings(
+            "full_content_embedding",
+            [
+                embeddings_store.search_by_id(report_id).vector
+                for report_id in community_reports.column("id")
+            ],
+        )
+        return
     for report in community_reports:
         report.full_content_embedding = embeddings_store.search_by_id(report.id).vector
 
@@ -140,7 +158,7 @@ def read_indexer_entities(
     entities: pd.DataFrame,
     communities: pd.DataFrame,
     community_level: int | None,
-) -> list[Entity]:
+) -> ColumnarCollection[Entity]:
     """Read in the Entities from the raw indexing outputs."""
     community_join = communities.explode("entity_ids").loc[
         :, ["community", "level", "entity_ids"]
@@ -181,7 +199,7 @@ def read_indexer_entities(
 def read_indexer_communities(
     final_communities: pd.DataFrame,
     final_community_reports: pd.DataFrame,
-) -> list[Community]:
+) -> ColumnarCollection[Community]:
     """Read in the Communities from the raw indexing outputs.
 
     Reconstruct the community hierarchy information and add to the sub-community field.
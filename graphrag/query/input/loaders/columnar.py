@@ -0,0 +1,481 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""Columnar storage for query-side data objects.
+
+Loaded tables are kept as columns instead of one Python object per row:
+strings (ids, titles, types, ...) are dictionary-encoded, list columns are
+stored as offsets into a flat dictionary-encoded value array, and embeddings
+are stored as a contiguous float32 matrix. Data model objects are exposed as
+lightweight row views that read their fields from the columns on access.
+"""
+
+import copy
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from dataclasses import MISSING, fields
+from functools import cache
+from typing import Any, Generic, TypeVar, overload
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+T = TypeVar("T")
+
+
+def _is_null(value: Any) -> bool:
+    """Check whether a scalar cell value is missing."""
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+class StringColumn:
+    """A dictionary-encoded string column (code -1 marks a missing value)."""
+
+    def __init__(self, codes: np.ndarray, dictionary: np.ndarray):
+        self.codes = codes
+        self.dictionary = dictionary
+
+    @classmethod
+    def from_values(cls, values: Any, required: bool = False) -> "StringColumn":
+        """Encode a series or array of values; other types are converted with str()."""
+        categorical = pd.Categorical(values)
+        codes = categorical.codes.astype(np.int32)
+        dictionary = categorical.categories.astype(str).to_numpy(dtype=object)
+        if required and (codes < 0).any():
+            # required columns keep the str() of the missing value, like to_str
+            missing = np.asarray(values, dtype=object)[codes < 0]
+            extra = np.array([str(value) for value in missing], dtype=object)
+            codes[codes < 0] = np.arange(len(dictionary), len(dictionary) + len(extra))
+            dictionary = np.concatenate([dictionary, extra])
+        return cls(codes, dictionary)
+
+    def get(self, row: int) -> str | None:
+        """Get the value of a row."""
+        code = self.codes[row]
+        return None if code < 0 else self.dictionary[code]
+
+    def to_numpy(self) -> np.ndarray:
+        """Decode the whole column into an object array."""
+        values = np.append(self.dictionary, None)
+        return values[self.codes]
+
+
+class ListColumn:
+    """A list column stored as offsets into a flat value array (CSR layout)."""
+
+    def __init__(
+        self, offsets: np.ndarray, values: StringColumn | np.ndarray, valid: np.ndarray
+    ):
+        self.offsets = offsets
+        self.values = values
+        self.valid = valid
+
+    @classmethod
+    def from_values(cls, values: Any) -> "ListColumn":
+        """Encode a series of lists or arrays; a single string becomes a 1-item list."""
+        cells = [
+            [value] if isinstance(value, str) else value
+            for value in np.asarray(values, dtype=object)
+        ]
+        array = pa.array(cells, from_pandas=True)
+        if pa.types.is_null(array.type):
+            return cls(
+                np.zeros(len(array) + 1, dtype=np.int64),
+                np.empty(0, dtype=object),
+                np.zeros(len(array), dtype=bool),
+            )
+        offsets = array.offsets.to_numpy().astype(np.int64)
+        flat = array.flatten()
+        if pa.types.is_string(flat.type) or pa.types.is_large_string(flat.type):
+            items: StringColumn | np.ndarray = StringColumn.from_values(
+                flat.to_numpy(zero_copy_only=False)
+            )
+        else:
+            items = flat.to_numpy(zero_copy_only=False)
+        return cls(offsets, items, ~array.is_null().to_numpy(zero_copy_only=False))
+
+    def get(self, row: int) -> list | None:
+        """Get the list of a row."""
+        if not self.valid[row]:
+            return None
+        start, end = self.offsets[row], self.offsets[row + 1]
+        if isinstance(self.values, StringColumn):
+            return list(self.values.dictionary[self.values.codes[start:end]])
+        return self.values[start:end].tolist()
+
+    def to_numpy(self) -> np.ndarray:
+        """Decode the whole column into an object array of lists."""
+        result = np.empty(len(self.valid), dtype=object)
+        for row in range(len(result)):
+            result[row] = self.get(row)
+        return result
+
+
+class EmbeddingColumn:
+    """Embeddings stored as one contiguous float32 matrix plus a validity mask."""
+
+    def __init__(self, matrix: np.ndarray, valid: np.ndarray):
+        self.matrix = matrix
+        self.valid = valid
+
+    @classmethod
+    def from_values(cls, values: Any) -> "EmbeddingColumn | ListColumn":
+        """Encode a series of vectors; falls back to a ListColumn for ragged vectors."""
+        array = pa.array(np.asarray(values, dtype=object), from_pandas=True)
+        if pa.types.is_null(array.type):
+            return cls(
+                np.zeros((len(array), 0), dtype=np.float32),
+                np.zeros(len(array), dtype=bool),
+            )
+        if not pa.types.is_list(array.type) and not pa.types.is_large_list(array.type):
+            msg = f"value is not a list of vectors: {array.type}"
+            raise TypeError(msg)
+        valid = ~array.is_null().to_numpy(zero_copy_only=False)
+        lengths = array.value_lengths().to_numpy(zero_copy_only=False)[valid]
+        if len(lengths) and (lengths != lengths[0]).any():
+            return ListColumn.from_values(values)
+        dimension = int(lengths[0]) if len(lengths) else 0
+        flat = array.flatten().to_numpy(zero_copy_only=False)
+        flat = flat.astype(np.float32, copy=False)
+        matrix = np.zeros((len(valid), dimension), dtype=np.float32)
+        matrix[valid] = flat.reshape(-1, dimension) if dimension else flat.reshape(0, 0)
+        return cls(matrix, valid)
+
+    @classmethod
+    def from_vectors(cls, vectors: Sequence[Any]) -> "EmbeddingColumn | ListColumn":
+        """Encode a list of vectors (None for missing)."""
+        return cls.from_values(pd.Series(list(vectors), dtype=object))
+
+    def get(self, row: int) -> np.ndarray | None:
+        """Get the embedding of a row as a read-only view into the matrix."""
+        if not self.valid[row]:
+            return None
+        vector = self.matrix[row]
+        vector.flags.writeable = False
+        return vector
+
+    def to_numpy(self) -> np.ndarray:
+        """Decode the whole column into an object array of row views."""
+        result = np.empty(len(self.valid), dtype=object)
+        for row in np.flatnonzero(self.valid):
+            result[row] = self.get(row)
+        return result
+
+
+class ValueColumn:
+    """A scalar column backed by a numpy array with a conversion applied on access."""
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        valid: np.ndarray,
+        convert: Callable[[Any], Any] | None = None,
+    ):
+        self.values = values
+        self.valid = valid
+        self.convert = convert
+
+    @classmethod
+    def from_values(
+        cls, values: Any, convert: Callable[[Any], Any] | None = None
+    ) -> "ValueColumn":
+        """Wrap a series of scalar (or arbitrary object) values."""
+        series = pd.Series(values) if not isinstance(values, pd.Series) else values
+        array = series.to_numpy()
+        if array.dtype == object:
+            valid = np.fromiter(
+                (not _is_null(value) for value in array), dtype=bool, count=len(array)
+            )
+        else:
+            valid = ~pd.isna(array)
+        return cls(array, valid, convert)
+
+    def get(self, row: int) -> Any:
+        """Get the value of a row."""
+        if not self.valid[row]:
+            return None
+        value = self.values[row]
+        if self.convert is not None:
+            return self.convert(value)
+        return value.item() if isinstance(value, np.generic) else value
+
+    def to_numpy(self) -> np.ndarray:
+        """Return the underlying array (missing values are not masked)."""
+        return self.values
+
+
+class AttributesColumn:
+    """Builds the `attributes` dict of a row from several columns."""
+
+    def __init__(self, columns: dict[str, "Column"], size: int):
+        self.columns = columns
+        self.size = size
+
+    def get(self, row: int) -> dict[str, Any]:
+        """Get the attributes of a row."""
+        return {name: column.get(row) for name, column in self.columns.items()}
+
+    def to_numpy(self) -> np.ndarray:
+        """Decode the whole column into an object array of dicts."""
+        result = np.empty(self.size, dtype=object)
+        result[:] = [self.get(row) for row in range(self.size)]
+        return result
+
+
+class ConstantColumn:
+    """A column holding the same value for every row."""
+
+    def __init__(self, value: Any, size: int):
+        self.value = value
+        self.size = size
+
+    def get(self, row: int) -> Any:
+        """Get the value of a row."""
+        return self.value
+
+    def to_numpy(self) -> np.ndarray:
+        """Return the value repeated for every row."""
+        result = np.empty(self.size, dtype=object)
+        result[:] = [self.value] * self.size
+        return result
+
+
+Column = (
+    StringColumn
+    | ListColumn
+    | EmbeddingColumn
+    | ValueColumn
+    | AttributesColumn
+    | ConstantColumn
+)
+
+
+class RowView:
+    """Mixin for data model classes whose fields are read from a ColumnarCollection."""
+
+    _collection: "ColumnarCollection"
+    _row: int
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RowView) and other._collection is self._collection:
+            return other._row == self._row
+        if not isinstance(other, self._model):  # type: ignore[attr-defined]
+            return NotImplemented
+        return all(
+            _values_equal(getattr(self, field.name), getattr(other, field.name))
+            for field in fields(self._model)  # type: ignore[attr-defined]
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def materialize(self) -> Any:
+        """Create a standalone data model object holding copies of this row's values."""
+        model = self._model  # type: ignore[attr-defined]
+        values = {}
+        for field in fields(model):
+            value = getattr(self, field.name)
+            if isinstance(value, np.ndarray):
+                value = value.copy()
+            values[field.name] = value
+        return model(**values)
+
+    def __deepcopy__(self, memo: dict) -> Any:
+        return copy.deepcopy(self.materialize(), memo)
+
+    def __copy__(self) -> Any:
+        return self.materialize()
+
+    def __reduce__(self) -> Any:
+        return self.materialize().__reduce__()
+
+
+def _values_equal(left: Any, right: Any) -> bool:
+    if isinstance(left, np.ndarray) or isinstance(right, np.ndarray):
+        return left is not None and right is not None and np.array_equal(left, right)
+    return left == right
+
+
+def _field_property(name: str) -> property:
+    def getter(self: RowView) -> Any:
+        return self._collection.get_field(name, self._row)
+
+    def setter(self: RowView, value: Any) -> None:
+        self._collection.set_field(name, self._row, value)
+
+    return property(getter, setter)
+
+
+@cache
+def view_class(model: type) -> type:
+    """Create (once per model class) a row view subclass of a data model dataclass."""
+    namespace: dict[str, Any] = {
+        field.name: _field_property(field.name) for field in fields(model)
+    }
+    namespace["_model"] = model
+    namespace["__repr__"] = lambda self: repr(self.materialize())
+    namespace["__doc__"] = f"Row view of a {model.__name__} in a ColumnarCollection."
+    return type(f"{model.__name__}View", (RowView, model), namespace)
+
+
+class ColumnarCollection(Sequence[T], Generic[T]):
+    """A read-mostly sequence of data model objects backed by columns.
+
+    Indexing and iteration return row views (subclasses of the data model class)
+    that are created on access. Assignments to view fields are kept in the
+    collection, so they are visible from every view of the same row. Dict and
+    list values are rebuilt from the columns on every read, so in-place changes
+    to them are not kept; assign a new value instead.
+    """
+
+    def __init__(self, model: type[T], columns: dict[str, Column], size: int):
+        self.model = model
+        self.columns = columns
+        self.size = size
+        self._view_class = view_class(model)
+        self._defaults = {
+            field.name: field.default
+            if field.default_factory is MISSING
+            else field.default_factory
+            for field in fields(model)
+        }
+        self._overrides: dict[str, dict[int, Any]] = {}
+        self._indexes: dict[str, dict[Any, int]] = {}
+
+    def __len__(self) -> int:
+        return self.size
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[T]: ...
+
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        if isinstance(index, slice):
+            return [self._view(row) for row in range(*index.indices(self.size))]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            msg = "ColumnarCollection index out of range"
+            raise IndexError(msg)
+        return self._view(index)
+
+    def __iter__(self) -> Iterator[T]:
+        return (self._view(row) for row in range(self.size))
+
+    def __add__(self, other: Sequence[T]) -> list[T]:
+        return [*self, *other]
+
+    def __radd__(self, other: Sequence[T]) -> list[T]:
+        return [*other, *self]
+
+    def __repr__(self) -> str:
+        return (
+            f"ColumnarCollection[{self.model.__name__}]"
+            f"(size={self.size}, columns={list(self.columns)})"
+        )
+
+    def _view(self, row: int) -> T:
+        view = object.__new__(self._view_class)
+        view._collection = self
+        view._row = row
+        return view
+
+    def get_field(self, name: str, row: int) -> Any:
+        """Read a field of a row."""
+        overrides = self._overrides.get(name)
+        if overrides and row in overrides:
+            return overrides[row]
+        column = self.columns.get(name)
+        if column is not None:
+            return column.get(row)
+        default = self._defaults[name]
+        if default is MISSING:
+            return None
+        return default() if callable(default) else default
+
+    def set_field(self, name: str, row: int, value: Any) -> None:
+        """Overwrite a field of a row."""
+        column = self.columns.get(name)
+        if (
+            isinstance(column, EmbeddingColumn)
+            and value is not None
+            and len(value) == column.matrix.shape[1]
+        ):
+            column.matrix[row] = value
+            column.valid[row] = True
+            return
+        self._overrides.setdefault(name, {})[row] = value
+        self._indexes.pop(name, None)
+
+    def column(self, name: str) -> np.ndarray:
+        """Return the values of a field for all rows as a numpy array."""
+        column = self.columns.get(name)
+        if column is None:
+            values = np.empty(self.size, dtype=object)
+            values[:] = [self.get_field(name, row) for row in range(self.size)]
+            return values
+        values = column.to_numpy()
+        overrides = self._overrides.get(name)
+        if overrides:
+            values = values.astype(object)
+            for row, value in overrides.items():
+                values[row] = value
+        return values
+
+    def embedding_matrix(self, name: str) -> tuple[np.ndarray, np.ndarray] | None:
+        """Return the (float32 matrix, validity mask) of an embedding field.
+
+        Returns None when the field is missing or its vectors have different lengths.
+        """
+        column = self.columns.get(name)
+        overrides = self._overrides.get(name)
+        if overrides or not isinstance(column, EmbeddingColumn):
+            rebuilt = EmbeddingColumn.from_vectors(self.column(name))
+            if not isinstance(rebuilt, EmbeddingColumn):
+                return None
+            self.columns[name] = column = rebuilt
+            self._overrides.pop(name, None)
+        return column.matrix, column.valid
+
+    def set_embeddings(self, name: str, vectors: Sequence[Any]) -> None:
+        """Replace an embedding field for all rows."""
+        if len(vectors) != self.size:
+            msg = f"expected {self.size} vectors, got {len(vectors)}"
+            raise ValueError(msg)
+        self.columns[name] = EmbeddingColumn.from_vectors(vectors)
+        self._overrides.pop(name, None)
+
+    def row_index(self, name: str = "id") -> dict[Any, int]:
+        """Return (and cache) a mapping from field value to row; later rows win."""
+        index = self._indexes.get(name)
+        if index is None:
+            values = self.column(name)
+            index = dict(zip(values.tolist(), range(self.size), strict=True))
+            self._indexes[name] = index
+        return index
+
+    def as_mapping(self, key: str = "id") -> "ColumnarMapping[T]":
+        """Return a read-only mapping from a field value (default: id) to row views."""
+        return ColumnarMapping(self, key)
+
+
+class ColumnarMapping(Mapping[Any, T], Generic[T]):
+    """A lazy mapping from a key field of a ColumnarCollection to row views."""
+
+    def __init__(self, collection: ColumnarCollection[T], key: str = "id"):
+        self.collection = collection
+        self.key = key
+        self._index = collection.row_index(key)
+
+    def __getitem__(self, key: Any) -> T:
+        return self.collection._view(self._index[key])  # noqa: SLF001
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._index
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
@@ -3,6 +3,8 @@
 
 """Load data from dataframes into collections of data objects."""
 
+from collections.abc import Callable
+
 import pandas as pd
 
 from graphrag.data_model.community import Community
@@ -11,25 +13,75 @@ from graphrag.data_model.covariate import Covariate
 from graphrag.data_model.entity import Entity
 from graphrag.data_model.relationship import Relationship
 from graphrag.data_model.text_unit import TextUnit
-from graphrag.query.input.loaders.utils import (
-    to_list,
-    to_optional_dict,
-    to_optional_float,
-    to_optional_int,
-    to_optional_list,
-    to_optional_str,
-    to_str,
+from graphrag.query.input.loaders.columnar import (
+    AttributesColumn,
+    Column,
+    ColumnarCollection,
+    ConstantColumn,
+    EmbeddingColumn,
+    ListColumn,
+    StringColumn,
+    ValueColumn,
 )
 
 
-def _prepare_records(df: pd.DataFrame) -> list[dict]:
-    """
-    Reset index and convert the DataFrame to a list of dictionaries.
+def _required_column(df: pd.DataFrame, column_name: str | None) -> pd.Series:
+    """Get a required column, raising a ValueError when it is missing."""
+    if column_name is None:
+        msg = "Column name is None"
+        raise ValueError(msg)
+    if column_name not in df.columns:
+        msg = f"Column [{column_name}] not found in data"
+        raise ValueError(msg)
+    return df[column_name]
+
+
+def _str_column(
+    df: pd.DataFrame, column_name: str | None, optional: bool = False
+) -> StringColumn:
+    """Dictionary-encode a required column; null values stay None if optional."""
+    return StringColumn.from_values(
+        _required_column(df, column_name), required=not optional
+    )
+
+
+def _short_id_column(df: pd.DataFrame, short_id_col: str | None) -> StringColumn:
+    """Read short ids from a column, or fall back to the dataframe index."""
+    if short_id_col:
+        return _str_column(df, short_id_col, optional=True)
+    return StringColumn.from_values(df.index, required=True)
+
+
+def _optional_column(
+    df: pd.DataFrame, column_name: str | None, build: Callable[[pd.Series], Column]
+) -> Column:
+    """Build a column from an optional dataframe column (all None if absent)."""
+    if column_name is None or column_name not in df.columns:
+        return ConstantColumn(None, len(df))
+    return build(df[column_name])
+
 
-    We rename the reset index column to 'Index' for consistency.
-    """
-    df_reset = df.reset_index().rename(columns={"index": "Index"})
-    return df_reset.to_dict("records")
+def _int_column(values: pd.Series) -> ValueColumn:
+    return ValueColumn.from_values(values, convert=int)
+
+
+def _float_column(values: pd.Series) -> ValueColumn:
+    return ValueColumn.from_values(values, convert=float)
+
+
+def _attributes_column(
+    df: pd.DataFrame, attributes_cols: list[str] | None
+) -> Column:
+    """Build the attributes dict column from a list of columns."""
+    if not attributes_cols:
+        return ConstantColumn(None, len(df))
+    return AttributesColumn(
+        {
+            col: _optional_column(df, col, ValueColumn.from_values)
+            for col in attributes_cols
+        },
+        len(df),
+    )
 
 
 def read_entities(
@@ -45,33 +97,33 @@ def read_entities(
     text_unit_ids_col: str | None = "text_unit_ids",
     rank_col: str | None = "degree",
     attributes_cols: list[str] | None = None,
-) -> list[Entity]:
-    """Read entities from a dataframe using pre-converted records."""
-    records = _prepare_records(df)
-    return [
-        Entity(
-            id=to_str(row, id_col),
-            short_id=to_optional_str(row, short_id_col)
-            if short_id_col
-            else str(row["Index"]),
-            title=to_str(row, title_col),
-            type=to_optional_str(row, type_col),
-            description=to_optional_str(row, description_col),
-            name_embedding=to_optional_list(row, name_embedding_col, item_type=float),
-            description_embedding=to_optional_list(
-                row, description_embedding_col, item_type=float
+) -> ColumnarCollection[Entity]:
+    """Read entities from a dataframe into a columnar collection."""
+    return ColumnarCollection(
+        Entity,
+        {
+            "id": _str_column(df, id_col),
+            "short_id": _short_id_column(df, short_id_col),
+            "title": _str_column(df, title_col),
+            "type": _str_column(df, type_col, optional=True),
+            "description": _str_column(df, description_col, optional=True),
+            "name_embedding": _optional_column(
+                df, name_embedding_col, EmbeddingColumn.from_values
             ),
-            community_ids=to_optional_list(row, community_col, item_type=str),
-            text_unit_ids=to_optional_list(row, text_unit_ids_col),
-            rank=to_optional_int(row, rank_col),
-            attributes=(
-                {col: row.get(col) for col in attributes_cols}
-                if attributes_cols
-                else None
+            "description_embedding": _optional_column(
+                df, description_embedding_col, EmbeddingColumn.from_values
             ),
-        )
-        for row in records
-    ]
+            "community_ids": _optional_column(
+                df, community_col, ListColumn.from_values
+            ),
+            "text_unit_ids": _optional_column(
+                df, text_unit_ids_col, ListColumn.from_values
+            ),
+            "rank": _optional_column(df, rank_col, _int_column),
+            "attributes": _attributes_column(df, attributes_cols),
+        },
+        len(df),
+    )
 
 
 def read_relationships(
@@ -86,32 +138,28 @@ def read_relationships(
     weight_col: str | None = "weight",
     text_unit_ids_col: str | None = "text_unit_ids",
     attributes_cols: list[str] | None = None,
-) -> list[Relationship]:
-    """Read relationships from a dataframe using pre-converted records."""
-    records = _prepare_records(df)
-    return [
-        Relationship(
-            id=to_str(row, id_col),
-            short_id=to_optional_str(row, short_id_col)
-            if short_id_col
-            else str(row["Index"]),
-            source=to_str(row, source_col),
-            target=to_str(row, target_col),
-            description=to_optional_str(row, description_col),
-            description_embedding=to_optional_list(
-                row, description_embedding_col, item_type=float
+) -> ColumnarCollection[Relationship]:
+    """Read relationships from a dataframe into a columnar collection."""
+    return ColumnarCollection(
+        Relationship,
+        {
+            "id": _str_column(df, id_col),
+            "short_id": _short_id_column(df, short_id_col),
+            "source": _str_column(df, source_col),
+            "target": _str_column(df, target_col),
+            "description": _str_column(df, description_col, optional=True),
+            "description_embedding": _optional_column(
+                df, description_embedding_col, EmbeddingColumn.from_values
             ),
-            weight=to_optional_float(row, weight_col),
-            text_unit_ids=to_optional_list(row, text_unit_ids_col, item_type=str),
-            rank=to_optional_int(row, rank_col),
-            attributes=(
-                {col: row.get(col) for col in attributes_cols}
-                if attributes_cols
-                else None
+            "weight": _optional_column(df, weight_col, _float_column),
+            "text_unit_ids": _optional_column(
+                df, text_unit_ids_col, ListColumn.from_values
             ),
-        )
-        for row in records
-    ]
+            "rank": _optional_column(df, rank_col, _int_column),
+            "attributes": _attributes_column(df, attributes_cols),
+        },
+        len(df),
+    )
 
 
 def read_covariates(
@@ -122,28 +170,26 @@ def read_covariates(
     covariate_type_col: str | None = "type",
     text_unit_ids_col: str | None = "text_unit_ids",
     attributes_cols: list[str] | None = None,
-) -> list[Covariate]:
-    """Read covariates from a dataframe using pre-converted records."""
-    records = _prepare_records(df)
-    return [
-        Covariate(
-            id=to_str(row, id_col),
-            short_id=to_optional_str(row, short_id_col)
-            if short_id_col
-            else str(row["Index"]),
-            subject_id=to_str(row, subject_col),
-            covariate_type=(
-                to_str(row, covariate_type_col) if covariate_type_col else "claim"
+) -> ColumnarCollection[Covariate]:
+    """Read covariates from a dataframe into a columnar collection."""
+    return ColumnarCollection(
+        Covariate,
+        {
+            "id": _str_column(df, id_col),
+            "short_id": _short_id_column(df, short_id_col),
+            "subject_id": _str_column(df, subject_col),
+            "covariate_type": (
+                _str_column(df, covariate_type_col)
+                if covariate_type_col
+                else ConstantColumn("claim", len(df))
             ),
-            text_unit_ids=to_optional_list(row, text_unit_ids_col, item_type=str),
-            attributes=(
-                {col: row.get(col) for col in attributes_cols}
-                if attributes_cols
-                else None
+            "text_unit_ids": _optional_column(
+                df, text_unit_ids_col, ListColumn.from_values
             ),
-        )
-        for row in records
-    ]
+            "attributes": _attributes_column(df, attributes_cols),
+        },
+        len(df),
+    )
 
 
 def read_communities(
@@ -158,32 +204,28 @@ def read_communities(
     parent_col: str | None = "parent",
     children_col: str | None = "children",
     attributes_cols: list[str] | None = None,
-) -> list[Community]:
-    """Read communities from a dataframe using pre-converted records."""
-    records = _prepare_records(df)
-    return [
-        Community(
-            id=to_str(row, id_col),
-            short_id=to_optional_str(row, short_id_col)
-            if short_id_col
-            else str(row["Index"]),
-            title=to_str(row, title_col),
-            level=to_str(row, level_col),
-            entity_ids=to_optional_list(row, entities_col, item_type=str),
-            relationship_ids=to_optional_list(row, relationships_col, item_type=str),
-            covariate_ids=to_optional_dict(
-                row, covariates_col, key_type=str, value_type=str
+) -> ColumnarCollection[Community]:
+    """Read communities from a dataframe into a columnar collection."""
+    return ColumnarCollection(
+        Community,
+        {
+            "id": _str_column(df, id_col),
+            "short_id": _short_id_column(df, short_id_col),
+            "title": _str_column(df, title_col),
+            "level": _str_column(df, level_col),
+            "entity_ids": _optional_column(df, entities_col, ListColumn.from_values),
+            "relationship_ids": _optional_column(
+                df, relationships_col, ListColumn.from_values
             ),
-            parent=to_str(row, parent_col),
-            children=to_list(row, children_col),
-            attributes=(
-                {col: row.get(col) for col in attributes_cols}
-                if attributes_cols
-                else None
+            "covariate_ids": _optional_column(
+                df, covariates_col, ValueColumn.from_values
             ),
-        )
-        for row in records
-    ]
+            "parent": _str_column(df, parent_col),
+            "children": ListColumn.from_values(_required_column(df, children_col)),
+            "attributes": _attributes_column(df, attributes_cols),
+        },
+        len(df),
+    )
 
 
 def read_community_reports(
@@ -197,31 +239,25 @@ def read_community_reports(
     rank_col: str | None = "rank",
     content_embedding_col: str | None = "full_content_embedding",
     attributes_cols: list[str] | None = None,
-) -> list[CommunityReport]:
-    """Read community reports from a dataframe using pre-converted records."""
-    records = _prepare_records(df)
-    return [
-        CommunityReport(
-            id=to_str(row, id_col),
-            short_id=to_optional_str(row, short_id_col)
-            if short_id_col
-            else str(row["Index"]),
-            title=to_str(row, title_col),
-            community_id=to_str(row, community_col),
-            summary=to_str(row, summary_col),
-            full_content=to_str(row, content_col),
-            rank=to_optional_float(row, rank_col),
-            full_content_embedding=to_optional_list(
-                row, content_embedding_col, item_type=float
+) -> ColumnarCollection[CommunityReport]:
+    """Read community reports from a dataframe into a columnar collection."""
+    return ColumnarCollection(
+        CommunityReport,
+        {
+            "id": _str_column(df, id_col),
+            "short_id": _short_id_column(df, short_id_col),
+            "title": _str_column(df, title_col),
+            "community_id": _str_column(df, community_col),
+            "summary": _str_column(df, summary_col),
+            "full_content": _str_column(df, content_col),
+            "rank": _optional_column(df, rank_col, _float_column),
+            "full_content_embedding": _optional_column(
+                df, content_embedding_col, EmbeddingColumn.from_values
             ),
-            attributes=(
-                {col: row.get(col) for col in attributes_cols}
-                if attributes_cols
-                else None
-            ),
-        )
-        for row in records
-    ]
+            "attributes": _attributes_column(df, attributes_cols),
+        },
+        len(df),
+    )
 
 
 def read_text_units(
@@ -234,26 +270,26 @@ def read_text_units(
     tokens_col: str | None = "n_tokens",
     document_ids_col: str | None = "document_ids",
     attributes_cols: list[str] | None = None,
-) -> list[TextUnit]:
-    """Read text units from a dataframe using pre-converted records."""
-    records = _prepare_records(df)
-    return [
-        TextUnit(
-            id=to_str(row, id_col),
-            short_id=str(row["Index"]),
-            text=to_str(row, text_col),
-            entity_ids=to_optional_list(row, entities_col, item_type=str),
-            relationship_ids=to_optional_list(row, relationships_col, item_type=str),
-            covariate_ids=to_optional_dict(
-                row, covariates_col, key_type=str, value_type=str
+) -> ColumnarCollection[TextUnit]:
+    """Read text units from a dataframe into a columnar collection."""
+    return ColumnarCollection(
+        TextUnit,
+        {
+            "id": _str_column(df, id_col),
+            "short_id": _short_id_column(df, None),
+            "text": _str_column(df, text_col),
+            "entity_ids": _optional_column(df, entities_col, ListColumn.from_values),
+            "relationship_ids": _optional_column(
+                df, relationships_col, ListColumn.from_values
+            ),
+            "covariate_ids": _optional_column(
+                df, covariates_col, ValueColumn.from_values
             ),
-            n_tokens=to_optional_int(row, tokens_col),
-            document_ids=to_optional_list(row, document_ids_col, item_type=str),
-            attributes=(
-                {col: row.get(col) for col in attributes_cols}
-                if attributes_cols
-                else None
+            "n_tokens": _optional_column(df, tokens_col, _int_column),
+            "document_ids": _optional_column(
+                df, document_ids_col, ListColumn.from_values
             ),
-        )
-        for row in records
-    ]
+            "attributes": _attributes_column(df, attributes_cols),
+        },
+        len(df),
+    )
@@ -3,27 +3,137 @@
 
 """Util functions to retrieve relationships from a collection."""
 
+from collections import defaultdict
+from collections.abc import Iterable, Sequence
 from typing import Any, cast
 
 import pandas as pd
 
 from graphrag.data_model.entity import Entity
 from graphrag.data_model.relationship import Relationship
+from graphrag.data_model.text_unit import TextUnit
+from graphrag.query.input.loaders.columnar import ColumnarCollection
+
+
+class RelationshipIndex:
+    """Adjacency index over a relationship collection, built once and queried per search.
+
+    Relationships are grouped by source title, target title, id and text unit id, so
+    retrieving the relationships of a few selected entities does not scan the graph.
+    Lookups return relationships in collection order, like scanning the list would.
+    """
+
+    def __init__(self, relationships: Sequence[Relationship]):
+        self.relationships = relationships
+        self.sources = _field_values(relationships, "source")
+        self.targets = _field_values(relationships, "target")
+        self.by_source = _group_positions(self.sources)
+        self.by_target = _group_positions(self.targets)
+        self.by_id = _group_positions(_field_values(relationships, "id"))
+        self.by_text_unit: dict[str, list[int]] = defaultdict(list)
+        for position, text_unit_ids in enumerate(
+            _field_values(relationships, "text_unit_ids")
+        ):
+            for text_unit_id in dict.fromkeys(text_unit_ids or []):
+                self.by_text_unit[text_unit_id].append(position)
+
+    def __len__(self) -> int:
+        return len(self.relationships)
+
+    def _select(self, positions: Iterable[int]) -> list[Relationship]:
+        return [self.relationships[position] for position in sorted(positions)]
+
+    def in_network(self, entity_names: set[str]) -> list[Relationship]:
+        """Get relationships whose source and target are both in entity_names."""
+        return self._select(
+            position
+            for name in entity_names
+            for position in self.by_source.get(name, ())
+            if self.targets[position] in entity_names
+        )
+
+    def out_network(self, entity_names: set[str]) -> list[Relationship]:
+        """Get relationships with exactly one end in entity_names, outgoing ones first."""
+        source_relationships = self._select(
+            position
+            for name in entity_names
+            for position in self.by_source.get(name, ())
+            if self.targets[position] not in entity_names
+        )
+        target_relationships = self._select(
+            position
+            for name in entity_names
+            for position in self.by_target.get(name, ())
+            if self.sources[position] not in entity_names
+        )
+        return source_relationships + target_relationships
+
+    def candidates(self, entity_names: set[str]) -> list[Relationship]:
+        """Get relationships with at least one end in entity_names."""
+        return self._select({
+            position
+            for name in entity_names
+            for group in (self.by_source, self.by_target)
+            for position in group.get(name, ())
+        })
+
+    def count_text_unit_relationships(
+        self, entity_name: str, text_unit: TextUnit
+    ) -> int:
+        """Count the relationships of an entity that are associated with the text unit.
+
+        Same result as count_relationships over the entity's relationships.
+        """
+
+        def is_linked(position: int) -> bool:
+            return (
+                self.sources[position] == entity_name
+                or self.targets[position] == entity_name
+            )
+
+        if not text_unit.relationship_ids:
+            return sum(
+                1
+                for position in self.by_text_unit.get(text_unit.id, ())
+                if is_linked(position)
+            )
+        return sum(
+            1
+            for relationship_id in text_unit.relationship_ids
+            if any(map(is_linked, self.by_id.get(relationship_id, ())))
+        )
+
+
+def _field_values(relationships: Sequence[Relationship], name: str) -> list[Any]:
+    """Read one field of every relationship, without creating row views for columnar input."""
+    if isinstance(relationships, ColumnarCollection):
+        return relationships.column(name).tolist()
+    return [getattr(relationship, name) for relationship in relationships]
+
+
+def _group_positions(values: list[Any]) -> dict[Any, list[int]]:
+    groups: dict[Any, list[int]] = defaultdict(list)
+    for position, value in enumerate(values):
+        groups[value].append(position)
+    return dict(groups)
 
 
 def get_in_network_relationships(
     selected_entities: list[Entity],
-    relationships: list[Relationship],
+    relationships: list[Relationship] | RelationshipIndex,
     ranking_attribute: str = "rank",
 ) -> list[Relationship]:
     """Get all directed relationships between selected entities, sorted by ranking_attribute."""
-    selected_entity_names = [entity.title for entity in selected_entities]
-    selected_relationships = [
-        relationship
-        for relationship in relationships
-        if relationship.source in selected_entity_names
-        and relationship.target in selected_entity_names
-    ]
+    selected_entity_names = {entity.title for entity in selected_entities}
+    if isinstance(relationships, RelationshipIndex):
+        selected_relationships = relationships.in_network(selected_entity_names)
+    else:
+        selected_relationships = [
+            relationship
+            for relationship in relationships
+            if relationship.source in selected_entity_names
+            and relationship.target in selected_entity_names
+        ]
     if len(selected_relationships) <= 1:
         return selected_relationships
 
@@ -33,33 +143,38 @@ def get_in_network_relationships(
 
 def get_out_network_relationships(
     selected_entities: list[Entity],
-    relationships: list[Relationship],
+    relationships: list[Relationship] | RelationshipIndex,
     ranking_attribute: str = "rank",
 ) -> list[Relationship]:
     """Get relationships from selected entities to other entities that are not within the selected entities, sorted by ranking_attribute."""
-    selected_entity_names = [entity.title for entity in selected_entities]
-    source_relationships = [
-        relationship
-        for relationship in relationships
-        if relationship.source in selected_entity_names
-        and relationship.target not in selected_entity_names
-    ]
-    target_relationships = [
-        relationship
-        for relationship in relationships
-        if relationship.target in selected_entity_names
-        and relationship.source not in selected_entity_names
-    ]
-    selected_relationships = source_relationships + target_relationships
+    selected_entity_names = {entity.title for entity in selected_entities}
+    if isinstance(relationships, RelationshipIndex):
+        selected_relationships = relationships.out_network(selected_entity_names)
+    else:
+        source_relationships = [
+            relationship
+            for relationship in relationships
+            if relationship.source in selected_entity_names
+            and relationship.target not in selected_entity_names
+        ]
+        target_relationships = [
+            relationship
+            for relationship in relationships
+            if relationship.target in selected_entity_names
+            and relationship.source not in selected_entity_names
+        ]
+        selected_relationships = source_relationships + target_relationships
     return sort_relationships_by_rank(selected_relationships, ranking_attribute)
 
 
 def get_candidate_relationships(
     selected_entities: list[Entity],
-    relationships: list[Relationship],
+    relationships: list[Relationship] | RelationshipIndex,
 ) -> list[Relationship]:
     """Get all relationships that are associated with the selected entities."""
-    selected_entity_names = [entity.title for entity in selected_entities]
+    selected_entity_names = {entity.title for entity in selected_entities}
+    if isinstance(relationships, RelationshipIndex):
+        return relationships.candidates(selected_entity_names)
     return [
         relationship
         for relationship in relationships
@@ -72,9 +187,9 @@ def get_entities_from_relationships(
     relationships: list[Relationship], entities: list[Entity]
 ) -> list[Entity]:
     """Get all entities that are associated with the selected relationships."""
-    selected_entity_names = [relationship.source for relationship in relationships] + [
+    selected_entity_names = {relationship.source for relationship in relationships} | {
         relationship.target for relationship in relationships
-    ]
+    }
     return [entity for entity in entities if entity.title in selected_entity_names]
 
 
@@ -16,10 +16,12 @@ def get_candidate_text_units(
     text_units: list[TextUnit],
 ) -> pd.DataFrame:
     """Get all text units that are associated to selected entities."""
-    selected_text_ids = [
-        entity.text_unit_ids for entity in selected_entities if entity.text_unit_ids
-    ]
-    selected_text_ids = [item for sublist in selected_text_ids for item in sublist]
+    selected_text_ids = {
+        text_id
+        for entity in selected_entities
+        if entity.text_unit_ids
+        for text_id in entity.text_unit_ids
+    }
     selected_text_units = [unit for unit in text_units if unit.id in selected_text_ids]
     return to_text_unit_dataframe(selected_text_units)
 
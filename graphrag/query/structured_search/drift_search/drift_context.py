@@ -23,6 +23,7 @@ from graphrag.prompts.query.drift_search_system_prompt import (
     DRIFT_REDUCE_PROMPT,
 )
 from graphrag.query.context_builder.entity_extraction import EntityVectorStoreKey
+from graphrag.query.input.loaders.columnar import ColumnarCollection
 from graphrag.query.structured_search.base import DRIFTContextBuilder
 from graphrag.query.structured_search.drift_search.primer import PrimerQueryProcessor
 from graphrag.query.structured_search.local_search.mixed_context import (
@@ -162,6 +163,61 @@ class DRIFTSearchContextBuilder(DRIFTContextBuilder):
             and isinstance(query_embedding[0], type(embedding[0]))
         )
 
+    def _top_k_columnar_reports(
+        self, reports: ColumnarCollection[CommunityReport], query_embedding: Any
+    ) -> pd.DataFrame:
+        """
+        Select the top-k reports by cosine similarity directly on the embedding matrix.
+
+        Args
+        ----
+        reports : ColumnarCollection[CommunityReport]
+            Reports loaded into a columnar collection.
+        query_embedding : Any
+            Embedding of the query.
+
+        Returns
+        -------
+        pd.DataFrame: Top-k most similar documents.
+
+        Raises
+        ------
+        ValueError: If some reports are missing full content embeddings, or the
+        query embedding does not match their dimension.
+        """
+        embeddings = reports.embedding_matrix("full_content_embedding")
+        if embeddings is None or not embeddings[1].all():
+            missing = (
+                len(reports) if embeddings is None else int((~embeddings[1]).sum())
+            )
+            error_message = (
+                "Some reports are missing full content embeddings. "
+                f"{missing} out of {len(reports)}"
+            )
+            raise ValueError(error_message)
+
+        matrix = embeddings[0]
+        if query_embedding is None or len(query_embedding) != matrix.shape[1]:
+            error_message = (
+                "Query and document embeddings are not compatible. "
+                "Please ensure that the embeddings are of the same type and length."
+            )
+            raise ValueError(error_message)
+
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        similarity = (matrix @ query_vector) / (
+            np.linalg.norm(matrix, axis=1) * np.linalg.norm(query_vector)
+        )
+        # stable sort keeps the first report on ties, like DataFrame.nlargest
+        rows = np.argsort(-similarity, kind="stable")[: self.config.drift_k_followups]
+        return pd.DataFrame(
+            {
+                column: reports.column(column)[rows]
+                for column in ["short_id", "community_id", "full_content"]
+            },
+            index=rows,
+        )
+
     async def build_context(
         self, query: str, **kwargs
     ) -> tuple[pd.DataFrame, dict[str, int]]:
@@ -198,6 +254,10 @@ class DRIFTSearchContextBuilder(DRIFTContextBuilder):
 
         query_embedding, token_ct = await query_processor(query)
 
+        if isinstance(self.reports, ColumnarCollection):
+            top_k = self._top_k_columnar_reports(self.reports, query_embedding)
+            return top_k, token_ct
+
         report_df = self.convert_reports_to_df(self.reports)
 
         # Check compatibility between query embedding and document embeddings
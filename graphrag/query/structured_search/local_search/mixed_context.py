@@ -3,8 +3,8 @@
 """Algorithms to build context data for local search prompt."""
 
 import logging
-from copy import deepcopy
-from typing import Any
+from collections.abc import Mapping, Sequence
+from typing import Any, TypeVar
 
 import pandas as pd
 import tiktoken
@@ -32,13 +32,12 @@ from graphrag.query.context_builder.local_context import (
     build_relationship_context,
     get_candidate_context,
 )
-from graphrag.query.context_builder.source_context import (
-    build_text_unit_context,
-    count_relationships,
-)
+from graphrag.query.context_builder.source_context import build_text_unit_context
+from graphrag.query.input.loaders.columnar import ColumnarCollection
 from graphrag.query.input.retrieval.community_reports import (
     get_candidate_communities,
 )
+from graphrag.query.input.retrieval.relationships import RelationshipIndex
 from graphrag.query.input.retrieval.text_units import get_candidate_text_units
 from graphrag.query.llm.text_utils import num_tokens
 from graphrag.query.structured_search.base import LocalContextBuilder
@@ -46,6 +45,15 @@ from graphrag.vector_stores.base import BaseVectorStore
 
 log = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+def _index_by(items: Sequence[T], key: str) -> Mapping[str, T]:
+    """Index data objects by a field, lazily for columnar collections."""
+    if isinstance(items, ColumnarCollection):
+        return items.as_mapping(key)
+    return {getattr(item, key): item for item in items}
+
 
 class LocalSearchMixedContext(LocalContextBuilder):
     """Build data context for local search prompt combining community reports and entity/relationship/covariate tables."""
@@ -70,14 +78,11 @@ class LocalSearchMixedContext(LocalContextBuilder):
             covariates = {}
         if text_units is None:
             text_units = []
-        self.entities = {entity.id: entity for entity in entities}
-        self.community_reports = {
-            community.community_id: community for community in community_reports
-        }
-        self.text_units = {unit.id: unit for unit in text_units}
-        self.relationships = {
-            relationship.id: relationship for relationship in relationships
-        }
+        self.entities = _index_by(entities, "id")
+        self.community_reports = _index_by(community_reports, "community_id")
+        self.text_units = _index_by(text_units, "id")
+        self.relationships = _index_by(relationships, "id")
+        self.relationship_index = RelationshipIndex(relationships)
         self.covariates = covariates
         self.entity_text_embeddings = entity_text_embeddings
         self.text_embedder = text_embedder
@@ -252,15 +257,20 @@ class LocalSearchMixedContext(LocalContextBuilder):
             if community_id in self.community_reports
         ]
         for community in selected_communities:
-            if community.attributes is None:
-                community.attributes = {}
-            community.attributes["matches"] = community_matches[community.community_id]
+            community.attributes = {
+                **(community.attributes or {}),
+                "matches": community_matches[community.community_id],
+            }
         selected_communities.sort(
             key=lambda x: (x.attributes["matches"], x.rank),  # type: ignore
             reverse=True,  # type: ignore
         )
         for community in selected_communities:
-            del community.attributes["matches"]  # type: ignore
+            community.attributes = {
+                key: value
+                for key, value in community.attributes.items()  # type: ignore
+                if key != "matches"
+            }
 
         context_text, context_data = build_community_context(
             community_reports=selected_communities,
@@ -318,21 +328,15 @@ class LocalSearchMixedContext(LocalContextBuilder):
         text_unit_ids_set = set()
 
         unit_info_list = []
-        relationship_values = list(self.relationships.values())
 
         for index, entity in enumerate(selected_entities):
-            # get matching relationships
-            entity_relationships = [
-                rel
-                for rel in relationship_values
-                if rel.source == entity.title or rel.target == entity.title
-            ]
-
             for text_id in entity.text_unit_ids or []:
                 if text_id not in text_unit_ids_set and text_id in self.text_units:
-                    selected_unit = deepcopy(self.text_units[text_id])
-                    num_relationships = count_relationships(
-                        entity_relationships, selected_unit
+                    selected_unit = self.text_units[text_id]
+                    num_relationships = (
+                        self.relationship_index.count_text_unit_relationships(
+                            entity.title, selected_unit
+                        )
                     )
                     text_unit_ids_set.add(text_id)
                     unit_info_list.append((selected_unit, index, num_relationships))
@@ -416,7 +420,7 @@ class LocalSearchMixedContext(LocalContextBuilder):
                 relationship_context_data,
             ) = build_relationship_context(
                 selected_entities=added_entities,
-                relationships=list(self.relationships.values()),
+                relationships=self.relationship_index,
                 token_encoder=self.token_encoder,
                 max_tokens=max_tokens,
                 column_delimiter=column_delimiter,
@@ -462,7 +466,7 @@ class LocalSearchMixedContext(LocalContextBuilder):
             candidate_context_data = get_candidate_context(
                 selected_entities=selected_entities,
                 entities=list(self.entities.values()),
-                relationships=list(self.relationships.values()),
+                relationships=self.relationship_index,
                 covariates=self.covariates,
                 include_entity_rank=include_entity_rank,
                 entity_rank_description=rank_description,
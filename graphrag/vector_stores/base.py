@@ -70,6 +70,19 @@ class BaseVectorStore(ABC):
     ) -> list[VectorStoreSearchResult]:
         """Perform ANN search by vector."""
 
+    def similarity_search_by_vectors(
+        self, query_embeddings: list[list[float]], k: int = 10, **kwargs: Any
+    ) -> list[list[VectorStoreSearchResult]]:
+        """Perform ANN search for a batch of vectors, one result list per query.
+
+        Stores that can score several queries at once should override this; the
+        default runs one `similarity_search_by_vector` call per query.
+        """
+        return [
+            self.similarity_search_by_vector(query_embedding, k, **kwargs)
+            for query_embedding in query_embeddings
+        ]
+
     @abstractmethod
     def similarity_search_by_text(
         self, text: str, text_embedder: TextEmbedder, k: int = 10, **kwargs: Any
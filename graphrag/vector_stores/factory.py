@@ -9,7 +9,9 @@ from typing import ClassVar
 from graphrag.vector_stores.azure_ai_search import AzureAISearchVectorStore
 from graphrag.vector_stores.base import BaseVectorStore
 from graphrag.vector_stores.cosmosdb import CosmosDBVectoreStore
+from graphrag.vector_stores.ivf import IVFVectorStore
 from graphrag.vector_stores.lancedb import LanceDBVectorStore
+from graphrag.vector_stores.numpy_store import NumpyVectorStore
 
 
 class VectorStoreType(str, Enum):
@@ -18,6 +20,8 @@ class VectorStoreType(str, Enum):
     LanceDB = "lancedb"
     AzureAISearch = "azure_ai_search"
     CosmosDB = "cosmosdb"
+    NumPy = "numpy"
+    IVF = "ivf"
 
 
 class VectorStoreFactory:
@@ -45,6 +49,10 @@ class VectorStoreFactory:
                 return AzureAISearchVectorStore(**kwargs)
             case VectorStoreType.CosmosDB:
                 return CosmosDBVectoreStore(**kwargs)
+            case VectorStoreType.NumPy:
+                return NumpyVectorStore(**kwargs)
+            case VectorStoreType.IVF:
+                return IVFVectorStore(**kwargs)
             case _:
                 if vector_store_type in cls.vector_store_types:
                     return cls.vector_store_types[vector_store_type](**kwargs)
@@ -0,0 +1,361 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""The IVF-PQ (approximate, in-process) vector storage implementation package."""
+
+import logging
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from graphrag.vector_stores.base import VectorStoreDocument, VectorStoreSearchResult
+from graphrag.vector_stores.numpy_store import (
+    NumpyVectorStore,
+    cosine_similarity,
+    top_k_indices,
+)
+
+log = logging.getLogger(__name__)
+
+INDEX_FILE = "ivf_index.npz"
+ASSIGNMENTS_FILE = "ivf_assignments.i32"
+CODES_FILE = "ivf_codes.u8"
+
+DEFAULT_NLIST = 1024
+DEFAULT_NPROBE = 16
+# approximate candidates re-scored exactly against the float32 vectors, per result
+DEFAULT_RERANK = 32
+
+# the index is trained once the collection holds this many rows per inverted list
+TRAIN_ROWS_PER_LIST = 32
+PQ_SUBVECTOR_DIMENSION = 16
+PQ_CENTROIDS = 256
+KMEANS_ITERATIONS = 10
+ENCODE_BATCH_SIZE = 16384
+
+
+class IVFVectorStore(NumpyVectorStore):
+    """Approximate vector storage: an inverted file index of product-quantized vectors.
+
+    Documents, vectors and persistence are handled as in the exact `NumpyVectorStore`.
+    Once the collection holds `TRAIN_ROWS_PER_LIST * nlist` rows, a spherical k-means
+    coarse quantizer with `nlist` lists and a product quantizer over the residuals are
+    trained; from then on every loaded batch is assigned and encoded incrementally.
+    A query scores the `nprobe` closest lists with per-query lookup tables and re-ranks
+    the best `rerank * k` candidates exactly. Smaller collections, and id filters
+    that select fewer rows than a probe would visit, are searched exactly.
+    """
+
+    def __init__(
+        self,
+        nlist: int | None = DEFAULT_NLIST,
+        nprobe: int | None = DEFAULT_NPROBE,
+        rerank: int | None = DEFAULT_RERANK,
+        **kwargs: Any,
+    ) -> None:
+        self.nlist = nlist or DEFAULT_NLIST
+        self.nprobe = nprobe or DEFAULT_NPROBE
+        self.rerank = rerank or DEFAULT_RERANK
+        super().__init__(**kwargs)
+
+    def _reset(self) -> None:
+        super()._reset()
+        self._centroids: np.ndarray | None = None
+        self._codebooks = np.zeros((0, 0, 0), dtype=np.float32)
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._codes = np.zeros((0, 0), dtype=np.uint8)
+        self._new_assignments: list[np.ndarray] = []
+        self._new_codes: list[np.ndarray] = []
+        self._lists: tuple[np.ndarray, np.ndarray] | None = None
+
+    @property
+    def trained(self) -> bool:
+        """Whether the approximate index has been trained."""
+        return self._centroids is not None
+
+    def connect(self, **kwargs: Any) -> Any:
+        """Connect to vector storage, loading the persisted collection and index."""
+        super().connect(**kwargs)
+        if self.path is None or not (self.path / INDEX_FILE).exists():
+            return
+        with np.load(self.path / INDEX_FILE) as index:
+            centroids, codebooks = index["centroids"], index["codebooks"]
+        rows = len(self._ids)
+        if (
+            _file_size(self.path / ASSIGNMENTS_FILE) != rows * 4
+            or _file_size(self.path / CODES_FILE) != rows * len(codebooks)
+            or rows == 0
+        ):
+            log.warning(
+                "IVF index of collection %s does not match its %d documents; "
+                "it will be retrained on the next load",
+                self.collection_name,
+                rows,
+            )
+            return
+        self._centroids, self._codebooks = centroids, codebooks
+        self._assignments = np.memmap(
+            self.path / ASSIGNMENTS_FILE, dtype=np.int32, mode="r"
+        )
+        self._codes = np.memmap(
+            self.path / CODES_FILE,
+            dtype=np.uint8,
+            mode="r",
+            shape=(rows, len(codebooks)),
+        )
+
+    def load_documents(
+        self, documents: list[VectorStoreDocument], overwrite: bool = True
+    ) -> None:
+        """Load documents into vector storage, indexing them once trained."""
+        start = 0 if overwrite else len(self._ids)
+        super().load_documents(documents, overwrite)
+        if len(self._ids) == start:
+            return
+        if self.trained:
+            self._add_to_index(self._chunks[-1])
+        elif len(self._ids) >= self.nlist * TRAIN_ROWS_PER_LIST:
+            self._train()
+
+    def _train(self) -> None:
+        """Train the coarse and product quantizers and index every stored vector."""
+        matrix, _ = self._vectors()
+        rng = np.random.default_rng(0)
+        sample = matrix[
+            np.sort(
+                rng.choice(
+                    len(matrix),
+                    min(len(matrix), self.nlist * TRAIN_ROWS_PER_LIST),
+                    replace=False,
+                )
+            )
+        ]
+        sample = _normalize(np.asarray(sample, dtype=np.float32))
+        centroids = _kmeans(sample, self.nlist, rng, spherical=True)
+        residuals = sample - centroids[_nearest(sample, centroids, spherical=True)]
+        subvectors = _pq_subvectors(residuals.shape[1])
+        self._centroids = centroids
+        self._codebooks = np.stack([
+            _kmeans(part, PQ_CENTROIDS, rng)
+            for part in np.split(residuals, subvectors, axis=1)
+        ])
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._codes = np.zeros((0, subvectors), dtype=np.uint8)
+        self._new_assignments, self._new_codes = [], []
+        if self.path is not None:
+            np.savez(
+                self.path / INDEX_FILE, centroids=centroids, codebooks=self._codebooks
+            )
+            (self.path / ASSIGNMENTS_FILE).write_bytes(b"")
+            (self.path / CODES_FILE).write_bytes(b"")
+        self._add_to_index(matrix)
+        log.info(
+            "trained IVF index for collection %s: %d lists over %d vectors",
+            self.collection_name,
+            len(centroids),
+            len(matrix),
+        )
+
+    def _add_to_index(self, vectors: np.ndarray) -> None:
+        """Assign vectors to their inverted lists and encode their residuals."""
+        centroids = self._centroids
+        if centroids is None:
+            return
+        for start in range(0, len(vectors), ENCODE_BATCH_SIZE):
+            batch = _normalize(
+                np.asarray(vectors[start : start + ENCODE_BATCH_SIZE], dtype=np.float32)
+            )
+            assignments = _nearest(batch, centroids, spherical=True).astype(np.int32)
+            residuals = batch - centroids[assignments]
+            codes = np.stack(
+                [
+                    _nearest(part, codebook)
+                    for part, codebook in zip(
+                        np.split(residuals, len(self._codebooks), axis=1),
+                        self._codebooks,
+                        strict=True,
+                    )
+                ],
+                axis=1,
+            ).astype(np.uint8)
+            self._new_assignments.append(assignments)
+            self._new_codes.append(codes)
+            if self.path is not None:
+                with (self.path / ASSIGNMENTS_FILE).open("ab") as f:
+                    f.write(assignments.tobytes())
+                with (self.path / CODES_FILE).open("ab") as f:
+                    f.write(codes.tobytes())
+        self._lists = None
+
+    def _index(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return (assignments, codes, list order, list offsets), merging new rows."""
+        if self._new_assignments:
+            self._assignments = np.concatenate([
+                self._assignments,
+                *self._new_assignments,
+            ])
+            self._codes = np.concatenate([self._codes, *self._new_codes])
+            self._new_assignments, self._new_codes = [], []
+        if self._lists is None:
+            counts = np.bincount(self._assignments, minlength=len(self._centroids))
+            self._lists = (
+                np.argsort(self._assignments, kind="stable"),
+                np.concatenate([[0], np.cumsum(counts)]),
+            )
+        return self._assignments, self._codes, *self._lists
+
+    def similarity_search_by_vectors(
+        self, query_embeddings: list[list[float]], k: int = 10, **kwargs: Any
+    ) -> list[list[VectorStoreSearchResult]]:
+        """Perform an approximate similarity search for a batch of queries.
+
+        Pass `nprobe` or `rerank` to override the store's recall/latency settings.
+        """
+        centroids = self._centroids
+        if centroids is None or len(query_embeddings) == 0 or k <= 0:
+            return super().similarity_search_by_vectors(query_embeddings, k, **kwargs)
+        nprobe = min(kwargs.get("nprobe") or self.nprobe, len(centroids))
+        rerank = kwargs.get("rerank") or self.rerank
+        queries = self._queries(query_embeddings)
+        mask = self.query_filter
+        if mask is not None:
+            allowed = np.flatnonzero(mask)
+            if len(allowed) <= nprobe * len(self._ids) / len(centroids):
+                return [
+                    self._results(rows, scores)
+                    for rows, scores in self._exact_top_k(queries, k, allowed)
+                ]
+
+        matrix, norms = self._vectors()
+        assignments, codes, order, offsets = self._index()
+        normalized = _normalize(queries)
+        coarse_scores = normalized @ centroids.T
+        subvectors = len(self._codebooks)
+        lookup_tables = np.einsum(
+            "qmd,mcd->qmc",
+            normalized.reshape(len(queries), subvectors, -1),
+            self._codebooks,
+        )
+        results = []
+        for query, query_coarse, lookup_table in zip(
+            queries, coarse_scores, lookup_tables, strict=True
+        ):
+            candidates = np.concatenate([
+                order[offsets[probe] : offsets[probe + 1]]
+                for probe in top_k_indices(query_coarse, nprobe)
+            ])
+            if mask is not None:
+                candidates = candidates[mask[candidates]]
+            approximate = query_coarse[assignments[candidates]] + lookup_table[
+                np.arange(subvectors), codes[candidates]
+            ].sum(axis=1)
+            shortlist = np.sort(
+                candidates[top_k_indices(approximate, k * rerank)]
+            )
+            scores = cosine_similarity(
+                query[np.newaxis],
+                np.linalg.norm(query, keepdims=True),
+                matrix[shortlist],
+                norms[shortlist],
+            )[0]
+            top = top_k_indices(scores, k)
+            results.append(self._results(shortlist[top], scores[top]))
+        return results
+
+
+def evaluate_recall(
+    store: IVFVectorStore,
+    query_embeddings: list[list[float]],
+    k: int = 10,
+    nprobe_values: tuple[int, ...] = (1, 2, 4, 8, 16, 32, 64),
+) -> list[dict[str, float]]:
+    """Measure recall@k and single-query latency of an IVF store against exact search.
+
+    Returns one row per `nprobe` value with the mean recall, the mean approximate
+    latency and the mean exact latency (both in milliseconds per query).
+    """
+    start = time.perf_counter()
+    exact = [
+        {result.document.id for result in results}
+        for results in (
+            NumpyVectorStore.similarity_search_by_vectors(store, [query], k)[0]
+            for query in query_embeddings
+        )
+    ]
+    exact_ms = (time.perf_counter() - start) * 1000 / len(query_embeddings)
+
+    rows = []
+    for nprobe in nprobe_values:
+        start = time.perf_counter()
+        approximate = [
+            store.similarity_search_by_vector(query, k, nprobe=nprobe)
+            for query in query_embeddings
+        ]
+        latency_ms = (time.perf_counter() - start) * 1000 / len(query_embeddings)
+        recall = np.mean([
+            len(expected & {result.document.id for result in results})
+            / max(len(expected), 1)
+            for expected, results in zip(exact, approximate, strict=True)
+        ])
+        rows.append({
+            "nprobe": nprobe,
+            "recall": float(recall),
+            "latency_ms": latency_ms,
+            "exact_latency_ms": exact_ms,
+        })
+    return rows
+
+
+def _file_size(path: Path) -> int:
+    return path.stat().st_size if path.exists() else 0
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms > 0)
+
+
+def _pq_subvectors(dimension: int) -> int:
+    """Return the number of PQ subvectors, each at least PQ_SUBVECTOR_DIMENSION wide."""
+    subvectors = max(1, dimension // PQ_SUBVECTOR_DIMENSION)
+    while dimension % subvectors:
+        subvectors -= 1
+    return subvectors
+
+
+def _nearest(
+    data: np.ndarray, centroids: np.ndarray, spherical: bool = False
+) -> np.ndarray:
+    """Return the index of the closest centroid (by cosine or euclidean distance)."""
+    offsets = 0 if spherical else 0.5 * np.einsum("cd,cd->c", centroids, centroids)
+    return np.concatenate([
+        np.argmax(
+            data[start : start + ENCODE_BATCH_SIZE] @ centroids.T - offsets, axis=1
+        )
+        for start in range(0, len(data), ENCODE_BATCH_SIZE)
+    ])
+
+
+def _kmeans(
+    data: np.ndarray,
+    n_clusters: int,
+    rng: np.random.Generator,
+    spherical: bool = False,
+) -> np.ndarray:
+    """Lloyd's k-means; spherical k-means keeps unit-length centroids."""
+    n_clusters = min(n_clusters, len(data))
+    centroids = data[rng.choice(len(data), n_clusters, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assignments = _nearest(data, centroids, spherical)
+        counts = np.bincount(assignments, minlength=n_clusters)
+        filled = counts > 0
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[filled]
+        sums = np.add.reduceat(data[np.argsort(assignments, kind="stable")], starts)
+        centroids[filled] = sums / counts[filled, np.newaxis]
+        # restart empty clusters from random points
+        centroids[~filled] = data[rng.choice(len(data), int((~filled).sum()))]
+        if spherical:
+            centroids = _normalize(centroids)
+    return centroids.astype(np.float32)
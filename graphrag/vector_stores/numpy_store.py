@@ -0,0 +1,271 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""The NumPy (exact, in-process) vector storage implementation package."""
+
+import json
+import shutil
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from graphrag.data_model.types import TextEmbedder
+from graphrag.vector_stores.base import (
+    BaseVectorStore,
+    VectorStoreDocument,
+    VectorStoreSearchResult,
+)
+
+VECTORS_FILE = "vectors.f32"
+DOCUMENTS_FILE = "documents.jsonl"
+
+# number of queries scored against the matrix at once, bounds the score buffer size
+QUERY_BATCH_SIZE = 256
+
+
+class NumpyVectorStore(BaseVectorStore):
+    """Exact vector storage backed by a float32 matrix.
+
+    Search is a brute-force cosine similarity (one matrix product per batch of
+    queries) with an argpartition top-k, and id filters are boolean row masks.
+    When `db_uri` is set (the config defaults it to the output directory), each
+    collection is persisted under `<db_uri>/<collection>` as a raw float32 matrix
+    (memory-mapped on load) plus a JSON lines file of ids, texts and attributes;
+    both files are append-only between overwrites.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.path: Path | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._chunks: list[np.ndarray] = []
+        self._norms: np.ndarray | None = None
+        self._ids: list[str | int] = []
+        self._texts: list[str | None] = []
+        self._attributes: list[str] = []
+        self._id_to_row: dict[str | int, int] = {}
+
+    def connect(self, **kwargs: Any) -> Any:
+        """Connect to vector storage, loading the persisted collection if it exists."""
+        db_uri = kwargs.get("db_uri")
+        self._reset()
+        self.path = (
+            Path(db_uri) / self.collection_name
+            if db_uri and self.collection_name
+            else None
+        )
+        if self.path is None or not (self.path / DOCUMENTS_FILE).exists():
+            return
+        with (self.path / DOCUMENTS_FILE).open(encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                self._append_record(record["id"], record["text"], record["attributes"])
+        if self._ids:
+            size = (self.path / VECTORS_FILE).stat().st_size
+            self._matrix = np.memmap(
+                self.path / VECTORS_FILE,
+                dtype=np.float32,
+                mode="r",
+                shape=(len(self._ids), size // (4 * len(self._ids))),
+            )
+
+    def _append_record(self, id: str | int, text: str | None, attributes: str) -> None:
+        self._id_to_row[id] = len(self._ids)
+        self._ids.append(id)
+        self._texts.append(text)
+        self._attributes.append(attributes)
+
+    def load_documents(
+        self, documents: list[VectorStoreDocument], overwrite: bool = True
+    ) -> None:
+        """Load documents into vector storage."""
+        if overwrite:
+            self._reset()
+            if self.path is not None and self.path.exists():
+                shutil.rmtree(self.path)
+
+        documents = [
+            document for document in documents if document.vector is not None
+        ]
+        if not documents:
+            return
+        vectors = np.asarray(
+            [document.vector for document in documents], dtype=np.float32
+        )
+        dimension = self.dimension
+        if vectors.ndim != 2 or (self._ids and vectors.shape[1] != dimension):
+            msg = f"Expected vectors of dimension {dimension}, got {vectors.shape}"
+            raise ValueError(msg)
+
+        records = [
+            {
+                "id": document.id,
+                "text": document.text,
+                "attributes": json.dumps(document.attributes),
+            }
+            for document in documents
+        ]
+        for record in records:
+            self._append_record(record["id"], record["text"], record["attributes"])
+        self._chunks.append(vectors)
+        self._norms = None
+
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            with (self.path / VECTORS_FILE).open("ab") as f:
+                f.write(vectors.tobytes())
+            with (self.path / DOCUMENTS_FILE).open("a", encoding="utf-8") as f:
+                f.writelines(json.dumps(record) + "\n" for record in records)
+
+    @property
+    def dimension(self) -> int:
+        """The dimension of the stored vectors (0 when empty)."""
+        if self._chunks:
+            return self._chunks[0].shape[1]
+        return self._matrix.shape[1]
+
+    def _vectors(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return the (matrix, row norms), merging newly loaded vectors on demand."""
+        if self._chunks:
+            parts = [self._matrix, *self._chunks] if len(self._matrix) else self._chunks
+            self._matrix = np.concatenate(parts)
+            self._chunks = []
+        if self._norms is None:
+            self._norms = np.linalg.norm(self._matrix, axis=1)
+        return self._matrix, self._norms
+
+    def filter_by_id(self, include_ids: list[str] | list[int]) -> Any:
+        """Build a query filter to filter documents by id."""
+        if len(include_ids) == 0:
+            self.query_filter = None
+        else:
+            mask = np.zeros(len(self._ids), dtype=bool)
+            rows = [self._id_to_row[id] for id in include_ids if id in self._id_to_row]
+            mask[rows] = True
+            self.query_filter = mask
+        return self.query_filter
+
+    def similarity_search_by_vector(
+        self, query_embedding: list[float], k: int = 10, **kwargs: Any
+    ) -> list[VectorStoreSearchResult]:
+        """Perform a vector-based similarity search."""
+        return self.similarity_search_by_vectors([query_embedding], k, **kwargs)[0]
+
+    def similarity_search_by_vectors(
+        self, query_embeddings: list[list[float]], k: int = 10, **kwargs: Any
+    ) -> list[list[VectorStoreSearchResult]]:
+        """Perform a vector-based similarity search for a batch of queries."""
+        if len(query_embeddings) == 0:
+            return []
+        matrix, _ = self._vectors()
+        if len(matrix) == 0 or k <= 0:
+            return [[] for _ in query_embeddings]
+        queries = self._queries(query_embeddings)
+        rows = None if self.query_filter is None else np.flatnonzero(self.query_filter)
+        return [
+            self._results(top_rows, top_scores)
+            for top_rows, top_scores in self._exact_top_k(queries, k, rows)
+        ]
+
+    def _queries(self, query_embeddings: list[list[float]]) -> np.ndarray:
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim != 2 or queries.shape[1] != self.dimension:
+            msg = (
+                f"Expected query vectors of dimension {self.dimension}, "
+                f"got shape {queries.shape}"
+            )
+            raise ValueError(msg)
+        return queries
+
+    def _exact_top_k(
+        self, queries: np.ndarray, k: int, rows: np.ndarray | None = None
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """Exactly score queries against all (or the given) rows.
+
+        Returns one (rows, scores) pair per query, sorted highest score first.
+        """
+        matrix, norms = self._vectors()
+        if rows is not None:
+            matrix, norms = matrix[rows], norms[rows]
+        k = min(k, len(matrix))
+        if k == 0:
+            return [(np.zeros(0, dtype=np.int64), np.zeros(0))] * len(queries)
+
+        query_norms = np.linalg.norm(queries, axis=1)
+        top_k = []
+        for start in range(0, len(queries), QUERY_BATCH_SIZE):
+            batch = slice(start, start + QUERY_BATCH_SIZE)
+            scores = cosine_similarity(
+                queries[batch], query_norms[batch], matrix, norms
+            )
+            for query_scores in scores:
+                top = top_k_indices(query_scores, k)
+                top_k.append((
+                    top if rows is None else rows[top],
+                    query_scores[top],
+                ))
+        return top_k
+
+    def _results(
+        self, rows: np.ndarray, scores: np.ndarray
+    ) -> list[VectorStoreSearchResult]:
+        return [
+            VectorStoreSearchResult(
+                document=self._document(int(row)), score=float(score)
+            )
+            for row, score in zip(rows, scores, strict=True)
+        ]
+
+    def similarity_search_by_text(
+        self, text: str, text_embedder: TextEmbedder, k: int = 10, **kwargs: Any
+    ) -> list[VectorStoreSearchResult]:
+        """Perform a similarity search using a given input text."""
+        query_embedding = text_embedder(text)
+        if query_embedding:
+            return self.similarity_search_by_vector(query_embedding, k)
+        return []
+
+    def search_by_id(self, id: str) -> VectorStoreDocument:
+        """Search for a document by id."""
+        row = self._id_to_row.get(id)
+        if row is None:
+            return VectorStoreDocument(id=id, text=None, vector=None)
+        return self._document(row)
+
+    def _document(self, row: int) -> VectorStoreDocument:
+        matrix, _ = self._vectors()
+        return VectorStoreDocument(
+            id=self._ids[row],
+            text=self._texts[row],
+            vector=matrix[row].tolist(),
+            attributes=json.loads(self._attributes[row]),
+        )
+
+
+def cosine_similarity(
+    queries: np.ndarray,
+    query_norms: np.ndarray,
+    vectors: np.ndarray,
+    vector_norms: np.ndarray,
+) -> np.ndarray:
+    """Return the (queries x vectors) cosine similarity matrix, 0 for zero vectors."""
+    denominator = np.outer(query_norms, vector_norms)
+    return np.divide(
+        queries @ vectors.T,
+        denominator,
+        out=np.zeros_like(denominator),
+        where=denominator > 0,
+    )
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return the indices of the k highest scores, highest first."""
+    if k < len(scores):
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind="stable")]
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+批量指标查询基准测试脚本
+对比逐节点查询(query_metrics)与批量查询(query_metrics_bulk)在不同子图规模下的
+往返次数和耗时。使用本地模拟的query_api代替真实InfluxDB，
+每次查询按固定往返延迟加上按返回行数计算的传输开销模拟耗时。
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from dynamic_graph_rag.db.influxdb_client import InfluxDBManager
+
+
+class StandInQueryApi:
+    """本地模拟的InfluxDB查询API，统计往返次数并模拟网络延迟"""
+
+    def __init__(self, data, round_trip_ms=5.0, per_row_us=2.0):
+        self.data = data
+        self.round_trip_ms = round_trip_ms
+        self.per_row_us = per_row_us
+        self.round_trips = 0
+
+    def query_data_frame(self, query):
+        self.round_trips += 1
+
+        # 解析查询中的节点过滤条件
+        set_match = re.search(r'contains\(value: r\.node_id, set: (\[.*?\])\)', query)
+        single_match = re.search(r'r\.node_id == "([^"]+)"', query)
+        if set_match:
+            node_ids = json.loads(set_match.group(1))
+        elif single_match:
+            node_ids = [single_match.group(1)]
+        else:
+            node_ids = None
+
+        result = self.data if node_ids is None else self.data[self.data["node_id"].isin(node_ids)]
+        time.sleep(self.round_trip_ms / 1000 + len(result) * self.per_row_us / 1e6)
+        return result.copy()
+
+
+def build_data(node_count, points_per_node):
+    """构造模拟的查询结果数据"""
+    node_ids = [f"VM_{i:05d}" for i in range(node_count)]
+    times = pd.date_range(end=pd.Timestamp.now(tz="UTC"), periods=points_per_node, freq="15min")
+    return pd.DataFrame({
+        "_time": np.tile(times, node_count),
+        "_value": np.random.random(node_count * points_per_node) * 100,
+        "_field": "value",
+        "_measurement": "vm_metrics",
+        "metric": "cpu_usage",
+        "node_id": np.repeat(node_ids, points_per_node),
+    }), node_ids
+
+
+def run_benchmark(sizes, points_per_node, round_trip_ms, chunk_size):
+    """运行基准测试并打印结果表"""
+    print(f"{'节点数':>8} | {'逐节点往返':>10} | {'逐节点耗时(s)':>13} | "
+          f"{'批量往返':>8} | {'批量耗时(s)':>11} | {'加速比':>6}")
+    print("-" * 78)
+
+    for size in sizes:
+        data, node_ids = build_data(size, points_per_node)
+
+        manager = InfluxDBManager(url="http://stand-in", token="-", org="-", bucket="metrics")
+        manager.client = object()
+        manager.query_api = StandInQueryApi(data, round_trip_ms=round_trip_ms)
+
+        # 逐节点查询
+        start = time.perf_counter()
+        for node_id in node_ids:
+            manager.query_metrics("vm_metrics", node_id=node_id, start_time="-1h")
+        per_node_elapsed = time.perf_counter() - start
+        per_node_trips = manager.query_api.round_trips
+
+        # 批量查询
+        manager.query_api.round_trips = 0
+        start = time.perf_counter()
+        manager.query_metrics_bulk("vm_metrics", node_ids, start_time="-1h", chunk_size=chunk_size)
+        bulk_elapsed = time.perf_counter() - start
+        bulk_trips = manager.query_api.round_trips
+
+        print(f"{size:>8} | {per_node_trips:>10} | {per_node_elapsed:>13.3f} | "
+              f"{bulk_trips:>8} | {bulk_elapsed:>11.3f} | {per_node_elapsed / bulk_elapsed:>5.1f}x")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='批量指标查询基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 50, 200, 500, 1000],
+                        help='子图节点数量列表')
+    parser.add_argument('--points', type=int, default=4, help='每个节点的数据点数量')
+    parser.add_argument('--rtt-ms', type=float, default=5.0, help='模拟的单次查询往返延迟（毫秒）')
+    parser.add_argument('--chunk-size', type=int, default=500, help='批量查询每次包含的最大节点数')
+    args = parser.parse_args()
+
+    run_benchmark(args.sizes, args.points, args.rtt_ms, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
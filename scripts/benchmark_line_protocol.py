@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+行协议编码基准测试脚本
+对比逐行iterrows构建Point并调用to_line_protocol()与按列向量化编码(encode_line_protocol)
+的吞吐量（点/秒）。可选使用本地模拟的write_api测量完整的流式写入路径(write_dataframe)。
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from influxdb_client import Point
+
+# 添加项目根目录到路径
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from dynamic_graph_rag.data.simulated.generators.time_series_generator import TimeSeriesGenerator
+from dynamic_graph_rag.db.influxdb_client import InfluxDBManager
+from dynamic_graph_rag.db.line_protocol import encode_line_protocol
+
+TAG_COLUMNS = ['node_id', 'node_type', 'metric']
+FIELD_COLUMNS = ['value', 'unit']
+
+
+class StandInWriteApi:
+    """本地模拟的同步写入API，只统计写入的行数和请求次数"""
+
+    def __init__(self, per_request_ms=0.0):
+        self.per_request_ms = per_request_ms
+        self.requests = 0
+        self.points = 0
+
+    def write(self, bucket, record, org=None):
+        self.requests += 1
+        self.points += len(record)
+        if self.per_request_ms:
+            time.sleep(self.per_request_ms / 1000)
+
+
+def run_point_path(frame):
+    """原有方式：逐行构建Point对象并序列化"""
+    lines = []
+    for _, row in frame.iterrows():
+        point = Point(f"{row['node_type'].lower()}_metrics")
+        for tag in TAG_COLUMNS:
+            point = point.tag(tag, row[tag])
+        point = point.field('value', float(row['value'])).field('unit', row['unit']).time(row['timestamp'])
+        lines.append(point.to_line_protocol())
+    return len(lines)
+
+
+def run_encoder_path(frame):
+    """按列向量化编码"""
+    return len(encode_line_protocol(frame, measurement_column='measurement',
+                                    tag_columns=TAG_COLUMNS, field_columns=FIELD_COLUMNS))
+
+
+def run_stream_path(frame, batch_size, per_request_ms):
+    """流式写入：分块编码后按批写入模拟的write_api"""
+    manager = InfluxDBManager()
+    manager.client = object()
+    manager.sync_write_api = StandInWriteApi(per_request_ms)
+    return manager.write_dataframe(frame, measurement_column='measurement', tag_columns=TAG_COLUMNS,
+                                   field_columns=FIELD_COLUMNS, batch_size=batch_size)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='行协议编码基准测试')
+    parser.add_argument('--nodes', type=int, nargs='+', default=[10, 100, 1000], help='VM节点数量列表')
+    parser.add_argument('--hours', type=int, default=24, help='每个节点生成多少小时的数据')
+    parser.add_argument('--point-limit', type=int, default=50000,
+                        help='Point方式的最大测量点数，超过时只测量前N个点并按比例估算')
+    parser.add_argument('--batch-size', type=int, default=5000, help='流式写入的每批点数')
+    parser.add_argument('--request-ms', type=float, default=0.0, help='模拟每次写请求的耗时（毫秒）')
+    args = parser.parse_args()
+
+    end_time = datetime(2025, 1, 1)
+    start_time = end_time - timedelta(hours=args.hours)
+
+    print(f"{'节点数':>8} | {'数据点':>10} | {'Point(点/s)':>12} | {'编码(点/s)':>12} | "
+          f"{'流式写入(点/s)':>14} | {'加速比':>6}")
+    print("-" * 84)
+
+    for size in args.nodes:
+        generator = TimeSeriesGenerator(nodes_info=[{"id": f"VM_{i:06d}", "type": "VM"} for i in range(size)],
+                                        seed=0)
+        frame = generator.generate_metrics_frame(start_time, end_time, include_anomalies=False)
+        frame['measurement'] = frame['node_type'].map(InfluxDBManager.get_measurement)
+        points = len(frame)
+
+        sample = frame.iloc[:args.point_limit]
+        start = time.perf_counter()
+        run_point_path(sample)
+        point_rate = len(sample) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        run_encoder_path(frame)
+        encoder_rate = points / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        written = run_stream_path(frame, args.batch_size, args.request_ms)
+        stream_rate = written / (time.perf_counter() - start)
+
+        estimated = "*" if len(sample) < points else " "
+        print(f"{size:>8} | {points:>10,} | {point_rate:>11,.0f}{estimated} | {encoder_rate:>12,.0f} | "
+              f"{stream_rate:>14,.0f} | {encoder_rate / point_rate:>5.1f}x")
+
+    print("\n* 按前 --point-limit 个数据点的耗时估算")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+时序数据生成基准测试脚本
+对比逐节点、逐指标生成(generate_periodic_pattern + add_anomalies)与
+按节点类型批量生成张量并输出长格式DataFrame的耗时和吞吐量；
+指定 --workers 时另外测量多进程分片生成并编码为行协议的吞吐量随进程数的变化。
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from dynamic_graph_rag.data.simulated.generators.time_series_generator import TimeSeriesGenerator
+
+
+def run_per_node(generator, node_ids, start_time, end_time):
+    """原有的逐节点、逐指标生成方式，每个 (节点, 指标) 构建一个DataFrame"""
+    time_range = generator.build_time_range("VM", start_time, end_time)
+    rows = 0
+    for node_id in node_ids:
+        for metric_name, config in generator.metrics_config["VM"].items():
+            values = generator.generate_periodic_pattern(
+                base_value=(config["min"] + config["max"]) / 2,
+                volatility=config["volatility"],
+                time_range=time_range,
+                daily_pattern=True,
+                weekly_pattern=True
+            )
+            values = generator.add_anomalies(values, anomaly_probability=0.05)
+            values = np.clip(values, config["min"], config["max"])
+            df = pd.DataFrame({
+                "timestamp": time_range,
+                "value": values,
+                "node_id": node_id,
+                "node_type": "VM",
+                "unit": config["unit"]
+            })
+            rows += len(df)
+    return rows
+
+
+def run_batched(generator, start_time, end_time, chunk_size):
+    """批量生成长格式数据，逐块消费"""
+    rows = 0
+    for frame in generator.iter_metrics_frames(start_time, end_time, node_chunk_size=chunk_size):
+        rows += len(frame)
+    return rows
+
+
+def run_parallel_encode(generator, start_time, end_time, workers, shard_size):
+    """多进程按分片生成并编码为行协议（不写入）"""
+    points = 0
+    for shard in generator.iter_shard_results(start_time, end_time, workers, shard_size=shard_size,
+                                              generate_logs=False, encode=True):
+        points += sum(len(lines) for lines in shard['metric_batches'])
+    return points
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='时序数据生成基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000], help='VM节点数量列表')
+    parser.add_argument('--days', type=int, default=30, help='生成多少天的数据')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='批量生成时每个张量的最大节点数')
+    parser.add_argument('--per-node-limit', type=int, default=1000,
+                        help='逐节点方式的最大节点数，超过时只测量前N个节点并按比例估算')
+    parser.add_argument('--workers', type=int, nargs='*', default=[],
+                        help='并行生成并编码的进程数列表，如 1 2 4 8')
+    parser.add_argument('--shard-size', type=int, default=1000, help='并行生成时每个分片的节点数')
+    args = parser.parse_args()
+
+    end_time = datetime(2025, 1, 1)
+    start_time = end_time - timedelta(days=args.days)
+
+    print(f"{'节点数':>8} | {'数据点':>12} | {'逐节点耗时(s)':>13} | {'批量耗时(s)':>11} | "
+          f"{'批量吞吐(点/s)':>14} | {'加速比':>6}")
+    print("-" * 84)
+
+    for size in args.sizes:
+        generator = TimeSeriesGenerator(nodes_info=[{"id": f"VM_{i:06d}", "type": "VM"} for i in range(size)],
+                                        seed=0)
+
+        measured = min(size, args.per_node_limit)
+        start = time.perf_counter()
+        run_per_node(generator, [node["id"] for node in generator.nodes_info[:measured]], start_time, end_time)
+        per_node_elapsed = (time.perf_counter() - start) * size / measured
+
+        start = time.perf_counter()
+        rows = run_batched(generator, start_time, end_time, args.chunk_size)
+        batched_elapsed = time.perf_counter() - start
+
+        estimated = "*" if measured < size else " "
+        print(f"{size:>8} | {rows:>12,} | {per_node_elapsed:>12.2f}{estimated} | {batched_elapsed:>11.2f} | "
+              f"{rows / batched_elapsed:>14,.0f} | {per_node_elapsed / batched_elapsed:>5.1f}x")
+
+    print("\n* 按前 --per-node-limit 个节点的耗时按比例估算")
+
+    if not args.workers:
+        return
+
+    size = max(args.sizes)
+    generator = TimeSeriesGenerator(nodes_info=[{"id": f"VM_{i:06d}", "type": "VM"} for i in range(size)],
+                                    seed=0, connect_databases=False)
+    print(f"\n并行生成并编码行协议 ({size} 个节点):")
+    print(f"{'进程数':>6} | {'数据点':>12} | {'耗时(s)':>8} | {'吞吐(点/s)':>12} | {'加速比':>6}")
+    print("-" * 60)
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        points = run_parallel_encode(generator, start_time, end_time, workers, args.shard_size)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>6} | {points:>12,} | {elapsed:>8.2f} | {points / elapsed:>12,.0f} | "
+              f"{baseline / elapsed:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
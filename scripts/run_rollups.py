@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+指标汇总层级管理 - 命令行工具
+创建小时/天汇总存储桶和定时汇总任务，或回填历史数据的汇总
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+from dynamic_graph_rag.db.influxdb_client import InfluxDBManager
+
+
+def parse_arguments():
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description='指标汇总层级管理工具')
+    subparsers = parser.add_subparsers(dest='command', help='子命令')
+
+    subparsers.add_parser('setup', help='创建汇总存储桶和定时汇总任务')
+
+    backfill_parser = subparsers.add_parser('backfill', help='回填历史数据的汇总')
+    backfill_parser.add_argument('--tier', choices=['hourly', 'daily'], nargs='+', default=['hourly', 'daily'],
+                                 help='需要回填的汇总层级')
+    backfill_parser.add_argument('--start', default='-30d',
+                                 help='开始时间，如 -30d 或 2025-01-01T00:00:00Z')
+    backfill_parser.add_argument('--end', default=None,
+                                 help='结束时间（默认当前时间）')
+
+    return parser.parse_args()
+
+
+def main():
+    """主函数"""
+    args = parse_arguments()
+    if not args.command:
+        print("请指定子命令: setup 或 backfill")
+        return 1
+
+    with InfluxDBManager() as influxdb:
+        if args.command == 'setup':
+            success = influxdb.ensure_rollups()
+        else:
+            success = all(influxdb.run_rollup(tier, args.start, args.end) for tier in args.tier)
+
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+"""
+使用示例:
+
+1. 创建汇总存储桶和定时任务:
+   python run_rollups.py setup
+
+2. 回填最近30天的小时和天汇总:
+   python run_rollups.py backfill --start -30d
+
+3. 只回填指定日期范围的天汇总:
+   python run_rollups.py backfill --tier daily --start 2025-01-01T00:00:00Z --end 2025-02-01T00:00:00Z
+
+启用查询路由需设置环境变量 ROLLUP_ENABLED=true
+"""
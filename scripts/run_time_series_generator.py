@@ -41,4 +41,7 @@ if __name__ == "__main__":
 
 6. 仅生成CSV数据文件，不导入InfluxDB（解决超时问题）:
    python run_time_series_generator.py --csv-only --output-dir ./output/timeseries_data
+
+7. 使用8个进程并行生成、4个线程写入InfluxDB，并固定随机种子:
+   python run_time_series_generator.py --days 30 --workers 8 --writers 4 --seed 42
 """ 
\ No newline at end of file